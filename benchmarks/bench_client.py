@@ -0,0 +1,123 @@
+"""
+Micro-benchmark of the client's per-request overhead, without any network I/O.
+
+Requests go through `BitgetClient._request` as usual (rate limiter, request preparation,
+`requests` session and response unwrapping), but the session's transport answers every
+request with a canned response. Each case is timed with the current request path and
+with the previous one, which signed every request (public or not) with a freshly keyed
+HMAC, built its headers from scratch and let `requests` rescan the environment for proxy
+and CA bundle settings.
+
+Usage:
+    python benchmarks/bench_client.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from market_beacon.api import BitgetClient
+from market_beacon.api.auth import generate_signature, get_timestamp_ms
+from market_beacon.api.ratelimit import RateLimiter
+
+BODY = json.dumps({"code": "00000", "msg": "success", "requestTime": 0, "data": []}).encode()
+
+# Case name -> (endpoint, query parameters).
+CASES: dict[str, tuple[str, dict[str, Any]]] = {
+    "public": ("/spot/market/candles", {"symbol": "BTCUSDT", "granularity": "1min", "limit": 5}),
+    "signed": ("/spot/account/assets", {"coin": "USDT"}),
+}
+
+
+class _CannedAdapter(HTTPAdapter):
+    """A transport adapter that answers every request with `BODY`."""
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = BODY
+        response.request = request
+        response.url = request.url or ""
+        return response
+
+
+def _legacy_prepare(
+    client: BitgetClient, method: str, endpoint: str, params: dict[str, Any] | None = None
+) -> tuple[str, dict[str, Any] | None, str, dict[str, str]]:
+    """The previous `_prepare_request`: every request signed, headers rebuilt each time."""
+    request_path = f"/api/v2{endpoint}"
+    url = client.BASE_URL + request_path
+    is_post = method.upper() == "POST"
+    body = json.dumps(params) if is_post and params else ""
+    query_params = params if not is_post else None
+    timestamp = get_timestamp_ms()
+    path_to_sign = request_path
+    if query_params:
+        path_to_sign += "?" + "&".join([f"{k}={v}" for k, v in query_params.items()])
+    signature = generate_signature(timestamp, method, path_to_sign, body, "secret")
+    headers = {
+        "ACCESS-KEY": "key",
+        "ACCESS-SIGN": signature,
+        "ACCESS-TIMESTAMP": timestamp,
+        "ACCESS-PASSPHRASE": "passphrase",
+        "Content-Type": "application/json",
+        "locale": "en-US",
+    }
+    return url, query_params, body, headers
+
+
+def _client(legacy: bool) -> BitgetClient:
+    # A quota far above what the loop can issue, so throttling never kicks in.
+    rate_limiter = RateLimiter({endpoint: 1e12 for endpoint, _ in CASES.values()}, 1e12)
+    client = BitgetClient("key", "secret", "passphrase", rate_limiter=rate_limiter)
+    client._session.mount("https://", _CannedAdapter())
+    if legacy:
+        client._prepare_request = lambda *a: _legacy_prepare(client, *a)  # type: ignore[method-assign]
+        # Let `requests` rescan the environment on every request, as it used to.
+        client._session.trust_env = True
+        client._environment_settings = dict  # type: ignore[method-assign]
+    return client
+
+
+def _best_us(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the best per-call time in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(repeat: int) -> None:
+    logger.disable("market_beacon")
+    header = f"{'case':<8} {'stage':<9} {'previous':>10} {'current':>10} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+
+    legacy, current = _client(legacy=True), _client(legacy=False)
+    for name, (endpoint, params) in CASES.items():
+        for stage in ("prepare", "request"):
+            timings = []
+            for client in (legacy, current):
+                call = client._prepare_request if stage == "prepare" else client._request
+                timings.append(_best_us(partial(call, "GET", endpoint, params), repeat))
+            before, after = timings
+            print(f"{name:<8} {stage:<9} {before:>8.1f}us {after:>8.1f}us {before / after:>7.2f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is kept).")
+    args = parser.parse_args()
+    run(args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
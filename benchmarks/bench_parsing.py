@@ -0,0 +1,112 @@
+"""
+Micro-benchmark of the validated and trusted ("fast parse") response parsing paths.
+
+Each hot endpoint's response body is replayed through `MarketDataAPI` without any network
+I/O, so the timings cover JSON decoding, envelope checks and payload parsing only.
+
+By default the payloads are generated in the exact shape of Bitget's V2 responses (a full
+page of trades, 1000 candles and a 150-level order book). To benchmark real responses,
+record them once with `--record DIR` and replay them with `--payloads DIR`.
+
+Usage:
+    python benchmarks/bench_parsing.py [--payloads DIR | --record DIR] [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+from loguru import logger
+from payloads import load_payloads, record_payloads, synthetic_payloads
+
+from market_beacon.api.client import MarketDataAPI, _BitgetClientBase, _json_loads
+
+# Fixture name -> (validated/trusted model call, columnar call).
+CASES: dict[str, tuple[Callable[[MarketDataAPI], Any], Callable[[MarketDataAPI], Any]]] = {
+    "fills-100": (
+        lambda api: api.get_trades("BTCUSDT"),
+        lambda api: api.get_trade_batch("BTCUSDT"),
+    ),
+    "candles-1000": (
+        lambda api: api.get_candles("BTCUSDT", granularity="1min", limit=1000),
+        lambda api: api.get_candle_batch("BTCUSDT", granularity="1min", limit=1000),
+    ),
+    "orderbook-150": (
+        lambda api: api.get_order_book("BTCUSDT", limit=150),
+        lambda api: api.get_order_book_snapshot("BTCUSDT", limit=150),
+    ),
+}
+
+
+def _replaying_api(body: bytes, fast_parse: bool) -> MarketDataAPI:
+    """Returns a `MarketDataAPI` whose every request is answered with `body`."""
+    response = httpx.Response(200, content=body)
+
+    def request(method: str, endpoint: str, params: Any = None, trusted: bool = False) -> Any:
+        return _BitgetClientBase._unwrap_response(response, trusted)
+
+    return MarketDataAPI(request, fast_parse=fast_parse)
+
+
+def _best_us(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the best per-call time in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(payloads: dict[str, bytes], repeat: int) -> None:
+    logger.disable("market_beacon")
+    decoder = "orjson" if _json_loads is not json.loads else "json (install the `fast` extra)"
+    print(f"JSON decoder on the fast path: {decoder}\n")
+    header = f"{'payload':<13} {'bytes':>9} {'validated':>11} {'fast':>15} {'batch':>15}"
+    print(header)
+    print("-" * len(header))
+
+    for name, body in payloads.items():
+        models, batch = CASES[name]
+        validated_api = _replaying_api(body, fast_parse=False)
+        fast_api = _replaying_api(body, fast_parse=True)
+
+        # The trusted path must produce exactly what the validated path does.
+        expected = models(validated_api)
+        actual = models(fast_api)
+        if isinstance(expected, list):
+            assert [m.model_dump() for m in actual] == [m.model_dump() for m in expected]
+        else:
+            assert actual.model_dump() == expected.model_dump()
+
+        validated = _best_us(lambda api=validated_api, f=models: f(api), repeat)
+        fast = _best_us(lambda api=fast_api, f=models: f(api), repeat)
+        columnar = _best_us(lambda api=fast_api, f=batch: f(api), repeat)
+        print(
+            f"{name:<13} {len(body):>9,} {validated:>9.0f}us "
+            f"{fast:>8.0f}us ({validated / fast:>3.1f}x) "
+            f"{columnar:>6.0f}us ({validated / columnar:>4.1f}x)"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--payloads", type=Path, help="Replay responses recorded in DIR.")
+    source.add_argument("--record", type=Path, help="Record live responses into DIR and exit.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is kept).")
+    args = parser.parse_args()
+
+    if args.record:
+        record_payloads(args.record, CASES)
+        return 0
+
+    payloads = load_payloads(args.payloads, CASES) if args.payloads else synthetic_payloads(CASES)
+    run(payloads, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Startup-time benchmark of the CLI's import graph.
+
+Each scenario imports a module in fresh interpreters and reports the median wall time,
+then lists the slowest imports from one `python -X importtime` run. Modules in
+`LAZY_MODULES` must not be imported by any scenario; the benchmark fails if one is, or if
+`--budget-ms` is exceeded, so it doubles as a startup regression check.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--top N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Scenario name -> module imported in a fresh interpreter.
+SCENARIOS = {
+    "cli": "market_beacon.__main__",
+    "client": "market_beacon.api",
+    "orderbook": "market_beacon.orderbook",
+}
+
+# Heavy dependencies that only the code paths using them may import.
+LAZY_MODULES = ("pandas", "talib", "httpx", "websockets", "pydantic_settings")
+
+_CHECK = "import sys, {module}; print(','.join(m for m in {lazy!r} if m in sys.modules))"
+
+
+def _time_import(module: str) -> float:
+    """Wall time (ms) of a fresh interpreter importing `module`."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def _leaked_modules(module: str) -> list[str]:
+    """The `LAZY_MODULES` that importing `module` pulls in."""
+    code = _CHECK.format(module=module, lazy=LAZY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.strip()
+    return output.split(",") if output else []
+
+
+def _slowest_imports(module: str, top: int) -> list[tuple[int, int, str]]:
+    """`(self_us, cumulative_us, name)` of the `top` slowest imports, by self time."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            rows.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run(runs: int, top: int, budget_ms: float | None) -> int:
+    # The CLI must import without credentials; settings are only read when it runs.
+    for name in ("BITGET_API_KEY", "BITGET_API_SECRET", "BITGET_API_PASSPHRASE"):
+        os.environ.pop(name, None)
+    baseline = statistics.median(_time_import("sys") for _ in range(runs))
+    print(f"Bare interpreter: {baseline:.0f}ms (subtracted below)\n")
+
+    failures = []
+    for name, module in SCENARIOS.items():
+        median = statistics.median(_time_import(module) for _ in range(runs)) - baseline
+        leaked = _leaked_modules(module)
+        print(f"{name:<10} import {module}: {median:.0f}ms")
+        for self_us, cumulative_us, imported in _slowest_imports(module, top):
+            self_ms, cumulative_ms = self_us / 1000, cumulative_us / 1000
+            print(f"    {self_ms:>6.1f}ms self {cumulative_ms:>6.1f}ms cumulative  {imported}")
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)}")
+        if budget_ms is not None and median > budget_ms:
+            failures.append(f"{module} took {median:.0f}ms (budget {budget_ms:.0f}ms)")
+        print()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7, help="Interpreters timed per scenario.")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports listed.")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Fail if a scenario is slower than MS."
+    )
+    args = parser.parse_args()
+    return run(args.runs, args.top, args.budget_ms)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
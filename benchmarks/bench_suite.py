@@ -0,0 +1,317 @@
+"""
+Staged benchmark suite over Bitget API fixtures, with a regression check between runs.
+
+Candle, trade, order book and ticker responses of several sizes (see `payloads.py`) are
+served by a local HTTP server and pushed through each stage of the pipeline in isolation:
+the HTTP round trip (`http` on the bare session, `request` through the client), JSON
+decoding, model validation, the columnar parse, every indicator group, the summary
+DataFrame and JSON serialization. Each stage reports its best time per call and the peak
+memory one call allocates (for the HTTP stages, including the server thread's).
+
+Each `indicators/<group>` stage times one of the indicator groups that
+`calculate_technical_indicators` runs; `indicators/all` times the whole call.
+`orderbook/engine` times the order book stats over a live `OrderBookEngine` holding the
+same book, which reads its cached depth curves.
+
+Fixtures are generated in the shape of Bitget's V2 responses unless recorded ones are
+given: record them once with `--record DIR` and replay them with `--fixtures DIR`.
+
+To check a change for regressions, save a baseline on the parent commit and compare:
+
+    git checkout main && python benchmarks/bench_suite.py --save baseline.json
+    git checkout - && python benchmarks/bench_suite.py --compare baseline.json
+
+Stages more than `--threshold` slower than the baseline, or allocating that much more, are
+flagged and make the run exit with status 1.
+
+Usage:
+    python benchmarks/bench_suite.py [--fixtures DIR | --record DIR] [--stage GLOB]
+        [--repeat N] [--save FILE] [--compare FILE] [--threshold FRACTION]
+"""
+
+import argparse
+import fnmatch
+import json
+import subprocess
+import sys
+import threading
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from loguru import logger
+from payloads import FIXTURES, load_payloads, record_payloads, synthetic_payloads
+from pydantic import TypeAdapter
+
+from market_beacon.analysis import (
+    _INDICATOR_GROUPS,
+    AnalysisResult,
+    _talib_indicator_values,
+    calculate_order_book_stats,
+    calculate_technical_indicators,
+    calculate_trade_stats_from_trades,
+    interpret_indicator_values,
+)
+from market_beacon.api import BitgetClient
+from market_beacon.api.batches import CandleBatch, OrderBookSnapshot, TickerTable, TradeBatch
+from market_beacon.api.client import TRADE_LIST_ADAPTER, _json_loads
+from market_beacon.api.models import Candle, OrderBook, Ticker
+from market_beacon.api.ratelimit import RateLimiter
+from market_beacon.depth import calculate_depth_analytics
+from market_beacon.orderbook import OrderBookEngine
+from market_beacon.scan import summarize_scan
+from market_beacon.screener import screen_tickers, top_movers
+
+TICKER_LIST_ADAPTER = TypeAdapter(list[Ticker])
+
+# Endpoint -> (model validation, columnar parse) of a response's `data` payload.
+PARSERS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any] | None]] = {
+    "/spot/market/fills": (TRADE_LIST_ADAPTER.validate_python, TradeBatch.from_rows),
+    "/spot/market/candles": (
+        lambda rows: [Candle.from_list(row) for row in rows],
+        CandleBatch.from_rows,
+    ),
+    "/spot/market/orderbook": (OrderBook.model_validate, OrderBookSnapshot.from_payload),
+    "/spot/market/tickers": (TICKER_LIST_ADAPTER.validate_python, TickerTable.from_rows),
+}
+
+# Growth in peak allocations below this is noise, whatever the relative change.
+MIN_PEAK_REGRESSION_KIB = 16.0
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    """Answers any path with the fixture body named by the `fixture` query parameter."""
+
+    daemon_threads = True
+
+    def __init__(self, bodies: dict[str, bytes]) -> None:
+        super().__init__(("127.0.0.1", 0), _FixtureHandler)
+        self.bodies = bodies
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    # Keep connections alive, as Bitget does, so `http` times a pooled request, and send
+    # the headers and body without waiting on delayed ACKs.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _FixtureServer
+
+    def do_GET(self) -> None:
+        names = parse_qs(urlparse(self.path).query).get("fixture", [""])
+        body = self.server.bodies.get(names[0])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def _fetch(session: requests.Session, url: str, params: dict[str, str]) -> bytes:
+    return session.get(url, params=params, timeout=10).content
+
+
+def _client(url: str) -> BitgetClient:
+    # A quota far above what the loop can issue, so throttling never kicks in.
+    rate_limiter = RateLimiter(dict.fromkeys(PARSERS, 1e12), 1e12)
+    client = BitgetClient("key", "secret", "passphrase", rate_limiter=rate_limiter)
+    client.BASE_URL = url
+    return client
+
+
+def build_stages(bodies: dict[str, bytes], client: BitgetClient) -> dict[str, Callable[[], Any]]:
+    """Returns every stage of the pipeline as a zero-argument call, keyed by stage name."""
+    stages: dict[str, Callable[[], Any]] = {}
+    parsed: dict[str, Any] = {}
+    for name, body in bodies.items():
+        endpoint, _ = FIXTURES[name]
+        params = {"fixture": name}
+        data = _json_loads(body)["data"]
+        validate, columnar = PARSERS[endpoint]
+        stages[f"{name}/http"] = partial(
+            _fetch, client._session, f"{client.BASE_URL}/api/v2{endpoint}", params
+        )
+        stages[f"{name}/request"] = partial(client._request, "GET", endpoint, params, True)
+        stages[f"{name}/decode"] = partial(_json_loads, body)
+        stages[f"{name}/validate"] = partial(validate, data)
+        if columnar is not None:
+            stages[f"{name}/columnar"] = partial(columnar, data)
+        # Analysis runs on the largest fixture of each kind.
+        parsed[endpoint] = (columnar or validate)(data)
+
+    candles = parsed.get("/spot/market/candles")
+    if candles is not None:
+        for group, compute in _INDICATOR_GROUPS.items():
+            stages[f"indicators/{group}"] = partial(compute, candles)
+        values = _talib_indicator_values(candles)
+        stages["indicators/interpret"] = partial(interpret_indicator_values, values)
+        stages["indicators/all"] = partial(calculate_technical_indicators, candles)
+    trades = parsed.get("/spot/market/fills")
+    if trades is not None:
+        stages["trades/stats"] = partial(calculate_trade_stats_from_trades, trades)
+    book = parsed.get("/spot/market/orderbook")
+    if book is not None:
+        stages["orderbook/stats"] = partial(calculate_order_book_stats, book)
+        stages["orderbook/depth"] = partial(calculate_depth_analytics, book)
+        engine = OrderBookEngine("BTCUSDT")
+        engine.apply_snapshot(
+            [[repr(p), repr(s)] for p, s in book.bids.tolist()],
+            [[repr(p), repr(s)] for p, s in book.asks.tolist()],
+            timestamp=book.timestamp,
+        )
+        stages["orderbook/engine"] = partial(calculate_order_book_stats, engine)
+    tickers = parsed.get("/spot/market/tickers")
+    if tickers is not None:
+        stages["tickers/screen"] = partial(
+            screen_tickers, tickers, "USDT", min_usdt_volume=1e6, max_spread_bps=5
+        )
+        stages["tickers/movers"] = partial(top_movers, tickers, 20)
+    if candles is not None and trades is not None:
+        result = AnalysisResult(
+            symbol="BTCUSDT",
+            trade_stats=calculate_trade_stats_from_trades(trades),
+            technical_analysis=calculate_technical_indicators(candles),
+        )
+        # One summary row per listed symbol, as for an `--all-symbols` scan.
+        symbols = tickers.symbol.tolist() if tickers is not None else []
+        results = [result.model_copy(update={"symbol": s}) for s in symbols] or [result]
+        stages["dataframe/summary"] = partial(summarize_scan, results)
+        stages["serialize/analysis"] = partial(result.model_dump_json, exclude_none=True)
+        stages["serialize/summary"] = summarize_scan(results).to_string
+    return stages
+
+
+def _best_us(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the best per-call time in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def _peak_kib(func: Callable[[], Any]) -> float:
+    """Kibibytes allocated at the peak of one call."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _revision() -> str:
+    """The checked-out commit, marked dirty if the tree has changes."""
+    git = partial(subprocess.run, cwd=Path(__file__).parent, capture_output=True, text=True)
+    try:
+        commit = git(["git", "rev-parse", "--short", "HEAD"], check=True).stdout.strip()
+        dirty = git(["git", "diff", "--quiet", "HEAD"], check=False).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def _change(current: float, previous: float) -> float:
+    return current / previous - 1 if previous > 0 else 0.0
+
+
+def run(
+    bodies: dict[str, bytes],
+    pattern: str,
+    repeat: int,
+    baseline: dict[str, Any] | None,
+    threshold: float,
+) -> tuple[dict[str, dict[str, float]], list[str]]:
+    """
+    Times every stage matching `pattern` and prints one row per stage.
+
+    Returns:
+        The measurements by stage, and the stages that regressed against `baseline`.
+    """
+    logger.disable("market_beacon")
+    previous = baseline["stages"] if baseline else {}
+    if baseline:
+        print(f"Comparing with {baseline['revision']} (threshold {threshold:.0%})\n")
+    header = f"{'stage':<28} {'time':>11} {'peak':>11}"
+    if baseline:
+        header += f" {'time Δ':>8} {'peak Δ':>8}"
+    print(header)
+    print("-" * len(header))
+
+    results: dict[str, dict[str, float]] = {}
+    regressions: list[str] = []
+    with _FixtureServer(bodies) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with _client(server.url) as client:
+                for stage, func in build_stages(bodies, client).items():
+                    if not fnmatch.fnmatch(stage, pattern):
+                        continue
+                    func()
+                    timing = {"us": _best_us(func, repeat), "peak_kib": _peak_kib(func)}
+                    results[stage] = timing
+                    row = f"{stage:<28} {timing['us']:>9.1f}us {timing['peak_kib']:>8.1f}KiB"
+                    if stage in previous:
+                        time_change = _change(timing["us"], previous[stage]["us"])
+                        peak_change = _change(timing["peak_kib"], previous[stage]["peak_kib"])
+                        peak_growth = timing["peak_kib"] - previous[stage]["peak_kib"]
+                        row += f" {time_change:>+8.0%} {peak_change:>+8.0%}"
+                        if time_change > threshold or (
+                            peak_change > threshold and peak_growth > MIN_PEAK_REGRESSION_KIB
+                        ):
+                            regressions.append(stage)
+                            row += "  REGRESSION"
+                    print(row)
+        finally:
+            server.shutdown()
+    return results, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", type=Path, help="Replay responses recorded in DIR.")
+    source.add_argument("--record", type=Path, help="Record live responses into DIR and exit.")
+    parser.add_argument("--stage", default="*", help="Only run stages matching this glob.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is kept).")
+    parser.add_argument("--save", type=Path, help="Write the measurements to FILE as JSON.")
+    parser.add_argument("--compare", type=Path, help="Flag regressions against a saved FILE.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Relative slowdown flagged (default 0.2)."
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        record_payloads(args.record)
+        return 0
+
+    bodies = load_payloads(args.fixtures) if args.fixtures else synthetic_payloads()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    results, regressions = run(bodies, args.stage, args.repeat, baseline, args.threshold)
+
+    if args.save:
+        report = {"revision": _revision(), "stages": results}
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
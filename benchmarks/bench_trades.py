@@ -0,0 +1,117 @@
+"""
+Micro-benchmark of 'full' mode trade statistics and trade-to-bar aggregation.
+
+A synthetic trade tape is analyzed three ways: the previous per-model implementation
+(six Python passes over a `list[Trade]`), `calculate_trade_stats_from_trades` over a
+columnar `TradeBatch`, and aggregation into per-candle `TradeBars`. The memory column is
+what each representation keeps alive for the whole window.
+
+Usage:
+    python benchmarks/bench_trades.py [--trades N] [--interval-ms MS] [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from market_beacon.analysis import TradeAnalysis, calculate_trade_stats_from_trades
+from market_beacon.api.batches import TradeBars, TradeBatch
+from market_beacon.api.models import Trade
+
+BASE_MS = 1_700_000_000_000
+
+
+def _legacy_stats(trades: list[Trade]) -> TradeAnalysis:
+    """The previous implementation over `Trade` models."""
+    buy_trades = [t for t in trades if t.side == "buy"]
+    sell_trades = [t for t in trades if t.side == "sell"]
+    total_volume = sum(t.size for t in trades)
+    buy_volume = sum(t.size for t in buy_trades)
+    sell_volume = sum(t.size for t in sell_trades)
+    weighted_price_sum = sum(t.price * t.size for t in trades)
+    return TradeAnalysis(
+        total_trades=len(trades),
+        buy_trades=len(buy_trades),
+        sell_trades=len(sell_trades),
+        total_volume=total_volume,
+        buy_volume=buy_volume,
+        sell_volume=sell_volume,
+        vwap=weighted_price_sum / total_volume if total_volume > 0 else 0.0,
+    )
+
+
+def synthetic_trades(count: int, seed: int = 7) -> TradeBatch:
+    """A tape of `count` trades, about ten per second."""
+    rng = np.random.default_rng(seed)
+    return TradeBatch(
+        np.arange(count, dtype=np.int64),
+        BASE_MS + np.sort(rng.integers(0, count * 100, count)),
+        100 * np.exp(np.cumsum(rng.normal(0, 1e-4, count))),
+        rng.exponential(0.2, count),
+        rng.random(count) < 0.5,
+    )
+
+
+def _best_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the best per-call time in milliseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e3
+
+
+def _retained_mb(build: Callable[[], Any]) -> float:
+    """Megabytes still allocated by the object `build` returns."""
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / 1e6
+
+
+def run(count: int, interval_ms: int, repeat: int) -> None:
+    logger.disable("market_beacon")
+    batch = synthetic_trades(count)
+    models = batch.to_trades()
+
+    cases: dict[str, tuple[Callable[[], Any], Callable[[], Any]]] = {
+        "list[Trade] stats": (lambda: _legacy_stats(models), batch.to_trades),
+        "TradeBatch stats": (
+            lambda: calculate_trade_stats_from_trades(batch),
+            lambda: synthetic_trades(count),
+        ),
+        "TradeBars build": (
+            lambda: TradeBars.from_trades(batch, interval_ms, BASE_MS),
+            lambda: TradeBars.from_trades(batch, interval_ms, BASE_MS),
+        ),
+    }
+    print(f"{count} trades, {interval_ms // 1000}s bars\n")
+    header = f"{'path':<20} {'time':>10} {'speedup':>8} {'retained':>10}"
+    print(header)
+    print("-" * len(header))
+    baseline = None
+    for name, (func, build) in cases.items():
+        elapsed = _best_ms(func, repeat)
+        baseline = baseline or elapsed
+        memory = _retained_mb(build)
+        print(f"{name:<20} {elapsed:>8.2f}ms {baseline / elapsed:>7.1f}x {memory:>8.2f}MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, default=200_000, help="Trades in the tape.")
+    parser.add_argument("--interval-ms", type=int, default=60_000, help="Bar length.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is kept).")
+    args = parser.parse_args()
+    run(args.trades, args.interval_ms, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
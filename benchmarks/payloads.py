@@ -0,0 +1,174 @@
+"""
+Bitget V2 response bodies shared by the benchmarks, generated or recorded.
+
+Each fixture is one response body named after its endpoint and size (`candles-1000`).
+`synthetic_payloads` generates them deterministically in the exact shape of Bitget's
+responses; `record_payloads` saves live responses from the public endpoints so they can be
+replayed with `load_payloads`.
+"""
+
+import json
+import random
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from market_beacon.api.client import _BitgetClientBase
+
+BASE_MS = 1_700_000_000_000
+
+# Tickers generated for the all-symbols tickers fixture, about Bitget's spot listing.
+SYNTHETIC_TICKERS = 800
+
+# Fixture name -> (endpoint, query parameters used when recording).
+FIXTURES: dict[str, tuple[str, dict[str, Any]]] = {
+    "fills-100": ("/spot/market/fills", {"symbol": "BTCUSDT", "limit": 100}),
+    "fills-500": ("/spot/market/fills", {"symbol": "BTCUSDT", "limit": 500}),
+    "candles-200": (
+        "/spot/market/candles",
+        {"symbol": "BTCUSDT", "granularity": "1min", "limit": 200},
+    ),
+    "candles-1000": (
+        "/spot/market/candles",
+        {"symbol": "BTCUSDT", "granularity": "1min", "limit": 1000},
+    ),
+    "orderbook-15": ("/spot/market/orderbook", {"symbol": "BTCUSDT", "type": "step0", "limit": 15}),
+    "orderbook-150": (
+        "/spot/market/orderbook",
+        {"symbol": "BTCUSDT", "type": "step0", "limit": 150},
+    ),
+    "tickers": ("/spot/market/tickers", {}),
+}
+
+
+def envelope(data: Any) -> bytes:
+    """Wraps a `data` payload in a successful V2 response envelope."""
+    payload = {"code": "00000", "msg": "success", "requestTime": BASE_MS, "data": data}
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _fills(rng: random.Random, count: int) -> list[dict[str, str]]:
+    price = 65_000.0
+    fills = []
+    for i in range(count):
+        price += rng.gauss(0, 2.5)
+        fills.append(
+            {
+                "symbol": "BTCUSDT",
+                "tradeId": str(1_300_000_000_000_000_000 + i),
+                "side": rng.choice(("buy", "sell")),
+                "price": f"{price:.2f}",
+                "size": f"{rng.expovariate(20):.6f}",
+                "ts": str(BASE_MS + i * 37),
+            }
+        )
+    return fills
+
+
+def _candles(rng: random.Random, count: int) -> list[list[str]]:
+    candles = []
+    close = 65_000.0
+    for i in range(count):
+        open_ = close
+        close = open_ + rng.gauss(0, 25)
+        high = max(open_, close) + abs(rng.gauss(0, 10))
+        low = min(open_, close) - abs(rng.gauss(0, 10))
+        volume = rng.uniform(5, 50)
+        candles.append(
+            [
+                str(BASE_MS + i * 60_000),
+                f"{open_:.2f}",
+                f"{high:.2f}",
+                f"{low:.2f}",
+                f"{close:.2f}",
+                f"{volume:.6f}",
+                f"{volume * close:.4f}",
+                f"{volume * close:.4f}",
+            ]
+        )
+    return candles
+
+
+def _orderbook(rng: random.Random, levels: int) -> dict[str, Any]:
+    mid = 65_000.0
+    return {
+        "asks": [
+            [f"{mid + 0.01 * (i + 1):.2f}", f"{rng.uniform(0, 2):.6f}"] for i in range(levels)
+        ],
+        "bids": [[f"{mid - 0.01 * i:.2f}", f"{rng.uniform(0, 2):.6f}"] for i in range(levels)],
+        "ts": str(BASE_MS),
+        "scale": "0.01",
+        "precision": "scale0",
+        "isMaxPrecision": "NO",
+    }
+
+
+def _tickers(rng: random.Random, count: int) -> list[dict[str, str]]:
+    tickers = []
+    for i in range(count):
+        price = 10 ** rng.uniform(-4, 4)
+        change = rng.gauss(0, 0.05)
+        volume = rng.uniform(1e3, 1e7)
+        tickers.append(
+            {
+                "symbol": f"COIN{i}USDT",
+                "high24h": f"{price * (1 + abs(change)):.6g}",
+                "open": f"{price / (1 + change):.6g}",
+                "lastPr": f"{price:.6g}",
+                "low24h": f"{price * (1 - abs(change)):.6g}",
+                "quoteVolume": f"{volume * price:.4f}",
+                "baseVolume": f"{volume:.4f}",
+                "usdtVolume": f"{volume * price:.4f}",
+                "bidPr": f"{price * 0.9999:.6g}",
+                "askPr": f"{price * 1.0001:.6g}",
+                "bidSz": f"{rng.uniform(0, 100):.4f}",
+                "askSz": f"{rng.uniform(0, 100):.4f}",
+                "openUtc": f"{price / (1 + change):.6g}",
+                "ts": str(BASE_MS),
+                "changeUtc24h": f"{change:.4f}",
+                "change24h": f"{change:.4f}",
+                "priceChangePercent": f"{change:.4f}",
+                "vol24h": f"{volume:.4f}",
+                "volUsd": f"{volume * price:.4f}",
+            }
+        )
+    return tickers
+
+
+# Endpoint -> generator of a `data` payload with the given number of rows or levels.
+_GENERATORS: dict[str, Callable[[random.Random, int], Any]] = {
+    "/spot/market/fills": _fills,
+    "/spot/market/candles": _candles,
+    "/spot/market/orderbook": _orderbook,
+    "/spot/market/tickers": _tickers,
+}
+
+
+def synthetic_payloads(names: Iterable[str] = FIXTURES, seed: int = 7) -> dict[str, bytes]:
+    """Builds deterministic response bodies for the named fixtures."""
+    rng = random.Random(seed)
+    bodies = {}
+    for name in names:
+        endpoint, params = FIXTURES[name]
+        size = params.get("limit", SYNTHETIC_TICKERS)
+        bodies[name] = envelope(_GENERATORS[endpoint](rng, size))
+    return bodies
+
+
+def record_payloads(directory: Path, names: Iterable[str] = FIXTURES) -> None:
+    """Saves live responses from the public endpoints for later replay."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        endpoint, params = FIXTURES[name]
+        url = f"{_BitgetClientBase.BASE_URL}/api/v2{endpoint}"
+        response = requests.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        (directory / f"{name}.json").write_bytes(response.content)
+        print(f"Recorded {name} ({len(response.content):,} bytes)")
+
+
+def load_payloads(directory: Path, names: Iterable[str] = FIXTURES) -> dict[str, bytes]:
+    """Loads recorded response bodies written by `record_payloads`."""
+    return {name: (directory / f"{name}.json").read_bytes() for name in names}
@@ -1,16 +1,208 @@
 import argparse
+import json
+import os
+import signal
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
 from typing import get_args
 
 from loguru import logger
 
+from market_beacon import metrics
 from market_beacon.analysis import (
+    AnalysisResult,
     calculate_order_book_stats,
     run_analysis,
 )
-from market_beacon.api import BitgetAPIError, BitgetClient
+from market_beacon.api import BitgetAPIError, BitgetClient, ReferenceCache
 from market_beacon.api.client import MarketDataAPI
-from market_beacon.config import settings
+from market_beacon.api.models import MAX_CANDLES_PER_REQUEST
+from market_beacon.backfill import DEFAULT_BACKFILL_WORKERS, backfill_candles
+from market_beacon.daemon import DEFAULT_SETTLE_DELAY, AnalysisDaemon
+from market_beacon.prefilter import CANDLE_SCORES, PrefilterConfig, prefilter_symbols
+from market_beacon.scan import (
+    RANK_COLUMNS,
+    ScanFailure,
+    fetch_analysis_inputs,
+    scan_symbols,
+    summarize_scan,
+)
+from market_beacon.store import CandleStore
+from market_beacon.timeframes import (
+    RESAMPLABLE_GRANULARITIES,
+    order_timeframes,
+    run_multi_timeframe_analysis,
+)
+
+# Where the supported-symbols list and clock offset are kept between runs.
+DEFAULT_REFERENCE_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "market-beacon"
+)
+
+
+@contextmanager
+def _metrics_sink(parsed_args: argparse.Namespace) -> Iterator[None]:
+    """Routes the instrumentation to the sink chosen on the command line, if any."""
+    if parsed_args.metrics_port is not None:
+        registry = metrics.MetricsRegistry()
+        server = metrics.serve_prometheus(
+            registry, parsed_args.metrics_port, parsed_args.metrics_host
+        )
+        logger.info(
+            f"Serving metrics at http://{parsed_args.metrics_host}:{parsed_args.metrics_port}"
+            "/metrics"
+        )
+        metrics.set_sink(registry)
+        try:
+            yield
+        finally:
+            metrics.set_sink(None)
+            server.shutdown()
+            server.server_close()
+    elif parsed_args.metrics_log:
+        with open(parsed_args.metrics_log, "a") as stream:
+            metrics.set_sink(metrics.JsonLinesSink(stream))
+            try:
+                yield
+            finally:
+                metrics.set_sink(None)
+    else:
+        yield
+
+
+def _run_scan(market: MarketDataAPI, symbols: list[str], parsed_args: argparse.Namespace) -> None:
+    """Scans `symbols`, streaming one JSON line per result, then prints the ranked summary."""
+    logger.info(
+        f"Scanning {len(symbols)} symbols in '{parsed_args.analysis_mode}' mode "
+        f"with granularity '{parsed_args.granularity}' ({parsed_args.candle_limit} candles)"
+    )
+    results: list[AnalysisResult] = []
+    failures: list[ScanFailure] = []
+    for result in scan_symbols(
+        market,
+        symbols,
+        granularity=parsed_args.granularity,
+        candle_limit=parsed_args.candle_limit,
+        mode=parsed_args.analysis_mode,
+        fetch_workers=parsed_args.fetch_workers,
+        processes=parsed_args.processes,
+        trade_workers=parsed_args.trade_workers,
+    ):
+        if isinstance(result, ScanFailure):
+            failures.append(result)
+            continue
+        results.append(result)
+        print(result.model_dump_json(exclude_none=True), flush=True)
+
+    logger.info(
+        f"--- Scan Complete: {len(results)} analyzed, {len(failures)} failed "
+        f"(ranked by {parsed_args.rank_by}) ---"
+    )
+    print(summarize_scan(results, rank_by=parsed_args.rank_by).to_string())
+
+    with open("scan_results.json", "w") as f:
+        json.dump([result.model_dump(mode="json", exclude_none=True) for result in results], f)
+
+
+def _run_prefilter(market: MarketDataAPI, parsed_args: argparse.Namespace) -> None:
+    """Shortlists the spot universe in stages and prints the final stage's results."""
+    config = PrefilterConfig(
+        quote_asset=parsed_args.quote_asset or None,
+        min_usdt_volume=parsed_args.min_usdt_volume,
+        max_spread_bps=parsed_args.max_spread_bps,
+        min_range=parsed_args.min_range,
+        min_abs_change=parsed_args.min_abs_change,
+        max_candidates=parsed_args.max_candidates,
+        score_by=parsed_args.score_by,
+        top=parsed_args.top,
+    )
+    report = prefilter_symbols(
+        market,
+        granularity=parsed_args.granularity,
+        candle_limit=parsed_args.candle_limit,
+        config=config,
+        final_stage="orderbook" if parsed_args.get_orderbook else "indicators",
+        fetch_workers=parsed_args.fetch_workers,
+        orderbook_level=parsed_args.orderbook_level,
+        orderbook_limit=parsed_args.orderbook_limit,
+    )
+    logger.info(
+        f"--- Prefilter Complete: {report.universe} tickers -> {len(report.candidates)} "
+        f"candidates -> {len(report.shortlist)} analyzed, {len(report.failures)} failed ---"
+    )
+    if parsed_args.get_orderbook:
+        books = {symbol: stats.model_dump() for symbol, stats in report.order_books.items()}
+        print(json.dumps(books, indent=2))
+        return
+    for result in report.analyses:
+        print(result.model_dump_json(exclude_none=True), flush=True)
+    if report.analyses:
+        print(summarize_scan(report.analyses, rank_by=parsed_args.rank_by).to_string())
+
+
+def _run_backfill(
+    market: MarketDataAPI, symbols: list[str], parsed_args: argparse.Namespace
+) -> None:
+    """Backfills each symbol into the candle cache, printing one JSON summary line each."""
+    store = CandleStore(parsed_args.candle_cache)
+    for symbol in symbols:
+        result = backfill_candles(
+            market,
+            symbol,
+            parsed_args.granularity,
+            start_time=parsed_args.backfill,
+            end_time=parsed_args.backfill_end,
+            store=store,
+            max_workers=parsed_args.backfill_workers,
+        )
+        timestamps = result.candles.timestamp
+        summary = {
+            "symbol": symbol,
+            "granularity": result.granularity,
+            "candles": len(timestamps),
+            "first": int(timestamps[0]) if len(timestamps) else None,
+            "last": int(timestamps[-1]) if len(timestamps) else None,
+            "requests": result.requests,
+            "gaps": result.gaps,
+        }
+        print(json.dumps(summary), flush=True)
+
+
+def _serve(market: MarketDataAPI, symbols: list[str], parsed_args: argparse.Namespace) -> None:
+    """Re-analyzes `symbols` as each candle closes until SIGTERM or Ctrl+C."""
+    output_path = "analysis_results.json" if len(symbols) == 1 else "scan_results.json"
+
+    def on_tick(results: list[AnalysisResult]) -> None:
+        for result in results:
+            print(result.model_dump_json(exclude_none=True), flush=True)
+        if len(symbols) == 1:
+            payload = results[0].model_dump_json(indent=2, exclude_none=True)
+        else:
+            payload = json.dumps([r.model_dump(mode="json", exclude_none=True) for r in results])
+        with open(output_path, "w") as f:
+            f.write(payload)
+
+    with AnalysisDaemon(
+        market,
+        symbols,
+        granularity=parsed_args.granularity,
+        candle_limit=parsed_args.candle_limit,
+        mode=parsed_args.analysis_mode,
+        fetch_workers=parsed_args.fetch_workers,
+        trade_workers=parsed_args.trade_workers,
+        settle_delay=parsed_args.settle_delay,
+    ) as daemon:
+        previous_handlers = {
+            signum: signal.signal(signum, lambda *_: daemon.stop())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            daemon.run(on_tick)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
 
 
 def main(args: list[str] | None = None) -> None:
@@ -24,12 +216,25 @@ def main(args: list[str] | None = None) -> None:
     valid_granularity = get_args(MarketDataAPI.get_candles.__annotations__["granularity"])
 
     parser = argparse.ArgumentParser(description="Market Beacon Bot")
-    parser.add_argument(
+    symbol_group = parser.add_mutually_exclusive_group()
+    symbol_group.add_argument(
         "--symbol",
         type=str,
         default="BTCUSDT",
         help="The trading symbol to analyze (e.g., BTCUSDT).",
     )
+    symbol_group.add_argument(
+        "--symbols",
+        type=str,
+        nargs="+",
+        metavar="SYMBOL",
+        help="Scan several symbols in one run and print a ranked summary.",
+    )
+    symbol_group.add_argument(
+        "--all-symbols",
+        action="store_true",
+        help="Scan every supported spot symbol and print a ranked summary.",
+    )
     # --- Group for Technical Analysis ---
     ta_group = parser.add_argument_group("Technical Analysis Options")
     ta_group.add_argument(
@@ -45,6 +250,20 @@ def main(args: list[str] | None = None) -> None:
         choices=valid_granularity,
         help="Candle granularity. From Bitget API.",
     )
+    ta_group.add_argument(
+        "--timeframes",
+        nargs="+",
+        default=None,
+        choices=RESAMPLABLE_GRANULARITIES,
+        metavar="GRANULARITY",
+        help=(
+            "Analyze the symbol on several timeframes, resampled from as few fetches as "
+            "possible: a timeframe is fetched directly when deriving it would take more "
+            "than one request. With --candle-cache, all are derived from the finest, since "
+            "later runs only download the newest candles. One or more of: "
+            f"{', '.join(RESAMPLABLE_GRANULARITIES)}."
+        ),
+    )
     ta_group.add_argument(
         "--analysis-mode",
         type=str,
@@ -55,6 +274,41 @@ def main(args: list[str] | None = None) -> None:
             "'full': Fetch all individual trades for precise, but slower, stats."
         ),
     )
+    ta_group.add_argument(
+        "--trade-workers",
+        type=int,
+        default=4,
+        help=(
+            "Number of concurrent workers used to fetch trades in 'full' mode. "
+            "The range is split into one equal time window per worker."
+        ),
+    )
+
+    ta_group.add_argument(
+        "--candle-cache",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help=(
+            "Directory for a persistent candle cache. When set, only candles newer than "
+            "the cached history (or missing from it) are downloaded."
+        ),
+    )
+    ta_group.add_argument(
+        "--reference-cache",
+        type=str,
+        default=DEFAULT_REFERENCE_CACHE,
+        metavar="DIR",
+        help=(
+            "Directory where the supported-symbols list and exchange clock offset are "
+            "cached between runs, so most runs skip those requests."
+        ),
+    )
+    ta_group.add_argument(
+        "--no-reference-cache",
+        action="store_true",
+        help="Always fetch the supported symbols and server time.",
+    )
 
     # --- Group for Order Book Analysis ---
     ob_group = parser.add_argument_group("Order Book Options")
@@ -74,24 +328,228 @@ def main(args: list[str] | None = None) -> None:
         "--orderbook-limit", type=int, default=50, help="Number of order book levels to fetch."
     )
 
+    # --- Group for Multi-Symbol Scans ---
+    scan_group = parser.add_argument_group("Scan Options")
+    scan_group.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=8,
+        help="Number of concurrent workers fetching market data in scan mode.",
+    )
+    scan_group.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of analysis worker processes in scan mode (0 analyzes in-process).",
+    )
+    scan_group.add_argument(
+        "--rank-by",
+        type=str,
+        default="change",
+        choices=list(RANK_COLUMNS),
+        help="Column the scan summary is ranked by, highest first.",
+    )
+
+    # --- Group for Universe Prefiltering ---
+    prefilter_group = parser.add_argument_group("Prefilter Options")
+    prefilter_group.add_argument(
+        "--prefilter",
+        action="store_true",
+        help=(
+            "Shortlist the whole spot universe in stages: one bulk tickers request and "
+            "filters, then candles for the survivors only, then the full analysis (or, with "
+            "--get-orderbook, the order book) for the best --top of them."
+        ),
+    )
+    prefilter_group.add_argument(
+        "--quote-asset",
+        type=str,
+        default="USDT",
+        help="Only consider symbols quoted in this asset (an empty string allows any).",
+    )
+    prefilter_group.add_argument(
+        "--min-usdt-volume",
+        type=float,
+        default=1e6,
+        help="Minimum 24h volume in USDT.",
+    )
+    prefilter_group.add_argument(
+        "--max-spread-bps",
+        type=float,
+        default=None,
+        help="Maximum bid/ask spread, in basis points of the mid-price.",
+    )
+    prefilter_group.add_argument(
+        "--min-range",
+        type=float,
+        default=None,
+        help="Minimum 24h high/low range as a fraction of the low (0.05 is 5%%).",
+    )
+    prefilter_group.add_argument(
+        "--min-abs-change",
+        type=float,
+        default=None,
+        help="Minimum absolute 24h price change as a fraction (0.03 is 3%%).",
+    )
+    prefilter_group.add_argument(
+        "--max-candidates",
+        type=int,
+        default=100,
+        help="Symbols, by USDT volume, that pass the filters and have candles fetched.",
+    )
+    prefilter_group.add_argument(
+        "--score-by",
+        type=str,
+        default="volatility",
+        choices=CANDLE_SCORES,
+        help="Candle score the candidates are ranked by before the final stage.",
+    )
+    prefilter_group.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of best-scoring candidates given the full analysis.",
+    )
+
+    # --- Group for Daemon Mode ---
+    serve_group = parser.add_argument_group("Daemon Options")
+    serve_group.add_argument(
+        "--serve",
+        action="store_true",
+        help=(
+            "Keep running and re-analyze the symbol(s) each time a candle closes, fetching "
+            "only the new candles. Stops cleanly on SIGTERM or Ctrl+C."
+        ),
+    )
+    serve_group.add_argument(
+        "--settle-delay",
+        type=float,
+        default=DEFAULT_SETTLE_DELAY,
+        help="Seconds to wait after a candle closes before fetching it in daemon mode.",
+    )
+
+    # --- Group for History Backfills ---
+    backfill_group = parser.add_argument_group("Backfill Options")
+    backfill_group.add_argument(
+        "--backfill",
+        type=datetime.fromisoformat,
+        default=None,
+        metavar="START",
+        help=(
+            "Download the candle history from START (an ISO date or datetime, local time "
+            "unless it has an offset) into --candle-cache, then exit. Candles already "
+            "cached are not downloaded again."
+        ),
+    )
+    backfill_group.add_argument(
+        "--backfill-end",
+        type=datetime.fromisoformat,
+        default=None,
+        metavar="END",
+        help="Exclusive end of the backfill range. Defaults to now.",
+    )
+    backfill_group.add_argument(
+        "--backfill-workers",
+        type=int,
+        default=DEFAULT_BACKFILL_WORKERS,
+        help="Number of concurrent history requests while backfilling.",
+    )
+
+    # --- Group for Instrumentation ---
+    metrics_group = parser.add_argument_group("Metrics Options")
+    metrics_sinks = metrics_group.add_mutually_exclusive_group()
+    metrics_sinks.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help=(
+            "Serve request latency, bytes, page, retry and compute-time metrics for "
+            "Prometheus at /metrics on PORT while running (most useful with --serve). "
+            "Indicators computed in --processes workers are not timed."
+        ),
+    )
+    metrics_sinks.add_argument(
+        "--metrics-log",
+        default=None,
+        metavar="PATH",
+        help="Append every metric observation to PATH as JSON lines.",
+    )
+    metrics_group.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Interface the --metrics-port endpoint listens on.",
+    )
+
     parsed_args = parser.parse_args(args)
+    scan_mode = bool(parsed_args.symbols) or parsed_args.all_symbols
+    if scan_mode and parsed_args.get_orderbook:
+        parser.error("--get-orderbook cannot be combined with --symbols or --all-symbols")
+    if parsed_args.serve and parsed_args.get_orderbook:
+        parser.error("--get-orderbook cannot be combined with --serve")
+    if parsed_args.prefilter:
+        if scan_mode or parsed_args.serve or parsed_args.backfill is not None:
+            parser.error("--prefilter cannot be combined with scans, --serve or --backfill")
+        if parsed_args.timeframes or parsed_args.analysis_mode != "fast":
+            parser.error("--prefilter cannot be combined with --timeframes or 'full' mode")
+    if parsed_args.timeframes:
+        if scan_mode or parsed_args.serve or parsed_args.get_orderbook:
+            parser.error("--timeframes only applies to single-symbol technical analysis")
+        if parsed_args.backfill is not None or parsed_args.analysis_mode != "fast":
+            parser.error("--timeframes cannot be combined with --backfill or 'full' mode")
+        try:
+            order_timeframes(parsed_args.timeframes)
+        except ValueError as e:
+            parser.error(str(e))
+    if parsed_args.backfill is not None:
+        if not parsed_args.candle_cache:
+            parser.error("--backfill requires --candle-cache")
+        if parsed_args.serve or parsed_args.get_orderbook:
+            parser.error("--backfill cannot be combined with --serve or --get-orderbook")
 
+    # Imported here so `--help` and argument errors don't pay for pydantic-settings.
+    from market_beacon.config import get_settings
+
+    settings = get_settings()
     logger.info("Market Beacon bot starting...")
     logger.info(f"API Key loaded (first 5 chars): {settings.bitget_api_key[:5]}...")
 
     try:
-        with BitgetClient(
-            api_key=settings.bitget_api_key,
-            secret_key=settings.bitget_api_secret,
-            passphrase=settings.bitget_api_passphrase,
-        ) as client:
+        with (
+            _metrics_sink(parsed_args),
+            BitgetClient(
+                api_key=settings.bitget_api_key,
+                secret_key=settings.bitget_api_secret,
+                passphrase=settings.bitget_api_passphrase,
+                pool_maxsize=max(20, parsed_args.fetch_workers),
+                candle_store=CandleStore(parsed_args.candle_cache)
+                if parsed_args.candle_cache
+                else None,
+                reference_cache=ReferenceCache(parsed_args.reference_cache)
+                if not parsed_args.no_reference_cache
+                else None,
+            ) as client,
+        ):
             # --- Validate Symbol and Synchronize Time ---
             server_time = client.market.get_server_time()
             logger.info(f"Connected to Bitget. Server time: {server_time.server_time}")
 
             spot_symbols_list = client.market.get_supported_symbols()
             valid_symbols = set(spot_symbols_list)
-            if parsed_args.symbol not in valid_symbols:
+            if scan_mode:
+                if parsed_args.all_symbols:
+                    symbols = spot_symbols_list
+                else:
+                    symbols = list(dict.fromkeys(parsed_args.symbols))
+                    unknown = [symbol for symbol in symbols if symbol not in valid_symbols]
+                    if unknown:
+                        logger.warning(
+                            f"Symbols not in the supported list: {', '.join(unknown)}. "
+                            "Proceeding anyway, but API calls may fail for them."
+                        )
+            elif parsed_args.prefilter:
+                logger.info(f"Prefiltering {len(spot_symbols_list)} supported symbols.")
+            elif parsed_args.symbol not in valid_symbols:
                 logger.warning(
                     f"Symbol '{parsed_args.symbol}' not found in the list of supported symbols. "
                     "Proceeding anyway, but API calls may fail if the symbol is truly invalid."
@@ -100,12 +558,26 @@ def main(args: list[str] | None = None) -> None:
                 logger.info(f"Symbol {parsed_args.symbol} validated against supported list.")
 
             # --- Main Logic: Execute one mode or the other ---
-            if parsed_args.get_orderbook:
+            if parsed_args.backfill is not None:
+                _run_backfill(
+                    client.market, symbols if scan_mode else [parsed_args.symbol], parsed_args
+                )
+
+            elif parsed_args.serve:
+                _serve(client.market, symbols if scan_mode else [parsed_args.symbol], parsed_args)
+
+            elif scan_mode:
+                _run_scan(client.market, symbols, parsed_args)
+
+            elif parsed_args.prefilter:
+                _run_prefilter(client.market, parsed_args)
+
+            elif parsed_args.get_orderbook:
                 logger.info(
                     f"Fetching order book for {parsed_args.symbol} "
                     f"(level: {parsed_args.orderbook_level}, limit: {parsed_args.orderbook_limit})"
                 )
-                order_book = client.market.get_order_book(
+                order_book = client.market.get_order_book_snapshot(
                     symbol=parsed_args.symbol,
                     level=parsed_args.orderbook_level,
                     limit=parsed_args.orderbook_limit,
@@ -114,6 +586,21 @@ def main(args: list[str] | None = None) -> None:
                 logger.info("--- Order Book Analysis Complete ---")
                 print(order_book_stats.model_dump_json(indent=2))
 
+            elif parsed_args.timeframes:
+                analysis_results = run_multi_timeframe_analysis(
+                    client.market,
+                    symbol=parsed_args.symbol,
+                    timeframes=parsed_args.timeframes,
+                    candle_limit=parsed_args.candle_limit,
+                    # A cached history is only downloaded once, so derive every timeframe.
+                    max_base_candles=None if parsed_args.candle_cache else MAX_CANDLES_PER_REQUEST,
+                )
+                logger.info("--- Multi-Timeframe Analysis Complete ---")
+                results_json = analysis_results.model_dump_json(indent=2, exclude_none=True)
+                print(results_json)
+                with open("analysis_results.json", "w") as f:
+                    f.write(results_json)
+
             else:  # Default to Technical Analysis
                 logger.info(
                     f"Analyzing symbol: {parsed_args.symbol} "
@@ -122,27 +609,17 @@ def main(args: list[str] | None = None) -> None:
                     f"({parsed_args.candle_limit} candles)"
                 )
 
-                # Always fetch candles as they are the basis for technical indicators
-                candles = client.market.get_candles(
+                # Candles are the basis for technical indicators; 'full' mode adds the
+                # trades within the candle time range
+                candles, trades = fetch_analysis_inputs(
+                    client.market,
                     symbol=parsed_args.symbol,
                     granularity=parsed_args.granularity,
-                    limit=parsed_args.candle_limit,
+                    candle_limit=parsed_args.candle_limit,
+                    mode=parsed_args.analysis_mode,
+                    trade_workers=parsed_args.trade_workers,
                 )
 
-                trades = []
-                if candles:
-                    # In 'full' mode, fetch all trades within the candle time range
-                    if parsed_args.analysis_mode == "full":
-                        start_time = candles[0].timestamp
-                        end_time = candles[-1].timestamp
-                        trades = client.market.get_trades(
-                            symbol=parsed_args.symbol,
-                            start_time=start_time,
-                            end_time=end_time,
-                        )
-                else:
-                    logger.warning("No candle data returned, skipping analysis.")
-
                 # --- Run Analysis ---
                 analysis_results = run_analysis(
                     symbol=parsed_args.symbol,
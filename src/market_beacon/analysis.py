@@ -1,12 +1,16 @@
-from typing import Literal
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
 
 import numpy as np
-import pandas as pd
-import talib
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from . import metrics
+from .api.batches import CandleBatch, OrderBookSnapshot, TradeBars, TradeBatch
 from .api.models import Candle, OrderBook, Trade
+from .depth import DepthAnalysis, DepthProfile, calculate_depth_analytics
+from .orderbook import OrderBookEngine
 
 # ==============================================================================
 # 1. Pydantic Models for Analysis Results
@@ -180,6 +184,10 @@ class AnalysisResult(BaseModel):
     symbol: str
     trade_stats: TradeAnalysis
     technical_analysis: TechnicalAnalysis
+    timeframes: dict[str, TechnicalAnalysis] | None = Field(
+        default=None,
+        description="Per-timeframe analyses of a multi-timeframe run, finest first.",
+    )
 
 
 class OrderBookAnalysis(BaseModel):
@@ -195,55 +203,189 @@ class OrderBookAnalysis(BaseModel):
     market_pressure_ratio: float = Field(
         ..., description="Ratio of total bid volume to total ask volume. >1 indicates buy pressure."
     )
+    depth: DepthAnalysis | None = Field(
+        None, description="Depth, imbalance and price impact analytics (None if a side is empty)."
+    )
 
 
 # ==============================================================================
 # 2. Analysis Calculation Functions
 # ==============================================================================
 
+# Indicator periods and interpretation thresholds, shared by `calculate_technical_indicators`
+# and the incremental `IndicatorState`.
+MA_SHORT, MA_LONG = 50, 200
+EMA_SHORT, EMA_MEDIUM = 9, 21
+EMA_RIBBON_PERIODS = (20, 25, 30, 35, 40, 45, 50, 55)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+ADX_PERIOD = 14
+ICHIMOKU_TENKAN, ICHIMOKU_KIJUN, ICHIMOKU_SENKOU = 9, 26, 52
+RSI_PERIOD, RSI_OVERBOUGHT, RSI_OVERSOLD = 14, 70, 30
+STOCH_FASTK_PERIOD, STOCH_SLOWK_PERIOD, STOCH_SLOWD_PERIOD = 14, 3, 3
+STOCH_OVERBOUGHT, STOCH_OVERSOLD = 80, 20
+WILLIAMS_PERIOD, WILLIAMS_OVERBOUGHT, WILLIAMS_OVERSOLD = 14, -20, -80
+BB_PERIOD, BB_DEV = 20, 2
+ATR_PERIOD, CMF_PERIOD = 14, 20
+
+# The minimum history needed, based on the longest lookback period (+1 for prev-value checks).
+MIN_REQUIRED_CANDLES = (
+    max(
+        MA_LONG,
+        max(EMA_RIBBON_PERIODS),
+        MACD_SLOW + MACD_SIGNAL,
+        ADX_PERIOD,
+        ICHIMOKU_SENKOU,
+        RSI_PERIOD,
+        STOCH_FASTK_PERIOD + STOCH_SLOWK_PERIOD + STOCH_SLOWD_PERIOD,
+        WILLIAMS_PERIOD,
+        BB_PERIOD,
+        ATR_PERIOD,
+        CMF_PERIOD,
+    )
+    + 1
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorValues:
+    """
+    The latest raw indicator readings that a `TechnicalAnalysis` is interpreted from.
 
-def calculate_trade_stats_from_trades(trades: list[Trade]) -> TradeAnalysis:
+    `calculate_technical_indicators` derives them from TA-Lib series over the whole candle
+    history; `IndicatorState` keeps them up to date one candle at a time. Readings whose
+    lookback isn't covered yet are `None`.
     """
-    Calculates precise statistics from a list of individual trades. ('full' mode)
+
+    first_open: float
+    close: float
+    low: float
+    prev_low: float | None
+    sma_short: float | None
+    prev_sma_short: float | None
+    sma_long: float | None
+    prev_sma_long: float | None
+    ema_short: float | None
+    ema_medium: float | None
+    ema_ribbon: dict[str, float | None]
+    macd_line: float | None
+    macd_signal: float | None
+    macd_histogram: float | None
+    prev_macd_histogram: float | None
+    adx: float | None
+    tenkan_sen: float | None
+    kijun_sen: float | None
+    # Senkou spans projected from 26 periods ago (aligned with the current price), and the
+    # ones projected from the latest candle.
+    senkou_span_a: float | None
+    senkou_span_b: float | None
+    future_senkou_span_a: float | None
+    future_senkou_span_b: float | None
+    chikou_span: float | None
+    psar: float | None
+    prev_psar: float | None
+    rsi: float | None
+    stochastic_k: float | None
+    stochastic_d: float | None
+    williams_r: float | None
+    bollinger_upper: float | None
+    bollinger_middle: float | None
+    bollinger_lower: float | None
+    atr: float | None
+    on_balance_volume: float | None
+    chaikin_money_flow: float | None
+
+
+def _as_candle_batch(candles: list[Candle] | CandleBatch) -> CandleBatch:
+    """Accepts either candle representation and returns the columnar one."""
+    return candles if isinstance(candles, CandleBatch) else CandleBatch.from_candles(candles)
+
+
+def _as_trade_batch(trades: list[Trade] | TradeBatch) -> TradeBatch:
+    """Accepts either trade representation and returns the columnar one."""
+    return trades if isinstance(trades, TradeBatch) else TradeBatch.from_trades(trades)
+
+
+@dataclass(slots=True)
+class TradeStatsAccumulator:
     """
-    if not trades:
-        logger.warning("Trade list is empty, returning zeroed-out stats.")
-        return TradeAnalysis(total_volume=0.0, vwap=0.0)
+    Running totals behind 'full' mode trade statistics, fed one chunk of trades at a time.
 
-    buy_trades = [t for t in trades if t.side == "buy"]
-    sell_trades = [t for t in trades if t.side == "sell"]
+    Consuming a trade stream (e.g. `MarketDataAPI.iter_trade_batches`) chunk by chunk
+    gives the same `TradeAnalysis` as `calculate_trade_stats_from_trades` over the whole
+    range, in constant memory.
+    """
 
-    total_volume = sum(t.size for t in trades)
-    buy_volume = sum(t.size for t in buy_trades)
-    sell_volume = sum(t.size for t in sell_trades)
+    total_trades: int = 0
+    buy_trades: int = 0
+    total_volume: float = 0.0
+    buy_volume: float = 0.0
+    quote_volume: float = 0.0
+
+    def update(self, trades: list[Trade] | TradeBatch | TradeBars) -> None:
+        """Adds a chunk of trades, or the bars aggregated from them, to the totals."""
+        if isinstance(trades, TradeBars):
+            self.total_trades += int(trades.trade_count.sum())
+            self.buy_trades += int(trades.buy_count.sum())
+            self.total_volume += float(trades.volume.sum())
+            self.buy_volume += float(trades.buy_volume.sum())
+            self.quote_volume += float(trades.quote_volume.sum())
+            return
+        batch = _as_trade_batch(trades)
+        # Volume per side in one pass: index 0 sums the sells, index 1 the buys.
+        sell_side, buy_side = np.bincount(batch.is_buy, weights=batch.size, minlength=2)
+        self.total_trades += len(batch)
+        self.buy_trades += int(np.count_nonzero(batch.is_buy))
+        self.total_volume += float(sell_side + buy_side)
+        self.buy_volume += float(buy_side)
+        self.quote_volume += float(np.dot(batch.price, batch.size))
+
+    def result(self) -> TradeAnalysis:
+        """The statistics of every trade added so far."""
+        if not self.total_trades:
+            return TradeAnalysis(total_volume=0.0, vwap=0.0)
+        vwap = self.quote_volume / self.total_volume if self.total_volume > 0 else 0.0
+        return TradeAnalysis(
+            total_trades=self.total_trades,
+            buy_trades=self.buy_trades,
+            sell_trades=self.total_trades - self.buy_trades,
+            total_volume=self.total_volume,
+            buy_volume=self.buy_volume,
+            sell_volume=self.total_volume - self.buy_volume,
+            vwap=vwap,
+        )
 
-    weighted_price_sum = sum(t.price * t.size for t in trades)
-    vwap = weighted_price_sum / total_volume if total_volume > 0 else 0.0
 
-    return TradeAnalysis(
-        total_trades=len(trades),
-        buy_trades=len(buy_trades),
-        sell_trades=len(sell_trades),
-        total_volume=total_volume,
-        buy_volume=buy_volume,
-        sell_volume=sell_volume,
-        vwap=vwap,
-    )
+def calculate_trade_stats_from_trades(
+    trades: list[Trade] | TradeBatch | TradeBars,
+) -> TradeAnalysis:
+    """
+    Calculates precise statistics from individual trades, or from the exact `TradeBars`
+    aggregated from them. ('full' mode)
+    """
+    if not len(trades):
+        logger.warning("Trade list is empty, returning zeroed-out stats.")
+        return TradeAnalysis(total_volume=0.0, vwap=0.0)
+
+    accumulator = TradeStatsAccumulator()
+    accumulator.update(trades)
+    return accumulator.result()
 
 
-def calculate_trade_stats_from_candles(candles: list[Candle]) -> TradeAnalysis:
+def calculate_trade_stats_from_candles(candles: list[Candle] | CandleBatch) -> TradeAnalysis:
     """
     Calculates aggregated statistics from candlestick data. ('fast' mode)
     This provides an efficient approximation for VWAP and total volume.
     """
-    if not candles:
+    if not len(candles):
         logger.warning("Candle list is empty, returning zeroed-out stats.")
         return TradeAnalysis(total_volume=0.0, vwap=0.0)
 
-    total_volume = sum(c.volume for c in candles)
+    batch = _as_candle_batch(candles)
+    total_volume = float(batch.volume.sum())
 
     # Approximate VWAP using (High + Low + Close) / 3 as the typical price for the period
-    weighted_price_sum = sum(((c.high + c.low + c.close) / 3) * c.volume for c in candles)
+    typical_price = (batch.high + batch.low + batch.close) / 3
+    weighted_price_sum = float(np.dot(typical_price, batch.volume))
     vwap = weighted_price_sum / total_volume if total_volume > 0 else 0.0
 
     logger.info("Calculated trade stats from candles (fast mode).")
@@ -254,6 +396,23 @@ def calculate_trade_stats_from_candles(candles: list[Candle]) -> TradeAnalysis:
     )
 
 
+def empty_technical_analysis() -> TechnicalAnalysis:
+    """Returns a `TechnicalAnalysis` with every indicator unset."""
+    return TechnicalAnalysis(
+        price_change_percent=0.0,
+        trend_indicators=TrendAnalysis(
+            moving_averages=MovingAverageAnalysis(),
+            macd=MACDAnalysis(),
+            adx=ADXAnalysis(),
+            ichimoku_cloud=IchimokuCloudAnalysis(),
+            parabolic_sar=ParabolicSARAnalysis(),
+        ),
+        momentum_indicators=MomentumAnalysis(),
+        volatility_indicators=VolatilityAnalysis(),
+        volume_indicators=VolumeAnalysis(),
+    )
+
+
 def _safe_get_float(
     series: np.ndarray, index: int = -1, default: float | None = None
 ) -> float | None:
@@ -269,95 +428,183 @@ def _safe_get_float(
         return default
 
 
-def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
+def calculate_technical_indicators(candles: list[Candle] | CandleBatch) -> TechnicalAnalysis:
     """Calculates a comprehensive suite of technical indicators from candlestick data."""
-    ma_short, ma_long = 50, 200
-    ema_short, ema_medium = 9, 21
-    ema_ribbon_periods = [20, 25, 30, 35, 40, 45, 50, 55]
-    macd_fast, macd_slow, macd_sign = 12, 26, 9
-    adx_period = 14
-    ichimoku_t, ichimoku_k, ichimoku_s = 9, 26, 52
-    rsi_period, rsi_ob, rsi_os = 14, 70, 30
-    stoch_fastk_period, stoch_slowk_period, stoch_slowd_period = 14, 3, 3
-    stoch_ob, stoch_os = 80, 20
-    williams_period, williams_ob, williams_os = 14, -20, -80
-    bb_period, bb_dev = 20, 2
-    atr_period, cmf_period = 14, 20
-
-    # Dynamically determine minimum required candles based on the longest lookback period
-    lookback_periods = [
-        ma_long,
-        max(ema_ribbon_periods),
-        macd_slow + macd_sign,
-        adx_period,
-        ichimoku_s,
-        rsi_period,
-        stoch_fastk_period + stoch_slowk_period + stoch_slowd_period,
-        williams_period,
-        bb_period,
-        atr_period,
-        cmf_period,
-    ]
-    min_required_candles = max(lookback_periods) + 1  # +1 for prev-value checks
-
-    if not candles or len(candles) < min_required_candles:
+    if not len(candles) or len(candles) < MIN_REQUIRED_CANDLES:
         logger.warning(
             f"Candle list has insufficient data ({len(candles)} candles, "
-            f"need {min_required_candles}), returning empty analysis."
+            f"need {MIN_REQUIRED_CANDLES}), returning empty analysis."
         )
-        return TechnicalAnalysis(
-            price_change_percent=0.0,
-            trend_indicators=TrendAnalysis(
-                moving_averages=MovingAverageAnalysis(),
-                macd=MACDAnalysis(),
-                adx=ADXAnalysis(),
-                ichimoku_cloud=IchimokuCloudAnalysis(),
-                parabolic_sar=ParabolicSARAnalysis(),
-            ),
-            momentum_indicators=MomentumAnalysis(),
-            volatility_indicators=VolatilityAnalysis(),
-            volume_indicators=VolumeAnalysis(),
-        )
-
-    df = pd.DataFrame([c.model_dump() for c in candles])
-    for col in ["open", "high", "low", "close", "volume"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df.dropna(inplace=True)
-    if len(df) < min_required_candles:
+        return empty_technical_analysis()
+
+    batch = _as_candle_batch(candles)
+    ohlcv = (batch.open, batch.high, batch.low, batch.close, batch.volume)
+    valid_rows = np.logical_and.reduce([np.isfinite(column) for column in ohlcv])
+    if not valid_rows.all():
+        batch = batch[valid_rows]
+    if len(batch) < MIN_REQUIRED_CANDLES:
         logger.warning(
-            f"DataFrame has insufficient data after cleaning ({len(df)} rows), "
+            f"Candle data has insufficient rows after cleaning ({len(batch)} rows), "
             f"returning empty analysis."
         )
-        return TechnicalAnalysis(
-            price_change_percent=0.0,
-            trend_indicators=TrendAnalysis(
-                moving_averages=MovingAverageAnalysis(),
-                macd=MACDAnalysis(),
-                adx=ADXAnalysis(),
-                ichimoku_cloud=IchimokuCloudAnalysis(),
-                parabolic_sar=ParabolicSARAnalysis(),
-            ),
-            momentum_indicators=MomentumAnalysis(),
-            volatility_indicators=VolatilityAnalysis(),
-            volume_indicators=VolumeAnalysis(),
-        )
+        return empty_technical_analysis()
+
+    values = _talib_indicator_values(batch)
+    with metrics.timer(metrics.INDICATOR_SECONDS, group="interpret"):
+        return interpret_indicator_values(values)
+
+
+def _trend_readings(batch: CandleBatch) -> dict[str, Any]:
+    """Moving averages, MACD, ADX and the Parabolic SAR."""
+    # pandas and TA-Lib take most of the package's import time, so only load them here
+    import talib
+
+    # TA-Lib consumes the batch's contiguous float64 columns directly
+    high, low, close = batch.high, batch.low, batch.close
+    sma_short_series = talib.SMA(close, timeperiod=MA_SHORT)
+    sma_long_series = talib.SMA(close, timeperiod=MA_LONG)
+    macd_line, macd_signal, hist_s = talib.MACD(
+        close, fastperiod=MACD_FAST, slowperiod=MACD_SLOW, signalperiod=MACD_SIGNAL
+    )
+    psar_series = talib.SAR(high, low)
+    return {
+        "sma_short": _safe_get_float(sma_short_series, -1),
+        "prev_sma_short": _safe_get_float(sma_short_series, -2),
+        "sma_long": _safe_get_float(sma_long_series, -1),
+        "prev_sma_long": _safe_get_float(sma_long_series, -2),
+        "ema_short": _safe_get_float(talib.EMA(close, timeperiod=EMA_SHORT)),
+        "ema_medium": _safe_get_float(talib.EMA(close, timeperiod=EMA_MEDIUM)),
+        "ema_ribbon": {
+            f"ema_{p}": _safe_get_float(talib.EMA(close, timeperiod=p)) for p in EMA_RIBBON_PERIODS
+        },
+        "macd_line": _safe_get_float(macd_line),
+        "macd_signal": _safe_get_float(macd_signal),
+        "macd_histogram": _safe_get_float(hist_s, -1),
+        "prev_macd_histogram": _safe_get_float(hist_s, -2),
+        "adx": _safe_get_float(talib.ADX(high, low, close, timeperiod=ADX_PERIOD)),
+        "psar": _safe_get_float(psar_series, -1),
+        "prev_psar": _safe_get_float(psar_series, -2),
+    }
+
 
-    # Convert to numpy arrays for TA-Lib
-    open_ = df["open"].to_numpy(dtype=float)
-    high = df["high"].to_numpy(dtype=float)
-    low = df["low"].to_numpy(dtype=float)
-    close = df["close"].to_numpy(dtype=float)
-    volume = df["volume"].to_numpy(dtype=float)
+def _ichimoku_readings(batch: CandleBatch) -> dict[str, Any]:
+    """The Ichimoku Cloud lines."""
+    import pandas as pd
 
-    price_change_percent = ((close[-1] - open_[0]) / open_[0]) * 100
+    high_s, low_s = pd.Series(batch.high), pd.Series(batch.low)
+    tenkan_sen_s = (
+        high_s.rolling(window=ICHIMOKU_TENKAN).max() + low_s.rolling(window=ICHIMOKU_TENKAN).min()
+    ) / 2
+    kijun_sen_s = (
+        high_s.rolling(window=ICHIMOKU_KIJUN).max() + low_s.rolling(window=ICHIMOKU_KIJUN).min()
+    ) / 2
+
+    # Senkou Span A is (Tenkan + Kijun) / 2, plotted 26 periods ahead.
+    senkou_span_a_future = ((tenkan_sen_s + kijun_sen_s) / 2).to_numpy()
+
+    # Senkou Span B is the 52-period high/low midpoint, plotted 26 periods ahead.
+    senkou_high = high_s.rolling(window=ICHIMOKU_SENKOU).max()
+    senkou_low = low_s.rolling(window=ICHIMOKU_SENKOU).min()
+    senkou_span_b_future = ((senkou_high + senkou_low) / 2).to_numpy()
+    return {
+        "tenkan_sen": _safe_get_float(tenkan_sen_s.to_numpy()),
+        "kijun_sen": _safe_get_float(kijun_sen_s.to_numpy()),
+        # The "current" cloud is what's aligned with the current price,
+        # which was projected from 26 periods ago.
+        "senkou_span_a": _safe_get_float(senkou_span_a_future, index=-ICHIMOKU_KIJUN),
+        "senkou_span_b": _safe_get_float(senkou_span_b_future, index=-ICHIMOKU_KIJUN),
+        # The "future" cloud is what is being projected from the most recent data.
+        "future_senkou_span_a": _safe_get_float(senkou_span_a_future),
+        "future_senkou_span_b": _safe_get_float(senkou_span_b_future),
+        # The Chikou Span (Lagging Span) is the close price from 26 periods ago.
+        "chikou_span": _safe_get_float(batch.close, index=-ICHIMOKU_KIJUN),
+    }
+
+
+def _momentum_readings(batch: CandleBatch) -> dict[str, Any]:
+    """RSI, the Stochastic Oscillator and Williams %R."""
+    import talib
+
+    high, low, close = batch.high, batch.low, batch.close
+    stoch_k_s, stoch_d_s = talib.STOCH(
+        high,
+        low,
+        close,
+        fastk_period=STOCH_FASTK_PERIOD,
+        slowk_period=STOCH_SLOWK_PERIOD,
+        slowd_period=STOCH_SLOWD_PERIOD,
+    )
+    return {
+        "rsi": _safe_get_float(talib.RSI(close, timeperiod=RSI_PERIOD)),
+        "stochastic_k": _safe_get_float(stoch_k_s),
+        "stochastic_d": _safe_get_float(stoch_d_s),
+        "williams_r": _safe_get_float(talib.WILLR(high, low, close, timeperiod=WILLIAMS_PERIOD)),
+    }
+
+
+def _volatility_readings(batch: CandleBatch) -> dict[str, Any]:
+    """Bollinger Bands and ATR."""
+    import talib
+
+    bb_upper, bb_middle, bb_lower = talib.BBANDS(
+        batch.close, timeperiod=BB_PERIOD, nbdevup=BB_DEV, nbdevdn=BB_DEV
+    )
+    return {
+        "bollinger_upper": _safe_get_float(bb_upper),
+        "bollinger_middle": _safe_get_float(bb_middle),
+        "bollinger_lower": _safe_get_float(bb_lower),
+        "atr": _safe_get_float(
+            talib.ATR(batch.high, batch.low, batch.close, timeperiod=ATR_PERIOD)
+        ),
+    }
+
+
+def _volume_readings(batch: CandleBatch) -> dict[str, Any]:
+    """On-Balance Volume and Chaikin Money Flow."""
+    import talib
+
+    high, low, close, volume = batch.high, batch.low, batch.close, batch.volume
+    mfm = np.where((high - low) > 0, ((close - low) - (high - close)) / (high - low), 0)
+    mfv = mfm * volume
+    cmf_s = talib.SUM(mfv, CMF_PERIOD) / talib.SUM(volume, CMF_PERIOD)
+    return {
+        "on_balance_volume": _safe_get_float(talib.OBV(close, volume)),
+        "chaikin_money_flow": _safe_get_float(cmf_s),
+    }
+
+
+# The indicator groups of `calculate_technical_indicators`, each timed separately (see
+# `metrics.INDICATOR_SECONDS`) and mapping a clean batch to its `IndicatorValues` fields.
+_INDICATOR_GROUPS: dict[str, Callable[[CandleBatch], dict[str, Any]]] = {
+    "trend": _trend_readings,
+    "ichimoku": _ichimoku_readings,
+    "momentum": _momentum_readings,
+    "volatility": _volatility_readings,
+    "volume": _volume_readings,
+}
+
+
+def _talib_indicator_values(batch: CandleBatch) -> IndicatorValues:
+    """Computes the latest indicator readings from full TA-Lib series over a clean batch."""
+    readings: dict[str, Any] = {
+        "first_open": float(batch.open[0]),
+        "close": float(batch.close[-1]),
+        "low": float(batch.low[-1]),
+        "prev_low": _safe_get_float(batch.low, -2),
+    }
+    for group, compute in _INDICATOR_GROUPS.items():
+        with metrics.timer(metrics.INDICATOR_SECONDS, group=group):
+            readings.update(compute(batch))
+    return IndicatorValues(**readings)
+
+
+def interpret_indicator_values(values: IndicatorValues) -> TechnicalAnalysis:
+    """Builds the interpreted `TechnicalAnalysis` (signals, levels, cloud) from raw readings."""
+    price_change_percent = ((values.close - values.first_open) / values.first_open) * 100
 
     # --- Trend Indicators ---
-    sma_short_series = talib.SMA(close, timeperiod=ma_short)
-    sma_long_series = talib.SMA(close, timeperiod=ma_long)
-    sma_short_val = _safe_get_float(sma_short_series, -1)
-    sma_short_prev = _safe_get_float(sma_short_series, -2)
-    sma_long_val = _safe_get_float(sma_long_series, -1)
-    sma_long_prev = _safe_get_float(sma_long_series, -2)
+    sma_short_val, sma_short_prev = values.sma_short, values.prev_sma_short
+    sma_long_val, sma_long_prev = values.sma_long, values.prev_sma_long
     crossover = None
     if all(v is not None for v in [sma_short_val, sma_short_prev, sma_long_val, sma_long_prev]):
         if sma_short_val > sma_long_val and sma_short_prev <= sma_long_prev:
@@ -367,21 +614,16 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
     ma_analysis = MovingAverageAnalysis(
         sma_short=sma_short_val,
         sma_long=sma_long_val,
-        ema_short=_safe_get_float(talib.EMA(close, timeperiod=ema_short)),
-        ema_medium=_safe_get_float(talib.EMA(close, timeperiod=ema_medium)),
+        ema_short=values.ema_short,
+        ema_medium=values.ema_medium,
         crossover_signal=crossover,
-        ema_ribbon={
-            f"ema_{p}": _safe_get_float(talib.EMA(close, timeperiod=p)) for p in ema_ribbon_periods
-        },
+        ema_ribbon=dict(values.ema_ribbon),
     )
 
-    macd_line_s, signal_line_s, hist_s = talib.MACD(
-        close, fastperiod=macd_fast, slowperiod=macd_slow, signalperiod=macd_sign
-    )
-    hist, hist_prev = _safe_get_float(hist_s, -1), _safe_get_float(hist_s, -2)
+    hist, hist_prev = values.macd_histogram, values.prev_macd_histogram
     macd_analysis = MACDAnalysis(
-        macd_line=_safe_get_float(macd_line_s),
-        signal_line=_safe_get_float(signal_line_s),
+        macd_line=values.macd_line,
+        signal_line=values.macd_signal,
         histogram=hist,
         momentum=(
             "Strengthening"
@@ -390,7 +632,7 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
         ),
     )
 
-    adx_val = _safe_get_float(talib.ADX(high, low, close, timeperiod=adx_period))
+    adx_val = values.adx
     adx_analysis = ADXAnalysis(
         adx=adx_val,
         trend_strength="Strong Trend"
@@ -401,37 +643,14 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
     )
 
     # --- ICHIMOKU CLOUD ---
-    tenkan_sen_s = (
-        df["high"].rolling(window=ichimoku_t).max() + df["low"].rolling(window=ichimoku_t).min()
-    ) / 2
-    kijun_sen_s = (
-        df["high"].rolling(window=ichimoku_k).max() + df["low"].rolling(window=ichimoku_k).min()
-    ) / 2
-
-    # Senkou Span A is (Tenkan + Kijun) / 2, plotted 26 periods ahead.
-    senkou_span_a_future = ((tenkan_sen_s + kijun_sen_s) / 2).to_numpy()
-
-    # Senkou Span B is the 52-period high/low midpoint, plotted 26 periods ahead.
-    senkou_span_b_future = (
-        (df["high"].rolling(window=ichimoku_s).max() + df["low"].rolling(window=ichimoku_s).min())
-        / 2
-    ).to_numpy()
-
-    # The "current" cloud is what's aligned with the current price,
-    # which was projected from 26 periods ago.
-    current_senkou_a = _safe_get_float(senkou_span_a_future, index=-ichimoku_k)
-    current_senkou_b = _safe_get_float(senkou_span_b_future, index=-ichimoku_k)
-
-    # The Chikou Span (Lagging Span) is the close price from 26 periods ago.
-    chikou_span_value = _safe_get_float(close, index=-ichimoku_k)
-
+    current_senkou_a, current_senkou_b = values.senkou_span_a, values.senkou_span_b
     price_pos, cloud_color = None, None
     if current_senkou_a is not None and current_senkou_b is not None:
         cloud_top, cloud_bottom = (
             max(current_senkou_a, current_senkou_b),
             min(current_senkou_a, current_senkou_b),
         )
-        price = close[-1]
+        price = values.close
         price_pos = (
             "Above Cloud"
             if price > cloud_top
@@ -441,28 +660,27 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
         )
         cloud_color = "Green" if current_senkou_a > current_senkou_b else "Red"
 
-    # The "future" cloud is what is being projected from the most recent data.
-    future_a = _safe_get_float(senkou_span_a_future)
-    future_b = _safe_get_float(senkou_span_b_future)
+    future_a, future_b = values.future_senkou_span_a, values.future_senkou_span_b
     future_color = (
         "Green" if future_a is not None and future_b is not None and future_a > future_b else "Red"
     )
 
     ichimoku_analysis = IchimokuCloudAnalysis(
-        tenkan_sen=_safe_get_float(tenkan_sen_s.to_numpy()),
-        kijun_sen=_safe_get_float(kijun_sen_s.to_numpy()),
+        tenkan_sen=values.tenkan_sen,
+        kijun_sen=values.kijun_sen,
         senkou_span_a=current_senkou_a,
         senkou_span_b=current_senkou_b,
-        chikou_span=chikou_span_value,
+        chikou_span=values.chikou_span,
         price_position=price_pos,
         cloud_color=cloud_color,
         future_cloud_color=future_color,
     )
 
-    psar_series = talib.SAR(high, low)
-    psar_val, psar_prev = _safe_get_float(psar_series, -1), _safe_get_float(psar_series, -2)
-    is_up_now = psar_val is not None and psar_val < low[-1]
-    was_up_before = psar_prev is not None and psar_prev < low[-2]
+    psar_val, psar_prev = values.psar, values.prev_psar
+    is_up_now = psar_val is not None and psar_val < values.low
+    was_up_before = (
+        psar_prev is not None and values.prev_low is not None and psar_prev < values.prev_low
+    )
     psar_analysis = ParabolicSARAnalysis(
         psar=psar_val,
         trend_direction="Uptrend" if is_up_now else "Downtrend",
@@ -480,37 +698,29 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
     )
 
     # --- Momentum Indicators ---
-    rsi_val = _safe_get_float(talib.RSI(close, timeperiod=rsi_period))
+    rsi_val = values.rsi
     rsi_level = (
         "Overbought"
-        if rsi_val and rsi_val > rsi_ob
+        if rsi_val and rsi_val > RSI_OVERBOUGHT
         else "Oversold"
-        if rsi_val and rsi_val < rsi_os
+        if rsi_val and rsi_val < RSI_OVERSOLD
         else "Neutral"
     )
 
-    stoch_k_s, stoch_d_s = talib.STOCH(
-        high,
-        low,
-        close,
-        fastk_period=stoch_fastk_period,
-        slowk_period=stoch_slowk_period,
-        slowd_period=stoch_slowd_period,
-    )
-    stoch_k_val = _safe_get_float(stoch_k_s)
+    stoch_k_val = values.stochastic_k
     stoch_level = (
         "Overbought"
-        if stoch_k_val and stoch_k_val > stoch_ob
+        if stoch_k_val and stoch_k_val > STOCH_OVERBOUGHT
         else "Oversold"
-        if stoch_k_val and stoch_k_val < stoch_os
+        if stoch_k_val and stoch_k_val < STOCH_OVERSOLD
         else "Neutral"
     )
-    williams_r_val = _safe_get_float(talib.WILLR(high, low, close, timeperiod=williams_period))
+    williams_r_val = values.williams_r
     williams_r_level = (
         "Overbought"
-        if williams_r_val and williams_r_val > williams_ob
+        if williams_r_val and williams_r_val > WILLIAMS_OVERBOUGHT
         else "Oversold"
-        if williams_r_val and williams_r_val < williams_os
+        if williams_r_val and williams_r_val < WILLIAMS_OVERSOLD
         else "Neutral"
     )
 
@@ -518,29 +728,26 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
         rsi=rsi_val,
         rsi_level=rsi_level,
         stochastic_k=stoch_k_val,
-        stochastic_d=_safe_get_float(stoch_d_s),
+        stochastic_d=values.stochastic_d,
         stochastic_level=stoch_level,
         williams_r=williams_r_val,
         williams_r_level=williams_r_level,
     )
 
     # --- Volatility Indicators ---
-    bb_upper, bb_middle, bb_lower = talib.BBANDS(
-        close, timeperiod=bb_period, nbdevup=bb_dev, nbdevdn=bb_dev
-    )
-    bb_upper_val = _safe_get_float(bb_upper)
-    bb_middle_val = _safe_get_float(bb_middle)
-    bb_lower_val = _safe_get_float(bb_lower)
+    bb_upper_val = values.bollinger_upper
+    bb_middle_val = values.bollinger_middle
+    bb_lower_val = values.bollinger_lower
     bb_bw, bb_p = None, None
     if all(v is not None for v in [bb_upper_val, bb_middle_val, bb_lower_val]):
         if bb_middle_val > 0:
             bb_bw = (bb_upper_val - bb_lower_val) / bb_middle_val
         band_range = bb_upper_val - bb_lower_val
         if band_range > 0:
-            bb_p = (close[-1] - bb_lower_val) / band_range
+            bb_p = (values.close - bb_lower_val) / band_range
 
     volatility_analysis = VolatilityAnalysis(
-        atr=_safe_get_float(talib.ATR(high, low, close, timeperiod=atr_period)),
+        atr=values.atr,
         bollinger_hband=bb_upper_val,
         bollinger_lband=bb_lower_val,
         bollinger_mavg=bb_middle_val,
@@ -549,13 +756,9 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
     )
 
     # --- Volume Indicators ---
-    mfm = np.where((high - low) > 0, ((close - low) - (high - close)) / (high - low), 0)
-    mfv = mfm * volume
-    cmf_s = talib.SUM(mfv, cmf_period) / talib.SUM(volume, cmf_period)
-
     volume_analysis = VolumeAnalysis(
-        on_balance_volume=_safe_get_float(talib.OBV(close, volume)),
-        chaikin_money_flow=_safe_get_float(cmf_s),
+        on_balance_volume=values.on_balance_volume,
+        chaikin_money_flow=values.chaikin_money_flow,
     )
 
     return TechnicalAnalysis(
@@ -567,9 +770,33 @@ def calculate_technical_indicators(candles: list[Candle]) -> TechnicalAnalysis:
     )
 
 
-def calculate_order_book_stats(order_book: OrderBook) -> OrderBookAnalysis:
-    """Calculates key metrics from the order book."""
-    if not order_book.bids or not order_book.asks:
+def calculate_order_book_stats(
+    order_book: OrderBook | OrderBookSnapshot | OrderBookEngine,
+) -> OrderBookAnalysis:
+    """
+    Calculates key metrics and depth analytics (see `calculate_depth_analytics`) from the
+    order book, over its level arrays.
+
+    A live `OrderBookEngine` is read from its cached depth totals instead of re-summing
+    or copying every level. An `OrderBookSnapshot` is used as is, and models are first
+    copied into one.
+    """
+    if isinstance(order_book, OrderBookEngine):
+        best_bid, best_ask = order_book.best_bid, order_book.best_ask
+        total_bid_volume = order_book.bids.total_size
+        total_ask_volume = order_book.asks.total_size
+        profile = DepthProfile.from_engine(order_book)
+    else:
+        if isinstance(order_book, OrderBook):
+            order_book = OrderBookSnapshot.from_order_book(order_book)
+        # The totals come from the depth curves, so every representation agrees exactly.
+        profile = DepthProfile.from_snapshot(order_book)
+        best_bid = float(profile.bid_prices[0]) if len(profile.bid_prices) else None
+        best_ask = float(profile.ask_prices[0]) if len(profile.ask_prices) else None
+        total_bid_volume = float(profile.bid_depth[-1])
+        total_ask_volume = float(profile.ask_depth[-1])
+
+    if best_bid is None or best_ask is None:
         logger.warning("Order book is missing bids or asks, cannot perform analysis.")
         return OrderBookAnalysis(
             best_bid=0.0,
@@ -582,16 +809,10 @@ def calculate_order_book_stats(order_book: OrderBook) -> OrderBookAnalysis:
             market_pressure_ratio=0.0,
         )
 
-    best_bid = order_book.bids[0].price
-    best_ask = order_book.asks[0].price
-
     mid_price = (best_ask + best_bid) / 2
     spread = best_ask - best_bid
     spread_percent = (spread / mid_price) * 100 if mid_price > 0 else 0.0
 
-    total_bid_volume = sum(level.size for level in order_book.bids)
-    total_ask_volume = sum(level.size for level in order_book.asks)
-
     market_pressure_ratio = (
         total_bid_volume / total_ask_volume if total_ask_volume > 0 else float("inf")
     )
@@ -605,6 +826,7 @@ def calculate_order_book_stats(order_book: OrderBook) -> OrderBookAnalysis:
         total_bid_volume=total_bid_volume,
         total_ask_volume=total_ask_volume,
         market_pressure_ratio=market_pressure_ratio,
+        depth=calculate_depth_analytics(profile),
     )
 
 
@@ -615,19 +837,20 @@ def calculate_order_book_stats(order_book: OrderBook) -> OrderBookAnalysis:
 
 def run_analysis(
     symbol: str,
-    trades: list[Trade],
-    candles: list[Candle],
+    trades: list[Trade] | TradeBatch | TradeBars,
+    candles: list[Candle] | CandleBatch,
     mode: Literal["fast", "full"] = "fast",
 ) -> AnalysisResult:
     """Runs all analysis functions and returns a composite result."""
     logger.info(f"Running analysis for {symbol} in '{mode}' mode...")
 
-    if mode == "full":
-        trade_stats = calculate_trade_stats_from_trades(trades)
-    else:  # 'fast' mode
-        trade_stats = calculate_trade_stats_from_candles(candles)
+    with metrics.timer(metrics.ANALYSIS_SECONDS, mode=mode):
+        if mode == "full":
+            trade_stats = calculate_trade_stats_from_trades(trades)
+        else:  # 'fast' mode
+            trade_stats = calculate_trade_stats_from_candles(candles)
 
-    technical_analysis = calculate_technical_indicators(candles)
+        technical_analysis = calculate_technical_indicators(candles)
     return AnalysisResult(
         symbol=symbol,
         trade_stats=trade_stats,
@@ -1,5 +1,46 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .batches import CandleBatch, OrderBookSnapshot, TickerTable, TradeBars, TradeBatch
+from .cache import ReferenceCache
 from .client import BitgetClient
 from .exceptions import BitgetAPIError
 from .models import Candle, Trade
 
-__all__ = ["BitgetAPIError", "BitgetClient", "Candle", "Trade"]
+if TYPE_CHECKING:
+    from .async_client import AsyncBitgetClient
+    from .stream import MarketStream, StreamMessage, Subscription
+
+# Attributes imported on first access, since their modules pull in httpx and websockets.
+_LAZY_ATTRIBUTES = {
+    "AsyncBitgetClient": ".async_client",
+    "MarketStream": ".stream",
+    "StreamMessage": ".stream",
+    "Subscription": ".stream",
+}
+
+__all__ = [
+    "AsyncBitgetClient",
+    "BitgetAPIError",
+    "BitgetClient",
+    "Candle",
+    "CandleBatch",
+    "MarketStream",
+    "OrderBookSnapshot",
+    "ReferenceCache",
+    "StreamMessage",
+    "Subscription",
+    "TickerTable",
+    "Trade",
+    "TradeBars",
+    "TradeBatch",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
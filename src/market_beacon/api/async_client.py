@@ -0,0 +1,425 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from datetime import datetime
+from types import TracebackType
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from .. import metrics
+from .auth import ClockOffset
+from .batches import CandleBatch, OrderBookSnapshot, TickerTable, TradeBatch
+from .client import TRADE_LIST_ADAPTER, _BitgetClientBase
+from .exceptions import (
+    BitgetAPIConnectionError,
+    BitgetAPIError,
+    BitgetAPIRequestError,
+    BitgetPaginationError,
+)
+from .models import (
+    Candle,
+    Granularity,
+    OrderBook,
+    OrderBookStep,
+    ServerTime,
+    SupportedSymbols,
+    Ticker,
+    Trade,
+)
+from .ratelimit import RateLimiter, RetryPolicy
+
+
+class AsyncMarketDataAPI:
+    """
+    Asyncio namespace for public market data endpoints.
+
+    `fast_parse` enables the same trusted parsing mode as `MarketDataAPI`, and server-time
+    responses update `clock` the same way.
+    """
+
+    def __init__(
+        self,
+        request_func: Callable[..., Awaitable[Any]],
+        fast_parse: bool = False,
+        clock: ClockOffset | None = None,
+    ):
+        self._request = request_func
+        self._fast_parse = fast_parse
+        self._clock = clock if clock is not None else ClockOffset()
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_server_time(self) -> ServerTime:
+        """
+        Gets the current exchange server time.
+        Endpoint: GET /public/time
+        """
+        logger.info("Fetching server time...")
+        sent_ms = time.time() * 1000
+        data = await self._request("GET", "/public/time")
+        server_time = ServerTime.model_validate(data)
+        self._clock.record(sent_ms, int(data["serverTime"]), time.time() * 1000)
+        return server_time
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_supported_symbols(self) -> list[str]:
+        """
+        Gets a list of all available spot trading pair names.
+        Endpoint: GET /spot/market/support-symbols
+        """
+        logger.info("Fetching all supported spot symbols...")
+        data = await self._request("GET", "/spot/market/support-symbols")
+        supported_symbols = SupportedSymbols.model_validate(data)
+        return supported_symbols.spot_list
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_ticker(self, symbol: str) -> Ticker:
+        """
+        Gets ticker information for a specific symbol.
+        Endpoint: GET /spot/market/ticker
+        """
+        logger.debug(f"Fetching ticker for {symbol}...")
+        params = {"symbol": symbol}
+        data = await self._request("GET", "/spot/market/ticker", params=params)
+        if not data:
+            raise BitgetAPIError(f"No ticker data returned for symbol {symbol}")
+        return Ticker.model_validate(data[0])
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_tickers(self) -> TickerTable:
+        """
+        Gets the 24h tickers of every spot symbol in one request, as a `TickerTable`.
+        Endpoint: GET /spot/market/tickers
+        """
+        logger.debug("Fetching tickers for all symbols...")
+        data = await self._request("GET", "/spot/market/tickers", trusted=self._fast_parse)
+        return TickerTable.from_rows(data)
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_trades(
+        self,
+        symbol: str,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        limit: int = 100,
+        after_trade_id: str | None = None,
+    ) -> list[Trade]:
+        """
+        Retrieves public trades for a given spot symbol.
+
+        Mirrors `MarketDataAPI.get_trades`: without a time range the most recent trades are
+        returned, otherwise every trade in the range is fetched page by page, raising a
+        resumable `BitgetPaginationError` if a page fails after retries.
+
+        Endpoint: GET /spot/market/fills
+        """
+        page_limit = max(1, min(100, limit))
+
+        if not start_time and not end_time:
+            logger.debug(f"Fetching last {page_limit} trades for {symbol}...")
+            params = {"symbol": symbol, "limit": page_limit}
+            data = await self._request(
+                "GET", "/spot/market/fills", params=params, trusted=self._fast_parse
+            )
+            return TRADE_LIST_ADAPTER.validate_python(data)
+
+        logger.info(f"Fetching all trades for {symbol} from {start_time} to {end_time}...")
+
+        all_trades: list[Trade] = []
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+        try:
+            async for page in self._iter_trade_pages(
+                symbol, start_ms, end_ms, page_limit, after_trade_id
+            ):
+                all_trades.extend(TRADE_LIST_ADAPTER.validate_python(page))
+        except BitgetPaginationError as e:
+            e.items = all_trades
+            raise
+
+        logger.info(f"Fetched a total of {len(all_trades)} trades.")
+
+        if all_trades:
+            all_trades.sort(key=lambda t: t.timestamp)
+
+        return all_trades
+
+    async def iter_trade_batches(
+        self, symbol: str, start_time: datetime, end_time: datetime
+    ) -> AsyncIterator[TradeBatch]:
+        """
+        Streams the public trades in `[start_time, end_time]` page by page, in
+        chronological order, as `TradeBatch` chunks held in constant memory.
+
+        Mirrors the single-worker `MarketDataAPI.iter_trade_batches`.
+
+        Endpoint: GET /spot/market/fills
+        """
+        start_ms = round(start_time.timestamp() * 1000)
+        end_ms = round(end_time.timestamp() * 1000)
+        async for page in self._iter_trade_pages(symbol, start_ms, end_ms, 100):
+            trades = TradeBatch.from_rows(page).sorted_by_time()
+            yield trades[(trades.timestamp >= start_ms) & (trades.timestamp <= end_ms)]
+
+    async def _iter_trade_pages(
+        self,
+        symbol: str,
+        start_ms: int | None,
+        end_ms: int | None,
+        page_limit: int,
+        after_trade_id: str | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yields the raw trade objects in `[start_ms, end_ms]` one page at a time, raising a
+        `BitgetPaginationError` (with no items) like `MarketDataAPI._iter_trade_pages`.
+        """
+        last_trade_id: str | None = after_trade_id
+        page_num = 1
+
+        base_params: dict[str, Any] = {"symbol": symbol, "limit": page_limit}
+        if start_ms is not None:
+            base_params["startTime"] = start_ms
+        if end_ms is not None:
+            base_params["endTime"] = end_ms
+
+        while True:
+            params = base_params.copy()
+            if last_trade_id:
+                params["afterTradeId"] = last_trade_id
+
+            try:
+                data = await self._request(
+                    "GET", "/spot/market/fills", params=params, trusted=self._fast_parse
+                )
+            except BitgetAPIError as e:
+                logger.error(f"Error fetching trades on page {page_num}: {e}")
+                raise BitgetPaginationError(
+                    f"Trade pagination for {symbol} failed on page {page_num}",
+                    cause=e,
+                    items=[],
+                    cursor=last_trade_id,
+                ) from e
+            if not data:
+                break
+
+            metrics.increment(metrics.PAGES, endpoint="/spot/market/fills")
+            yield data
+
+            last_trade_id = str(data[-1]["tradeId"])
+            page_num += 1
+
+            if len(data) < page_limit:
+                break
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_candles(
+        self,
+        symbol: str,
+        granularity: Granularity,
+        limit: int = 100,
+    ) -> list[Candle]:
+        """
+        Retrieves historical candlestick data for a given spot symbol.
+        Endpoint: GET /spot/market/candles
+        """
+        logger.debug(f"Fetching last {limit} candles ({granularity}) for {symbol}...")
+        params = {"symbol": symbol, "granularity": granularity, "limit": limit}
+        data = await self._request(
+            "GET", "/spot/market/candles", params=params, trusted=self._fast_parse
+        )
+        return CandleBatch.from_rows(data).to_candles()
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def get_order_book(
+        self,
+        symbol: str,
+        level: OrderBookStep = "step0",
+        limit: int = 50,
+    ) -> OrderBook:
+        """
+        Retrieves the order book for a given spot symbol.
+        Endpoint: GET /spot/market/orderbook
+        """
+        logger.debug(f"Fetching order book for {symbol} (level: {level}, limit: {limit})...")
+        params = {"symbol": symbol, "type": level, "limit": limit}
+        data = await self._request(
+            "GET", "/spot/market/orderbook", params=params, trusted=self._fast_parse
+        )
+        if self._fast_parse:
+            return OrderBookSnapshot.from_payload(data).to_order_book()
+        return OrderBook.model_validate(data)
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def gather_candles(
+        self,
+        symbols: Iterable[str],
+        granularity: Granularity,
+        limit: int = 100,
+        return_exceptions: bool = False,
+    ) -> dict[str, list[Candle] | BitgetAPIError]:
+        """
+        Fetches candles for many symbols concurrently.
+
+        Requests are issued together and bounded only by the client's concurrency limit,
+        so a scan over N symbols takes roughly `N / max_concurrency` round trips.
+
+        Args:
+            symbols: The trading pair symbols to fetch.
+            granularity: The candle granularity shared by every request.
+            limit: The number of candles to fetch per symbol.
+            return_exceptions: If True, API errors are returned in place of a symbol's
+                candles instead of being raised.
+
+        Returns:
+            A mapping of symbol to its candles (or its error), in the order requested.
+        """
+        return await self._gather(
+            symbols,
+            lambda symbol: self.get_candles(symbol, granularity=granularity, limit=limit),
+            return_exceptions,
+        )
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    async def gather_tickers(
+        self, symbols: Iterable[str], return_exceptions: bool = False
+    ) -> dict[str, Ticker | BitgetAPIError]:
+        """
+        Fetches tickers for many symbols concurrently, one request each. For the whole
+        universe, `get_tickers` fetches them all in a single request.
+
+        See `gather_candles` for the semantics of `return_exceptions`.
+        """
+        return await self._gather(symbols, self.get_ticker, return_exceptions)
+
+    @staticmethod
+    async def _gather[T](
+        symbols: Iterable[str],
+        fetch: Callable[[str], Awaitable[T]],
+        return_exceptions: bool,
+    ) -> dict[str, T | BitgetAPIError]:
+        """Runs `fetch` for every symbol concurrently and keys the results by symbol."""
+        symbol_list = list(dict.fromkeys(symbols))
+        logger.info(f"Gathering data for {len(symbol_list)} symbols...")
+        results = await asyncio.gather(
+            *(fetch(symbol) for symbol in symbol_list), return_exceptions=return_exceptions
+        )
+
+        gathered: dict[str, T | BitgetAPIError] = {}
+        for symbol, result in zip(symbol_list, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, BitgetAPIError):
+                # Only API errors are captured; anything else is a programming error.
+                raise result
+            gathered[symbol] = result
+        return gathered
+
+
+class AsyncBitgetClient(_BitgetClientBase):
+    """
+    An asyncio client for the Bitget V2 API, backed by a pooled `httpx.AsyncClient`.
+
+    Args:
+        api_key: The Bitget API key.
+        secret_key: The Bitget API secret.
+        passphrase: The Bitget API passphrase.
+        max_connections: Size of the HTTP connection pool (kept alive between requests).
+        max_concurrency: Maximum number of requests in flight at once.
+        timeout: Per-request timeout in seconds.
+        rate_limiter: Per-endpoint throttle; defaults to Bitget's published quotas.
+        retry_policy: Backoff policy for transient failures.
+        fast_parse: Trust the payloads of hot endpoints and parse them in bulk, checking
+            only the envelope `code` (see `MarketDataAPI`).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        passphrase: str,
+        max_connections: int = 20,
+        max_concurrency: int = 20,
+        timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        fast_parse: bool = False,
+    ):
+        super().__init__(api_key, secret_key, passphrase, rate_limiter, retry_policy)
+        if max_connections < 1 or max_concurrency < 1:
+            raise ValueError("max_connections and max_concurrency must be at least 1.")
+
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # --- API Namespaces ---
+        self.market = AsyncMarketDataAPI(self._request, fast_parse=fast_parse, clock=self.clock)
+
+    async def __aenter__(self) -> "AsyncBitgetClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the underlying connection pool."""
+        await self._client.aclose()
+        logger.debug("Async Bitget API client session closed.")
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        trusted: bool = False,
+    ) -> Any:
+        """Generic coroutine to make a rate-limited, retried request to the Bitget API."""
+        attempt = 0
+        while True:
+            wait = self._rate_limiter.reserve(endpoint)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await self._send(method, endpoint, params, trusted)
+            except BitgetAPIError as e:
+                delay = self._next_retry_delay(e, attempt, endpoint)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        trusted: bool = False,
+    ) -> Any:
+        """Sends a single request attempt and unwraps the response."""
+        async with self._semaphore:
+            # Sign inside the semaphore so queued requests don't carry a stale timestamp.
+            url, query_params, body, headers = self._prepare_request(method, endpoint, params)
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    method=method, url=url, params=query_params, content=body, headers=headers
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise BitgetAPIRequestError(response=e.response) from e
+            except httpx.HTTPError as e:
+                raise BitgetAPIConnectionError(f"HTTP Request failed: {e}") from e
+            finally:
+                metrics.observe(
+                    metrics.REQUEST_SECONDS, time.perf_counter() - started, endpoint=endpoint
+                )
+
+        return self._decode(response, endpoint, trusted)
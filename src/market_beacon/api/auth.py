@@ -1,12 +1,52 @@
 import base64
 import hmac
+import threading
 import time
 from hashlib import sha256
 
 
-def get_timestamp_ms() -> str:
-    """Returns the current time as a string of milliseconds since Epoch."""
-    return str(int(time.time() * 1000))
+def get_timestamp_ms(offset_ms: int = 0) -> str:
+    """
+    Returns the current time as a string of milliseconds since Epoch.
+
+    `offset_ms` is added to the local clock, e.g. a `ClockOffset` estimate, so the
+    timestamp tracks the exchange's clock.
+    """
+    return str(int(time.time() * 1000) + offset_ms)
+
+
+class ClockOffset:
+    """
+    A thread-safe estimate of how far the exchange clock is ahead of the local one.
+
+    Each server-time response is assumed to be stamped halfway through its round trip,
+    so the estimate is accurate to half the round-trip time.
+    """
+
+    def __init__(self, offset_ms: int = 0):
+        self._lock = threading.Lock()
+        self._offset_ms = offset_ms
+
+    @property
+    def offset_ms(self) -> int:
+        """Milliseconds to add to the local clock to get the exchange's time."""
+        with self._lock:
+            return self._offset_ms
+
+    @offset_ms.setter
+    def offset_ms(self, value: int) -> None:
+        with self._lock:
+            self._offset_ms = value
+
+    def record(self, sent_ms: float, server_ms: int, received_ms: float) -> int:
+        """Updates the estimate from one server-time round trip and returns it."""
+        offset = round(server_ms - (sent_ms + received_ms) / 2)
+        self.offset_ms = offset
+        return offset
+
+    def now_ms(self) -> int:
+        """The estimated exchange time in milliseconds since Epoch."""
+        return int(time.time() * 1000) + self.offset_ms
 
 
 def generate_signature(
@@ -21,3 +61,20 @@ def generate_signature(
     message = timestamp + method.upper() + request_path + body
     mac = hmac.new(bytes(secret_key, "utf-8"), bytes(message, "utf-8"), digestmod=sha256)
     return base64.b64encode(mac.digest()).decode()
+
+
+class RequestSigner:
+    """
+    Computes the same signatures as `generate_signature` for one secret key.
+
+    Keying HMAC-SHA256 hashes the padded secret into the inner and outer digest states;
+    that is done once here, and each `sign` call continues from a copy of the keyed state.
+    """
+
+    def __init__(self, secret_key: str):
+        self._keyed = hmac.new(secret_key.encode(), digestmod=sha256)
+
+    def sign(self, timestamp: str, method: str, request_path: str, body: str) -> str:
+        mac = self._keyed.copy()
+        mac.update((timestamp + method.upper() + request_path + body).encode())
+        return base64.b64encode(mac.digest()).decode()
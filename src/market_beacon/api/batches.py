@@ -0,0 +1,493 @@
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Self
+
+import numpy as np
+
+from .models import Candle, OrderBook, OrderBookLevel, Trade
+
+# Column order of a candle row returned by the candles endpoints.
+CANDLE_ROW_FIELDS = ("timestamp", "open", "high", "low", "close", "volume", "quote_volume")
+
+
+@dataclass(frozen=True, slots=True)
+class CandleBatch:
+    """
+    A columnar batch of candles backed by contiguous NumPy arrays.
+
+    `timestamp` holds candle open times in milliseconds since Epoch (int64); every other
+    column is float64. Rows are in chronological order, as returned by the API.
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Returns a batch with no rows."""
+        return cls(
+            np.empty(0, dtype=np.int64),
+            *(np.empty(0, dtype=np.float64) for _ in CANDLE_ROW_FIELDS[1:]),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[str]]) -> Self:
+        """
+        Parses the API's list-of-lists candle payload in bulk, without per-row models.
+
+        Raises:
+            ValueError: If the rows are ragged, too short, or not numeric.
+        """
+        if not len(rows):
+            return cls.empty()
+        # Converting the strings straight to float64 is far cheaper than materialising a
+        # unicode array first; open times are parsed separately so they stay exact.
+        table = np.array(rows, dtype=np.float64)
+        if table.ndim != 2 or table.shape[1] < len(CANDLE_ROW_FIELDS):
+            raise ValueError(
+                f"Candle rows must have at least {len(CANDLE_ROW_FIELDS)} elements, "
+                f"got an array of shape {table.shape}"
+            )
+        return cls(
+            np.array([row[0] for row in rows], dtype=np.int64),
+            *(np.ascontiguousarray(table[:, i]) for i in range(1, len(CANDLE_ROW_FIELDS))),
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> Self:
+        """Builds a batch from `Candle` models."""
+        count = len(candles)
+        return cls(
+            np.fromiter(
+                (int(c.timestamp.timestamp() * 1000) for c in candles), dtype=np.int64, count=count
+            ),
+            *(
+                np.fromiter((getattr(c, name) for c in candles), dtype=np.float64, count=count)
+                for name in CANDLE_ROW_FIELDS[1:]
+            ),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence[Self]) -> Self:
+        """Concatenates batches row-wise, preserving their order."""
+        if not batches:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(b, f.name) for b in batches]) for f in fields(cls)))
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index: slice | np.ndarray) -> Self:
+        """Selects rows with a slice, boolean mask or index array."""
+        return type(self)(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    def resample(self, interval_ms: int, origin_ms: int = 0) -> Self:
+        """
+        Aggregates the candles into coarser candles of `interval_ms`, aligned so that one
+        opens at `origin_ms`, in a single vectorized pass over each column.
+
+        A leading candle the batch only covers part of is dropped, since its open and
+        volume would be wrong; the last candle is kept even if it is still forming, as the
+        exchange's latest candle is. Intervals without any candle have none.
+        """
+        if not len(self):
+            return self
+        buckets = (self.timestamp - origin_ms) // interval_ms
+        starts = _run_starts(buckets)
+        ends = np.append(starts[1:], len(buckets)) - 1
+        candles = type(self)(
+            origin_ms + buckets[starts] * interval_ms,
+            self.open[starts],
+            np.maximum.reduceat(self.high, starts),
+            np.minimum.reduceat(self.low, starts),
+            self.close[ends],
+            np.add.reduceat(self.volume, starts),
+            np.add.reduceat(self.quote_volume, starts),
+        )
+        return candles[1:] if candles.timestamp[0] < self.timestamp[0] else candles
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Returns the batch as a mapping of column name to array."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def datetimes(self) -> list[datetime]:
+        """Returns the candle open times as local `datetime` objects."""
+        return [datetime.fromtimestamp(ts / 1000.0) for ts in self.timestamp.tolist()]
+
+    def to_candles(self) -> list[Candle]:
+        """Converts the batch back into `Candle` models."""
+        rows = zip(
+            self.datetimes(),
+            *(getattr(self, name).tolist() for name in CANDLE_ROW_FIELDS[1:]),
+            strict=True,
+        )
+        return [
+            Candle(
+                timestamp=ts,
+                open=o,
+                high=h,
+                low=low,
+                close=c,
+                volume=v,
+                quote_volume=qv,
+            )
+            for ts, o, h, low, c, v, qv in rows
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class TradeBatch:
+    """
+    A columnar batch of trades backed by contiguous NumPy arrays.
+
+    `trade_id` and `timestamp` (milliseconds since Epoch) are int64, `price` and `size`
+    are float64, and `is_buy` is a boolean mask of taker-buy trades.
+    """
+
+    trade_id: np.ndarray
+    timestamp: np.ndarray
+    price: np.ndarray
+    size: np.ndarray
+    is_buy: np.ndarray
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Returns a batch with no rows."""
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.bool_),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict[str, Any]]) -> Self:
+        """Parses the API's list-of-objects trade payload in bulk."""
+        if not len(rows):
+            return cls.empty()
+        return cls(
+            np.array([r["tradeId"] for r in rows], dtype=np.int64),
+            np.array([r["ts"] for r in rows], dtype=np.int64),
+            np.array([r["price"] for r in rows], dtype=np.float64),
+            np.array([r["size"] for r in rows], dtype=np.float64),
+            np.array([r["side"] == "buy" for r in rows], dtype=np.bool_),
+        )
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Trade]) -> Self:
+        """Builds a batch from `Trade` models."""
+        count = len(trades)
+        return cls(
+            np.fromiter((int(t.trade_id) for t in trades), dtype=np.int64, count=count),
+            np.fromiter(
+                (int(t.timestamp.timestamp() * 1000) for t in trades), dtype=np.int64, count=count
+            ),
+            np.fromiter((t.price for t in trades), dtype=np.float64, count=count),
+            np.fromiter((t.size for t in trades), dtype=np.float64, count=count),
+            np.fromiter((t.side == "buy" for t in trades), dtype=np.bool_, count=count),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence[Self]) -> Self:
+        """Concatenates batches row-wise, preserving their order."""
+        if not batches:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(b, f.name) for b in batches]) for f in fields(cls)))
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index: slice | np.ndarray) -> Self:
+        """Selects rows with a slice, boolean mask or index array."""
+        return type(self)(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Returns the batch as a mapping of column name to array."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def sorted_by_time(self) -> Self:
+        """Returns the batch in chronological order (stable for equal timestamps)."""
+        return self[np.argsort(self.timestamp, kind="stable")]
+
+    def to_trades(self) -> list[Trade]:
+        """Converts the batch back into `Trade` models."""
+        rows = zip(
+            self.trade_id.tolist(),
+            self.timestamp.tolist(),
+            self.price.tolist(),
+            self.size.tolist(),
+            self.is_buy.tolist(),
+            strict=True,
+        )
+        return [
+            Trade(
+                tradeId=str(trade_id),
+                ts=ts,
+                price=price,
+                size=size,
+                side="buy" if is_buy else "sell",
+            )
+            for trade_id, ts, price, size, is_buy in rows
+        ]
+
+
+def _run_starts(keys: np.ndarray) -> np.ndarray:
+    """Indices where each run of equal consecutive `keys` starts."""
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+
+@dataclass(frozen=True, slots=True)
+class TradeBars:
+    """
+    Exact per-interval bars aggregated from individual trades, as contiguous NumPy arrays.
+
+    `timestamp` holds bar open times in milliseconds since Epoch and `trade_count` and
+    `buy_count` are int64; every other column is float64. Unlike candles, bars carry the
+    taker-side split of their volume, and their VWAP is the true `quote_volume / volume`
+    rather than a typical-price estimate. Intervals without trades have no bar.
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+    buy_volume: np.ndarray
+    trade_count: np.ndarray
+    buy_count: np.ndarray
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Returns bars with no rows."""
+        return cls(
+            np.empty(0, dtype=np.int64),
+            *(np.empty(0, dtype=np.float64) for _ in range(7)),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_trades(cls, trades: TradeBatch, interval_ms: int, origin_ms: int = 0) -> Self:
+        """
+        Aggregates trades into bars of `interval_ms`, aligned so that one opens at
+        `origin_ms`, in a single vectorized pass over each column.
+        """
+        if not len(trades):
+            return cls.empty()
+        if np.any(np.diff(trades.timestamp) < 0):
+            trades = trades.sorted_by_time()
+        buckets = (trades.timestamp - origin_ms) // interval_ms
+        starts = _run_starts(buckets)
+        ends = np.append(starts[1:], len(buckets)) - 1
+        return cls(
+            origin_ms + buckets[starts] * interval_ms,
+            trades.price[starts],
+            np.maximum.reduceat(trades.price, starts),
+            np.minimum.reduceat(trades.price, starts),
+            trades.price[ends],
+            np.add.reduceat(trades.size, starts),
+            np.add.reduceat(trades.price * trades.size, starts),
+            np.add.reduceat(np.where(trades.is_buy, trades.size, 0.0), starts),
+            np.diff(np.append(starts, len(buckets))),
+            np.add.reduceat(trades.is_buy.astype(np.int64), starts),
+        )
+
+    @classmethod
+    def combine(cls, parts: Sequence[Self]) -> Self:
+        """
+        Concatenates bars built from consecutive, time-ordered chunks of trades, merging
+        the partial bars of an interval split across chunks.
+        """
+        if not parts:
+            return cls.empty()
+        bars = cls(*(np.concatenate([getattr(b, f.name) for b in parts]) for f in fields(cls)))
+        starts = _run_starts(bars.timestamp)
+        if not len(bars) or len(starts) == len(bars):
+            return bars
+        ends = np.append(starts[1:], len(bars)) - 1
+        return cls(
+            bars.timestamp[starts],
+            bars.open[starts],
+            np.maximum.reduceat(bars.high, starts),
+            np.minimum.reduceat(bars.low, starts),
+            bars.close[ends],
+            *(
+                np.add.reduceat(getattr(bars, name), starts)
+                for name in ("volume", "quote_volume", "buy_volume", "trade_count", "buy_count")
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index: slice | np.ndarray) -> Self:
+        """Selects rows with a slice, boolean mask or index array."""
+        return type(self)(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    @property
+    def sell_volume(self) -> np.ndarray:
+        return self.volume - self.buy_volume
+
+    @property
+    def delta(self) -> np.ndarray:
+        """Taker buy volume minus taker sell volume."""
+        return 2 * self.buy_volume - self.volume
+
+    @property
+    def vwap(self) -> np.ndarray:
+        """The volume-weighted average price of each bar (NaN for zero-volume bars)."""
+        vwap = np.full_like(self.quote_volume, np.nan)
+        return np.divide(self.quote_volume, self.volume, out=vwap, where=self.volume > 0)
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Returns the bars as a mapping of column name to array."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def to_candle_batch(self) -> CandleBatch:
+        """Returns the OHLCV columns as a `CandleBatch`."""
+        return CandleBatch(*(getattr(self, name) for name in CANDLE_ROW_FIELDS))
+
+
+def _levels_from_rows(rows: Sequence[Sequence[str]] | None) -> np.ndarray:
+    """Parses `[price, size]` order book rows into an (N, 2) float64 array."""
+    if not rows:
+        return np.empty((0, 2), dtype=np.float64)
+    table = np.array(rows, dtype=np.float64)
+    if table.ndim != 2 or table.shape[1] != 2:
+        raise ValueError(f"Order book levels must be [price, size] pairs, got shape {table.shape}")
+    return table
+
+
+def _levels_from_models(levels: Sequence[OrderBookLevel]) -> np.ndarray:
+    """Packs `OrderBookLevel` models into an (N, 2) float64 array."""
+    pairs = [(level.price, level.size) for level in levels]
+    return np.array(pairs, dtype=np.float64).reshape(-1, 2)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookSnapshot:
+    """
+    An order book held as two (N, 2) float64 arrays of `[price, size]` rows.
+
+    Both sides are ordered best level first, as returned by the API: `bids` by descending
+    price and `asks` by ascending price. `timestamp` is in milliseconds since Epoch.
+    """
+
+    bids: np.ndarray
+    asks: np.ndarray
+    timestamp: int
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any]) -> Self:
+        """
+        Parses the API's order book payload in bulk, without per-level models.
+
+        Raises:
+            ValueError: If a side is not a list of `[price, size]` pairs.
+        """
+        return cls(
+            _levels_from_rows(data.get("bids")),
+            _levels_from_rows(data.get("asks")),
+            int(data["ts"]),
+        )
+
+    @classmethod
+    def from_order_book(cls, book: OrderBook) -> Self:
+        """Builds a snapshot from an `OrderBook` model."""
+        return cls(
+            _levels_from_models(book.bids),
+            _levels_from_models(book.asks),
+            int(book.timestamp.timestamp() * 1000),
+        )
+
+    def to_order_book(self) -> OrderBook:
+        """Converts the snapshot into an `OrderBook` model."""
+        # The levels are validated as usual; the book itself is assembled directly, since
+        # its validators only exist to parse the raw `[price, size]` string pairs.
+        return OrderBook.model_construct(
+            bids=[OrderBookLevel(price=p, size=s) for p, s in self.bids.tolist()],
+            asks=[OrderBookLevel(price=p, size=s) for p, s in self.asks.tolist()],
+            timestamp=datetime.fromtimestamp(self.timestamp / 1000.0),
+        )
+
+
+def _float_column(rows: Sequence[dict[str, Any]], key: str) -> np.ndarray:
+    """Parses one numeric field of every row into float64, empty or missing values as NaN."""
+    return np.array([row.get(key) or "nan" for row in rows], dtype=np.float64)
+
+
+@dataclass(frozen=True, slots=True)
+class TickerTable:
+    """
+    24-hour tickers of many symbols as a columnar table backed by NumPy arrays.
+
+    `symbol` is a unicode array of names and `timestamp` is int64 (milliseconds since
+    Epoch); every other column is float64, with NaN where the exchange sent no value
+    (e.g. no bid on an illiquid pair). `change_24h` is a fraction (0.01 is +1%), and
+    `usdt_volume` is the 24h quote volume converted to USDT, so it compares across quote
+    currencies.
+    """
+
+    symbol: np.ndarray
+    last_price: np.ndarray
+    price_24h_high: np.ndarray
+    price_24h_low: np.ndarray
+    change_24h: np.ndarray
+    base_volume: np.ndarray
+    quote_volume: np.ndarray
+    usdt_volume: np.ndarray
+    bid_price: np.ndarray
+    ask_price: np.ndarray
+    timestamp: np.ndarray
+
+    @classmethod
+    def empty(cls) -> Self:
+        """Returns a table with no rows."""
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict[str, Any]]) -> Self:
+        """Parses the API's list-of-objects tickers payload in bulk, without per-row models."""
+        return cls(
+            np.array([row["symbol"] for row in rows], dtype=np.str_),
+            _float_column(rows, "lastPr"),
+            _float_column(rows, "high24h"),
+            _float_column(rows, "low24h"),
+            _float_column(rows, "change24h"),
+            _float_column(rows, "baseVolume"),
+            _float_column(rows, "quoteVolume"),
+            _float_column(rows, "usdtVolume"),
+            _float_column(rows, "bidPr"),
+            _float_column(rows, "askPr"),
+            np.array([row["ts"] for row in rows], dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def __getitem__(self, index: slice | np.ndarray) -> Self:
+        """Selects rows with a slice, boolean mask or index array."""
+        return type(self)(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    @property
+    def spread_bps(self) -> np.ndarray:
+        """The bid/ask spread in basis points of the mid-price."""
+        return (self.ask_price - self.bid_price) / (self.ask_price + self.bid_price) * 2e4
+
+    @property
+    def range_24h(self) -> np.ndarray:
+        """The 24h high/low range as a fraction of the low, a rough volatility measure."""
+        return self.price_24h_high / self.price_24h_low - 1
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Returns the table as a mapping of column name to array."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .exceptions import BitgetAPIError
+
+# Cache keys of the reference data kept by `MarketDataAPI`.
+SUPPORTED_SYMBOLS_KEY = "/spot/market/support-symbols"
+CLOCK_OFFSET_KEY = "clock-offset"
+
+# Seconds each key stays fresh. The symbol list changes a few times a week, and clock
+# drift between a server and the exchange is a matter of milliseconds per hour.
+DEFAULT_TTLS: dict[str, float] = {
+    SUPPORTED_SYMBOLS_KEY: 60 * 60,
+    CLOCK_OFFSET_KEY: 15 * 60,
+}
+# TTL of keys without an entry in `ttls`.
+DEFAULT_TTL = 5 * 60.0
+
+
+class ReferenceCache:
+    """
+    A TTL cache for slow-changing reference data, with an optional on-disk tier.
+
+    Entries live in memory and, if `directory` is set, in one JSON file per key, so
+    short-lived processes (cron jobs, containers) share them across invocations. Disk
+    writes replace files atomically. Values must be JSON-serializable.
+
+    `get_or_fetch` refreshes an entry only once it is older than its TTL. If that refresh
+    fails with an API error, the stale value is served instead (with a warning), so an
+    exchange hiccup does not fail a run over data that rarely changes.
+
+    Args:
+        directory: Directory for the on-disk tier, created on first write. None keeps
+            entries in memory only.
+        ttls: Seconds each key stays fresh, overriding `DEFAULT_TTLS`.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, ttls: Mapping[str, float] | None = None
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self._ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, key: str) -> float:
+        """Seconds an entry for `key` stays fresh."""
+        return self._ttls.get(key, DEFAULT_TTL)
+
+    def get(self, key: str) -> Any | None:
+        """Returns the value stored for `key` if it is still fresh, else None."""
+        entry = self._load(key)
+        return entry[1] if entry is not None and self._is_fresh(key, entry) else None
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores `value` for `key`, stamped with the current time."""
+        entry = (time.time(), value)
+        with self._lock:
+            self._entries[key] = entry
+        if self.directory is not None:
+            self._write(self._path_for(self.directory, key), entry)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Returns the fresh value for `key`, calling `fetch` to refresh it if needed."""
+        entry = self._load(key)
+        if entry is not None and self._is_fresh(key, entry):
+            return entry[1]
+        try:
+            value = fetch()
+        except BitgetAPIError as e:
+            if entry is None:
+                raise
+            logger.warning(f"Refreshing cached '{key}' failed ({e}); serving the stale value.")
+            return entry[1]
+        self.put(key, value)
+        return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drops `key`, or every entry if `key` is None, from both tiers."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                self._entries.pop(k, None)
+        if self.directory is None:
+            return
+        if key is not None:
+            paths = [self._path_for(self.directory, key)]
+        else:
+            paths = list(self.directory.glob("*.json"))
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _path_for(directory: Path, key: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", key.strip("/"))
+        return directory / f"{safe}.json"
+
+    def _is_fresh(self, key: str, entry: tuple[float, Any]) -> bool:
+        return time.time() - entry[0] < self.ttl(key)
+
+    def _load(self, key: str) -> tuple[float, Any] | None:
+        """
+        Returns `(stored_at, value)` for `key`. A stale or missing in-memory entry is
+        checked against the disk tier, which another process may have refreshed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if self.directory is None or (entry is not None and self._is_fresh(key, entry)):
+            return entry
+        path = self._path_for(self.directory, key)
+        if not path.exists():
+            return entry
+        try:
+            payload = json.loads(path.read_text())
+            stored = (float(payload["stored_at"]), payload["value"])
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding unreadable reference cache {path}: {e}")
+            return entry
+        if entry is not None and entry[0] >= stored[0]:
+            return entry
+        with self._lock:
+            self._entries[key] = stored
+        return stored
+
+    def _write(self, path: Path, entry: tuple[float, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"stored_at": entry[0], "value": entry[1]}, f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
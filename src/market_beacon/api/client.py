@@ -1,42 +1,169 @@
 import json
-from collections.abc import Callable
-from datetime import datetime
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
 from types import TracebackType
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any
 
 import requests
 from loguru import logger
-
-from .auth import generate_signature, get_timestamp_ms
-from .exceptions import BitgetAPIError, BitgetAPIRequestError
-from .models import APIResponse, Candle, OrderBook, ServerTime, SupportedSymbols, Ticker, Trade
+from pydantic import TypeAdapter
+from requests.adapters import HTTPAdapter
+
+from .. import metrics
+from .auth import ClockOffset, RequestSigner, get_timestamp_ms
+from .batches import CandleBatch, OrderBookSnapshot, TickerTable, TradeBars, TradeBatch
+from .cache import CLOCK_OFFSET_KEY, SUPPORTED_SYMBOLS_KEY, ReferenceCache
+from .exceptions import (
+    BitgetAPIConnectionError,
+    BitgetAPIError,
+    BitgetAPIRequestError,
+    BitgetPaginationError,
+)
+from .models import (
+    GRANULARITY_SECONDS,
+    MAX_CANDLES_PER_REQUEST,
+    MAX_HISTORY_CANDLES_PER_REQUEST,
+    APIResponse,
+    Candle,
+    Granularity,
+    OrderBook,
+    OrderBookStep,
+    ServerTime,
+    SupportedSymbols,
+    Ticker,
+    Trade,
+)
+from .ratelimit import RateLimiter, RequestStats, RetryPolicy
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is installed with the optional `fast` extra
+    _json_loads = json.loads
+
+if TYPE_CHECKING:
+    from ..store import CandleStore
+
+# Endpoint prefixes that need no authentication. Bitget ignores auth headers on them, so
+# requests to them are sent unsigned.
+PUBLIC_ENDPOINT_PREFIXES = ("/public/", "/spot/market/")
+
+# Length of the time windows `iter_trade_batches` fetches concurrently with several workers.
+DEFAULT_TRADE_WINDOW = timedelta(minutes=5)
+
+# Validates a whole page of trades in one call into pydantic-core, rather than per row.
+TRADE_LIST_ADAPTER = TypeAdapter(list[Trade])
+
+
+def _trade_row_timestamp(trade: dict[str, Any]) -> int:
+    """Sort key for raw trade objects, whose `ts` may be a string or a number."""
+    return int(trade["ts"])
+
+
+def _split_range(start_ms: int, end_ms: int, window_ms: int) -> list[tuple[int, int]]:
+    """Splits the inclusive range `[start_ms, end_ms]` into inclusive windows."""
+    window_ms = max(1, window_ms)
+    return [
+        (window_start, min(window_start + window_ms - 1, end_ms))
+        for window_start in range(start_ms, end_ms + 1, window_ms)
+    ]
+
+
+def _merge_trade_windows(windows: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Merges consecutive time windows of raw trade objects into one chronological list."""
+    # Windows are already in time order, so each only needs a local sort. Trades stamped
+    # exactly on a boundary may be reported by both neighbours; drop repeats.
+    merged: list[dict[str, Any]] = []
+    previous_ids: set[str] = set()
+    for window_trades in windows:
+        window_trades.sort(key=_trade_row_timestamp)
+        merged.extend(t for t in window_trades if str(t["tradeId"]) not in previous_ids)
+        previous_ids = {str(t["tradeId"]) for t in window_trades}
+    return merged
 
 
 class MarketDataAPI:
-    """Namespace for public market data endpoints."""
+    """
+    Namespace for public market data endpoints.
 
-    def __init__(self, request_func: Callable[..., Any]):
-        self._request = request_func
+    If a `candle_store` is given, `get_candles` serves fixed-width granularities from it
+    and only fetches candles that are newer than, or missing from, the stored history.
+
+    With `fast_parse`, the hot endpoints (trades, candles, order book, tickers) trust the
+    exchange's envelope: it is decoded with orjson when installed and only its `code` is
+    checked, instead of being validated as an `APIResponse` model. Combined with the
+    columnar `get_trade_batch`, `get_candle_batch`, `get_order_book_snapshot` and
+    `get_tickers`, which parse payloads in bulk into NumPy arrays, no per-row Pydantic
+    validation is done.
+
+    Every server-time response updates `clock`, the exchange clock offset used to stamp
+    signed requests. With a `reference_cache`, the supported symbols and that offset are
+    reused until their TTLs expire instead of being fetched on every call.
+    """
 
+    def __init__(
+        self,
+        request_func: Callable[..., Any],
+        candle_store: "CandleStore | None" = None,
+        fast_parse: bool = False,
+        clock: ClockOffset | None = None,
+        reference_cache: ReferenceCache | None = None,
+    ):
+        self._request = request_func
+        self._candle_store = candle_store
+        self._fast_parse = fast_parse
+        self._clock = clock if clock is not None else ClockOffset()
+        self._reference_cache = reference_cache
+        if reference_cache is not None:
+            offset = reference_cache.get(CLOCK_OFFSET_KEY)
+            if offset is not None:
+                self._clock.offset_ms = offset
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_server_time(self) -> ServerTime:
         """
         Gets the current exchange server time.
         Endpoint: GET /public/time
+
+        While the reference cache holds a fresh clock offset, the time is estimated from
+        the local clock without a request.
         """
+        cache = self._reference_cache
+        if cache is not None:
+            offset = cache.get(CLOCK_OFFSET_KEY)
+            if offset is not None:
+                self._clock.offset_ms = offset
+                return ServerTime.model_validate({"serverTime": str(self._clock.now_ms())})
+
         logger.info("Fetching server time...")
+        sent_ms = time.time() * 1000
         data = self._request("GET", "/public/time")
-        return ServerTime.model_validate(data)
+        server_time = ServerTime.model_validate(data)
+        offset = self._clock.record(sent_ms, int(data["serverTime"]), time.time() * 1000)
+        if cache is not None:
+            cache.put(CLOCK_OFFSET_KEY, offset)
+        return server_time
 
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_supported_symbols(self) -> list[str]:
         """
         Gets a list of all available spot trading pair names.
         Endpoint: GET /spot/market/support-symbols
         """
-        logger.info("Fetching all supported spot symbols...")
-        data = self._request("GET", "/spot/market/support-symbols")
+
+        def fetch() -> Any:
+            logger.info("Fetching all supported spot symbols...")
+            return self._request("GET", "/spot/market/support-symbols")
+
+        cache = self._reference_cache
+        data = fetch() if cache is None else cache.get_or_fetch(SUPPORTED_SYMBOLS_KEY, fetch)
         supported_symbols = SupportedSymbols.model_validate(data)
         return supported_symbols.spot_list
 
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_ticker(self, symbol: str) -> Ticker:
         """
         Gets ticker information for a specific symbol.
@@ -50,12 +177,27 @@ class MarketDataAPI:
             raise BitgetAPIError(f"No ticker data returned for symbol {symbol}")
         return Ticker.model_validate(data[0])
 
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_tickers(self) -> TickerTable:
+        """
+        Gets the 24h tickers of every spot symbol in one request, as a columnar
+        `TickerTable` parsed in bulk straight from the API payload.
+        Endpoint: GET /spot/market/tickers
+        """
+        logger.info("Fetching tickers for all symbols...")
+        data = self._request("GET", "/spot/market/tickers", trusted=self._fast_parse)
+        return TickerTable.from_rows(data)
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_trades(
         self,
         symbol: str,
         start_time: datetime | None = None,
         end_time: datetime | None = None,
         limit: int = 100,
+        after_trade_id: str | None = None,
+        max_workers: int = 1,
+        window: timedelta | None = None,
     ) -> list[Trade]:
         """
         Retrieves public trades for a given spot symbol, with support for time-based
@@ -65,8 +207,65 @@ class MarketDataAPI:
         multiple paginated requests if necessary. If no time range is given, it fetches
         the most recent trades up to the specified limit.
 
+        With `max_workers > 1` and a bounded range, the range is split into independent
+        time windows (of length `window`, or `max_workers` equal windows by default) that
+        are paginated concurrently on a thread pool and merged in timestamp order.
+
+        Transient page failures are retried by the client. If a page still fails, a
+        `BitgetPaginationError` is raised carrying the trades fetched so far and the
+        `afterTradeId` cursor; pass that cursor back as `after_trade_id` to resume. With
+        concurrent windows, the trades are those of every window before the failed one
+        plus the failed window's partial trades, and the cursor is only valid inside the
+        failed window: resume with `start_time` set to that window's start, which the
+        error message gives.
+
         Endpoint: GET /spot/market/fills
         """
+        try:
+            rows = self._get_trade_rows(
+                symbol, start_time, end_time, limit, after_trade_id, max_workers, window
+            )
+        except BitgetPaginationError as e:
+            e.items = TRADE_LIST_ADAPTER.validate_python(e.items)
+            raise
+        return TRADE_LIST_ADAPTER.validate_python(rows)
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_trade_batch(
+        self,
+        symbol: str,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        limit: int = 100,
+        after_trade_id: str | None = None,
+        max_workers: int = 1,
+        window: timedelta | None = None,
+    ) -> TradeBatch:
+        """
+        Same as `get_trades`, but parses the trades into a columnar `TradeBatch`.
+
+        On a pagination failure, the error's `items` is the partial `TradeBatch`.
+        """
+        try:
+            rows = self._get_trade_rows(
+                symbol, start_time, end_time, limit, after_trade_id, max_workers, window
+            )
+        except BitgetPaginationError as e:
+            e.items = TradeBatch.from_rows(e.items)
+            raise
+        return TradeBatch.from_rows(rows)
+
+    def _get_trade_rows(
+        self,
+        symbol: str,
+        start_time: datetime | None,
+        end_time: datetime | None,
+        limit: int,
+        after_trade_id: str | None,
+        max_workers: int,
+        window: timedelta | None,
+    ) -> list[dict[str, Any]]:
+        """Fetches raw trade objects in chronological order (see `get_trades`)."""
         # The API's per-page limit is 100.
         page_limit = max(1, min(100, limit))
 
@@ -74,22 +273,74 @@ class MarketDataAPI:
         if not start_time and not end_time:
             logger.info(f"Fetching last {page_limit} trades for {symbol}...")
             params = {"symbol": symbol, "limit": page_limit}
-            data = self._request("GET", "/spot/market/fills", params=params)
-            return [Trade.model_validate(trade) for trade in data]
+            return self._request(
+                "GET", "/spot/market/fills", params=params, trusted=self._fast_parse
+            )
+
+        start_ms = int(start_time.timestamp() * 1000) if start_time else None
+        end_ms = int(end_time.timestamp() * 1000) if end_time else None
+
+        if max_workers > 1 and start_ms is not None and end_ms is not None and not after_trade_id:
+            return self._get_trades_windowed(
+                symbol, start_ms, end_ms, page_limit, max_workers, window
+            )
 
         # --- New behavior: Fetch all trades within the specified time range ---
         logger.info(f"Fetching all trades for {symbol} from {start_time} to {end_time}...")
+        all_trades = self._fetch_trade_range(symbol, start_ms, end_ms, page_limit, after_trade_id)
+        logger.info(f"Fetched a total of {len(all_trades)} trades.")
+
+        # Sort the final list by timestamp to ensure perfect chronological order
+        if all_trades:
+            all_trades.sort(key=_trade_row_timestamp)
+
+        return all_trades
+
+    def _fetch_trade_range(
+        self,
+        symbol: str,
+        start_ms: int | None,
+        end_ms: int | None,
+        page_limit: int,
+        after_trade_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Sequentially pages through every raw trade object in `[start_ms, end_ms]`."""
+        all_trades: list[dict[str, Any]] = []
+        try:
+            for page in self._iter_trade_pages(
+                symbol, start_ms, end_ms, page_limit, after_trade_id
+            ):
+                all_trades.extend(page)
+        except BitgetPaginationError as e:
+            e.items = all_trades
+            raise
+        return all_trades
 
-        all_trades: list[Trade] = []
-        last_trade_id: str | None = None
+    def _iter_trade_pages(
+        self,
+        symbol: str,
+        start_ms: int | None,
+        end_ms: int | None,
+        page_limit: int,
+        after_trade_id: str | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Yields the raw trade objects in `[start_ms, end_ms]` one page at a time, following
+        the `afterTradeId` cursor forward.
+
+        A failed page raises `BitgetPaginationError` with the cursor to resume from; its
+        `items` is empty, since the earlier pages have already been yielded.
+        """
+        last_trade_id: str | None = after_trade_id
         page_num = 1
+        total = 0
 
         # Prepare base parameters for the requests
         base_params: dict[str, Any] = {"symbol": symbol, "limit": page_limit}
-        if start_time:
-            base_params["startTime"] = int(start_time.timestamp() * 1000)
-        if end_time:
-            base_params["endTime"] = int(end_time.timestamp() * 1000)
+        if start_ms is not None:
+            base_params["startTime"] = start_ms
+        if end_ms is not None:
+            base_params["endTime"] = end_ms
 
         while True:
             params = base_params.copy()
@@ -99,72 +350,327 @@ class MarketDataAPI:
             logger.debug(f"Fetching page {page_num} of trades with params: {params}")
 
             try:
-                data = self._request("GET", "/spot/market/fills", params=params)
-                if not data:
-                    break  # No more data in the given range
+                data = self._request(
+                    "GET", "/spot/market/fills", params=params, trusted=self._fast_parse
+                )
+            except BitgetAPIError as e:
+                logger.error(f"Error fetching trades on page {page_num}: {e}")
+                raise BitgetPaginationError(
+                    f"Trade pagination for {symbol} failed on page {page_num}",
+                    cause=e,
+                    items=[],
+                    cursor=last_trade_id,
+                ) from e
+            if not data:
+                break  # No more data in the given range
+
+            metrics.increment(metrics.PAGES, endpoint="/spot/market/fills")
+            yield data
+            total += len(data)
+
+            # Update the cursor for the next page
+            last_trade_id = str(data[-1]["tradeId"])
+            page_num += 1
+
+            # Stop if the last page had fewer items than the limit
+            if len(data) < page_limit:
+                break
 
-                current_page_trades = [Trade.model_validate(trade) for trade in data]
-                all_trades.extend(current_page_trades)
+        logger.debug(f"Fetched a total of {total} trades in {page_num - 1} page(s).")
 
-                # Update the cursor for the next page
-                last_trade_id = current_page_trades[-1].trade_id
-                page_num += 1
+    def _fetch_trade_window(self, symbol: str, lo: int, hi: int) -> TradeBatch:
+        """
+        Fetches the trades in `[lo, hi]` as one chronological `TradeBatch`, parsing each
+        page into columns as it arrives rather than holding the raw objects.
+        """
+        pages = [TradeBatch.from_rows(page) for page in self._iter_trade_pages(symbol, lo, hi, 100)]
+        trades = TradeBatch.concat(pages)
+        # Trades on a window boundary may be reported by both neighbours.
+        return trades[(trades.timestamp >= lo) & (trades.timestamp <= hi)].sorted_by_time()
 
-                # Stop if the last page had fewer items than the limit
-                if len(current_page_trades) < page_limit:
-                    break
+    def _get_trades_windowed(
+        self,
+        symbol: str,
+        start_ms: int,
+        end_ms: int,
+        page_limit: int,
+        max_workers: int,
+        window: timedelta | None,
+    ) -> list[dict[str, Any]]:
+        """Fetches `[start_ms, end_ms]` as concurrent, non-overlapping time windows."""
+        if window is not None:
+            window_ms = int(window.total_seconds() * 1000)
+        else:
+            window_ms = -(-(end_ms - start_ms + 1) // max_workers)  # ceiling division
+        bounds = _split_range(start_ms, end_ms, window_ms)
+        logger.info(
+            f"Fetching all trades for {symbol} in {len(bounds)} window(s) "
+            f"using {max_workers} workers..."
+        )
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trades") as pool:
+            futures = [
+                pool.submit(self._fetch_trade_range, symbol, lo, hi, page_limit)
+                for lo, hi in bounds
+            ]
+            windows: list[list[dict[str, Any]]] = []
+            try:
+                for future in futures:
+                    windows.append(future.result())
+            except BitgetPaginationError as e:
+                pool.shutdown(wait=False, cancel_futures=True)
+                # Keep the windows that finished before the failed one, so resuming from
+                # the failed window's start loses nothing.
+                lo = bounds[len(windows)][0]
+                raise BitgetPaginationError(
+                    f"Trade pagination for {symbol} failed in the window starting at {lo} "
+                    f"ms; resume from there with the cursor",
+                    cause=e.cause,
+                    items=_merge_trade_windows([*windows, e.items]),
+                    cursor=e.cursor,
+                ) from e
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        merged = _merge_trade_windows(windows)
+        logger.info(f"Fetched a total of {len(merged)} trades across {len(bounds)} window(s).")
+        return merged
+
+    def iter_trade_batches(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime,
+        max_workers: int = 1,
+        window: timedelta = DEFAULT_TRADE_WINDOW,
+    ) -> Iterator[TradeBatch]:
+        """
+        Streams the public trades in `[start_time, end_time]` in chronological order, as
+        `TradeBatch` chunks, without ever holding the whole range.
 
-            except BitgetAPIRequestError as e:
-                logger.error(f"Error fetching trades on page {page_num}: {e}")
-                break
+        With one worker, each page is yielded as soon as it arrives (sorted; the
+        `afterTradeId` cursor walks forward in time), so memory stays constant. With
+        `max_workers > 1`, the range is split into time windows of length `window`, fetched
+        concurrently up to `max_workers` ahead of the consumer and yielded one batch per
+        window, in order; memory then holds at most `max_workers` windows of trades.
 
-        logger.info(f"Fetched a total of {len(all_trades)} trades in {page_num - 1} page(s).")
+        A failed page raises `BitgetPaginationError` with the cursor of the failed window.
 
-        # Sort the final list by timestamp to ensure perfect chronological order
-        if all_trades:
-            all_trades.sort(key=lambda t: t.timestamp)
+        Endpoint: GET /spot/market/fills
+        """
+        # Rounded, as bounds like the last millisecond of a candle are not exact floats.
+        start_ms = round(start_time.timestamp() * 1000)
+        end_ms = round(end_time.timestamp() * 1000)
+        if max_workers <= 1:
+            for page in self._iter_trade_pages(symbol, start_ms, end_ms, 100):
+                trades = TradeBatch.from_rows(page).sorted_by_time()
+                yield trades[(trades.timestamp >= start_ms) & (trades.timestamp <= end_ms)]
+            return
+
+        windows = iter(_split_range(start_ms, end_ms, round(window.total_seconds() * 1000)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trades") as pool:
+            pending = deque(
+                pool.submit(self._fetch_trade_window, symbol, lo, hi)
+                for lo, hi in islice(windows, max_workers)
+            )
+            try:
+                while pending:
+                    trades = pending.popleft().result()
+                    next_window = next(windows, None)
+                    if next_window is not None:
+                        pending.append(pool.submit(self._fetch_trade_window, symbol, *next_window))
+                    if len(trades):
+                        yield trades
+            finally:
+                # Also reached when the consumer stops early.
+                for future in pending:
+                    future.cancel()
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_trade_bars(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: timedelta,
+        origin: datetime | None = None,
+        max_workers: int = 1,
+        window: timedelta | None = None,
+    ) -> TradeBars:
+        """
+        Aggregates the public trades in `[start_time, end_time]` into exact `TradeBars` of
+        length `interval`, aligned so that one opens at `origin` (by default `start_time`).
 
-        return all_trades
+        The trades are streamed with `iter_trade_batches` and each chunk is reduced to bars
+        as it arrives. With one worker, pages are reduced one at a time, so raw trades are
+        never held for the whole range. With `max_workers > 1`, the range is split into
+        windows of `window`, or `max_workers` equal windows by default as in `get_trades`;
+        every window costs at least one request however few trades it holds, so pass a
+        smaller `window` only to bound memory on very busy ranges.
 
+        Endpoint: GET /spot/market/fills
+        """
+        interval_ms = round(interval.total_seconds() * 1000)
+        origin_ms = round((origin or start_time).timestamp() * 1000)
+        if window is None:
+            span_ms = round((end_time - start_time).total_seconds() * 1000) + 1
+            window = timedelta(milliseconds=-(-span_ms // max(1, max_workers)))
+        logger.info(
+            f"Aggregating trades for {symbol} from {start_time} to {end_time} into bars "
+            f"using {max_workers} workers..."
+        )
+        chunks = self.iter_trade_batches(symbol, start_time, end_time, max_workers, window)
+        return TradeBars.combine(
+            [TradeBars.from_trades(trades, interval_ms, origin_ms) for trades in chunks]
+        )
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_candles(
         self,
         symbol: str,
-        granularity: Literal[
-            "1min",
-            "3min",
-            "5min",
-            "15min",
-            "30min",
-            "1h",
-            "4h",
-            "6h",
-            "12h",
-            "1day",
-            "1week",
-            "1M",
-            "6Hutc",
-            "12Hutc",
-            "1Dutc",
-            "3Dutc",
-            "1Wutc",
-            "1Mutc",
-        ],
+        granularity: Granularity,
         limit: int = 100,
     ) -> list[Candle]:
         """
         Retrieves historical candlestick data for a given spot symbol.
         Endpoint: GET /spot/market/candles
         """
+        return self.get_candle_batch(symbol, granularity, limit).to_candles()
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_candle_batch(
+        self,
+        symbol: str,
+        granularity: Granularity,
+        limit: int = 100,
+    ) -> CandleBatch:
+        """
+        Retrieves historical candlestick data as a columnar `CandleBatch`, parsed in bulk
+        straight from the API payload.
+
+        A `limit` above what one request returns is served by paging back through the
+        history-candles endpoint. To download long ranges, use `backfill_candles`.
+        Endpoint: GET /spot/market/candles
+        """
+        interval_seconds = GRANULARITY_SECONDS.get(granularity)
+        if self._candle_store is not None and interval_seconds is not None:
+            return self._get_candles_cached(
+                self._candle_store, symbol, granularity, limit, interval_seconds * 1000
+            )
+
         logger.info(f"Fetching last {limit} candles ({granularity}) for {symbol}...")
-        params = {"symbol": symbol, "granularity": granularity, "limit": limit}
-        data = self._request("GET", "/spot/market/candles", params=params)
+        return self._fetch_latest_candles(symbol, granularity, limit)
+
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_history_candle_batch(
+        self,
+        symbol: str,
+        granularity: Granularity,
+        end_ms: int,
+        limit: int = MAX_HISTORY_CANDLES_PER_REQUEST,
+    ) -> CandleBatch:
+        """
+        Retrieves up to `limit` (at most 200) candles opening before `end_ms`, however far
+        back, as a `CandleBatch`.
+        Endpoint: GET /spot/market/history-candles
+        """
+        # Candle open times fall on whole seconds, so asking for candles up to
+        # `end_ms - 1` selects the same rows whether `endTime` is inclusive or not.
+        params: dict[str, Any] = {
+            "symbol": symbol,
+            "granularity": granularity,
+            "endTime": end_ms - 1,
+            "limit": min(limit, MAX_HISTORY_CANDLES_PER_REQUEST),
+        }
+        data = self._request(
+            "GET", "/spot/market/history-candles", params=params, trusted=self._fast_parse
+        )
+        metrics.increment(metrics.PAGES, endpoint="/spot/market/history-candles")
+        candles = CandleBatch.from_rows(data)
+        return candles[candles.timestamp < end_ms]
+
+    def _fetch_latest_candles(
+        self, symbol: str, granularity: Granularity, limit: int
+    ) -> CandleBatch:
+        """Fetches the latest `limit` candles, paging back through the history if needed."""
+        if limit <= MAX_CANDLES_PER_REQUEST:
+            return self._fetch_candles(symbol, granularity, limit)
+
+        pages = [self._fetch_candles(symbol, granularity, MAX_CANDLES_PER_REQUEST)]
+        remaining = limit - len(pages[0])
+        while remaining > 0 and len(pages[-1]):
+            page = self.get_history_candle_batch(
+                symbol, granularity, int(pages[-1].timestamp[0]), remaining
+            )
+            pages.append(page)
+            remaining -= len(page)
+        candles = CandleBatch.concat(pages[::-1])
+        if len(candles) < limit:
+            logger.warning(
+                f"Only {len(candles)} of the {limit} requested candles ({granularity}) "
+                f"exist for {symbol}."
+            )
+        return candles
+
+    def _fetch_candles(
+        self,
+        symbol: str,
+        granularity: Granularity,
+        limit: int,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> CandleBatch:
+        """Fetches one page of candles, optionally bounded to an open-time range."""
+        params: dict[str, Any] = {"symbol": symbol, "granularity": granularity, "limit": limit}
+        if start_ms is not None:
+            params["startTime"] = start_ms
+        if end_ms is not None:
+            params["endTime"] = end_ms
+        data = self._request("GET", "/spot/market/candles", params=params, trusted=self._fast_parse)
         # Data is already in chronological order (oldest to newest)
-        return [Candle.from_list(candle_data) for candle_data in data]
+        return CandleBatch.from_rows(data)
+
+    def _get_candles_cached(
+        self,
+        store: "CandleStore",
+        symbol: str,
+        granularity: Granularity,
+        limit: int,
+        interval_ms: int,
+    ) -> CandleBatch:
+        """Serves candles from the candle store, fetching only new or missing candles."""
+        plan = store.plan_refresh(symbol, granularity, interval_ms, limit, int(time.time() * 1000))
+        if plan is None:
+            logger.info(f"No cached candles for {symbol} ({granularity}), fetching {limit}...")
+            store.upsert(
+                symbol, granularity, self._fetch_latest_candles(symbol, granularity, limit)
+            )
+            return store.read(symbol, granularity, limit=limit)
+
+        window_start, ranges = plan
+        logger.info(
+            f"Refreshing cached candles ({granularity}) for {symbol} "
+            f"with {len(ranges)} request(s)..."
+        )
+        fetched = [
+            self._fetch_candles(
+                symbol,
+                granularity,
+                (end_ms - start_ms) // interval_ms + 1,
+                start_ms=start_ms,
+                end_ms=end_ms,
+            )
+            for start_ms, end_ms in ranges
+        ]
+        store.upsert(symbol, granularity, CandleBatch.concat(fetched))
+        return store.read(symbol, granularity, start_ms=window_start, limit=limit)
 
+    @metrics.timed(metrics.API_CALL_SECONDS)
     def get_order_book(
         self,
         symbol: str,
-        level: Literal["step0", "step1", "step2", "step3", "step4", "step5"] = "step0",
+        level: OrderBookStep = "step0",
         limit: int = 50,
     ) -> OrderBook:
         """
@@ -176,30 +682,203 @@ class MarketDataAPI:
             level: The price aggregation level. 'step0' is the most granular.
             limit: The number of price levels to return (max 400 for step0).
         """
+        if self._fast_parse:
+            return self.get_order_book_snapshot(symbol, level, limit).to_order_book()
+
         logger.info(f"Fetching order book for {symbol} (level: {level}, limit: {limit})...")
         params = {"symbol": symbol, "type": level, "limit": limit}
         data = self._request("GET", "/spot/market/orderbook", params=params)
         return OrderBook.model_validate(data)
 
+    @metrics.timed(metrics.API_CALL_SECONDS)
+    def get_order_book_snapshot(
+        self,
+        symbol: str,
+        level: OrderBookStep = "step0",
+        limit: int = 50,
+    ) -> OrderBookSnapshot:
+        """
+        Retrieves the order book as an `OrderBookSnapshot` of (N, 2) price/size arrays,
+        parsed in bulk straight from the API payload.
+        Endpoint: GET /spot/market/orderbook
+        """
+        logger.info(f"Fetching order book for {symbol} (level: {level}, limit: {limit})...")
+        params = {"symbol": symbol, "type": level, "limit": limit}
+        data = self._request(
+            "GET", "/spot/market/orderbook", params=params, trusted=self._fast_parse
+        )
+        return OrderBookSnapshot.from_payload(data)
+
 
-class BitgetClient:
+class _BitgetClientBase:
     """
-    A high-performance, typed client for the Bitget V2 API.
+    Transport-agnostic request signing and response handling shared by the
+    synchronous and asynchronous Bitget clients.
     """
 
     BASE_URL = "https://api.bitget.com"
 
-    def __init__(self, api_key: str, secret_key: str, passphrase: str):
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        passphrase: str,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
         if not all([api_key, secret_key, passphrase]):
             raise ValueError("API key, secret key, and passphrase must be provided.")
 
         self._api_key = api_key
         self._secret_key = secret_key
         self._passphrase = passphrase
+        self._rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._signer = RequestSigner(secret_key)
+        # Header templates, copied and completed per signed request. Public requests share
+        # `_public_headers` as is; HTTP sessions merge headers without mutating them.
+        self._public_headers = {"Content-Type": "application/json", "locale": "en-US"}
+        self._signed_headers = {
+            **self._public_headers,
+            "ACCESS-KEY": api_key,
+            "ACCESS-PASSPHRASE": passphrase,
+        }
+        # Estimated exchange clock offset applied to request timestamps.
+        self.clock = ClockOffset()
+
+    @property
+    def stats(self) -> RequestStats:
+        """Counters for throttled waits and retries, useful for tuning throughput."""
+        return self._rate_limiter.stats
+
+    def _next_retry_delay(self, error: BitgetAPIError, attempt: int, endpoint: str) -> float | None:
+        """Returns the backoff before retrying a failed request, or None to give up."""
+        if not self._retry_policy.is_retryable(error):
+            return None
+        if attempt >= self._retry_policy.max_retries:
+            self.stats.record_exhausted()
+            return None
+
+        delay = self._retry_policy.backoff(attempt)
+        self.stats.record_retry()
+        metrics.increment(metrics.RETRIES, endpoint=endpoint)
+        logger.warning(
+            f"Request to {endpoint} failed ({error}); retrying in {delay:.2f}s "
+            f"(attempt {attempt + 1}/{self._retry_policy.max_retries})."
+        )
+        return delay
+
+    def _create_headers(
+        self, method: str, path_to_sign: str, body: str, timestamp: str
+    ) -> dict[str, str]:
+        """Creates the authentication headers for a signed API request."""
+        headers = self._signed_headers.copy()
+        headers["ACCESS-SIGN"] = self._signer.sign(timestamp, method, path_to_sign, body)
+        headers["ACCESS-TIMESTAMP"] = timestamp
+        return headers
+
+    def _prepare_request(
+        self, method: str, endpoint: str, params: dict[str, Any] | None = None
+    ) -> tuple[str, dict[str, Any] | None, str, dict[str, str]]:
+        """
+        Builds the URL, query parameters, body and headers for a request. Requests to
+        `PUBLIC_ENDPOINT_PREFIXES` are left unsigned; all others are signed.
+
+        Returns:
+            A `(url, query_params, body, headers)` tuple ready to hand to an HTTP session.
+        """
+        request_path = f"/api/v2{endpoint}"
+        url = self.BASE_URL + request_path
+
+        is_post = method.upper() == "POST"
+        body = json.dumps(params) if is_post and params else ""
+        query_params = params if not is_post else None
+        if endpoint.startswith(PUBLIC_ENDPOINT_PREFIXES):
+            return url, query_params, body, self._public_headers
+
+        path_to_sign = request_path
+        if query_params:
+            # Create a URL-encoded query string
+            query_string = "&".join([f"{k}={v}" for k, v in query_params.items()])
+            path_to_sign += f"?{query_string}"
+
+        timestamp = get_timestamp_ms(self.clock.offset_ms)
+        headers = self._create_headers(method, path_to_sign, body, timestamp)
+        return url, query_params, body, headers
+
+    @staticmethod
+    def _unwrap_response(response: Any, trusted: bool = False) -> Any:
+        """
+        Validates the response envelope and returns its `data` payload.
+
+        With `trusted`, the envelope is not validated as a model; only its `code` is
+        checked, which is enough to surface API errors on endpoints whose payloads are
+        parsed in bulk afterwards.
+        """
+        if trusted:
+            payload = _json_loads(response.content)
+            if not isinstance(payload, dict) or payload.get("code") != "00000":
+                raise BitgetAPIRequestError(response)
+            return payload.get("data")
+
+        parsed_response = APIResponse[Any].model_validate(response.json())
+
+        if parsed_response.code != "00000":
+            # Pass the original response to the exception for full context
+            raise BitgetAPIRequestError(response)
+
+        return parsed_response.data
+
+    def _decode(self, response: Any, endpoint: str, trusted: bool) -> Any:
+        """`_unwrap_response`, recording the body size and the time spent unwrapping it."""
+        metrics.increment(metrics.RESPONSE_BYTES, len(response.content), endpoint=endpoint)
+        with metrics.timer(metrics.DECODE_SECONDS, endpoint=endpoint):
+            return self._unwrap_response(response, trusted)
+
+
+class BitgetClient(_BitgetClientBase):
+    """
+    A high-performance, typed client for the Bitget V2 API.
+
+    Requests are throttled per endpoint by `rate_limiter` and transient failures are
+    retried according to `retry_policy`; both default to Bitget's published limits.
+    `pool_maxsize` bounds the number of kept-alive connections, which should be at least
+    the number of worker threads sharing the client. An optional `candle_store` lets
+    `market.get_candles` fetch incrementally instead of re-downloading the full window.
+    `fast_parse` enables the trusted parsing mode of `MarketDataAPI` for hot endpoints,
+    and `reference_cache` lets it reuse the symbol list and clock offset.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        passphrase: str,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        pool_maxsize: int = 20,
+        candle_store: "CandleStore | None" = None,
+        fast_parse: bool = False,
+        reference_cache: ReferenceCache | None = None,
+    ):
+        super().__init__(api_key, secret_key, passphrase, rate_limiter, retry_policy)
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # `requests` rescans the environment for proxies and CA bundles on every request;
+        # resolve them once per base URL instead (see `_environment_settings`).
+        self._session.trust_env = False
+        self._environment: dict[str, dict[str, Any]] = {}
 
         # --- API Namespaces ---
-        self.market = MarketDataAPI(self._request)
+        self.market = MarketDataAPI(
+            self._request,
+            candle_store=candle_store,
+            fast_parse=fast_parse,
+            clock=self.clock,
+            reference_cache=reference_cache,
+        )
 
     def __enter__(self) -> "BitgetClient":
         return self
@@ -217,56 +896,73 @@ class BitgetClient:
         self._session.close()
         logger.debug("Bitget API client session closed.")
 
-    def _create_headers(
-        self, method: str, path_to_sign: str, body: str | bytes, timestamp: str
-    ) -> dict[str, str]:
-        """Creates the necessary headers for an API request."""
-        body_str = body.decode() if isinstance(body, bytes) else body
-        signature = generate_signature(timestamp, method, path_to_sign, body_str, self._secret_key)
-        return {
-            "ACCESS-KEY": self._api_key,
-            "ACCESS-SIGN": signature,
-            "ACCESS-TIMESTAMP": timestamp,
-            "ACCESS-PASSPHRASE": self._passphrase,
-            "Content-Type": "application/json",
-            "locale": "en-US",
-        }
-
-    def _request(self, method: str, endpoint: str, params: dict[str, Any] | None = None) -> Any:
-        """Generic method to make a request to the Bitget API."""
-        request_path = f"/api/v2{endpoint}"
-        url = self.BASE_URL + request_path
-
-        is_post = method.upper() == "POST"
-        body = json.dumps(params) if is_post and params else ""
-        query_params = params if not is_post else None
-        timestamp = get_timestamp_ms()
-
-        path_to_sign = request_path
-        if query_params:
-            # Create a URL-encoded query string
-            query_string = "&".join([f"{k}={v}" for k, v in query_params.items()])
-            path_to_sign += f"?{query_string}"
-
-        # All requests, including public ones, are signed for simplicity and consistency.
-        # Bitget's public endpoints ignore auth headers if not needed.
-        headers = self._create_headers(method, path_to_sign, body, timestamp)
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        trusted: bool = False,
+    ) -> Any:
+        """
+        Generic method to make a rate-limited, retried request to the Bitget API.
 
+        `trusted` skips model validation of the response envelope (see `_unwrap_response`).
+        """
+        attempt = 0
+        while True:
+            wait = self._rate_limiter.reserve(endpoint)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return self._send(method, endpoint, params, trusted)
+            except BitgetAPIError as e:
+                delay = self._next_retry_delay(e, attempt, endpoint)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    def _environment_settings(self) -> dict[str, Any]:
+        """The proxy and TLS settings the environment implies for `BASE_URL`, cached."""
+        settings = self._environment.get(self.BASE_URL)
+        if settings is None:
+            with requests.Session() as env_session:
+                settings = env_session.merge_environment_settings(
+                    self.BASE_URL, {}, None, None, None
+                )
+            self._environment[self.BASE_URL] = settings
+        return settings
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        trusted: bool = False,
+    ) -> Any:
+        """Sends a single request attempt and unwraps the response."""
+        url, query_params, body, headers = self._prepare_request(method, endpoint, params)
+
+        started = time.perf_counter()
         try:
             # Note: `requests` will handle URL encoding of query_params correctly
             response = self._session.request(
-                method=method, url=url, params=query_params, data=body, headers=headers, timeout=10
+                method=method,
+                url=url,
+                params=query_params,
+                data=body,
+                headers=headers,
+                timeout=10,
+                **self._environment_settings(),
             )
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             raise BitgetAPIRequestError(response=e.response) from e
         except requests.exceptions.RequestException as e:
-            raise BitgetAPIError(f"HTTP Request failed: {e}") from e
-
-        parsed_response = APIResponse[Any].model_validate(response.json())
-
-        if parsed_response.code != "00000":
-            # Pass the original response to the exception for full context
-            raise BitgetAPIRequestError(response)
+            raise BitgetAPIConnectionError(f"HTTP Request failed: {e}") from e
+        finally:
+            metrics.observe(
+                metrics.REQUEST_SECONDS, time.perf_counter() - started, endpoint=endpoint
+            )
 
-        return parsed_response.data
+        return self._decode(response, endpoint, trusted)
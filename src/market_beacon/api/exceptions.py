@@ -1,6 +1,8 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from requests import Response
+if TYPE_CHECKING:
+    import httpx
+    from requests import Response
 
 
 class BitgetAPIError(Exception):
@@ -24,7 +26,7 @@ class BitgetAPIError(Exception):
 class BitgetAPIRequestError(BitgetAPIError):
     """Raised for non-200 HTTP status codes or API-level errors (e.g., bad request)."""
 
-    def __init__(self, response: Response):
+    def __init__(self, response: "Response | httpx.Response"):
         self.response = response
         try:
             body = response.json()
@@ -33,3 +35,24 @@ class BitgetAPIRequestError(BitgetAPIError):
             body = None
             msg = response.text or "Failed to decode response"
         super().__init__(message=msg, status_code=response.status_code, response_body=body)
+
+
+class BitgetAPIConnectionError(BitgetAPIError):
+    """Raised when a request fails before a response is received (timeouts, resets)."""
+
+
+class BitgetPaginationError(BitgetAPIError):
+    """
+    Raised when a paginated fetch fails part-way through.
+
+    Carries everything fetched before the failure together with the cursor needed to
+    resume, so callers can pick up where the failed page left off instead of starting over.
+    """
+
+    def __init__(self, message: str, cause: BitgetAPIError, items: Any, cursor: str | None):
+        self.cause = cause
+        self.items = items
+        self.cursor = cursor
+        super().__init__(
+            message=message, status_code=cause.status_code, response_body=cause.response_body
+        )
@@ -1,9 +1,59 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from dateutil.parser import isoparse
 from pydantic import BaseModel, Field, field_validator
 
+# Candle granularities accepted by the spot candles endpoint.
+Granularity = Literal[
+    "1min",
+    "3min",
+    "5min",
+    "15min",
+    "30min",
+    "1h",
+    "4h",
+    "6h",
+    "12h",
+    "1day",
+    "1week",
+    "1M",
+    "6Hutc",
+    "12Hutc",
+    "1Dutc",
+    "3Dutc",
+    "1Wutc",
+    "1Mutc",
+]
+
+# Length of each fixed-width granularity in seconds. Calendar-month granularities
+# ("1M", "1Mutc") have no fixed length and are intentionally absent.
+GRANULARITY_SECONDS: dict[str, int] = {
+    "1min": 60,
+    "3min": 3 * 60,
+    "5min": 5 * 60,
+    "15min": 15 * 60,
+    "30min": 30 * 60,
+    "1h": 60 * 60,
+    "4h": 4 * 60 * 60,
+    "6h": 6 * 60 * 60,
+    "12h": 12 * 60 * 60,
+    "1day": 24 * 60 * 60,
+    "1week": 7 * 24 * 60 * 60,
+    "6Hutc": 6 * 60 * 60,
+    "12Hutc": 12 * 60 * 60,
+    "1Dutc": 24 * 60 * 60,
+    "3Dutc": 3 * 24 * 60 * 60,
+    "1Wutc": 7 * 24 * 60 * 60,
+}
+
+# Most candles a single request returns from the candles and history-candles endpoints.
+MAX_CANDLES_PER_REQUEST = 1000
+MAX_HISTORY_CANDLES_PER_REQUEST = 200
+
+# Price aggregation levels accepted by the spot order book endpoint.
+OrderBookStep = Literal["step0", "step1", "step2", "step3", "step4", "step5"]
+
 
 class APIResponse[T](BaseModel):
     """Generic Pydantic model for a standard Bitget API response structure."""
@@ -79,6 +129,31 @@ class Ticker(BaseModel):
         return v
 
 
+class TickerUpdate(BaseModel):
+    """Represents a ticker pushed on the public WebSocket `ticker` channel."""
+
+    symbol: str = Field(alias="instId")
+    last_price: float = Field(alias="lastPr")
+    open_24h: float = Field(alias="open24h")
+    price_24h_high: float = Field(alias="high24h")
+    price_24h_low: float = Field(alias="low24h")
+    change_24h: float = Field(alias="change24h")
+    bid_price: float = Field(alias="bidPr")
+    ask_price: float = Field(alias="askPr")
+    bid_size: float = Field(alias="bidSz")
+    ask_size: float = Field(alias="askSz")
+    base_volume: float = Field(alias="baseVolume")
+    quote_volume: float = Field(alias="quoteVolume")
+    timestamp: datetime = Field(alias="ts")
+
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def convert_timestamp_to_datetime(cls, v: Any) -> datetime:
+        if isinstance(v, str) and v.isdigit():
+            return datetime.fromtimestamp(int(v) / 1000.0)
+        return v
+
+
 class Trade(BaseModel):
     """Represents a single trade execution."""
 
@@ -0,0 +1,155 @@
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+from .. import metrics
+from .exceptions import BitgetAPIConnectionError, BitgetAPIError
+
+# Bitget's published per-IP quotas (requests per second) for the V2 public endpoints.
+DEFAULT_ENDPOINT_QUOTAS: dict[str, float] = {
+    "/public/time": 20,
+    "/spot/market/support-symbols": 20,
+    "/spot/market/ticker": 20,
+    "/spot/market/tickers": 20,
+    "/spot/market/orderbook": 20,
+    "/spot/market/candles": 20,
+    "/spot/market/history-candles": 20,
+    "/spot/market/fills": 10,
+    "/spot/market/fills-history": 10,
+}
+
+# Quota applied to endpoints without a published entry above.
+DEFAULT_QUOTA = 10.0
+
+# HTTP status codes that indicate a transient, retryable failure.
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class RequestStats:
+    """Thread-safe counters describing how the client spent time waiting and retrying."""
+
+    throttled_waits: int = 0
+    throttled_seconds: float = 0.0
+    retries: int = 0
+    retries_exhausted: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_throttle(self, seconds: float) -> None:
+        with self._lock:
+            self.throttled_waits += 1
+            self.throttled_seconds += seconds
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_exhausted(self) -> None:
+        with self._lock:
+            self.retries_exhausted += 1
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that hands out reservations instead of sleeping.
+
+    `reserve()` always succeeds and returns how long the caller must wait before using its
+    token, which lets blocking and asyncio callers share the same bucket.
+
+    Args:
+        rate: Tokens replenished per second.
+        capacity: Maximum burst size. Defaults to one second's worth of tokens.
+        clock: Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` from the bucket and returns the number of seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            # A negative balance is debt that later reservations queue behind.
+            return max(0.0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Per-endpoint token-bucket rate limiter following Bitget's published quotas.
+
+    Args:
+        quotas: Requests-per-second overrides keyed by endpoint (e.g. `/spot/market/fills`).
+            Merged over `DEFAULT_ENDPOINT_QUOTAS`.
+        default_quota: Requests per second for endpoints without an explicit quota.
+        stats: Counters to record throttled waits into.
+    """
+
+    def __init__(
+        self,
+        quotas: Mapping[str, float] | None = None,
+        default_quota: float = DEFAULT_QUOTA,
+        stats: RequestStats | None = None,
+    ):
+        self._quotas = {**DEFAULT_ENDPOINT_QUOTAS, **(quotas or {})}
+        self._default_quota = default_quota
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.stats = stats if stats is not None else RequestStats()
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                bucket = TokenBucket(self._quotas.get(endpoint, self._default_quota))
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def reserve(self, endpoint: str) -> float:
+        """Reserves a request slot for `endpoint` and returns the seconds to wait for it."""
+        wait = self._bucket(endpoint).reserve()
+        if wait > 0:
+            self.stats.record_throttle(wait)
+            metrics.increment(metrics.THROTTLED_SECONDS, wait, endpoint=endpoint)
+        return wait
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient API failures.
+
+    Requests failing with HTTP 429, a 5xx status, a timeout or a connection error are
+    retried up to `max_retries` times, sleeping a random ("full jitter") delay between
+    zero and `min(max_delay, base_delay * 2**attempt)` before each retry.
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def is_retryable(self, error: BitgetAPIError) -> bool:
+        """Returns True if `error` is a transient failure worth retrying."""
+        if isinstance(error, BitgetAPIConnectionError):
+            return True
+        return error.status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay in seconds before retry number `attempt` (zero-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
@@ -0,0 +1,485 @@
+import asyncio
+import contextlib
+import inspect
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Literal, Self
+
+from loguru import logger
+from pydantic import ValidationError
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import WebSocketException
+
+from .batches import CandleBatch, OrderBookSnapshot, TradeBatch
+from .client import _json_loads
+from .models import Granularity, TickerUpdate
+from .ratelimit import RetryPolicy, TokenBucket
+
+# WebSocket candle channel for each REST granularity that has a streaming equivalent.
+CANDLE_CHANNELS: dict[str, str] = {
+    "1min": "candle1m",
+    "5min": "candle5m",
+    "15min": "candle15m",
+    "30min": "candle30m",
+    "1h": "candle1H",
+    "4h": "candle4H",
+    "6h": "candle6H",
+    "12h": "candle12H",
+    "1day": "candle1D",
+    "1week": "candle1W",
+    "1M": "candle1M",
+    "6Hutc": "candle6Hutc",
+    "12Hutc": "candle12Hutc",
+    "1Dutc": "candle1Dutc",
+    "3Dutc": "candle3Dutc",
+    "1Wutc": "candle1Wutc",
+    "1Mutc": "candle1Mutc",
+}
+
+# Order book channels: incremental full depth ("books") or fixed-depth snapshots.
+BookChannel = Literal["books", "books1", "books5", "books15"]
+
+# Bitget accepts at most 10 messages per second per connection, and subscribe requests
+# must stay under 4096 bytes, which comfortably fits this many channel arguments.
+MAX_MESSAGES_PER_SECOND = 10.0
+SUBSCRIBE_BATCH_SIZE = 50
+
+
+@dataclass(frozen=True, slots=True)
+class Subscription:
+    """A public channel for one instrument, e.g. the `ticker` channel of BTCUSDT."""
+
+    channel: str
+    symbol: str
+    inst_type: str = "SPOT"
+
+    @classmethod
+    def ticker(cls, symbol: str) -> Self:
+        """The 24h ticker of a symbol."""
+        return cls("ticker", symbol)
+
+    @classmethod
+    def trades(cls, symbol: str) -> Self:
+        """Public trades of a symbol."""
+        return cls("trade", symbol)
+
+    @classmethod
+    def books(cls, symbol: str, channel: BookChannel = "books") -> Self:
+        """The order book of a symbol: incremental full depth, or 1/5/15-level snapshots."""
+        return cls(channel, symbol)
+
+    @classmethod
+    def candles(cls, symbol: str, granularity: Granularity) -> Self:
+        """
+        Candles of a symbol at a REST granularity.
+
+        Raises:
+            ValueError: If the granularity has no streaming channel.
+        """
+        channel = CANDLE_CHANNELS.get(granularity)
+        if channel is None:
+            raise ValueError(f"Granularity {granularity!r} has no WebSocket candle channel")
+        return cls(channel, symbol)
+
+    @classmethod
+    def from_arg(cls, arg: dict[str, Any]) -> Self:
+        """Builds a subscription from a channel argument echoed by the server."""
+        return cls(arg["channel"], arg["instId"], arg.get("instType", "SPOT"))
+
+    def to_arg(self) -> dict[str, str]:
+        """Returns the channel argument used in subscribe and unsubscribe requests."""
+        return {"instType": self.inst_type, "channel": self.channel, "instId": self.symbol}
+
+
+@dataclass(frozen=True, slots=True)
+class BookUpdate:
+    """
+    An order book snapshot or delta pushed on a `books*` channel.
+
+    Levels are kept as the exchange's `[price, size]` strings, since Bitget computes the
+    checksum over their exact textual form. A size of "0" in a delta deletes the level.
+    """
+
+    bids: list[list[str]]
+    asks: list[list[str]]
+    timestamp: int
+    seq: int | None = None
+    checksum: int | None = None
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any]) -> Self:
+        seq = data.get("seq")
+        checksum = data.get("checksum")
+        return cls(
+            bids=data.get("bids") or [],
+            asks=data.get("asks") or [],
+            timestamp=int(data["ts"]),
+            seq=int(seq) if seq is not None else None,
+            checksum=int(checksum) if checksum is not None else None,
+        )
+
+    def to_snapshot(self) -> OrderBookSnapshot:
+        """Parses the levels into an `OrderBookSnapshot` of float arrays."""
+        return OrderBookSnapshot.from_payload(
+            {"bids": self.bids, "asks": self.asks, "ts": self.timestamp}
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StreamMessage:
+    """
+    A parsed push from a subscribed channel.
+
+    `data` depends on the channel: a list of `TickerUpdate` for `ticker`, a `TradeBatch`
+    for `trade`, a `CandleBatch` for `candle*` and a list of `BookUpdate` for `books*`.
+    """
+
+    subscription: Subscription
+    action: Literal["snapshot", "update"]
+    data: Any
+    timestamp: int | None = None
+
+
+def parse_channel_data(channel: str, data: list[Any]) -> Any:
+    """Parses the `data` array of a push according to its channel."""
+    if channel == "ticker":
+        return [TickerUpdate.model_validate(item) for item in data]
+    if channel == "trade":
+        return TradeBatch.from_rows(data).sorted_by_time()
+    if channel.startswith("candle"):
+        return CandleBatch.from_rows(data)
+    if channel.startswith("books"):
+        return [BookUpdate.from_payload(item) for item in data]
+    return data
+
+
+Listener = Callable[[StreamMessage], Awaitable[None] | None]
+
+
+class UpdateIterator:
+    """
+    An async iterator over the messages of a `MarketStream`, backed by a bounded queue.
+
+    A consumer that falls behind never stalls the stream: once `maxsize` messages are
+    queued, the oldest is dropped (and counted in `dropped`) to make room for the newest.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue[StreamMessage | None] = asyncio.Queue(maxsize)
+        self._closed = False
+        self.dropped = 0
+        self._remove: Callable[[], None] = lambda: None
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> StreamMessage:
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        message = await self._queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    def put(self, message: StreamMessage | None) -> None:
+        if self._queue.full() and self._queue.get_nowait() is not None:
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    def close(self) -> None:
+        """Stops receiving messages; iteration ends once the queue is drained."""
+        if not self._closed:
+            self._closed = True
+            self._remove()
+            self.put(None)
+
+
+class _StreamConnection:
+    """One WebSocket connection carrying a share of a `MarketStream`'s subscriptions."""
+
+    def __init__(self, stream: "MarketStream", name: str):
+        self._stream = stream
+        self.name = name
+        # Insertion-ordered set, so resubscription replays the original order.
+        self.subscriptions: dict[Subscription, None] = {}
+        self._ws: ClientConnection | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._send_bucket = TokenBucket(MAX_MESSAGES_PER_SECOND)
+        self._last_received = time.monotonic()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def subscribe(self, subscriptions: list[Subscription]) -> None:
+        self.subscriptions.update(dict.fromkeys(subscriptions))
+        # If the socket isn't open, everything is (re)subscribed once it connects.
+        await self._send_if_open("subscribe", subscriptions)
+
+    async def unsubscribe(self, subscriptions: list[Subscription]) -> None:
+        for subscription in subscriptions:
+            self.subscriptions.pop(subscription, None)
+        await self._send_if_open("unsubscribe", subscriptions)
+
+    async def _send_if_open(self, op: str, subscriptions: list[Subscription]) -> None:
+        if self._ws is None:
+            return
+        try:
+            await self._send_op(self._ws, op, subscriptions)
+        except WebSocketException as e:
+            # The reconnect loop resubscribes the current channel set from scratch.
+            logger.debug(f"{self.name}: {op} deferred to the next connection: {e!r}")
+
+    async def _send_op(
+        self, ws: ClientConnection, op: str, subscriptions: list[Subscription]
+    ) -> None:
+        for i in range(0, len(subscriptions), SUBSCRIBE_BATCH_SIZE):
+            wait = self._send_bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            args = [s.to_arg() for s in subscriptions[i : i + SUBSCRIBE_BATCH_SIZE]]
+            await ws.send(json.dumps({"op": op, "args": args}))
+
+    async def _run(self) -> None:
+        """Keeps the connection open, reconnecting and resubscribing after any failure."""
+        attempt = 0
+        while True:
+            try:
+                async with connect(self._stream.url, ping_interval=None) as ws:
+                    logger.info(
+                        f"{self.name}: connected, subscribing to "
+                        f"{len(self.subscriptions)} channel(s)."
+                    )
+                    self._last_received = time.monotonic()
+                    self._ws = ws
+                    heartbeat = asyncio.create_task(self._heartbeat(ws))
+                    try:
+                        await self._send_op(ws, "subscribe", list(self.subscriptions))
+                        attempt = 0
+                        async for raw in ws:
+                            self._last_received = time.monotonic()
+                            self._handle(raw)
+                    finally:
+                        self._ws = None
+                        heartbeat.cancel()
+                logger.warning(f"{self.name}: connection closed by the server.")
+            except (OSError, TimeoutError, WebSocketException) as e:
+                logger.warning(f"{self.name}: connection failed: {e!r}")
+
+            delay = self._stream.reconnect_policy.backoff(attempt)
+            attempt += 1
+            logger.info(f"{self.name}: reconnecting in {delay:.2f}s (attempt {attempt}).")
+            await asyncio.sleep(delay)
+
+    async def _heartbeat(self, ws: ClientConnection) -> None:
+        """Sends Bitget's text pings and drops the connection if the server goes silent."""
+        interval = self._stream.ping_interval
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_received > 2 * interval:
+                logger.warning(f"{self.name}: no data for {2 * interval:.0f}s, reconnecting.")
+                await ws.close()
+                return
+            await ws.send("ping")
+
+    def _handle(self, raw: str | bytes) -> None:
+        if raw == "pong":
+            return
+        try:
+            message = _json_loads(raw)
+        except ValueError:
+            logger.warning(f"{self.name}: ignoring undecodable message {raw!r:.200}")
+            return
+        if not isinstance(message, dict):
+            logger.warning(f"{self.name}: ignoring non-object message {raw!r:.200}")
+            return
+
+        event = message.get("event")
+        if event == "error":
+            logger.error(f"{self.name}: {message.get('code')} {message.get('msg')}")
+            return
+        if event is not None:
+            logger.debug(f"{self.name}: {event} {message.get('arg')}")
+            return
+
+        try:
+            subscription = Subscription.from_arg(message["arg"])
+            data = parse_channel_data(subscription.channel, message.get("data") or [])
+            ts = message.get("ts")
+            timestamp = int(ts) if ts is not None else None
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.warning(f"{self.name}: ignoring malformed push: {e}")
+            return
+        self._stream.publish(
+            StreamMessage(
+                subscription=subscription,
+                action=message.get("action", "snapshot"),
+                data=data,
+                timestamp=timestamp,
+            )
+        )
+
+
+class MarketStream:
+    """
+    Streams public market data from Bitget's WebSocket API to in-process consumers.
+
+    Subscriptions are spread over as few connections as possible, each carrying at most
+    `max_subscriptions_per_connection` channels. Every connection sends Bitget's text
+    heartbeat, and on any failure it reconnects with jittered backoff and resubscribes
+    its channels. Parsed `StreamMessage`s are fanned out to callbacks registered with
+    `add_listener` and to async iterators created with `updates`.
+
+    Args:
+        url: The WebSocket endpoint; defaults to Bitget's public V2 endpoint.
+        max_subscriptions_per_connection: Channels multiplexed onto one connection.
+        ping_interval: Seconds between heartbeats. A connection that receives nothing
+            for twice this long is considered dead and is replaced.
+        reconnect_policy: Backoff between reconnect attempts (`max_retries` is ignored;
+            reconnection is attempted until the stream is closed).
+    """
+
+    URL = "wss://ws.bitget.com/v2/ws/public"
+
+    def __init__(
+        self,
+        url: str | None = None,
+        max_subscriptions_per_connection: int = 50,
+        ping_interval: float = 25.0,
+        reconnect_policy: RetryPolicy | None = None,
+    ):
+        if max_subscriptions_per_connection < 1:
+            raise ValueError("max_subscriptions_per_connection must be at least 1.")
+        self.url = url or self.URL
+        self.max_subscriptions_per_connection = max_subscriptions_per_connection
+        self.ping_interval = ping_interval
+        self.reconnect_policy = reconnect_policy or RetryPolicy(base_delay=1.0, max_delay=30.0)
+        self._connections: list[_StreamConnection] = []
+        self._listeners: dict[int, tuple[Listener, frozenset[Subscription] | None]] = {}
+        self._iterators: set[UpdateIterator] = set()
+        self._next_listener_id = 0
+        self._background: set[asyncio.Future[None]] = set()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        """All active subscriptions, across every connection."""
+        return [s for conn in self._connections for s in conn.subscriptions]
+
+    async def subscribe(self, *subscriptions: Subscription) -> None:
+        """Subscribes to channels, opening new connections as existing ones fill up."""
+        active = set(self.subscriptions)
+        pending = [s for s in dict.fromkeys(subscriptions) if s not in active]
+        for conn in self._connections:
+            room = self.max_subscriptions_per_connection - len(conn.subscriptions)
+            if room > 0 and pending:
+                batch, pending = pending[:room], pending[room:]
+                await conn.subscribe(batch)
+        while pending:
+            batch = pending[: self.max_subscriptions_per_connection]
+            pending = pending[self.max_subscriptions_per_connection :]
+            conn = _StreamConnection(self, name=f"stream-{len(self._connections)}")
+            self._connections.append(conn)
+            await conn.subscribe(batch)
+            conn.start()
+
+    async def unsubscribe(self, *subscriptions: Subscription) -> None:
+        """Unsubscribes from channels; their connections stay open for reuse."""
+        targets = set(subscriptions)
+        for conn in self._connections:
+            owned = [s for s in conn.subscriptions if s in targets]
+            if owned:
+                await conn.unsubscribe(owned)
+
+    async def resubscribe(self, *subscriptions: Subscription) -> None:
+        """
+        Unsubscribes and subscribes again, making the exchange resend a full snapshot.
+        Use this to recover an order book that fell out of sync.
+        """
+        await self.unsubscribe(*subscriptions)
+        await self.subscribe(*subscriptions)
+
+    def add_listener(
+        self, callback: Listener, subscriptions: Iterable[Subscription] | None = None
+    ) -> Callable[[], None]:
+        """
+        Calls `callback` with every message, or only those for `subscriptions`.
+
+        Plain callbacks run inline on the event loop and should return quickly; coroutine
+        callbacks are scheduled as tasks. Exceptions are logged, never propagated.
+
+        Returns:
+            A function that removes the listener.
+        """
+        listener_id = self._next_listener_id
+        self._next_listener_id += 1
+        wanted = frozenset(subscriptions) if subscriptions is not None else None
+        self._listeners[listener_id] = (callback, wanted)
+        return lambda: self._listeners.pop(listener_id, None)
+
+    def updates(
+        self, subscriptions: Iterable[Subscription] | None = None, maxsize: int = 1000
+    ) -> UpdateIterator:
+        """
+        Returns an async iterator over messages, or only those for `subscriptions`.
+
+        Messages are queued from the moment this is called, so create the iterator before
+        subscribing to avoid missing the initial snapshots.
+        """
+        iterator = UpdateIterator(maxsize)
+        remove = self.add_listener(iterator.put, subscriptions)
+        self._iterators.add(iterator)
+
+        def detach() -> None:
+            remove()
+            self._iterators.discard(iterator)
+
+        iterator._remove = detach
+        return iterator
+
+    def publish(self, message: StreamMessage) -> None:
+        """Fans a message out to every matching listener."""
+        for callback, wanted in list(self._listeners.values()):
+            if wanted is not None and message.subscription not in wanted:
+                continue
+            try:
+                result = callback(message)
+            except Exception:
+                logger.exception(f"Stream listener failed on {message.subscription}")
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._background.add(task)
+                task.add_done_callback(self._on_listener_done)
+
+    def _on_listener_done(self, task: asyncio.Future[None]) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error("Async stream listener failed")
+
+    async def close(self) -> None:
+        """Closes every connection and ends all update iterators."""
+        await asyncio.gather(*(conn.close() for conn in self._connections))
+        self._connections.clear()
+        for iterator in list(self._iterators):
+            iterator.close()
+        logger.debug("Market stream closed.")
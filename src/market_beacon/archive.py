@@ -0,0 +1,279 @@
+import json
+import os
+import re
+import tempfile
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .api.batches import CandleBatch, OrderBookSnapshot, TradeBatch
+
+# Bumped whenever the on-disk layout changes; series written by another version are refused.
+ARCHIVE_VERSION = 1
+# Per-series file recording the layout and the committed number of rows.
+META_FILE = "meta.json"
+
+
+def _newer_rows(timestamp: np.ndarray, tiebreak: np.ndarray, last: tuple[int, int]) -> np.ndarray:
+    """
+    Indices of the rows that sort strictly after `last` by `(timestamp, tiebreak)`, in that
+    order, with duplicates of an earlier row dropped.
+    """
+    order = np.lexsort((tiebreak, timestamp))
+    ts, tb = timestamp[order], tiebreak[order]
+    after_last = (ts > last[0]) | ((ts == last[0]) & (tb > last[1]))
+    repeated = np.zeros(len(ts), dtype=np.bool_)
+    repeated[1:] = (ts[1:] == ts[:-1]) & (tb[1:] == tb[:-1])
+    return order[after_last & ~repeated]
+
+
+def _time_range(timestamp: np.ndarray, start_ms: int | None, end_ms: int | None) -> tuple[int, int]:
+    """The row range of the sorted `timestamp` column falling in `[start_ms, end_ms)`."""
+    first = 0 if start_ms is None else int(np.searchsorted(timestamp, start_ms))
+    last = len(timestamp) if end_ms is None else int(np.searchsorted(timestamp, end_ms))
+    return first, last
+
+
+def _layout(columns: dict[str, np.ndarray]) -> dict[str, list[Any]]:
+    """Each column's dtype and per-row shape, as recorded in the meta file."""
+    return {name: [column.dtype.str, list(column.shape[1:])] for name, column in columns.items()}
+
+
+class MarketArchive:
+    """
+    An append-only archive of candles, trades and order books, read back as zero-copy
+    memory maps.
+
+    Each series (candles per `(symbol, granularity)`, trades and order books per symbol)
+    is a directory holding one raw file of fixed-width values per column, plus a small
+    meta file with the column layouts and the committed row count. Keeping the columns
+    apart, rather than interleaving them into row records, means a read maps each one as
+    a contiguous array, so the returned batches are views of the page cache that go
+    straight into TA-Lib and the analysis functions without a copy. Rows are kept in time
+    order, so the timestamp column doubles as the index: a range read is two binary
+    searches.
+
+    Order books are stored one level per row: the snapshot's timestamp, whether the level
+    is a bid, and its `[price, size]` pair. A snapshot's bids and then asks are adjacent
+    rows, so each side reads back as a slice of the mapped level column.
+
+    An append first cuts every column back to the committed row count, dropping any torn
+    tail left by a crashed append, then writes and fsyncs the new values before
+    atomically replacing the meta file. Readers only map committed rows, so they never
+    see a partial append. One writer per series is assumed.
+
+    Only append closed candles: stored rows are never rewritten.
+
+    Args:
+        root: Directory that holds the archive. Created on first append.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path_for(self, kind: str, key: str) -> Path:
+        """Returns the directory backing the `kind` series of `key`."""
+        return self.root / kind / re.sub(r"[^A-Za-z0-9_-]", "_", key)
+
+    def append_candles(self, symbol: str, granularity: str, candles: CandleBatch) -> int:
+        """
+        Appends the candles newer than the last archived one, returning how many were new.
+
+        Raises:
+            ValueError: If the series was written with another layout.
+        """
+        path = self.path_for("candles", f"{symbol}_{granularity}")
+        return self._append_batch(path, candles, lambda batch: batch.timestamp)
+
+    def append_trades(self, symbol: str, trades: TradeBatch) -> int:
+        """
+        Appends the trades after the last archived one by `(timestamp, trade_id)`, in time
+        order whatever order they arrive in, returning how many were new.
+
+        Raises:
+            ValueError: If the series was written with another layout.
+        """
+        return self._append_batch(self.path_for("trades", symbol), trades, lambda t: t.trade_id)
+
+    def append_order_books(self, symbol: str, snapshots: Sequence[OrderBookSnapshot]) -> int:
+        """
+        Appends the snapshots newer than the last archived one, in time order, returning
+        how many were new. Of several snapshots with the same timestamp, the first is kept;
+        a snapshot with no levels on either side has nothing to store and is skipped.
+
+        Raises:
+            ValueError: If the series was written with another layout.
+        """
+        path = self.path_for("books", symbol)
+        columns = self._map(path)
+        last = int(columns["timestamp"][-1]) if columns else np.iinfo(np.int64).min
+        timestamps = np.array([s.timestamp for s in snapshots], dtype=np.int64)
+        keep = _newer_rows(timestamps, np.zeros_like(timestamps), (last, 0))
+        books = [snapshots[i] for i in keep if len(snapshots[i].bids) or len(snapshots[i].asks)]
+        if not books:
+            return 0
+
+        # Each book's bids, then its asks, one row per level.
+        sides = [side for book in books for side in (book.bids, book.asks)]
+        counts = [len(side) for side in sides]
+        book_timestamps = np.array([book.timestamp for book in books], dtype=np.int64)
+        rows = {
+            "timestamp": np.repeat(np.repeat(book_timestamps, 2), counts),
+            "is_bid": np.repeat(np.tile([True, False], len(books)), counts),
+            "levels": np.concatenate([side.reshape(-1, 2) for side in sides]).astype(np.float64),
+        }
+        self._commit(path, rows)
+        return len(books)
+
+    def candles(
+        self,
+        symbol: str,
+        granularity: str,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> CandleBatch:
+        """
+        Maps the archived candles opening in `[start_ms, end_ms)`, or all of them, as
+        read-only views of the archive files.
+        """
+        path = self.path_for("candles", f"{symbol}_{granularity}")
+        return self._read_batch(path, CandleBatch, start_ms, end_ms)
+
+    def trades(
+        self, symbol: str, start_ms: int | None = None, end_ms: int | None = None
+    ) -> TradeBatch:
+        """
+        Maps the archived trades executed in `[start_ms, end_ms)`, or all of them, as
+        read-only views of the archive files.
+        """
+        return self._read_batch(self.path_for("trades", symbol), TradeBatch, start_ms, end_ms)
+
+    def order_books(
+        self, symbol: str, start_ms: int | None = None, end_ms: int | None = None
+    ) -> Iterator[OrderBookSnapshot]:
+        """
+        Yields the archived snapshots taken in `[start_ms, end_ms)`, or all of them, in
+        time order. Their `bids` and `asks` are read-only views of the archive files.
+        """
+        columns = self._map(self.path_for("books", symbol))
+        if columns is None:
+            return
+        first, last = _time_range(columns["timestamp"], start_ms, end_ms)
+        timestamp = columns["timestamp"][first:last]
+        if not len(timestamp):
+            return
+        is_bid, levels = columns["is_bid"][first:last], columns["levels"][first:last]
+        starts = np.flatnonzero(np.diff(timestamp, prepend=timestamp[0] - 1))
+        ends = np.append(starts[1:], len(timestamp))
+        bid_ends = starts + np.add.reduceat(is_bid, starts, dtype=np.int64)
+        for start, bid_end, end in zip(
+            starts.tolist(), bid_ends.tolist(), ends.tolist(), strict=True
+        ):
+            yield OrderBookSnapshot(
+                levels[start:bid_end], levels[bid_end:end], int(timestamp[start])
+            )
+
+    def candle_windows(
+        self,
+        symbol: str,
+        granularity: str,
+        window: int,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> Iterator[CandleBatch]:
+        """
+        Replays the archive one candle at a time: for each candle opening in
+        `[start_ms, end_ms)`, yields it with the `window - 1` candles before it (fewer at
+        the start of the archive). Every window is a view of the same mapping.
+        """
+        candles = self.candles(symbol, granularity)
+        first, last = _time_range(candles.timestamp, start_ms, end_ms)
+        for stop in range(first + 1, last + 1):
+            yield candles[max(0, stop - window) : stop]
+
+    def _append_batch[B: (CandleBatch, TradeBatch)](
+        self, path: Path, batch: B, tiebreak: Callable[[B], np.ndarray]
+    ) -> int:
+        """Appends the rows of `batch` after the last stored one by `(timestamp, tiebreak)`."""
+        last = (np.iinfo(np.int64).min, np.iinfo(np.int64).min)
+        stored = self._read_batch(path, type(batch), None, None)
+        if len(stored):
+            tail = stored[len(stored) - 1 :]
+            last = (int(tail.timestamp[0]), int(tiebreak(tail)[0]))
+        rows = batch[_newer_rows(batch.timestamp, tiebreak(batch), last)]
+        if len(rows):
+            self._commit(path, rows.columns())
+        return len(rows)
+
+    def _read_batch[B: (CandleBatch, TradeBatch)](
+        self, path: Path, batch_type: type[B], start_ms: int | None, end_ms: int | None
+    ) -> B:
+        columns = self._map(path)
+        if columns is None:
+            return batch_type.empty()
+        batch = batch_type(*(columns[f.name] for f in fields(batch_type)))
+        first, last = _time_range(batch.timestamp, start_ms, end_ms)
+        return batch[first:last]
+
+    def _map(self, path: Path) -> dict[str, np.ndarray] | None:
+        """Maps the committed rows of every column, or returns None if there are none."""
+        meta = self._load_meta(path)
+        if meta is None or not meta["length"]:
+            return None
+        # np.asarray drops the memmap subclass but keeps the view of the mapping.
+        return {
+            name: np.asarray(
+                np.memmap(
+                    path / f"{name}.bin",
+                    dtype=np.dtype(dtype),
+                    mode="r",
+                    shape=(meta["length"], *shape),
+                )
+            )
+            for name, (dtype, shape) in meta["columns"].items()
+        }
+
+    def _commit(self, path: Path, rows: dict[str, np.ndarray]) -> None:
+        """Appends `rows` to every column, then commits them by updating the meta file."""
+        meta = self._load_meta(path)
+        if meta is None:
+            meta = {"version": ARCHIVE_VERSION, "length": 0, "columns": _layout(rows)}
+        elif meta["columns"] != _layout(rows):
+            raise ValueError(f"Archive series {path} has columns {meta['columns']}")
+        length = meta["length"]
+
+        path.mkdir(parents=True, exist_ok=True)
+        for name, column in rows.items():
+            with open(path / f"{name}.bin", "ab") as f:
+                f.truncate(length * column.dtype.itemsize * int(np.prod(column.shape[1:])))
+                f.write(np.ascontiguousarray(column).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self._write_meta(path, {**meta, "length": length + len(next(iter(rows.values())))})
+
+    def _load_meta(self, path: Path) -> dict[str, Any] | None:
+        try:
+            meta = json.loads((path / META_FILE).read_text())
+        except FileNotFoundError:
+            return None
+        if meta.get("version") != ARCHIVE_VERSION:
+            raise ValueError(
+                f"Archive series {path} is version {meta.get('version')}, "
+                f"expected {ARCHIVE_VERSION}"
+            )
+        return meta
+
+    def _write_meta(self, path: Path, meta: dict[str, Any]) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(meta, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path / META_FILE)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
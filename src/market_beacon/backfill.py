@@ -0,0 +1,186 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from loguru import logger
+
+from .api.batches import CandleBatch
+from .api.client import MarketDataAPI
+from .api.models import GRANULARITY_SECONDS, MAX_HISTORY_CANDLES_PER_REQUEST, Granularity
+from .store import CandleStore
+
+# Requests a backfill keeps in flight. The client's rate limiter caps the request rate;
+# the workers only need to hide the round-trip latency.
+DEFAULT_BACKFILL_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class BackfillResult:
+    """
+    The candles of a backfilled range, and the spans in it for which none exist.
+
+    `gaps` holds `(start_ms, end_ms)` spans, end exclusive, in which no candle opens even
+    though the granularity implies one should: exchange outages, or the time before the
+    symbol was listed. `requests` counts the history requests the backfill made.
+    """
+
+    symbol: str
+    granularity: Granularity
+    candles: CandleBatch
+    gaps: list[tuple[int, int]]
+    requests: int
+
+
+def plan_backfill(
+    timestamps: np.ndarray, start_ms: int, end_ms: int, interval_ms: int
+) -> list[tuple[int, int]]:
+    """
+    Splits `[start_ms, end_ms)` into the history requests needed to download it.
+
+    Chunks are half-open `(lo, hi)` ranges laid out backward from `end_ms`, each spanning
+    one page of candles, so a page requested up to `hi` covers its chunk whatever the
+    exchange's grid alignment. Chunks already fully covered by `timestamps` are skipped.
+
+    Args:
+        timestamps: Sorted open times (ms) of the candles already held.
+        start_ms: Open time of the oldest candle wanted.
+        end_ms: Exclusive upper bound on the open times wanted.
+        interval_ms: The candle length in milliseconds.
+
+    Returns:
+        The chunks to fetch, newest first.
+    """
+    chunk_ms = MAX_HISTORY_CANDLES_PER_REQUEST * interval_ms
+    highs = np.arange(end_ms, start_ms, -chunk_ms, dtype=np.int64)
+    lows = np.maximum(highs - chunk_ms, start_ms)
+    held = np.searchsorted(timestamps, highs) - np.searchsorted(timestamps, lows)
+    # A partial (oldest) chunk may hold one candle fewer than this, depending on the grid
+    # alignment; it is then refetched rather than risk skipping a missing candle.
+    expected = -(-(highs - lows) // interval_ms)
+    return [
+        (int(lo), int(hi))
+        for lo, hi, count, wanted in zip(lows, highs, held, expected, strict=True)
+        if count < wanted
+    ]
+
+
+def find_candle_gaps(
+    timestamps: np.ndarray, start_ms: int, end_ms: int, interval_ms: int
+) -> list[tuple[int, int]]:
+    """
+    Finds the spans of `[start_ms, end_ms)` in which a candle should open but none does.
+
+    Args:
+        timestamps: Sorted, unique open times (ms) of the candles in the range.
+
+    Returns:
+        `(start_ms, end_ms)` spans, end exclusive, in time order.
+    """
+    starts = np.concatenate(([start_ms], timestamps + interval_ms))
+    ends = np.concatenate((timestamps, [end_ms]))
+    # `start_ms` need not be on the candle grid, so the span before the first candle is
+    # only a gap if a whole interval fits in it.
+    minimum = np.ones(len(starts), dtype=np.int64)
+    minimum[0] = interval_ms
+    missing = ends - starts >= minimum
+    return [(int(lo), int(hi)) for lo, hi in zip(starts[missing], ends[missing], strict=True)]
+
+
+def _merge_unique(batches: list[CandleBatch]) -> CandleBatch:
+    """Concatenates batches into one sorted by open time, keeping one row per open time."""
+    candles = CandleBatch.concat(batches)
+    _, first = np.unique(candles.timestamp, return_index=True)
+    return candles[first]
+
+
+def _fetch_chunk(
+    market: MarketDataAPI, symbol: str, granularity: Granularity, lo: int, hi: int
+) -> CandleBatch:
+    candles = market.get_history_candle_batch(symbol, granularity, hi)
+    return candles[candles.timestamp >= lo]
+
+
+def backfill_candles(
+    market: MarketDataAPI,
+    symbol: str,
+    granularity: Granularity,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    store: CandleStore | None = None,
+    max_workers: int = DEFAULT_BACKFILL_WORKERS,
+) -> BackfillResult:
+    """
+    Downloads every candle opening in `[start_time, end_time)` from the history endpoint.
+
+    The range is split into one-request chunks (see `plan_backfill`) that are downloaded
+    concurrently on `max_workers` threads, with the client's rate limiter keeping the
+    request rate within the endpoint's quota. The chunks are merged in time order without
+    duplicates and gap-checked; gaps are logged and returned (see `BackfillResult`).
+
+    With a `store`, chunks it already holds in full are not downloaded again, and the
+    downloaded candles are merged into it in a single write. If a chunk fails, every chunk
+    that completed is still written before the error propagates, so running the same
+    backfill again resumes it. Chunks containing gaps are always refetched.
+
+    Args:
+        end_time: Defaults to now, which includes the candle still in progress.
+
+    Raises:
+        ValueError: If the granularity has no fixed length or the range is empty.
+    """
+    interval_seconds = GRANULARITY_SECONDS.get(granularity)
+    if interval_seconds is None:
+        raise ValueError(f"Cannot backfill calendar-month granularity '{granularity}'")
+    interval_ms = interval_seconds * 1000
+    start_ms = int(start_time.timestamp() * 1000)
+    end_ms = int((end_time.timestamp() if end_time else time.time()) * 1000)
+    if end_ms <= start_ms:
+        raise ValueError(f"Backfill range is empty: {start_time} to {end_time}")
+
+    if store is not None:
+        held = store.read(symbol, granularity, start_ms=start_ms)
+    else:
+        held = CandleBatch.empty()
+    chunks = plan_backfill(held.timestamp, start_ms, end_ms, interval_ms)
+    logger.info(
+        f"Backfilling {symbol} ({granularity}) from {start_time} with {len(chunks)} "
+        f"request(s) on {max_workers} workers..."
+    )
+
+    futures: list[Future[CandleBatch]] = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backfill") as pool:
+            futures = [
+                pool.submit(_fetch_chunk, market, symbol, granularity, lo, hi) for lo, hi in chunks
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        # Chunks that were in flight when another failed have finished by now; keep them.
+        downloaded = _merge_unique(
+            [
+                future.result()
+                for future in futures
+                if future.done() and not future.cancelled() and future.exception() is None
+            ]
+        )
+        if store is not None and len(downloaded):
+            held = store.upsert(symbol, granularity, downloaded)
+
+    candles = held if store is not None else downloaded
+    candles = candles[(candles.timestamp >= start_ms) & (candles.timestamp < end_ms)]
+    gaps = find_candle_gaps(candles.timestamp, start_ms, end_ms, interval_ms)
+    if gaps:
+        missing = sum(-(-(hi - lo) // interval_ms) for lo, hi in gaps)
+        logger.warning(
+            f"{symbol} ({granularity}) has {len(gaps)} gap(s) totalling about {missing} "
+            f"candle(s) between {start_time} and {end_time or 'now'}."
+        )
+    logger.info(f"Backfilled {len(candles)} candles for {symbol} ({granularity}).")
+    return BackfillResult(symbol, granularity, candles, gaps, len(chunks))
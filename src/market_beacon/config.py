@@ -1,3 +1,6 @@
+from functools import cache
+from typing import Any
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -15,5 +18,14 @@ class Settings(BaseSettings):
     bitget_api_passphrase: str
 
 
-# Create a singleton instance of the settings
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    """Returns the settings singleton, reading the environment and `.env` on first use."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # `settings` is kept for existing imports, but no longer loaded at import time.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
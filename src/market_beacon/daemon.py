@@ -0,0 +1,229 @@
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timedelta
+from types import TracebackType
+
+import numpy as np
+from loguru import logger
+
+from .analysis import (
+    AnalysisResult,
+    calculate_trade_stats_from_candles,
+    calculate_trade_stats_from_trades,
+    empty_technical_analysis,
+    interpret_indicator_values,
+)
+from .api.batches import CandleBatch, TradeBars
+from .api.client import MarketDataAPI
+from .api.models import GRANULARITY_SECONDS, Granularity
+from .indicators import IndicatorState
+from .scan import AnalysisMode
+
+# Seconds to wait after a candle closes before fetching it, so the exchange has sealed it.
+DEFAULT_SETTLE_DELAY = 2.0
+
+
+def closed_candles(candles: CandleBatch, interval_ms: int, now_ms: int) -> CandleBatch:
+    """Keeps the candles that have closed by `now_ms`, dropping the one still in progress."""
+    return candles[candles.timestamp + interval_ms <= now_ms]
+
+
+def _valid_rows(candles: CandleBatch) -> CandleBatch:
+    """Drops candles with non-finite prices or volume, as the analysis does."""
+    columns = (candles.open, candles.high, candles.low, candles.close, candles.volume)
+    return candles[np.logical_and.reduce([np.isfinite(column) for column in columns])]
+
+
+class _SymbolTracker:
+    """The warm state of one symbol: its indicator recurrences, candle window and trades."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.state = IndicatorState()
+        self.window = CandleBatch.empty()
+        self.trade_bars = TradeBars.empty()
+        self.trades_end_ms: int | None = None
+
+
+class AnalysisDaemon:
+    """
+    Keeps analyses of a set of symbols up to date, re-running them as each candle closes.
+
+    Unlike a one-shot run, the client session, each symbol's `IndicatorState` and its
+    candle window stay warm between ticks, so a tick fetches only the candles that closed
+    since the previous one and updates the indicators in O(1) per candle. Ticks follow
+    the candle grid of the fetched data (so session-aligned granularities need no special
+    casing) plus `settle_delay`. Only closed candles are analyzed.
+
+    A symbol is reseeded from a fresh `candle_limit` window on its first tick, or when more
+    than a window's worth of candles was missed. Between reseeds its indicators carry the
+    full history seen since, while trade stats and the price change cover the latest
+    `candle_limit` candles, like `run_analysis`.
+    """
+
+    def __init__(
+        self,
+        market: MarketDataAPI,
+        symbols: Iterable[str],
+        granularity: Granularity,
+        candle_limit: int = 300,
+        mode: AnalysisMode = "fast",
+        fetch_workers: int = 8,
+        trade_workers: int = 1,
+        settle_delay: float = DEFAULT_SETTLE_DELAY,
+    ):
+        interval_seconds = GRANULARITY_SECONDS.get(granularity)
+        if interval_seconds is None:
+            raise ValueError(
+                f"Granularity '{granularity}' has no fixed length and can't be scheduled."
+            )
+        self._market = market
+        self._granularity = granularity
+        self._interval_ms = interval_seconds * 1000
+        self._candle_limit = candle_limit
+        self._mode = mode
+        self._trade_workers = trade_workers
+        self._settle_delay = settle_delay
+        self._trackers = [_SymbolTracker(symbol) for symbol in dict.fromkeys(symbols)]
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="serve")
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "AnalysisDaemon":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the loop and releases the fetch workers."""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self) -> None:
+        """Asks `run` to return once the current tick is done. Safe from signal handlers."""
+        self._stop.set()
+
+    def run(self, on_tick: Callable[[list[AnalysisResult]], None]) -> None:
+        """
+        Ticks until `stop` is called, passing each tick's fresh results to `on_tick`.
+
+        Ticks with nothing new (e.g. the exchange hasn't sealed the candle yet) are retried
+        after `settle_delay`, but no sooner than one second.
+        """
+        logger.info(
+            f"Serving {len(self._trackers)} symbol(s) every {self._granularity} candle close."
+        )
+        while not self._stop.is_set():
+            results = self.tick()
+            if results:
+                on_tick(results)
+            wait_seconds = self.next_tick_ms() / 1000 - time.time()
+            self._stop.wait(max(wait_seconds, self._settle_delay, 1.0))
+        logger.info("Analysis daemon stopped.")
+
+    def next_tick_ms(self) -> int:
+        """When (ms since Epoch) the next candle is due to close, plus the settle delay."""
+        last = [t.state.last_timestamp for t in self._trackers]
+        known = [ts for ts in last if ts is not None]
+        if not known or len(known) < len(last):
+            # A symbol hasn't been seeded yet; retry it after the settle delay.
+            due_ms = int(time.time() * 1000)
+        else:
+            # The newest closed candle is followed by one in progress; wait for it to close.
+            # Symbols lagging behind it catch up on that tick.
+            due_ms = max(known) + 2 * self._interval_ms
+        return due_ms + round(self._settle_delay * 1000)
+
+    def tick(self, now_ms: int | None = None) -> list[AnalysisResult]:
+        """
+        Fetches the candles closed since the last tick and re-analyzes the symbols that got
+        any, in symbol order. Symbols that fail are logged and retried on the next tick.
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        futures = [
+            (tracker.symbol, self._executor.submit(self._refresh, tracker, now_ms))
+            for tracker in self._trackers
+        ]
+        results: list[AnalysisResult] = []
+        for symbol, future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"{symbol}: refresh failed: {e}")
+                continue
+            if result is not None:
+                results.append(result)
+        return results
+
+    def _refresh(self, tracker: _SymbolTracker, now_ms: int) -> AnalysisResult | None:
+        """Brings one symbol up to date; returns None if no candle closed since last time."""
+        last = tracker.state.last_timestamp
+        missed = None if last is None else (now_ms - self._interval_ms - last) // self._interval_ms
+        if missed is not None and missed <= 0:
+            return None
+
+        if missed is None or missed >= self._candle_limit:
+            # One extra candle: the newest one returned is still in progress.
+            candles = self._fetch_closed(tracker.symbol, self._candle_limit + 1, now_ms)
+            window = candles[-self._candle_limit :]
+            tracker.state = IndicatorState.from_candles(window)
+            tracker.window = window
+            tracker.trade_bars, tracker.trades_end_ms = TradeBars.empty(), None
+        else:
+            candles = self._fetch_closed(tracker.symbol, missed + 1, now_ms)
+            candles = candles[candles.timestamp > last]
+            if not tracker.state.extend(candles):
+                return None
+            tracker.window = CandleBatch.concat([tracker.window, candles])[-self._candle_limit :]
+
+        if not len(tracker.window):
+            logger.warning(f"No candle data returned for {tracker.symbol}, skipping analysis.")
+            return None
+        if self._mode == "full":
+            self._refresh_trades(tracker)
+        return self._analyze(tracker)
+
+    def _fetch_closed(self, symbol: str, limit: int, now_ms: int) -> CandleBatch:
+        candles = self._market.get_candle_batch(symbol, self._granularity, limit=limit)
+        return _valid_rows(closed_candles(candles, self._interval_ms, now_ms))
+
+    def _refresh_trades(self, tracker: _SymbolTracker) -> None:
+        """Aggregates the trades of the newly closed candles and drops the bars left behind."""
+        window_start = int(tracker.window.timestamp[0])
+        end_ms = int(tracker.window.timestamp[-1]) + self._interval_ms
+        start_ms = tracker.trades_end_ms if tracker.trades_end_ms is not None else window_start
+        fetched = self._market.get_trade_bars(
+            symbol=tracker.symbol,
+            start_time=datetime.fromtimestamp(start_ms / 1000.0),
+            end_time=datetime.fromtimestamp((end_ms - 1) / 1000.0),
+            interval=timedelta(milliseconds=self._interval_ms),
+            max_workers=self._trade_workers,
+        )
+        bars = TradeBars.combine([tracker.trade_bars, fetched])
+        tracker.trade_bars = bars[bars.timestamp >= window_start]
+        tracker.trades_end_ms = end_ms
+
+    def _analyze(self, tracker: _SymbolTracker) -> AnalysisResult:
+        if tracker.state.ready:
+            # Measure the price change over the window, as a one-shot run would.
+            values = replace(tracker.state.values(), first_open=float(tracker.window.open[0]))
+            technical_analysis = interpret_indicator_values(values)
+        else:
+            technical_analysis = empty_technical_analysis()
+        if self._mode == "full":
+            trade_stats = calculate_trade_stats_from_trades(tracker.trade_bars)
+        else:
+            trade_stats = calculate_trade_stats_from_candles(tracker.window)
+        return AnalysisResult(
+            symbol=tracker.symbol,
+            trade_stats=trade_stats,
+            technical_analysis=technical_analysis,
+        )
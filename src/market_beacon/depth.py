@@ -0,0 +1,247 @@
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal, Self
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .api.batches import OrderBookSnapshot
+from .orderbook import OrderBookEngine, running_totals
+
+# Distances from the mid-price, in basis points, that resting depth is reported within.
+DEPTH_BANDS_BPS = (10, 25, 50, 100)
+# Taker order notionals, in quote currency, that price impact is reported for.
+IMPACT_NOTIONALS = (1_000, 10_000, 100_000)
+# Numbers of levels per side that the book imbalance is reported at.
+IMBALANCE_LEVELS = (1, 5, 10, 25)
+# Levels per side averaged into the depth-weighted mid-price.
+WEIGHTED_MID_LEVELS = 5
+
+
+class DepthAnalysis(BaseModel):
+    """Pydantic model for holding order book depth analytics."""
+
+    microprice: float = Field(
+        ..., description="Best bid and ask weighted by the size on the opposite side."
+    )
+    weighted_mid_price: float = Field(
+        ...,
+        description=(
+            "The microprice over the top levels: each side's volume-weighted average price, "
+            "weighted by the size on the opposite side."
+        ),
+    )
+    bid_depth_bps: dict[str, float | None] = Field(
+        ..., description="Bid size resting within each distance (in bps) below the mid-price."
+    )
+    ask_depth_bps: dict[str, float | None] = Field(
+        ..., description="Ask size resting within each distance (in bps) above the mid-price."
+    )
+    imbalance: dict[str, float | None] = Field(
+        ...,
+        description=(
+            "(bid - ask) / (bid + ask) size over the top N levels, from -1 (all asks) "
+            "to 1 (all bids)."
+        ),
+    )
+    buy_slippage_bps: dict[str, float | None] = Field(
+        ...,
+        description=(
+            "Average fill price of a market buy of each quote notional, in bps above the "
+            "mid-price. None if the book is too thin to fill it."
+        ),
+    )
+    sell_slippage_bps: dict[str, float | None] = Field(
+        ...,
+        description=(
+            "Average fill price of a market sell of each quote notional, in bps below the "
+            "mid-price. None if the book is too thin to fill it."
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DepthProfile:
+    """
+    Cumulative depth curves of both sides of an order book, best level outwards.
+
+    `*_depth` and `*_notional` hold the running size and quote notional (price * size)
+    with a leading zero, so entry `i` covers the best `i` levels. Every query is a
+    `searchsorted` or a lookup into these curves, and accepts an array of thresholds to
+    answer them all in one call. `mid_price` is None if either side is empty.
+    """
+
+    bid_prices: np.ndarray
+    ask_prices: np.ndarray
+    bid_depth: np.ndarray
+    ask_depth: np.ndarray
+    bid_notional: np.ndarray
+    ask_notional: np.ndarray
+    mid_price: float | None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: OrderBookSnapshot) -> Self:
+        """Builds the curves from a snapshot, whose sides are ordered best level first."""
+        bids = running_totals(snapshot.bids[:, 0], snapshot.bids[:, 1])
+        asks = running_totals(snapshot.asks[:, 0], snapshot.asks[:, 1])
+        mid_price = None
+        if len(snapshot.bids) and len(snapshot.asks):
+            mid_price = float(snapshot.bids[0, 0] + snapshot.asks[0, 0]) / 2
+        return cls(
+            bid_prices=snapshot.bids[:, 0],
+            ask_prices=snapshot.asks[:, 0],
+            bid_depth=bids[0],
+            ask_depth=asks[0],
+            bid_notional=bids[1],
+            ask_notional=asks[1],
+            mid_price=mid_price,
+        )
+
+    @classmethod
+    def from_engine(cls, book: OrderBookEngine) -> Self:
+        """
+        Builds the curves from a live book's cached running totals, without copying its
+        levels into a snapshot.
+        """
+        bids, asks = book.bids.running_totals, book.asks.running_totals
+        return cls(
+            bid_prices=book.bids.prices,
+            ask_prices=book.asks.prices,
+            bid_depth=bids[0],
+            ask_depth=asks[0],
+            bid_notional=bids[1],
+            ask_notional=asks[1],
+            mid_price=book.mid_price,
+        )
+
+    def depth_within_bps(self, bps: Sequence[float] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Bid and ask size resting within each of `bps` basis points of the mid-price.
+
+        Raises:
+            ValueError: If either side of the book is empty.
+        """
+        mid = self._require_mid()
+        offsets = np.asarray(bps, dtype=np.float64) / 1e4
+        # Bids descend, so search their negated prices, which ascend.
+        bid_levels = np.searchsorted(-self.bid_prices, -mid * (1 - offsets), side="right")
+        ask_levels = np.searchsorted(self.ask_prices, mid * (1 + offsets), side="right")
+        return self.bid_depth[bid_levels], self.ask_depth[ask_levels]
+
+    def imbalance(self, levels: Sequence[int] | np.ndarray) -> np.ndarray:
+        """
+        (bid - ask) / (bid + ask) size over the best `levels` levels of each side, or NaN
+        where both are empty.
+        """
+        levels = np.asarray(levels)
+        bid = self.bid_depth[np.minimum(levels, len(self.bid_depth) - 1)]
+        ask = self.ask_depth[np.minimum(levels, len(self.ask_depth) - 1)]
+        total = bid + ask
+        return np.divide(bid - ask, total, out=np.full(total.shape, np.nan), where=total > 0)
+
+    def weighted_mid_price(self, levels: int = WEIGHTED_MID_LEVELS) -> float:
+        """
+        Each side's volume-weighted average price over its best `levels` levels, weighted
+        by the size on the opposite side. With one level this is the microprice.
+
+        Raises:
+            ValueError: If either side of the book is empty.
+        """
+        self._require_mid()
+        bid_levels = min(levels, len(self.bid_prices))
+        ask_levels = min(levels, len(self.ask_prices))
+        bid_size, ask_size = self.bid_depth[bid_levels], self.ask_depth[ask_levels]
+        bid_vwap = self.bid_notional[bid_levels] / bid_size
+        ask_vwap = self.ask_notional[ask_levels] / ask_size
+        return float((bid_vwap * ask_size + ask_vwap * bid_size) / (bid_size + ask_size))
+
+    def average_fill_price(
+        self, notional: Sequence[float] | np.ndarray, side: Literal["buy", "sell"]
+    ) -> np.ndarray:
+        """
+        The average price a market order of each quote `notional` fills at, sweeping the
+        asks for a buy or the bids for a sell. NaN where the side is too thin to fill it.
+        """
+        if side == "buy":
+            prices, depth, cumulative = self.ask_prices, self.ask_depth, self.ask_notional
+        else:
+            prices, depth, cumulative = self.bid_prices, self.bid_depth, self.bid_notional
+        notional = np.asarray(notional, dtype=np.float64)
+        if not len(prices):
+            return np.full(notional.shape, np.nan)
+        # The order takes every level before `level` whole, and the rest from `level`.
+        level = np.searchsorted(cumulative[1:], notional, side="left")
+        filled = level < len(prices)
+        level = np.minimum(level, len(prices) - 1)
+        size = depth[level] + (notional - cumulative[level]) / prices[level]
+        return np.divide(notional, size, out=np.full(size.shape, np.nan), where=filled)
+
+    def slippage_bps(
+        self, notional: Sequence[float] | np.ndarray, side: Literal["buy", "sell"]
+    ) -> np.ndarray:
+        """
+        How far the average fill of a market order of each quote `notional` is from the
+        mid-price, in basis points, positive when worse than mid (see
+        `average_fill_price`).
+
+        Raises:
+            ValueError: If either side of the book is empty.
+        """
+        mid = self._require_mid()
+        relative = self.average_fill_price(notional, side) / mid - 1
+        return (relative if side == "buy" else -relative) * 1e4
+
+    def _require_mid(self) -> float:
+        mid = self.mid_price
+        if mid is None:
+            raise ValueError("Depth analytics need both bids and asks")
+        return mid
+
+
+def _readings(keys: Sequence[float], values: np.ndarray) -> dict[str, float | None]:
+    """Maps each key (formatted as a JSON-friendly string) to its reading, NaN as None."""
+    return {
+        f"{key:g}": None if math.isnan(value) else value
+        for key, value in zip(keys, values.tolist(), strict=True)
+    }
+
+
+def calculate_depth_analytics(
+    book: OrderBookSnapshot | OrderBookEngine | DepthProfile,
+    bands_bps: Sequence[float] = DEPTH_BANDS_BPS,
+    notionals: Sequence[float] = IMPACT_NOTIONALS,
+    imbalance_levels: Sequence[int] = IMBALANCE_LEVELS,
+    weighted_mid_levels: int = WEIGHTED_MID_LEVELS,
+) -> DepthAnalysis | None:
+    """
+    Computes depth, imbalance, price impact and weighted mid-prices from the book's level
+    arrays (see `DepthProfile`), or returns None if either side is empty.
+
+    Args:
+        book: The order book, or its curves. A live engine is read from its cached
+            running totals.
+        bands_bps: Distances from the mid-price, in basis points, to report depth within.
+        notionals: Quote-currency order sizes to report buy and sell slippage for.
+        imbalance_levels: Level counts to report the bid/ask imbalance at.
+        weighted_mid_levels: Levels per side in the weighted mid-price.
+    """
+    if isinstance(book, DepthProfile):
+        profile = book
+    elif isinstance(book, OrderBookEngine):
+        profile = DepthProfile.from_engine(book)
+    else:
+        profile = DepthProfile.from_snapshot(book)
+    if profile.mid_price is None:
+        return None
+    amounts = np.asarray(notionals, dtype=np.float64)
+    bid_depth, ask_depth = profile.depth_within_bps(bands_bps)
+    return DepthAnalysis(
+        microprice=profile.weighted_mid_price(1),
+        weighted_mid_price=profile.weighted_mid_price(weighted_mid_levels),
+        bid_depth_bps=_readings(bands_bps, bid_depth),
+        ask_depth_bps=_readings(bands_bps, ask_depth),
+        imbalance=_readings(imbalance_levels, profile.imbalance(imbalance_levels)),
+        buy_slippage_bps=_readings(notionals, profile.slippage_bps(amounts, "buy")),
+        sell_slippage_bps=_readings(notionals, profile.slippage_bps(amounts, "sell")),
+    )
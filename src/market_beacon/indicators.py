@@ -0,0 +1,560 @@
+import math
+import operator
+from collections import deque
+from collections.abc import Callable
+
+from loguru import logger
+
+from .analysis import (
+    ADX_PERIOD,
+    ATR_PERIOD,
+    BB_DEV,
+    BB_PERIOD,
+    CMF_PERIOD,
+    EMA_MEDIUM,
+    EMA_RIBBON_PERIODS,
+    EMA_SHORT,
+    ICHIMOKU_KIJUN,
+    ICHIMOKU_SENKOU,
+    ICHIMOKU_TENKAN,
+    MA_LONG,
+    MA_SHORT,
+    MACD_FAST,
+    MACD_SIGNAL,
+    MACD_SLOW,
+    MIN_REQUIRED_CANDLES,
+    RSI_PERIOD,
+    STOCH_FASTK_PERIOD,
+    STOCH_SLOWD_PERIOD,
+    STOCH_SLOWK_PERIOD,
+    WILLIAMS_PERIOD,
+    IndicatorValues,
+    TechnicalAnalysis,
+    empty_technical_analysis,
+    interpret_indicator_values,
+)
+from .api.batches import CandleBatch
+from .api.models import Candle
+
+# TA-Lib treats magnitudes below this as zero (its TA_IS_ZERO macro).
+_TA_EPSILON = 1e-14
+
+# Parabolic SAR acceleration factor step and maximum (TA-Lib's defaults).
+SAR_ACCELERATION, SAR_MAXIMUM = 0.02, 0.2
+
+
+def _is_zero(value: float) -> bool:
+    return -_TA_EPSILON < value < _TA_EPSILON
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class _RollingSum:
+    """The sum of the last `period` values, kept as a running total like TA-Lib's SUM/SMA."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: deque[float] = deque()
+        self._total = 0.0
+
+    def update(self, value: float) -> float | None:
+        self._window.append(value)
+        self._total += value
+        if len(self._window) < self.period:
+            return None
+        total = self._total
+        self._total -= self._window.popleft()
+        return total
+
+
+class _RollingExtreme:
+    """The max (or min) of the last `period` values, from a monotonic deque."""
+
+    def __init__(self, period: int, maximum: bool):
+        self.period = period
+        self._dominates: Callable[[float, float], bool] = operator.ge if maximum else operator.le
+        # (index, value) pairs whose values strictly decrease (or increase) front to back.
+        self._window: deque[tuple[int, float]] = deque()
+        self._count = 0
+
+    def update(self, value: float) -> float | None:
+        while self._window and self._dominates(value, self._window[-1][1]):
+            self._window.pop()
+        self._window.append((self._count, value))
+        self._count += 1
+        if self._window[0][0] <= self._count - 1 - self.period:
+            self._window.popleft()
+        return self._window[0][1] if self._count >= self.period else None
+
+
+class _EMA:
+    """An exponential moving average seeded with the SMA of its first `period` values."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._k = 2.0 / (period + 1)
+        self._seed_total = 0.0
+        self._seen = 0
+        self.value: float | None = None
+
+    def update(self, value: float) -> float | None:
+        if self.value is not None:
+            self.value = (value - self.value) * self._k + self.value
+            return self.value
+        self._seed_total += value
+        self._seen += 1
+        if self._seen == self.period:
+            self.value = self._seed_total / self.period
+        return self.value
+
+
+class _MACD:
+    def __init__(self, fast: int, slow: int, signal: int):
+        # TA-Lib seeds the fast EMA so that it starts on the same candle as the slow one.
+        self._fast_offset = slow - fast
+        self._fast, self._slow, self._signal = _EMA(fast), _EMA(slow), _EMA(signal)
+        self._count = 0
+        self.line: float | None = None
+        self.signal: float | None = None
+        self.histogram: float | None = None
+
+    def update(self, close: float) -> None:
+        self._count += 1
+        slow = self._slow.update(close)
+        fast = self._fast.update(close) if self._count > self._fast_offset else None
+        if slow is None or fast is None:
+            return
+        line = fast - slow
+        signal = self._signal.update(line)
+        if signal is not None:
+            self.line, self.signal, self.histogram = line, signal, line - signal
+
+
+class _RSI:
+    """Wilder's RSI, seeded with the average gain and loss of the first `period` changes."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._prev_close: float | None = None
+        self._changes = 0
+        self._gain = self._loss = 0.0
+        self.value: float | None = None
+
+    def update(self, close: float) -> None:
+        if self._prev_close is None:
+            self._prev_close = close
+            return
+        change = close - self._prev_close
+        self._prev_close = close
+        self._changes += 1
+        n = self.period
+        if self._changes > n:
+            self._gain *= n - 1
+            self._loss *= n - 1
+        if change < 0:
+            self._loss -= change
+        else:
+            self._gain += change
+        if self._changes < n:
+            return
+        self._gain /= n
+        self._loss /= n
+        total = self._gain + self._loss
+        self.value = 100.0 * (self._gain / total) if not _is_zero(total) else 0.0
+
+
+class _ATR:
+    """Wilder's average true range, seeded with the mean of the first `period` ranges."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._seed_total = 0.0
+        self._ranges = 0
+        self.value: float | None = None
+
+    def update(self, true_range: float) -> None:
+        if self.value is not None:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+            return
+        self._seed_total += true_range
+        self._ranges += 1
+        if self._ranges == self.period:
+            self.value = self._seed_total / self.period
+
+
+class _ADX:
+    """
+    Wilder's ADX: directional movement and true range are summed over the first
+    `period - 1` changes, Wilder-smoothed over the next `period` to seed the ADX with the
+    mean DX, and every later DX is Wilder-smoothed into it.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._changes = 0
+        self._plus_dm = self._minus_dm = self._tr = 0.0
+        self._dx_total = 0.0
+        self.value: float | None = None
+
+    def update(self, high: float, low: float, prev_high: float, prev_low: float, tr: float) -> None:
+        n = self.period
+        self._changes += 1
+        smoothing = self._changes >= n
+        if smoothing:
+            self._minus_dm -= self._minus_dm / n
+            self._plus_dm -= self._plus_dm / n
+
+        up, down = high - prev_high, prev_low - low
+        if down > 0 and up < down:
+            self._minus_dm += down
+        elif up > 0 and up > down:
+            self._plus_dm += up
+
+        if not smoothing:
+            self._tr += tr
+            return
+        self._tr = self._tr - self._tr / n + tr
+
+        dx = self._dx()
+        if self._changes < 2 * n - 1:
+            self._dx_total += dx or 0.0
+        elif self._changes == 2 * n - 1:
+            self.value = (self._dx_total + (dx or 0.0)) / n
+        elif dx is not None:
+            self.value = (self.value * (n - 1) + dx) / n
+
+    def _dx(self) -> float | None:
+        if _is_zero(self._tr):
+            return None
+        minus_di = 100.0 * (self._minus_dm / self._tr)
+        plus_di = 100.0 * (self._plus_dm / self._tr)
+        total = minus_di + plus_di
+        return 100.0 * (abs(minus_di - plus_di) / total) if not _is_zero(total) else None
+
+
+class _ParabolicSAR:
+    """TA-Lib's Parabolic SAR, whose initial direction comes from the first two candles."""
+
+    def __init__(self, acceleration: float, maximum: float):
+        self.acceleration, self.maximum = acceleration, maximum
+        self._af = acceleration
+        self._long = True
+        self._sar = self._extreme = 0.0
+        self._prev_high: float | None = None
+        self._prev_low: float | None = None
+        self._started = False
+        self.value: float | None = None
+
+    def update(self, high: float, low: float) -> None:
+        if self._prev_high is None or self._prev_low is None:
+            self._prev_high, self._prev_low = high, low
+            return
+        if not self._started:
+            # A dominant down move on the second candle starts the SAR short.
+            down, up = self._prev_low - low, high - self._prev_high
+            self._long = not (down > 0 and up < down)
+            self._extreme = high if self._long else low
+            self._sar = self._prev_low if self._long else self._prev_high
+            # TA-Lib bounds the first step by the second candle's own range.
+            self._prev_high, self._prev_low = high, low
+            self._started = True
+
+        prev_high, prev_low = self._prev_high, self._prev_low
+        self._prev_high, self._prev_low = high, low
+        if self._long:
+            if low <= self._sar:
+                self._long = False
+                sar = max(self._extreme, prev_high, high)
+                self.value = sar
+                self._af, self._extreme = self.acceleration, low
+                self._sar = max(sar + self._af * (self._extreme - sar), prev_high, high)
+                return
+            self.value = self._sar
+            if high > self._extreme:
+                self._extreme = high
+                self._af = min(self._af + self.acceleration, self.maximum)
+            self._sar = min(self._sar + self._af * (self._extreme - self._sar), prev_low, low)
+        else:
+            if high >= self._sar:
+                self._long = True
+                sar = min(self._extreme, prev_low, low)
+                self.value = sar
+                self._af, self._extreme = self.acceleration, high
+                self._sar = min(sar + self._af * (self._extreme - sar), prev_low, low)
+                return
+            self.value = self._sar
+            if low < self._extreme:
+                self._extreme = low
+                self._af = min(self._af + self.acceleration, self.maximum)
+            self._sar = max(self._sar + self._af * (self._extreme - self._sar), prev_high, high)
+
+
+def _midpoint(high: float | None, low: float | None) -> float | None:
+    return (high + low) / 2 if high is not None and low is not None else None
+
+
+class IndicatorState:
+    """
+    The indicator suite of `calculate_technical_indicators`, updated in O(1) per candle.
+
+    Seed it with history (`from_candles`), then `update` it with each newly closed candle;
+    `analysis()` returns the same `TechnicalAnalysis` that `calculate_technical_indicators`
+    would produce over every candle the state has seen. Moving averages use running sums
+    and EMA recurrences, RSI/ATR/ADX use Wilder smoothing, and the rolling highs and lows
+    behind the Stochastic, Williams %R and Ichimoku lines come from monotonic deques.
+    Every recurrence follows TA-Lib's, including its seeding, so results match it to
+    floating-point rounding.
+
+    Candles must arrive in time order. Candles that are not newer than the last one, or
+    that have non-finite prices or volume, are skipped, so overlapping batches can be
+    replayed safely. Only feed closed candles: an in-progress candle can't be revised.
+    """
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._last_timestamp: int | None = None
+        self._first_open = 0.0
+        self._close = self._low = self._high = math.nan
+        self._prev_low: float | None = None
+
+        self._sma_short, self._sma_long = _RollingSum(MA_SHORT), _RollingSum(MA_LONG)
+        self._sma_short_values: deque[float | None] = deque([None, None], maxlen=2)
+        self._sma_long_values: deque[float | None] = deque([None, None], maxlen=2)
+        self._ema_short, self._ema_medium = _EMA(EMA_SHORT), _EMA(EMA_MEDIUM)
+        self._ema_ribbon = {f"ema_{p}": _EMA(p) for p in EMA_RIBBON_PERIODS}
+        self._macd = _MACD(MACD_FAST, MACD_SLOW, MACD_SIGNAL)
+        self._prev_macd_histogram: float | None = None
+        self._adx = _ADX(ADX_PERIOD)
+        self._atr = _ATR(ATR_PERIOD)
+        self._rsi = _RSI(RSI_PERIOD)
+        self._psar = _ParabolicSAR(SAR_ACCELERATION, SAR_MAXIMUM)
+        self._prev_psar: float | None = None
+
+        self._ichimoku_highs = {
+            p: _RollingExtreme(p, maximum=True)
+            for p in (ICHIMOKU_TENKAN, ICHIMOKU_KIJUN, ICHIMOKU_SENKOU)
+        }
+        self._ichimoku_lows = {
+            p: _RollingExtreme(p, maximum=False)
+            for p in (ICHIMOKU_TENKAN, ICHIMOKU_KIJUN, ICHIMOKU_SENKOU)
+        }
+        self._tenkan_sen: float | None = None
+        self._kijun_sen: float | None = None
+        # The last 26 projected spans and closes; the oldest aligns with the current candle.
+        self._senkou_spans: deque[tuple[float | None, float | None]] = deque(maxlen=ICHIMOKU_KIJUN)
+        self._closes: deque[float] = deque(maxlen=ICHIMOKU_KIJUN)
+
+        self._stoch_high = _RollingExtreme(STOCH_FASTK_PERIOD, maximum=True)
+        self._stoch_low = _RollingExtreme(STOCH_FASTK_PERIOD, maximum=False)
+        self._stoch_slow_k = _RollingSum(STOCH_SLOWK_PERIOD)
+        self._stoch_slow_d = _RollingSum(STOCH_SLOWD_PERIOD)
+        self._stochastic: tuple[float, float] | None = None
+        self._williams_high = _RollingExtreme(WILLIAMS_PERIOD, maximum=True)
+        self._williams_low = _RollingExtreme(WILLIAMS_PERIOD, maximum=False)
+        self._williams_r: float | None = None
+
+        self._bb_sum = _RollingSum(BB_PERIOD)
+        self._bb_squares = _RollingSum(BB_PERIOD)
+        self._bollinger: tuple[float, float, float] | None = None
+
+        self._obv = 0.0
+        self._cmf_flow, self._cmf_volume = _RollingSum(CMF_PERIOD), _RollingSum(CMF_PERIOD)
+        self._cmf: float | None = None
+
+    @classmethod
+    def from_candles(cls, candles: list[Candle] | CandleBatch) -> "IndicatorState":
+        """Creates a state seeded with a candle history (oldest first)."""
+        state = cls()
+        state.extend(candles)
+        return state
+
+    def __len__(self) -> int:
+        """The number of candles applied so far."""
+        return self._count
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough candles have been seen for a full analysis."""
+        return self._count >= MIN_REQUIRED_CANDLES
+
+    @property
+    def last_timestamp(self) -> int | None:
+        """Open time (ms) of the latest applied candle."""
+        return self._last_timestamp
+
+    def extend(self, candles: list[Candle] | CandleBatch) -> int:
+        """Applies candles in order and returns how many were applied."""
+        batch = candles if isinstance(candles, CandleBatch) else CandleBatch.from_candles(candles)
+        columns = (batch.timestamp, batch.open, batch.high, batch.low, batch.close, batch.volume)
+        return sum(self.push(*row) for row in zip(*(c.tolist() for c in columns), strict=True))
+
+    def update(self, candle: Candle) -> bool:
+        """Applies one closed candle; returns False if it was skipped."""
+        timestamp = round(candle.timestamp.timestamp() * 1000)
+        return self.push(
+            timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume
+        )
+
+    def push(
+        self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float
+    ) -> bool:
+        """Applies one closed candle given as raw values; returns False if it was skipped."""
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            return False
+        if not all(map(math.isfinite, (open_, high, low, close, volume))):
+            logger.debug(f"Skipping candle at {timestamp} with non-finite values.")
+            return False
+
+        if not self._count:
+            self._first_open = open_
+            self._obv = volume
+        else:
+            self._update_with_previous(high, low, close, volume)
+        self._count += 1
+        self._last_timestamp = timestamp
+        self._prev_low = self._low if self._count > 1 else None
+        self._high, self._low, self._close = high, low, close
+
+        self._update_averages(close)
+        self._update_ranges(high, low, close)
+        self._update_bands(close)
+
+        range_ = high - low
+        flow_multiplier = ((close - low) - (high - close)) / range_ if range_ > 0 else 0.0
+        flow = self._cmf_flow.update(flow_multiplier * volume)
+        volume_total = self._cmf_volume.update(volume)
+        if flow is not None and volume_total is not None:
+            self._cmf = flow / volume_total if volume_total else None
+        return True
+
+    def _update_with_previous(self, high: float, low: float, close: float, volume: float) -> None:
+        """Updates the indicators built from changes between consecutive candles."""
+        prev_close = self._close
+        tr = _true_range(high, low, prev_close)
+        self._atr.update(tr)
+        self._adx.update(high, low, self._high, self._low, tr)
+        if close > prev_close:
+            self._obv += volume
+        elif close < prev_close:
+            self._obv -= volume
+
+    def _update_averages(self, close: float) -> None:
+        self._rsi.update(close)
+        for window, values in (
+            (self._sma_short, self._sma_short_values),
+            (self._sma_long, self._sma_long_values),
+        ):
+            total = window.update(close)
+            values.append(total / window.period if total is not None else None)
+        self._ema_short.update(close)
+        self._ema_medium.update(close)
+        for ema in self._ema_ribbon.values():
+            ema.update(close)
+        self._prev_macd_histogram = self._macd.histogram
+        self._macd.update(close)
+
+    def _update_ranges(self, high: float, low: float, close: float) -> None:
+        self._prev_psar = self._psar.value
+        self._psar.update(high, low)
+
+        highs = {p: window.update(high) for p, window in self._ichimoku_highs.items()}
+        lows = {p: window.update(low) for p, window in self._ichimoku_lows.items()}
+        self._tenkan_sen = _midpoint(highs[ICHIMOKU_TENKAN], lows[ICHIMOKU_TENKAN])
+        self._kijun_sen = _midpoint(highs[ICHIMOKU_KIJUN], lows[ICHIMOKU_KIJUN])
+        self._senkou_spans.append(
+            (
+                _midpoint(self._tenkan_sen, self._kijun_sen),
+                _midpoint(highs[ICHIMOKU_SENKOU], lows[ICHIMOKU_SENKOU]),
+            )
+        )
+        self._closes.append(close)
+
+        highest, lowest = self._stoch_high.update(high), self._stoch_low.update(low)
+        if highest is not None and lowest is not None:
+            diff = (highest - lowest) / 100.0
+            fast_k = (close - lowest) / diff if diff != 0.0 else 0.0
+            slow_k_total = self._stoch_slow_k.update(fast_k)
+            if slow_k_total is not None:
+                slow_k = slow_k_total / STOCH_SLOWK_PERIOD
+                slow_d_total = self._stoch_slow_d.update(slow_k)
+                if slow_d_total is not None:
+                    self._stochastic = (slow_k, slow_d_total / STOCH_SLOWD_PERIOD)
+
+        highest, lowest = self._williams_high.update(high), self._williams_low.update(low)
+        if highest is not None and lowest is not None:
+            diff = (highest - lowest) / -100.0
+            self._williams_r = (highest - close) / diff if diff != 0.0 else 0.0
+
+    def _update_bands(self, close: float) -> None:
+        total = self._bb_sum.update(close)
+        squares = self._bb_squares.update(close * close)
+        if total is None or squares is None:
+            return
+        middle = total / BB_PERIOD
+        variance = squares / BB_PERIOD - middle * middle
+        width = BB_DEV * (math.sqrt(variance) if variance >= _TA_EPSILON else 0.0)
+        self._bollinger = (middle + width, middle, middle - width)
+
+    def values(self) -> IndicatorValues:
+        """
+        The latest indicator readings.
+
+        Raises:
+            ValueError: If no candle has been applied yet.
+        """
+        if not self._count:
+            raise ValueError("IndicatorState has no candles yet")
+        current_a, current_b = (
+            self._senkou_spans[0] if len(self._senkou_spans) == ICHIMOKU_KIJUN else (None, None)
+        )
+        future_a, future_b = self._senkou_spans[-1]
+        stoch_k, stoch_d = self._stochastic or (None, None)
+        bb_upper, bb_middle, bb_lower = self._bollinger or (None, None, None)
+        return IndicatorValues(
+            first_open=self._first_open,
+            close=self._close,
+            low=self._low,
+            prev_low=self._prev_low,
+            sma_short=self._sma_short_values[-1],
+            prev_sma_short=self._sma_short_values[0],
+            sma_long=self._sma_long_values[-1],
+            prev_sma_long=self._sma_long_values[0],
+            ema_short=self._ema_short.value,
+            ema_medium=self._ema_medium.value,
+            ema_ribbon={name: ema.value for name, ema in self._ema_ribbon.items()},
+            macd_line=self._macd.line,
+            macd_signal=self._macd.signal,
+            macd_histogram=self._macd.histogram,
+            prev_macd_histogram=self._prev_macd_histogram,
+            adx=self._adx.value,
+            tenkan_sen=self._tenkan_sen,
+            kijun_sen=self._kijun_sen,
+            senkou_span_a=current_a,
+            senkou_span_b=current_b,
+            future_senkou_span_a=future_a,
+            future_senkou_span_b=future_b,
+            chikou_span=self._closes[0] if len(self._closes) == ICHIMOKU_KIJUN else None,
+            psar=self._psar.value,
+            prev_psar=self._prev_psar,
+            rsi=self._rsi.value,
+            stochastic_k=stoch_k,
+            stochastic_d=stoch_d,
+            williams_r=self._williams_r,
+            bollinger_upper=bb_upper,
+            bollinger_middle=bb_middle,
+            bollinger_lower=bb_lower,
+            atr=self._atr.value,
+            on_balance_volume=self._obv,
+            chaikin_money_flow=self._cmf,
+        )
+
+    def analysis(self) -> TechnicalAnalysis:
+        """
+        The interpreted analysis of every candle seen so far, or an empty analysis while
+        there are fewer than `MIN_REQUIRED_CANDLES`.
+        """
+        if not self.ready:
+            return empty_technical_analysis()
+        return interpret_indicator_values(self.values())
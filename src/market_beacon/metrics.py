@@ -0,0 +1,324 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol, TextIO
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Metric names. Durations are in seconds; `_total` metrics are counters.
+REQUEST_SECONDS = "market_beacon_request_seconds"
+DECODE_SECONDS = "market_beacon_decode_seconds"
+RESPONSE_BYTES = "market_beacon_response_bytes_total"
+RETRIES = "market_beacon_retries_total"
+THROTTLED_SECONDS = "market_beacon_throttled_seconds_total"
+PAGES = "market_beacon_pages_total"
+API_CALL_SECONDS = "market_beacon_api_call_seconds"
+INDICATOR_SECONDS = "market_beacon_indicator_seconds"
+ANALYSIS_SECONDS = "market_beacon_analysis_seconds"
+
+METRIC_HELP: dict[str, str] = {
+    REQUEST_SECONDS: "Latency of each HTTP request attempt, by endpoint.",
+    DECODE_SECONDS: "Time spent decoding and checking response envelopes, by endpoint.",
+    RESPONSE_BYTES: "Response body bytes received, by endpoint.",
+    RETRIES: "Request attempts retried after a transient failure, by endpoint.",
+    THROTTLED_SECONDS: "Time requests waited on the rate limiter, by endpoint.",
+    PAGES: "Pages fetched by paginated requests, by endpoint.",
+    API_CALL_SECONDS: "Duration of market data API calls, including parsing, by method.",
+    INDICATOR_SECONDS: "Compute time of each technical indicator group.",
+    ANALYSIS_SECONDS: "Duration of a full analysis run, by mode.",
+}
+
+# Histogram bucket upper bounds in seconds, from indicator groups to slow requests.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+type Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsSink(Protocol):
+    """Receives every counter increment and histogram observation."""
+
+    def increment(self, name: str, value: float, labels: Mapping[str, str]) -> None: ...
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None: ...
+
+
+# The active sink. None disables instrumentation, leaving one check per call site.
+_sink: MetricsSink | None = None
+
+
+def set_sink(sink: MetricsSink | None) -> None:
+    """Routes all instrumentation to `sink`, or disables it with None."""
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> MetricsSink | None:
+    """Returns the active sink, or None if instrumentation is disabled."""
+    return _sink
+
+
+def increment(name: str, value: float = 1.0, **labels: str) -> None:
+    """Adds `value` to a counter."""
+    sink = _sink
+    if sink is not None:
+        sink.increment(name, value, labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Records one observation in a histogram."""
+    sink = _sink
+    if sink is not None:
+        sink.observe(name, value, labels)
+
+
+class _Timer:
+    __slots__ = ("_labels", "_name", "_sink", "_started")
+
+    def __init__(self, sink: MetricsSink, name: str, labels: Mapping[str, str]) -> None:
+        self._sink = sink
+        self._name = name
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._sink.observe(self._name, time.perf_counter() - self._started, self._labels)
+
+
+_NO_TIMER = nullcontext()
+
+
+def timer(name: str, **labels: str) -> AbstractContextManager[None]:
+    """Returns a context manager recording the duration of its block in a histogram."""
+    sink = _sink
+    if sink is None:
+        return _NO_TIMER
+    return _Timer(sink, name, labels)
+
+
+def timed[F: Callable[..., Any]](name: str) -> Callable[[F], F]:
+    """
+    Decorates a function or coroutine function to record each call's duration in a
+    histogram, labelled with its qualified name as `method`.
+
+    Calls that raise are recorded too. Generator functions are not supported; their call
+    returns before any work is done.
+    """
+
+    def decorate(func: F) -> F:
+        labels = {"method": func.__qualname__}
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                sink = _sink
+                if sink is None:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    sink.observe(name, time.perf_counter() - started, labels)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            sink = _sink
+            if sink is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sink.observe(name, time.perf_counter() - started, labels)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Observation counts per bucket (the last one unbounded), with their sum and count."""
+
+    buckets: tuple[float, ...]
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        # Buckets are inclusive upper bounds, as in Prometheus.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels_key(labels: Mapping[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+@dataclass
+class MetricsRegistry:
+    """
+    A thread-safe, in-memory sink that aggregates counters and histograms.
+
+    Use it directly to inspect metrics (in tests, say), render it in Prometheus' text
+    format with `render_prometheus`, or expose it over HTTP with `serve_prometheus`.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counters: dict[tuple[str, Labels], float] = field(default_factory=dict)
+    histograms: dict[tuple[str, Labels], Histogram] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def increment(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets, [0] * (len(self.buckets) + 1))
+                self.histograms[key] = histogram
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """The value of a counter, or 0 if it was never incremented."""
+        with self._lock:
+            return self.counters.get((name, _labels_key(labels)), 0.0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        """A copy of a histogram, or None if it has no observations."""
+        with self._lock:
+            histogram = self.histograms.get((name, _labels_key(labels)))
+            if histogram is None:
+                return None
+            return Histogram(
+                histogram.buckets, histogram.counts.copy(), histogram.sum, histogram.count
+            )
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, histogram.counts.copy(), histogram.sum, histogram.count)
+                for key, histogram in self.histograms.items()
+            )
+
+        lines: list[str] = []
+        declared: set[str] = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in declared:
+                declared.add(name)
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value!r}")
+        for (name, labels), counts, total, count in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonLinesSink:
+    """Writes every increment and observation to `stream` as one JSON object per line."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def _write(self, kind: str, name: str, value: float, labels: Mapping[str, str]) -> None:
+        line = json.dumps(
+            {"time": time.time(), "type": kind, "name": name, "value": value, "labels": labels}
+        )
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def increment(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        self._write("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        self._write("observation", name, value, labels)
+
+
+def serve_prometheus(
+    registry: MetricsRegistry, port: int, host: str = "127.0.0.1"
+) -> "ThreadingHTTPServer":
+    """
+    Serves `registry` for Prometheus to scrape at `http://host:port/metrics`, from a
+    daemon thread. Call `shutdown()` on the returned server to stop it.
+    """
+    # Only the exporter needs an HTTP server, so keep it off the CLI's import path
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
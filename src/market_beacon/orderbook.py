@@ -0,0 +1,319 @@
+import zlib
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+
+from .api.batches import OrderBookSnapshot
+
+if TYPE_CHECKING:
+    # The stream module pulls in websockets, which only streaming callers need.
+    from .api.stream import BookUpdate, StreamMessage
+
+# Bitget's book checksum covers this many levels on each side.
+CHECKSUM_DEPTH = 25
+
+
+class OrderBookOutOfSyncError(Exception):
+    """
+    Raised when an update cannot be applied consistently: it arrived out of sequence, or
+    the resulting book does not match the exchange's checksum. The book must be rebuilt
+    from a fresh snapshot (e.g. by resubscribing to the channel).
+    """
+
+
+def book_checksum(
+    bids: Sequence[Sequence[str]], asks: Sequence[Sequence[str]], depth: int = CHECKSUM_DEPTH
+) -> int:
+    """
+    Computes Bitget's order book checksum: the signed CRC32 of the top `depth` bid and ask
+    levels, interleaved as `bid1_price:bid1_size:ask1_price:ask1_size:...`, using the
+    exchange's original price and size strings.
+    """
+    parts: list[str] = []
+    for i in range(max(min(depth, len(bids)), min(depth, len(asks)))):
+        if i < len(bids):
+            parts.extend(bids[i][:2])
+        if i < len(asks):
+            parts.extend(asks[i][:2])
+    crc = zlib.crc32(":".join(parts).encode())
+    return crc - (1 << 32) if crc >= 1 << 31 else crc
+
+
+def running_totals(prices: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """
+    Running size (row 0) and quote notional (row 1) of levels ordered best first, with a
+    leading zero, so column `i` covers the best `i` levels.
+    """
+    # Size and notional side by side, so one cumsum builds both curves.
+    totals = np.empty((len(sizes) + 1, 2), dtype=np.float64)
+    totals[0] = 0.0
+    totals[1:, 0] = sizes
+    np.multiply(prices, sizes, out=totals[1:, 1])
+    np.cumsum(totals[1:], axis=0, out=totals[1:])
+    return totals.T
+
+
+class BookSide:
+    """
+    One side of an order book, kept sorted best level first in contiguous arrays.
+
+    Prices are stored as sort keys (negated for bids) so both sides ascend from the best
+    level, letting updates locate levels with a binary search. Deltas are applied as a
+    batch: existing levels are updated in place, and a delta that adds or removes levels
+    rebuilds the arrays once. Running size and notional are cached between updates.
+    """
+
+    def __init__(self, descending: bool):
+        self._sign = -1.0 if descending else 1.0
+        self._keys = np.empty(0, dtype=np.float64)
+        self._sizes = np.empty(0, dtype=np.float64)
+        # The exchange's [price, size] strings for each level, needed for checksums.
+        self._raw = np.empty((0, 2), dtype=object)
+        self._totals: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Level prices, best first."""
+        return self._keys * self._sign
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Level sizes, best first (a read-only view)."""
+        view = self._sizes.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def raw_levels(self) -> np.ndarray:
+        """The exchange's `[price, size]` strings, best first."""
+        return self._raw
+
+    @property
+    def best_price(self) -> float | None:
+        return float(self._keys[0] * self._sign) if len(self._keys) else None
+
+    @property
+    def running_totals(self) -> np.ndarray:
+        """The side's running size and notional curves (see `running_totals`)."""
+        if self._totals is None:
+            self._totals = running_totals(self.prices, self._sizes)
+        return self._totals
+
+    @property
+    def cumulative_sizes(self) -> np.ndarray:
+        """Running total of size from the best level outwards."""
+        return self.running_totals[0, 1:]
+
+    @property
+    def total_size(self) -> float:
+        cumulative = self.cumulative_sizes
+        return float(cumulative[-1]) if len(cumulative) else 0.0
+
+    def depth(self, levels: int) -> float:
+        """Total size of the best `levels` levels."""
+        cumulative = self.cumulative_sizes
+        if levels <= 0 or not len(cumulative):
+            return 0.0
+        return float(cumulative[min(levels, len(cumulative)) - 1])
+
+    def depth_to_price(self, price: float) -> float:
+        """Total size of every level at `price` or better."""
+        count = int(np.searchsorted(self._keys, price * self._sign, side="right"))
+        return self.depth(count)
+
+    def replace(self, rows: Sequence[Sequence[str]]) -> None:
+        """Replaces the whole side with a snapshot's levels."""
+        keys, sizes, raw = self._parse(rows)
+        keep = sizes > 0
+        order = np.argsort(keys[keep], kind="stable")
+        self._keys = keys[keep][order]
+        self._sizes = sizes[keep][order]
+        self._raw = raw[keep][order]
+        self._totals = None
+
+    def apply(self, rows: Sequence[Sequence[str]]) -> None:
+        """Applies a delta: a size of zero deletes a level, anything else upserts it."""
+        if not len(rows):
+            return
+        keys, sizes, raw = self._parse(rows)
+        order = np.argsort(keys, kind="stable")
+        keys, sizes, raw = keys[order], sizes[order], raw[order]
+        # Within one delta the last change to a price wins; the stable sort keeps repeats
+        # in arrival order, so keep only the last of each run of equal keys.
+        repeated = keys[1:] == keys[:-1]
+        if repeated.any():
+            last = np.append(~repeated, True)
+            keys, sizes, raw = keys[last], sizes[last], raw[last]
+
+        positions = np.searchsorted(self._keys, keys)
+        if len(self._keys):
+            clipped = np.minimum(positions, len(self._keys) - 1)
+            exists = (positions < len(self._keys)) & (self._keys[clipped] == keys)
+        else:
+            exists = np.zeros(len(keys), dtype=np.bool_)
+        delete = sizes == 0
+
+        update = exists & ~delete
+        self._sizes[positions[update]] = sizes[update]
+        self._raw[positions[update]] = raw[update]
+
+        insert = ~exists & ~delete
+        remove = exists & delete
+        if insert.any() or remove.any():
+            # Rebuild once per delta: drop removed levels, append new ones and re-sort.
+            keep = np.ones(len(self._keys), dtype=np.bool_)
+            keep[positions[remove]] = False
+            merged = np.concatenate([self._keys[keep], keys[insert]])
+            order = np.argsort(merged, kind="stable")
+            self._keys = merged[order]
+            self._sizes = np.concatenate([self._sizes[keep], sizes[insert]])[order]
+            self._raw = np.concatenate([self._raw[keep], raw[insert]])[order]
+        self._totals = None
+
+    def truncate(self, max_levels: int) -> None:
+        if len(self._keys) > max_levels:
+            self._keys = self._keys[:max_levels]
+            self._sizes = self._sizes[:max_levels]
+            self._raw = self._raw[:max_levels]
+            self._totals = None
+
+    def _parse(self, rows: Sequence[Sequence[str]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        raw = np.array([row[:2] for row in rows], dtype=object).reshape(-1, 2)
+        table = raw.astype(np.float64)
+        return table[:, 0] * self._sign, table[:, 1], raw
+
+
+class OrderBookEngine:
+    """
+    A local order book maintained from a snapshot plus incremental updates.
+
+    Feed it the `books` WebSocket channel (see `handle_message`), or call
+    `apply_snapshot`/`apply_update` directly with the exchange's string levels. Every
+    update's sequence number must increase, and if the exchange sends a checksum it is
+    verified against the top 25 levels. On either failure `OrderBookOutOfSyncError` is
+    raised and further updates are refused until a new snapshot arrives.
+
+    Best bid/ask and spread are O(1); cumulative depth is O(1) by level count and
+    O(log n) by price once the running totals are cached after an update.
+
+    Args:
+        symbol: The instrument, used in log messages.
+        max_depth: If set, each side is truncated to this many levels after an update.
+        verify_checksum: Whether to verify the exchange's checksums.
+    """
+
+    def __init__(
+        self, symbol: str = "", max_depth: int | None = None, verify_checksum: bool = True
+    ):
+        self.symbol = symbol
+        self.max_depth = max_depth
+        self.verify_checksum = verify_checksum
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.seq: int | None = None
+        self.timestamp: int | None = None
+        self._synced = False
+
+    @property
+    def synced(self) -> bool:
+        """Whether the book reflects a snapshot and every update since."""
+        return self._synced
+
+    @property
+    def best_bid(self) -> float | None:
+        return self.bids.best_price
+
+    @property
+    def best_ask(self) -> float | None:
+        return self.asks.best_price
+
+    @property
+    def mid_price(self) -> float | None:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self) -> float | None:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    def apply_snapshot(
+        self,
+        bids: Sequence[Sequence[str]],
+        asks: Sequence[Sequence[str]],
+        timestamp: int,
+        seq: int | None = None,
+        checksum: int | None = None,
+    ) -> None:
+        """Replaces the book with a full snapshot."""
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self._synced = True
+        self._finish(timestamp, seq, checksum)
+
+    def apply_update(
+        self,
+        bids: Sequence[Sequence[str]],
+        asks: Sequence[Sequence[str]],
+        timestamp: int,
+        seq: int | None = None,
+        checksum: int | None = None,
+    ) -> None:
+        """
+        Applies an incremental update on top of the current book.
+
+        Raises:
+            OrderBookOutOfSyncError: If no snapshot has been applied since the last
+                failure, the update is out of sequence, or the checksum doesn't match.
+        """
+        if not self._synced:
+            raise OrderBookOutOfSyncError(f"{self.symbol}: no snapshot to apply updates to")
+        if seq is not None and self.seq is not None and seq <= self.seq:
+            self._synced = False
+            raise OrderBookOutOfSyncError(
+                f"{self.symbol}: update seq {seq} does not follow {self.seq}"
+            )
+        self.bids.apply(bids)
+        self.asks.apply(asks)
+        self._finish(timestamp, seq, checksum)
+
+    def apply(self, update: "BookUpdate", snapshot: bool) -> None:
+        """Applies a `BookUpdate` from the stream as a snapshot or an incremental update."""
+        apply = self.apply_snapshot if snapshot else self.apply_update
+        apply(update.bids, update.asks, update.timestamp, update.seq, update.checksum)
+
+    def handle_message(self, message: "StreamMessage") -> None:
+        """Applies a `books*` channel message; usable as a `MarketStream` listener."""
+        for update in message.data:
+            self.apply(update, snapshot=message.action == "snapshot")
+
+    def checksum(self, depth: int = CHECKSUM_DEPTH) -> int:
+        """Bitget's checksum of the current book (see `book_checksum`)."""
+        return book_checksum(self.bids.raw_levels[:depth], self.asks.raw_levels[:depth], depth)
+
+    def to_snapshot(self, levels: int | None = None) -> OrderBookSnapshot:
+        """Copies the best `levels` levels (or the whole book) into an `OrderBookSnapshot`."""
+        return OrderBookSnapshot(
+            bids=np.column_stack([self.bids.prices[:levels], self.bids.sizes[:levels]]),
+            asks=np.column_stack([self.asks.prices[:levels], self.asks.sizes[:levels]]),
+            timestamp=self.timestamp or 0,
+        )
+
+    def _finish(self, timestamp: int, seq: int | None, checksum: int | None) -> None:
+        if self.max_depth is not None:
+            self.bids.truncate(self.max_depth)
+            self.asks.truncate(self.max_depth)
+        self.timestamp = timestamp
+        self.seq = seq if seq is not None else self.seq
+
+        if self.verify_checksum and checksum is not None and checksum != self.checksum():
+            self._synced = False
+            logger.warning(f"{self.symbol}: order book checksum mismatch at seq {seq}.")
+            raise OrderBookOutOfSyncError(f"{self.symbol}: checksum mismatch at seq {seq}")
@@ -0,0 +1,458 @@
+import math
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from typing import Self
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .analysis import (
+    ADX_PERIOD,
+    ATR_PERIOD,
+    BB_DEV,
+    BB_PERIOD,
+    CMF_PERIOD,
+    EMA_MEDIUM,
+    EMA_RIBBON_PERIODS,
+    EMA_SHORT,
+    ICHIMOKU_KIJUN,
+    ICHIMOKU_SENKOU,
+    ICHIMOKU_TENKAN,
+    MA_LONG,
+    MA_SHORT,
+    MACD_FAST,
+    MACD_SIGNAL,
+    MACD_SLOW,
+    MIN_REQUIRED_CANDLES,
+    RSI_PERIOD,
+    STOCH_FASTK_PERIOD,
+    STOCH_SLOWD_PERIOD,
+    STOCH_SLOWK_PERIOD,
+    WILLIAMS_PERIOD,
+    IndicatorValues,
+    TechnicalAnalysis,
+    empty_technical_analysis,
+    interpret_indicator_values,
+)
+from .api.batches import CandleBatch
+from .api.models import Candle
+from .indicators import _TA_EPSILON, SAR_ACCELERATION, SAR_MAXIMUM
+
+# The OHLCV columns a panel holds besides timestamps.
+PANEL_PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True, slots=True)
+class CandlePanel:
+    """
+    Candles for many symbols as 2-D (symbols x time) arrays.
+
+    Each row is one symbol's candles in chronological order, right-aligned so every
+    symbol's latest candle is in the last column. Shorter histories are left-padded with
+    NaN prices and zero timestamps. Rows are aligned by position, not by open time: a
+    symbol whose feed has stalled still has its latest candle in the last column (see the
+    `last_timestamp` column of `calculate_indicator_table`).
+    """
+
+    symbols: tuple[str, ...]
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_batches(
+        cls, candles: Mapping[str, CandleBatch | list[Candle]], length: int | None = None
+    ) -> Self:
+        """
+        Stacks per-symbol candle histories into a panel.
+
+        Rows with non-finite prices or volume are dropped first, as
+        `calculate_technical_indicators` does.
+
+        Args:
+            candles: Candle history per symbol, oldest first.
+            length: Keep at most this many of each symbol's latest candles. Defaults to
+                the longest history.
+        """
+        batches: dict[str, CandleBatch] = {}
+        for symbol, history in candles.items():
+            batch = (
+                history if isinstance(history, CandleBatch) else CandleBatch.from_candles(history)
+            )
+            valid = np.logical_and.reduce(
+                [np.isfinite(getattr(batch, name)) for name in PANEL_PRICE_FIELDS]
+            )
+            batches[symbol] = batch if valid.all() else batch[valid]
+
+        width = max((len(batch) for batch in batches.values()), default=0)
+        if length is not None:
+            width = min(width, length)
+        shape = (len(batches), width)
+        timestamp = np.zeros(shape, dtype=np.int64)
+        prices = {name: np.full(shape, np.nan) for name in PANEL_PRICE_FIELDS}
+        for row, batch in enumerate(batches.values()):
+            tail = batch[len(batch) - min(len(batch), width) :]
+            if not len(tail):
+                continue
+            timestamp[row, -len(tail) :] = tail.timestamp
+            for name, column in prices.items():
+                column[row, -len(tail) :] = getattr(tail, name)
+        return cls(symbols=tuple(batches), timestamp=timestamp, **prices)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+# ------------------------------------------------------------------------------
+# Vectorized kernels. Every array is (symbols x time) and left-padded with NaN; `first`
+# holds the column of each row's first candle. Recurrences step along time for all
+# symbols at once and follow TA-Lib's seeding.
+# ------------------------------------------------------------------------------
+
+
+def _trailing(values: np.ndarray, size: int, lag: int = 0) -> np.ndarray:
+    """The `size` columns ending `lag` columns before the last one."""
+    end = values.shape[1] - lag
+    return values[:, end - size : end]
+
+
+def _window_sum(values: np.ndarray, start: np.ndarray, length: int) -> np.ndarray:
+    """Per-row sum of `length` values from column `start` (NaN if it runs past the end)."""
+    rows, width = values.shape
+    columns = start[:, None] + np.arange(length)
+    sums = values[np.arange(rows)[:, None], np.minimum(columns, width - 1)].sum(axis=1)
+    return np.where(columns[:, -1] < width, sums, np.nan)
+
+
+def _recurrence(
+    values: np.ndarray,
+    seed: np.ndarray,
+    seed_index: np.ndarray,
+    step: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    full: bool = True,
+) -> np.ndarray:
+    """
+    Runs `state = step(state, values[:, t])` along time for every row, starting from
+    `seed` at column `seed_index`; the state is NaN before a row's seed. `seed` and
+    `seed_index` may have a leading axis to run several recurrences over the same values
+    in one pass. Returns the state at every column, or only the final state.
+    """
+    shape = np.broadcast_shapes(np.shape(seed), np.shape(seed_index))
+    width = values.shape[1]
+    out = np.full((*shape, width), np.nan) if full else None
+    state = np.full(shape, np.nan)
+    seed_columns = set(np.unique(seed_index).tolist())
+    for t in range(int(np.min(seed_index, initial=width)), width):
+        state = step(state, values[:, t])
+        if t in seed_columns:
+            state = np.where(seed_index == t, seed, state)
+        if out is not None:
+            out[..., t] = state
+    return out if out is not None else state
+
+
+def _ema(
+    values: np.ndarray, periods: Sequence[int], first: np.ndarray, full: bool = True
+) -> np.ndarray:
+    """EMAs (one per period, stacked) seeded with the SMA of each row's first values."""
+    k = np.array([2.0 / (period + 1) for period in periods])[:, None]
+    seed = np.stack([_window_sum(values, first, period) / period for period in periods])
+    seed_index = np.stack([first + period - 1 for period in periods])
+    return _recurrence(values, seed, seed_index, lambda prev, x: (x - prev) * k + prev, full)
+
+
+def _wilder_average(values: np.ndarray, period: int, first: np.ndarray) -> np.ndarray:
+    """The final Wilder moving average, seeded with the mean of each row's first values."""
+    seed = _window_sum(values, first, period) / period
+    return _recurrence(
+        values,
+        seed,
+        first + period - 1,
+        lambda prev, x: (prev * (period - 1) + x) / period,
+        full=False,
+    )
+
+
+def _wilder_sum(values: np.ndarray, period: int, first: np.ndarray) -> np.ndarray:
+    """Wilder's running sum, seeded with the sum of each row's first `period - 1` values."""
+    seed = _window_sum(values, first, period - 1)
+    return _recurrence(values, seed, first + period - 2, lambda prev, x: prev - prev / period + x)
+
+
+def _shifted(values: np.ndarray) -> np.ndarray:
+    """The previous column's values (NaN for the first column)."""
+    return np.concatenate([np.full((len(values), 1), np.nan), values[:, :-1]], axis=1)
+
+
+def _macd(close: np.ndarray, first: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # TA-Lib seeds the fast EMA so that it starts on the same candle as the slow one.
+    slow = _ema(close, [MACD_SLOW], first)[0]
+    fast = _ema(close, [MACD_FAST], first + MACD_SLOW - MACD_FAST)[0]
+    line = fast - slow
+    signal = _ema(line, [MACD_SIGNAL], first + MACD_SLOW - 1)[0]
+    return line, signal
+
+
+def _rsi(close: np.ndarray, first: np.ndarray) -> np.ndarray:
+    change = close - _shifted(close)
+    # Gains and losses are smoothed in one pass, stacked as separate rows.
+    moves = np.concatenate([np.maximum(change, 0.0), np.maximum(-change, 0.0)])
+    gain, loss = np.split(_wilder_average(moves, RSI_PERIOD, np.tile(first + 1, 2)), 2)
+    total = gain + loss
+    return np.where(np.abs(total) < _TA_EPSILON, 0.0, 100.0 * (gain / total))
+
+
+def _adx(
+    high: np.ndarray, low: np.ndarray, true_range: np.ndarray, first: np.ndarray
+) -> np.ndarray:
+    n = ADX_PERIOD
+    up, down = high - _shifted(high), _shifted(low) - low
+    plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+    minus_dm = np.where((down > 0) & (up < down), down, 0.0)
+    sums = _wilder_sum(np.concatenate([plus_dm, minus_dm, true_range]), n, np.tile(first + 1, 3))
+    plus, minus, tr = np.split(sums, 3)
+
+    plus_di, minus_di = 100.0 * (plus / tr), 100.0 * (minus / tr)
+    di_total = plus_di + minus_di
+    # TA-Lib only derives DX once the sums have been smoothed, and skips it when the true
+    # range or DI total is zero.
+    smoothed = np.arange(high.shape[1]) >= (first + n)[:, None]
+    valid = smoothed & (np.abs(tr) >= _TA_EPSILON) & (np.abs(di_total) >= _TA_EPSILON)
+    dx = np.where(valid, 100.0 * (np.abs(minus_di - plus_di) / di_total), np.nan)
+
+    seed = _window_sum(np.where(smoothed, np.nan_to_num(dx), np.nan), first + n, n) / n
+    return _recurrence(
+        dx,
+        seed,
+        first + 2 * n - 1,
+        lambda prev, x: np.where(np.isnan(x), prev, (prev * (n - 1) + x) / n),
+        full=False,
+    )
+
+
+def _parabolic_sar(
+    high: np.ndarray, low: np.ndarray, first: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """TA-Lib's Parabolic SAR for the last two candles of every row."""
+    rows, width = high.shape
+    acc, maximum = SAR_ACCELERATION, SAR_MAXIMUM
+    is_long = np.ones(rows, dtype=np.bool_)
+    sar, extreme = np.full(rows, np.nan), np.full(rows, np.nan)
+    af = np.full(rows, acc)
+    prev_high, prev_low = np.full(rows, np.nan), np.full(rows, np.nan)
+    output, prev_output = np.full(rows, np.nan), np.full(rows, np.nan)
+
+    start_columns = set((first + 1).tolist())
+    for t in range(int((first + 1).min(initial=width)), width):
+        high_t, low_t = high[:, t], low[:, t]
+        if t in start_columns:
+            start = t == first + 1
+            # A dominant down move on the second candle starts the SAR short. TA-Lib bounds
+            # the first step by the second candle's own range.
+            down, up = low[:, t - 1] - low_t, high_t - high[:, t - 1]
+            starts_long = ~((down > 0) & (up < down))
+            is_long = np.where(start, starts_long, is_long)
+            extreme = np.where(start, np.where(starts_long, high_t, low_t), extreme)
+            sar = np.where(start, np.where(starts_long, low[:, t - 1], high[:, t - 1]), sar)
+            af = np.where(start, acc, af)
+            prev_high = np.where(start, high_t, prev_high)
+            prev_low = np.where(start, low_t, prev_low)
+
+        reverse_short = is_long & (low_t <= sar)
+        reverse_long = ~is_long & (high_t >= sar)
+        reversed_ = reverse_short | reverse_long
+        # On a reversal the SAR restarts at the prior extreme, bounded by the two candles.
+        restart = np.where(
+            reverse_short,
+            np.maximum.reduce([extreme, prev_high, high_t]),
+            np.minimum.reduce([extreme, prev_low, low_t]),
+        )
+        prev_output = output
+        output = np.where(reversed_, restart, sar)
+
+        new_extreme = np.where(is_long, np.maximum(extreme, high_t), np.minimum(extreme, low_t))
+        extended = np.where(is_long, high_t > extreme, low_t < extreme)
+        af = np.where(reversed_, acc, np.where(extended, np.minimum(af + acc, maximum), af))
+        extreme = np.where(reversed_, np.where(reverse_short, low_t, high_t), new_extreme)
+        is_long = is_long ^ reversed_
+        stepped = output + af * (extreme - output)
+        sar = np.where(
+            is_long,
+            np.minimum.reduce([stepped, prev_low, low_t]),
+            np.maximum.reduce([stepped, prev_high, high_t]),
+        )
+        prev_high, prev_low = high_t, low_t
+    return output, prev_output
+
+
+def _midrange(high: np.ndarray, low: np.ndarray, size: int, lag: int = 0) -> np.ndarray:
+    """The midpoint of the highest high and lowest low over `size` candles."""
+    return (_trailing(high, size, lag).max(axis=1) + _trailing(low, size, lag).min(axis=1)) / 2
+
+
+def _compact(panel: CandlePanel) -> dict[str, np.ndarray]:
+    """
+    Moves each row's valid candles to the right end, dropping rows with non-finite values
+    in place, and pads the panel to at least `MIN_REQUIRED_CANDLES` columns.
+    """
+    columns = {name: getattr(panel, name) for name in ("timestamp", *PANEL_PRICE_FIELDS)}
+    valid = np.logical_and.reduce([np.isfinite(columns[name]) for name in PANEL_PRICE_FIELDS])
+    if not valid.all():
+        # A stable sort on the validity mask keeps each row's candles in order.
+        order = np.argsort(valid, axis=1, kind="stable")
+        valid = np.take_along_axis(valid, order, axis=1)
+        for name, column in columns.items():
+            column = np.take_along_axis(column, order, axis=1)
+            columns[name] = np.where(valid, column, 0 if name == "timestamp" else np.nan)
+    missing = MIN_REQUIRED_CANDLES - panel.close.shape[1]
+    if missing > 0:
+        for name, column in columns.items():
+            fill = 0 if name == "timestamp" else np.nan
+            columns[name] = np.pad(column, ((0, 0), (missing, 0)), constant_values=fill)
+    return columns
+
+
+def calculate_indicator_table(panel: CandlePanel) -> pd.DataFrame:
+    """
+    Computes the `calculate_technical_indicators` suite for every symbol of a panel in
+    one vectorized pass.
+
+    Returns a DataFrame indexed by symbol with one column per `IndicatorValues` reading
+    (the EMA ribbon as `ema_20` ... `ema_55`), plus `candles`, `last_timestamp` and
+    `price_change_percent`. Unavailable readings are NaN, and so is every reading of a
+    symbol with fewer than `MIN_REQUIRED_CANDLES` valid candles, matching the empty
+    per-symbol analysis. Use `technical_analysis_from_table` for the interpreted model.
+    """
+    columns = _compact(panel)
+    open_, high, low, close, volume = (columns[name] for name in PANEL_PRICE_FIELDS)
+    rows, width = close.shape
+    candles = np.isfinite(close).sum(axis=1)
+    first = width - candles
+    index = np.arange(rows)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        readings: dict[str, np.ndarray] = {}
+        first_open = open_[index, np.minimum(first, width - 1)]
+        readings["price_change_percent"] = (close[:, -1] - first_open) / first_open * 100
+        readings["first_open"] = first_open
+        readings["close"] = close[:, -1]
+        readings["low"] = low[:, -1]
+        readings["prev_low"] = low[:, -2]
+
+        for name, period in (("sma_short", MA_SHORT), ("sma_long", MA_LONG)):
+            readings[name] = _trailing(close, period).sum(axis=1) / period
+            readings[f"prev_{name}"] = _trailing(close, period, lag=1).sum(axis=1) / period
+
+        names = ["ema_short", "ema_medium", *(f"ema_{p}" for p in EMA_RIBBON_PERIODS)]
+        emas = _ema(close, [EMA_SHORT, EMA_MEDIUM, *EMA_RIBBON_PERIODS], first, full=False)
+        readings.update(zip(names, emas, strict=True))
+
+        line, signal = _macd(close, first)
+        readings["macd_line"] = line[:, -1]
+        readings["macd_signal"] = signal[:, -1]
+        readings["macd_histogram"] = line[:, -1] - signal[:, -1]
+        readings["prev_macd_histogram"] = line[:, -2] - signal[:, -2]
+
+        prev_close = _shifted(close)
+        true_range = np.maximum.reduce(
+            [high - low, np.abs(high - prev_close), np.abs(low - prev_close)]
+        )
+        readings["adx"] = _adx(high, low, true_range, first)
+
+        tenkan = _midrange(high, low, ICHIMOKU_TENKAN)
+        kijun = _midrange(high, low, ICHIMOKU_KIJUN)
+        # The current cloud was projected from 26 periods ago.
+        lag = ICHIMOKU_KIJUN - 1
+        readings["tenkan_sen"] = tenkan
+        readings["kijun_sen"] = kijun
+        readings["senkou_span_a"] = (
+            _midrange(high, low, ICHIMOKU_TENKAN, lag) + _midrange(high, low, ICHIMOKU_KIJUN, lag)
+        ) / 2
+        readings["senkou_span_b"] = _midrange(high, low, ICHIMOKU_SENKOU, lag)
+        readings["future_senkou_span_a"] = (tenkan + kijun) / 2
+        readings["future_senkou_span_b"] = _midrange(high, low, ICHIMOKU_SENKOU)
+        readings["chikou_span"] = close[:, -ICHIMOKU_KIJUN]
+
+        readings["psar"], readings["prev_psar"] = _parabolic_sar(high, low, first)
+        readings["rsi"] = _rsi(close, first)
+
+        # Stochastic: the last few %K values are smoothed into slow %K, then into %D.
+        span = STOCH_SLOWK_PERIOD + STOCH_SLOWD_PERIOD - 1
+        highest = sliding_window_view(
+            _trailing(high, STOCH_FASTK_PERIOD + span - 1), STOCH_FASTK_PERIOD, axis=1
+        ).max(axis=2)
+        lowest = sliding_window_view(
+            _trailing(low, STOCH_FASTK_PERIOD + span - 1), STOCH_FASTK_PERIOD, axis=1
+        ).min(axis=2)
+        diff = (highest - lowest) / 100.0
+        fast_k = np.where(diff != 0.0, (_trailing(close, span) - lowest) / diff, 0.0)
+        slow_k = sliding_window_view(fast_k, STOCH_SLOWK_PERIOD, axis=1).sum(axis=2)
+        slow_k /= STOCH_SLOWK_PERIOD
+        readings["stochastic_k"] = slow_k[:, -1]
+        readings["stochastic_d"] = slow_k.sum(axis=1) / STOCH_SLOWD_PERIOD
+
+        highest = _trailing(high, WILLIAMS_PERIOD).max(axis=1)
+        lowest = _trailing(low, WILLIAMS_PERIOD).min(axis=1)
+        diff = (highest - lowest) / -100.0
+        readings["williams_r"] = np.where(diff != 0.0, (highest - close[:, -1]) / diff, 0.0)
+
+        # Bollinger Bands use the population deviation, computed the way TA-Lib does.
+        window = _trailing(close, BB_PERIOD)
+        middle = window.sum(axis=1) / BB_PERIOD
+        variance = (window * window).sum(axis=1) / BB_PERIOD - middle * middle
+        band = BB_DEV * np.where(variance >= _TA_EPSILON, np.sqrt(np.abs(variance)), 0.0)
+        readings["bollinger_upper"] = middle + band
+        readings["bollinger_middle"] = middle
+        readings["bollinger_lower"] = middle - band
+
+        readings["atr"] = _wilder_average(true_range, ATR_PERIOD, first + 1)
+
+        # OBV accumulates in time order from the first candle's volume.
+        after_first = np.arange(width) > first[:, None]
+        signed = np.where(after_first, np.sign(close - prev_close) * volume, 0.0)
+        signed[index, np.minimum(first, width - 1)] = volume[index, np.minimum(first, width - 1)]
+        readings["on_balance_volume"] = np.cumsum(signed, axis=1)[:, -1]
+
+        hi, lo, cl, vol = (_trailing(col, CMF_PERIOD) for col in (high, low, close, volume))
+        flow = np.where(hi - lo > 0, ((cl - lo) - (hi - cl)) / (hi - lo), 0.0) * vol
+        volume_total = vol.sum(axis=1)
+        readings["chaikin_money_flow"] = np.where(
+            volume_total != 0, flow.sum(axis=1) / volume_total, np.nan
+        )
+
+    insufficient = candles < MIN_REQUIRED_CANDLES
+    table = pd.DataFrame(
+        {
+            "candles": candles,
+            "last_timestamp": columns["timestamp"][:, -1],
+            **{name: np.where(insufficient, np.nan, value) for name, value in readings.items()},
+        },
+        index=pd.Index(panel.symbols, name="symbol"),
+    )
+    return table
+
+
+def indicator_values_from_row(row: pd.Series) -> IndicatorValues:
+    """Converts one row of an indicator table back into `IndicatorValues`."""
+
+    def reading(name: str) -> float | None:
+        value = float(row[name])
+        return None if math.isnan(value) else value
+
+    values = {
+        field.name: reading(field.name) for field in fields(IndicatorValues) if field.name in row
+    }
+    values["ema_ribbon"] = {f"ema_{p}": reading(f"ema_{p}") for p in EMA_RIBBON_PERIODS}
+    return IndicatorValues(**values)
+
+
+def technical_analysis_from_table(table: pd.DataFrame, symbol: str) -> TechnicalAnalysis:
+    """The interpreted `TechnicalAnalysis` of one symbol of an indicator table."""
+    row = table.loc[symbol]
+    if row["candles"] < MIN_REQUIRED_CANDLES:
+        return empty_technical_analysis()
+    return interpret_indicator_values(indicator_values_from_row(row))
@@ -0,0 +1,206 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from loguru import logger
+
+from .analysis import AnalysisResult, OrderBookAnalysis, calculate_order_book_stats, run_analysis
+from .api.batches import TickerTable, TradeBatch
+from .api.client import MarketDataAPI
+from .api.models import Granularity, OrderBookStep
+from .scan import ScanFailure
+from .screener import rank_tickers, screen_tickers
+
+if TYPE_CHECKING:
+    from .panel import CandlePanel
+
+# Cheap per-symbol measures computed from candles in stage two, any of which can rank the
+# shortlist: the standard deviation of log returns, the total return, the quote volume,
+# and the net move as a fraction of the distance travelled (1 is a straight line).
+CANDLE_SCORES = ("volatility", "return", "volume", "efficiency")
+
+FinalStage = Literal["indicators", "orderbook"]
+
+
+@dataclass(frozen=True, slots=True)
+class PrefilterConfig:
+    """
+    Thresholds and stage limits of `prefilter_symbols`.
+
+    Stage one keeps the tickers passing every filter that is set (see `screen_tickers`),
+    then the `max_candidates` with the highest USDT volume. Stage two ranks those by the
+    `score_by` candle score and keeps the best `top`.
+    """
+
+    quote_asset: str | None = "USDT"
+    min_usdt_volume: float | None = 1e6
+    max_spread_bps: float | None = None
+    min_range: float | None = None
+    min_abs_change: float | None = None
+    max_candidates: int = 100
+    score_by: str = "volatility"
+    top: int = 10
+
+
+@dataclass(slots=True)
+class PrefilterReport:
+    """What each stage of `prefilter_symbols` kept, with the final analyses."""
+
+    # Tickers fetched in stage one, and those that passed its filters and limit.
+    universe: int
+    candidates: TickerTable
+    # Each candidate's candle scores from stage two (None where there were too few).
+    candle_scores: dict[str, dict[str, float | None]] = field(default_factory=dict)
+    # Candidates that made the final stage, best first.
+    shortlist: list[str] = field(default_factory=list)
+    analyses: list[AnalysisResult] = field(default_factory=list)
+    order_books: dict[str, OrderBookAnalysis] = field(default_factory=dict)
+    failures: list[ScanFailure] = field(default_factory=list)
+
+
+def score_candles(panel: "CandlePanel") -> dict[str, np.ndarray]:
+    """
+    Computes every `CANDLE_SCORES` measure for all the panel's symbols in one pass over
+    its (symbols x time) arrays. Symbols with fewer than two candles score NaN.
+    """
+    returns = np.diff(np.log(panel.close), axis=1)
+    valid = np.isfinite(returns)
+    count = valid.sum(axis=1)
+    returns = np.where(valid, returns, 0.0)
+    net = returns.sum(axis=1)
+    path = np.abs(returns).sum(axis=1)
+    scored = count > 0
+
+    def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(
+            numerator, denominator, out=np.full(len(panel), np.nan), where=denominator > 0
+        )
+
+    mean = ratio(net, count)
+    deviations = np.where(valid, returns - mean[:, None], 0.0)
+    return {
+        "volatility": np.sqrt(ratio((deviations**2).sum(axis=1), count)),
+        "return": np.where(scored, np.expm1(net), np.nan),
+        "volume": np.where(scored, np.nansum(panel.close * panel.volume, axis=1), np.nan),
+        "efficiency": np.where(scored, ratio(np.abs(net), path), np.nan),
+    }
+
+
+def _fetch_each[T](
+    pool: ThreadPoolExecutor,
+    symbols: list[str],
+    fetch: Callable[[str], T],
+    failures: list[ScanFailure],
+) -> dict[str, T]:
+    """Runs `fetch` for every symbol on `pool`, recording failures instead of raising."""
+    futures = {symbol: pool.submit(fetch, symbol) for symbol in symbols}
+    results: dict[str, T] = {}
+    for symbol, future in futures.items():
+        try:
+            results[symbol] = future.result()
+        except Exception as e:
+            logger.error(f"{symbol}: fetch failed: {e}")
+            failures.append(ScanFailure(symbol=symbol, stage="fetch", error=str(e)))
+    return results
+
+
+def prefilter_symbols(
+    market: MarketDataAPI,
+    granularity: Granularity,
+    candle_limit: int,
+    config: PrefilterConfig | None = None,
+    final_stage: FinalStage = "indicators",
+    fetch_workers: int = 8,
+    orderbook_level: OrderBookStep = "step0",
+    orderbook_limit: int = 50,
+) -> PrefilterReport:
+    """
+    Shortlists the spot universe in stages, so each costlier stage only sees the symbols
+    that survived the cheaper one before it.
+
+    1. One bulk tickers request, screened and ranked in a single vectorized pass.
+    2. Candles for the surviving candidates only, fetched concurrently on
+       `fetch_workers` threads and scored together (see `score_candles`).
+    3. For the best `config.top` candidates, the full 'fast' `run_analysis` over the
+       candles already fetched, or, with `final_stage="orderbook"`, an order book
+       snapshot and its analysis.
+
+    A symbol that fails to fetch or analyze is reported in the report's `failures`
+    instead of aborting the run.
+
+    Raises:
+        ValueError: If `config.score_by` is not one of `CANDLE_SCORES`.
+    """
+    config = config or PrefilterConfig()
+    if config.score_by not in CANDLE_SCORES:
+        raise ValueError(
+            f"Cannot score candles by {config.score_by!r}; choose from {CANDLE_SCORES}"
+        )
+    # The candle panel is built on pandas, so keep it off the CLI's import path
+    from .panel import CandlePanel
+
+    tickers = market.get_tickers()
+    screened = screen_tickers(
+        tickers,
+        quote_asset=config.quote_asset,
+        min_usdt_volume=config.min_usdt_volume,
+        max_spread_bps=config.max_spread_bps,
+        min_range=config.min_range,
+        min_abs_change=config.min_abs_change,
+    )
+    report = PrefilterReport(
+        universe=len(tickers),
+        candidates=rank_tickers(screened, "usdt_volume", config.max_candidates),
+    )
+    symbols = report.candidates.symbol.tolist()
+    logger.info(
+        f"Stage 1: {len(screened)} of {len(tickers)} tickers passed the filters; "
+        f"fetching candles for the top {len(symbols)} by volume."
+    )
+
+    with ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="prefilter") as pool:
+        candles = _fetch_each(
+            pool,
+            symbols,
+            lambda symbol: market.get_candle_batch(symbol, granularity, candle_limit),
+            report.failures,
+        )
+        panel = CandlePanel.from_batches(candles)
+        scores = score_candles(panel)
+        for row, symbol in enumerate(panel.symbols):
+            report.candle_scores[symbol] = {
+                name: None if np.isnan(values[row]) else float(values[row])
+                for name, values in scores.items()
+            }
+        ranking = scores[config.score_by]
+        order = np.argsort(-ranking, kind="stable")
+        report.shortlist = [
+            panel.symbols[i] for i in order[: config.top] if np.isfinite(ranking[i])
+        ]
+        logger.info(
+            f"Stage 2: scored {len(panel)} symbols by {config.score_by}; "
+            f"analyzing the top {len(report.shortlist)}."
+        )
+
+        if final_stage == "orderbook":
+            books = _fetch_each(
+                pool,
+                report.shortlist,
+                lambda symbol: market.get_order_book_snapshot(
+                    symbol, orderbook_level, orderbook_limit
+                ),
+                report.failures,
+            )
+            for symbol, book in books.items():
+                report.order_books[symbol] = calculate_order_book_stats(book)
+            return report
+
+    for symbol in report.shortlist:
+        try:
+            report.analyses.append(run_analysis(symbol, TradeBatch.empty(), candles[symbol]))
+        except Exception as e:
+            logger.error(f"{symbol}: analysis failed: {e}")
+            report.failures.append(ScanFailure(symbol=symbol, stage="analysis", error=str(e)))
+    return report
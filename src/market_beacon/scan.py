@@ -0,0 +1,225 @@
+import multiprocessing
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+from loguru import logger
+
+from .analysis import AnalysisResult, run_analysis
+from .api.batches import CandleBatch, TradeBars, TradeBatch
+from .api.client import MarketDataAPI
+from .api.models import GRANULARITY_SECONDS, Granularity
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+AnalysisMode = Literal["fast", "full"]
+
+# Summary table column used for each `--rank-by` choice.
+RANK_COLUMNS = {
+    "change": "change_%",
+    "rsi": "rsi",
+    "adx": "adx",
+    "macd": "macd_hist",
+    "volume": "volume",
+}
+_SUMMARY_COLUMNS = (
+    "change_%",
+    "rsi",
+    "adx",
+    "macd_hist",
+    "trend",
+    "crossover",
+    "cloud",
+    "volume",
+    "vwap",
+)
+_NUMERIC_SUMMARY_COLUMNS = ("change_%", "rsi", "adx", "macd_hist", "volume", "vwap")
+
+
+@dataclass(frozen=True, slots=True)
+class ScanFailure:
+    """A symbol whose scan failed, and the stage it failed in."""
+
+    symbol: str
+    stage: Literal["fetch", "analysis"]
+    error: str
+
+
+def fetch_analysis_inputs(
+    market: MarketDataAPI,
+    symbol: str,
+    granularity: Granularity,
+    candle_limit: int,
+    mode: AnalysisMode = "fast",
+    trade_workers: int = 1,
+) -> tuple[CandleBatch, TradeBatch | TradeBars]:
+    """
+    Fetches the candles `run_analysis` needs and, in 'full' mode, every trade within the
+    candles' time range.
+
+    The trades are streamed and aggregated into `TradeBars` as they arrive (one bar per
+    candle), so memory does not grow with the number of trades.
+    """
+    candles = market.get_candle_batch(symbol=symbol, granularity=granularity, limit=candle_limit)
+    trades: TradeBatch | TradeBars = TradeBatch.empty()
+    if not len(candles):
+        logger.warning(f"No candle data returned for {symbol}, skipping analysis.")
+    elif mode == "full":
+        start_time = datetime.fromtimestamp(candles.timestamp[0] / 1000.0)
+        interval = GRANULARITY_SECONDS.get(granularity)
+        if interval is None:
+            # Calendar months have no fixed length: aggregate the candles' whole range into
+            # a single bar, fetched as one window per worker.
+            start_ms, end_ms = int(candles.timestamp[0]), int(candles.timestamp[-1])
+            span_ms = end_ms - start_ms + 1
+            trades = market.get_trade_bars(
+                symbol=symbol,
+                start_time=start_time,
+                end_time=datetime.fromtimestamp(end_ms / 1000.0),
+                interval=timedelta(milliseconds=span_ms),
+                max_workers=trade_workers,
+                window=timedelta(milliseconds=-(-span_ms // max(1, trade_workers))),
+            )
+        else:
+            # Up to the last millisecond of the newest candle.
+            end_ms = int(candles.timestamp[-1]) + interval * 1000 - 1
+            trades = market.get_trade_bars(
+                symbol=symbol,
+                start_time=start_time,
+                end_time=datetime.fromtimestamp(end_ms / 1000.0),
+                interval=timedelta(seconds=interval),
+                max_workers=trade_workers,
+            )
+    return candles, trades
+
+
+def _init_analysis_worker() -> None:
+    """Quiets per-symbol info logging in analysis worker processes."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+
+def _submit(executor: Executor | None, func: Callable[..., Any], *args: Any) -> Future:
+    """Submits to `executor`, or runs `func` inline and returns an already-done future."""
+    if executor is not None:
+        return executor.submit(func, *args)
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def scan_symbols(
+    market: MarketDataAPI,
+    symbols: Iterable[str],
+    granularity: Granularity,
+    candle_limit: int,
+    mode: AnalysisMode = "fast",
+    fetch_workers: int = 8,
+    processes: int | None = None,
+    trade_workers: int = 1,
+) -> Iterator[AnalysisResult | ScanFailure]:
+    """
+    Fetches and analyzes many symbols, yielding each result as soon as it is ready.
+
+    Fetches run concurrently on `fetch_workers` threads sharing the client's session and
+    rate limiter. Each symbol's `run_analysis` is submitted to a pool of `processes`
+    long-lived worker processes as soon as its data arrives, so fetching and analysis
+    overlap and every worker pays the pandas/TA-Lib import once. `processes=0` analyzes
+    in the calling process instead.
+
+    A symbol that fails to fetch or analyze is reported as a `ScanFailure` rather than
+    aborting the scan.
+    """
+    symbols = list(symbols)
+    fetchers = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="scan")
+    analyzers = (
+        ProcessPoolExecutor(
+            max_workers=processes,
+            # Forking a process that runs fetch threads can deadlock; spawn fresh workers.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_analysis_worker,
+        )
+        if processes != 0
+        else None
+    )
+    pending: dict[Future, tuple[str, Literal["fetch", "analysis"]]] = {
+        fetchers.submit(
+            fetch_analysis_inputs, market, symbol, granularity, candle_limit, mode, trade_workers
+        ): (symbol, "fetch")
+        for symbol in symbols
+    }
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol, stage = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"{symbol}: {stage} failed: {e}")
+                    yield ScanFailure(symbol=symbol, stage=stage, error=str(e))
+                    continue
+                if stage == "analysis":
+                    yield result
+                    continue
+                candles, trades = result
+                analysis = _submit(analyzers, run_analysis, symbol, trades, candles, mode)
+                pending[analysis] = (symbol, "analysis")
+    finally:
+        fetchers.shutdown(wait=False, cancel_futures=True)
+        if analyzers is not None:
+            analyzers.shutdown(wait=False, cancel_futures=True)
+
+
+def summarize_scan(
+    results: Iterable[AnalysisResult], rank_by: str = "change", top: int | None = None
+) -> "pd.DataFrame":
+    """
+    Builds a ranked summary table with one row per symbol, best first.
+
+    Args:
+        results: Completed analyses.
+        rank_by: A key of `RANK_COLUMNS`; rows are sorted by that column, descending,
+            with missing values last.
+        top: If set, keep only the best `top` rows.
+    """
+    import pandas as pd
+
+    rows = []
+    for result in results:
+        technical = result.technical_analysis
+        trend = technical.trend_indicators
+        rows.append(
+            {
+                "symbol": result.symbol,
+                "change_%": technical.price_change_percent,
+                "rsi": technical.momentum_indicators.rsi,
+                "adx": trend.adx.adx,
+                "macd_hist": trend.macd.histogram,
+                "trend": trend.parabolic_sar.trend_direction,
+                "crossover": trend.moving_averages.crossover_signal,
+                "cloud": trend.ichimoku_cloud.price_position,
+                "volume": result.trade_stats.total_volume,
+                "vwap": result.trade_stats.vwap,
+            }
+        )
+    table = pd.DataFrame(rows, columns=["symbol", *_SUMMARY_COLUMNS])
+    table = table.astype(dict.fromkeys(_NUMERIC_SUMMARY_COLUMNS, np.float64))
+    table = table.sort_values(RANK_COLUMNS[rank_by], ascending=False, na_position="last")
+    table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+    return table if top is None else table.head(top)
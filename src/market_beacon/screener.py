@@ -0,0 +1,94 @@
+from typing import Literal
+
+import numpy as np
+
+from .api.batches import TickerTable
+
+# `TickerTable` columns and derived measures tickers can be ranked by.
+TICKER_RANK_KEYS = (
+    "change_24h",
+    "last_price",
+    "base_volume",
+    "quote_volume",
+    "usdt_volume",
+    "spread_bps",
+    "range_24h",
+)
+
+MoveDirection = Literal["gainers", "losers", "both"]
+
+
+def screen_tickers(
+    tickers: TickerTable,
+    quote_asset: str | None = None,
+    min_usdt_volume: float | None = None,
+    max_spread_bps: float | None = None,
+    min_range: float | None = None,
+    min_abs_change: float | None = None,
+) -> TickerTable:
+    """
+    Keeps the tickers that pass every given filter, with one vectorized comparison per
+    filter over the whole table. A missing (NaN) value fails any filter on it.
+
+    Args:
+        tickers: The universe to screen, as returned by `MarketDataAPI.get_tickers`.
+        quote_asset: Keep only symbols quoted in this asset (e.g. "USDT").
+        min_usdt_volume: Minimum 24h volume, in USDT.
+        max_spread_bps: Maximum bid/ask spread, in basis points of the mid-price.
+        min_range: Minimum 24h high/low range, as a fraction of the low (0.05 is 5%).
+        min_abs_change: Minimum absolute 24h price change, as a fraction.
+    """
+    keep = np.ones(len(tickers), dtype=np.bool_)
+    if quote_asset is not None:
+        keep &= np.char.endswith(tickers.symbol, quote_asset)
+    if min_usdt_volume is not None:
+        keep &= tickers.usdt_volume >= min_usdt_volume
+    if max_spread_bps is not None:
+        keep &= tickers.spread_bps <= max_spread_bps
+    if min_range is not None:
+        keep &= tickers.range_24h >= min_range
+    if min_abs_change is not None:
+        keep &= np.abs(tickers.change_24h) >= min_abs_change
+    return tickers[keep]
+
+
+def rank_tickers(
+    tickers: TickerTable,
+    by: str = "usdt_volume",
+    top: int | None = None,
+    ascending: bool = False,
+) -> TickerTable:
+    """
+    Sorts the tickers by a column, highest first unless `ascending`, with missing values
+    last and ties in their original order.
+
+    Args:
+        tickers: The tickers to rank.
+        by: A key of `TICKER_RANK_KEYS`.
+        top: If set, keep only the best `top` rows.
+        ascending: Rank the lowest values first.
+
+    Raises:
+        ValueError: If `by` is not a key of `TICKER_RANK_KEYS`.
+    """
+    if by not in TICKER_RANK_KEYS:
+        raise ValueError(f"Cannot rank tickers by {by!r}; choose from {TICKER_RANK_KEYS}")
+    values = getattr(tickers, by)
+    # NaN sorts last either way, since negating it leaves it NaN.
+    order = np.argsort(values if ascending else -values, kind="stable")
+    return tickers[order[:top]]
+
+
+def top_movers(
+    tickers: TickerTable, count: int = 10, direction: MoveDirection = "both"
+) -> TickerTable:
+    """
+    The `count` tickers with the largest 24h price change: the biggest gains, the biggest
+    losses, or the biggest moves either way.
+    """
+    if direction == "gainers":
+        return rank_tickers(tickers, "change_24h", count)
+    if direction == "losers":
+        return rank_tickers(tickers, "change_24h", count, ascending=True)
+    order = np.argsort(-np.abs(tickers.change_24h), kind="stable")
+    return tickers[order[:count]]
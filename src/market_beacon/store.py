@@ -0,0 +1,145 @@
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from .api.batches import CANDLE_ROW_FIELDS, CandleBatch
+from .api.models import MAX_CANDLES_PER_REQUEST
+
+
+def plan_candle_refresh(
+    timestamps: np.ndarray, interval_ms: int, limit: int, now_ms: int
+) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Works out which candles must be fetched to serve the latest `limit` candles.
+
+    The candle grid is anchored on the newest stored open time, so granularities aligned
+    to non-UTC sessions or weeks are handled without knowing the exchange's alignment.
+
+    Args:
+        timestamps: Sorted open times (ms) of the stored candles. Must not be empty.
+        interval_ms: The candle length in milliseconds.
+        limit: The number of most recent candles requested.
+        now_ms: The current time in milliseconds.
+
+    Returns:
+        The open time of the oldest candle in the requested window, and a list of
+        inclusive `(start_ms, end_ms)` open-time ranges to fetch. The newest stored candle
+        is always refetched since it may have been incomplete when it was stored.
+    """
+    last_ts = int(timestamps[-1])
+    latest_open = last_ts + max(0, (now_ms - last_ts) // interval_ms) * interval_ms
+    window_start = latest_open - (limit - 1) * interval_ms
+
+    expected = np.arange(window_start, latest_open + 1, interval_ms, dtype=np.int64)
+    present = np.isin(expected, timestamps[:-1], assume_unique=True)
+    missing = expected[~present]
+    if not len(missing):
+        return window_start, []
+
+    # Split the missing open times into contiguous runs of at most one request each.
+    breaks = np.flatnonzero(np.diff(missing) != interval_ms) + 1
+    ranges: list[tuple[int, int]] = []
+    for run in np.split(missing, breaks):
+        for chunk_start in range(0, len(run), MAX_CANDLES_PER_REQUEST):
+            chunk = run[chunk_start : chunk_start + MAX_CANDLES_PER_REQUEST]
+            ranges.append((int(chunk[0]), int(chunk[-1])))
+    return window_start, ranges
+
+
+class CandleStore:
+    """
+    A persistent, columnar candle cache with one `.npz` file per (symbol, granularity).
+
+    Each file holds the columns of a `CandleBatch`, sorted by open time with no
+    duplicates. Writes go to a temporary file that atomically replaces the old one, so a
+    crashed or concurrent run never leaves a torn file behind.
+
+    Args:
+        root: Directory that holds the cache files. Created on first write.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def path_for(self, symbol: str, granularity: str) -> Path:
+        """Returns the file backing `(symbol, granularity)`."""
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", f"{symbol}_{granularity}")
+        return self.root / f"{safe}.npz"
+
+    def load(self, symbol: str, granularity: str) -> CandleBatch:
+        """Loads the stored candles for a key, or an empty batch if nothing is cached."""
+        path = self.path_for(symbol, granularity)
+        if not path.exists():
+            return CandleBatch.empty()
+        try:
+            with np.load(path) as data:
+                return CandleBatch(*(data[name] for name in CANDLE_ROW_FIELDS))
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Discarding unreadable candle cache {path}: {e}")
+            return CandleBatch.empty()
+
+    def last_timestamp(self, symbol: str, granularity: str) -> int | None:
+        """Returns the open time (ms) of the newest stored candle, if any."""
+        timestamps = self.load(symbol, granularity).timestamp
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def plan_refresh(
+        self, symbol: str, granularity: str, interval_ms: int, limit: int, now_ms: int
+    ) -> tuple[int, list[tuple[int, int]]] | None:
+        """
+        Plans the fetches needed to bring a key up to date (see `plan_candle_refresh`).
+
+        Returns None if nothing is stored for the key yet.
+        """
+        timestamps = self.load(symbol, granularity).timestamp
+        if not len(timestamps):
+            return None
+        return plan_candle_refresh(timestamps, interval_ms, limit, now_ms)
+
+    def read(
+        self, symbol: str, granularity: str, start_ms: int | None = None, limit: int | None = None
+    ) -> CandleBatch:
+        """Returns up to the newest `limit` stored candles opening at or after `start_ms`."""
+        batch = self.load(symbol, granularity)
+        first = 0
+        if start_ms is not None:
+            first = int(np.searchsorted(batch.timestamp, start_ms, side="left"))
+        if limit is not None:
+            first = max(first, len(batch) - limit)
+        return batch[first:]
+
+    def upsert(self, symbol: str, granularity: str, candles: CandleBatch) -> CandleBatch:
+        """
+        Merges `candles` into the stored candles and returns the merged result.
+
+        Incoming candles replace stored candles with the same open time, which lets a
+        refreshed (previously incomplete) latest candle overwrite its stale copy.
+        """
+        existing = self.load(symbol, granularity)
+        if not len(candles):
+            return existing
+        merged = CandleBatch.concat([existing, candles])
+
+        # np.unique keeps the first occurrence, so search the reversed timestamps to let
+        # the incoming (later) rows win; the returned indices are in ascending time order.
+        reversed_ts = merged.timestamp[::-1]
+        _, first_in_reversed = np.unique(reversed_ts, return_index=True)
+        merged = merged[len(reversed_ts) - 1 - first_in_reversed]
+
+        self._write(self.path_for(symbol, granularity), merged)
+        return merged
+
+    def _write(self, path: Path, candles: CandleBatch) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **candles.columns())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
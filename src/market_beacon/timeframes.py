@@ -0,0 +1,162 @@
+from collections.abc import Mapping, Sequence
+
+from loguru import logger
+
+from . import metrics
+from .analysis import AnalysisResult, calculate_trade_stats_from_candles
+from .api.batches import CandleBatch
+from .api.client import MarketDataAPI
+from .api.models import GRANULARITY_SECONDS, MAX_CANDLES_PER_REQUEST, Granularity
+
+# Granularities whose candles open on whole multiples of their length since the Unix
+# epoch, so any of them can be rebuilt from a finer one. Bitget aligns "6h", "12h", "1day"
+# and "1week" to UTC+8 (their "utc" variants are listed instead), and neither "3Dutc" nor
+# "1Wutc" starts its candles on an epoch multiple.
+RESAMPLABLE_GRANULARITIES: tuple[Granularity, ...] = (
+    "1min",
+    "3min",
+    "5min",
+    "15min",
+    "30min",
+    "1h",
+    "4h",
+    "6Hutc",
+    "12Hutc",
+    "1Dutc",
+)
+
+
+def order_timeframes(timeframes: Sequence[Granularity]) -> list[Granularity]:
+    """
+    Returns the distinct timeframes finest first, checking each can be derived from the
+    finest one.
+
+    Raises:
+        ValueError: If a timeframe is not in `RESAMPLABLE_GRANULARITIES` or its length is
+            not a multiple of the finest timeframe's.
+    """
+    unsupported = [tf for tf in timeframes if tf not in RESAMPLABLE_GRANULARITIES]
+    if unsupported or not timeframes:
+        raise ValueError(
+            f"Cannot derive timeframes {unsupported or list(timeframes)}; choose from "
+            f"{', '.join(RESAMPLABLE_GRANULARITIES)}"
+        )
+    ordered = sorted(set(timeframes), key=GRANULARITY_SECONDS.__getitem__)
+    base_seconds = GRANULARITY_SECONDS[ordered[0]]
+    uneven = [tf for tf in ordered if GRANULARITY_SECONDS[tf] % base_seconds]
+    if uneven:
+        raise ValueError(f"Timeframes {uneven} are not whole multiples of {ordered[0]}")
+    return ordered
+
+
+def base_candles_needed(timeframes: Sequence[Granularity], candle_limit: int) -> int:
+    """
+    The number of candles of the finest timeframe that yields `candle_limit` candles of
+    the coarsest, counting one extra coarse interval for the partial oldest candle.
+    """
+    ordered = order_timeframes(timeframes)
+    ratio = GRANULARITY_SECONDS[ordered[-1]] // GRANULARITY_SECONDS[ordered[0]]
+    return (candle_limit + 1) * ratio
+
+
+def group_timeframes(
+    timeframes: Sequence[Granularity],
+    candle_limit: int,
+    max_base_candles: int | None = MAX_CANDLES_PER_REQUEST,
+) -> list[list[Granularity]]:
+    """
+    Splits the timeframes, finest first, into groups that can each be resampled from one
+    fetch of their finest member.
+
+    A timeframe joins the previous group unless that would take more than
+    `max_base_candles` base candles (see `base_candles_needed`) or its length is not a
+    multiple of the group's base; it then starts a group of its own, fetched directly.
+    With `max_base_candles=None`, every timeframe is derived from the finest.
+    """
+    ordered = order_timeframes(timeframes)
+    groups = [[ordered[0]]]
+    for timeframe in ordered[1:]:
+        group = groups[-1]
+        fits = GRANULARITY_SECONDS[timeframe] % GRANULARITY_SECONDS[group[0]] == 0 and (
+            max_base_candles is None
+            or base_candles_needed([*group, timeframe], candle_limit) <= max_base_candles
+        )
+        if fits:
+            group.append(timeframe)
+        else:
+            groups.append([timeframe])
+    return groups
+
+
+def resample_timeframes(
+    candles: CandleBatch, timeframes: Sequence[Granularity], candle_limit: int
+) -> dict[Granularity, CandleBatch]:
+    """
+    Builds the latest `candle_limit` candles of every timeframe from candles of the
+    finest one, finest first.
+    """
+    ordered = order_timeframes(timeframes)
+    resampled: dict[Granularity, CandleBatch] = {}
+    for timeframe in ordered:
+        bars = candles
+        if timeframe != ordered[0]:
+            bars = candles.resample(GRANULARITY_SECONDS[timeframe] * 1000)
+        resampled[timeframe] = bars[max(0, len(bars) - candle_limit) :]
+    return resampled
+
+
+def analyze_timeframes(symbol: str, candles: Mapping[Granularity, CandleBatch]) -> AnalysisResult:
+    """
+    Computes the indicator suite for every timeframe in one vectorized pass, as a
+    `CandlePanel` with one row per timeframe.
+
+    Returns:
+        An `AnalysisResult` whose `timeframes` holds each timeframe's analysis, and whose
+        trade stats and `technical_analysis` are those of the first (finest) timeframe.
+    """
+    # The indicator panel is built on pandas, so keep it off the CLI's import path
+    from .panel import CandlePanel, calculate_indicator_table, technical_analysis_from_table
+
+    with metrics.timer(metrics.ANALYSIS_SECONDS, mode="multi-timeframe"):
+        table = calculate_indicator_table(CandlePanel.from_batches(candles))
+        analyses = {
+            timeframe: technical_analysis_from_table(table, timeframe) for timeframe in candles
+        }
+        base = next(iter(candles))
+        return AnalysisResult(
+            symbol=symbol,
+            trade_stats=calculate_trade_stats_from_candles(candles[base]),
+            technical_analysis=analyses[base],
+            timeframes=analyses,
+        )
+
+
+def run_multi_timeframe_analysis(
+    market: MarketDataAPI,
+    symbol: str,
+    timeframes: Sequence[Granularity],
+    candle_limit: int,
+    max_base_candles: int | None = MAX_CANDLES_PER_REQUEST,
+) -> AnalysisResult:
+    """
+    Analyzes `symbol` on several timeframes from as few candle fetches as possible.
+
+    The timeframes are grouped (see `group_timeframes`) so that no fetch needs more than
+    `max_base_candles` candles, by default one request's worth: the finest timeframe of
+    each group is fetched once, covering `candle_limit` candles of the group's coarsest
+    (see `base_candles_needed`), then resampled to the group's other timeframes. All of
+    them are analyzed together (see `analyze_timeframes`). With a candle store configured
+    on the client, later runs only download the candles that closed since, so a larger
+    (or unbounded) `max_base_candles` only costs the first run.
+
+    Raises:
+        ValueError: If the timeframes cannot be derived from one another (see
+            `order_timeframes`).
+    """
+    candles: dict[Granularity, CandleBatch] = {}
+    for group in group_timeframes(timeframes, candle_limit, max_base_candles):
+        limit = base_candles_needed(group, candle_limit) if len(group) > 1 else candle_limit
+        logger.info(f"Analyzing {symbol} on {', '.join(group)} from {limit} {group[0]} candles...")
+        base = market.get_candle_batch(symbol, group[0], limit=limit)
+        candles.update(resample_timeframes(base, group, candle_limit))
+    return analyze_timeframes(symbol, candles)
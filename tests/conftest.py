@@ -0,0 +1,13 @@
+from collections.abc import Iterator
+
+import pytest
+
+from .helpers import StubBitgetServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubBitgetServer]:
+    server = StubBitgetServer()
+    server.start()
+    yield server
+    server.stop()
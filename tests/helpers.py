@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from market_beacon.analysis import TechnicalAnalysis
+from market_beacon.api import AsyncBitgetClient, BitgetClient
+from market_beacon.api.batches import CandleBatch
+
+# Open time of the first generated candle.
+BASE_MS = 1_700_000_000_000
+
+# A route handler receives the parsed query parameters and returns the `data` payload.
+RouteHandler = Callable[[dict[str, str]], Any]
+
+
+class StubHTTPError(Exception):
+    """Raised by a route handler to answer the request with an HTTP error status."""
+
+    def __init__(self, status: int):
+        self.status = status
+        super().__init__(status)
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections when more clients connect at once,
+    # and each dropped one is only retried (by the kernel) a second later.
+    request_queue_size = 64
+
+
+class StubBitgetServer:
+    """A local HTTP server that answers Bitget-style requests from registered routes."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteHandler] = {}
+        # Queued HTTP status codes returned (in order) before a route is served normally.
+        self.failures: dict[str, list[int]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.delay = 0.0
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.max_in_flight = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                with stub._lock:
+                    stub.requests.append((parsed.path, params))
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    with stub._lock:
+                        queued = stub.failures.get(parsed.path)
+                        status = queued.pop(0) if queued else None
+                    if status is not None:
+                        self._send(status, {"code": str(status), "msg": "Injected failure"})
+                        return
+                    route = stub.routes.get(parsed.path)
+                    if route is None:
+                        self._send(404, {"code": "40404", "msg": "Not Found"})
+                        return
+                    try:
+                        data = route(params)
+                    except StubHTTPError as e:
+                        self._send(e.status, {"code": str(e.status), "msg": "Injected failure"})
+                        return
+                    self._send(
+                        200,
+                        {"code": "00000", "msg": "success", "requestTime": 0, "data": data},
+                    )
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+            def _send(self, status: int, payload: dict[str, Any]) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = _StubHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def route(self, endpoint: str, handler: RouteHandler) -> None:
+        """Registers a handler for a V2 endpoint path such as `/spot/market/ticker`."""
+        self.routes[f"/api/v2{endpoint}"] = handler
+
+    def fail(self, endpoint: str, *statuses: int) -> None:
+        """Makes the next requests to `endpoint` fail with the given HTTP statuses."""
+        self.failures.setdefault(f"/api/v2{endpoint}", []).extend(statuses)
+
+    def client[C: (BitgetClient, AsyncBitgetClient)](
+        self, client_type: type[C] = BitgetClient, **kwargs: Any
+    ) -> C:
+        """Returns a client of `client_type`, built with `kwargs`, that talks to this server."""
+        client = client_type("key", "secret", "passphrase", **kwargs)
+        client.BASE_URL = self.url
+        return client
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_random_candles(count: int, seed: int = 11) -> CandleBatch:
+    """A random walk of 1-minute candles with trending stretches, gaps and some flat candles."""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.004, count // 40 + 1), 40)[:count]
+    close = 100 * np.cumprod(1 + drift + rng.normal(0, 0.01, count))
+    open_ = np.concatenate([close[:1], close[:-1]]) * (1 + rng.normal(0, 0.002, count))
+    high = np.maximum(open_, close) * (1 + rng.exponential(0.004, count))
+    low = np.minimum(open_, close) * (1 - rng.exponential(0.004, count))
+    flat = rng.random(count) < 0.02
+    open_[flat] = high[flat] = low[flat] = close[flat]
+    volume = rng.uniform(1, 50, count)
+    return CandleBatch(
+        timestamp=BASE_MS + np.arange(count, dtype=np.int64) * 60_000,
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+        quote_volume=volume * close,
+    )
+
+
+def _flatten(value: Any, prefix: str = "") -> dict[str, Any]:
+    if isinstance(value, dict):
+        flat: dict[str, Any] = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}{key}."))
+        return flat
+    return {prefix.rstrip("."): value}
+
+
+def assert_same_analysis(actual: TechnicalAnalysis, expected: TechnicalAnalysis) -> None:
+    """Asserts two analyses agree: labels exactly, readings to floating-point rounding."""
+    want, got = _flatten(expected.model_dump()), _flatten(actual.model_dump())
+    assert got.keys() == want.keys()
+    for key, value in want.items():
+        if isinstance(value, float):
+            assert got[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+        else:
+            assert got[key] == value, key
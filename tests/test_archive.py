@@ -0,0 +1,117 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from market_beacon.analysis import (
+    calculate_order_book_stats,
+    calculate_technical_indicators,
+    run_analysis,
+)
+from market_beacon.api.batches import OrderBookSnapshot, TradeBatch
+from market_beacon.archive import MarketArchive
+
+from .helpers import BASE_MS, make_random_candles
+
+MINUTE_MS = 60_000
+
+
+def _trades(ids: list[int]) -> TradeBatch:
+    ids_array = np.array(ids, dtype=np.int64)
+    return TradeBatch(
+        ids_array,
+        BASE_MS + ids_array // 2 * 1000,
+        100.0 + ids_array,
+        np.ones(len(ids)),
+        ids_array % 2 == 0,
+    )
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, mmap.mmap)
+
+
+def test_appends_read_back_as_mapped_views_and_seek_by_time(tmp_path):
+    archive = MarketArchive(tmp_path)
+    candles = make_random_candles(300)
+
+    assert archive.append_candles("BTC/USDT", "1min", candles[:200]) == 200
+    # Overlapping and already archived candles are skipped.
+    assert archive.append_candles("BTC/USDT", "1min", candles[150:]) == 100
+    assert archive.append_candles("BTC/USDT", "1min", candles[:10]) == 0
+
+    stored = archive.candles("BTC/USDT", "1min")
+    for name, column in candles.columns().items():
+        np.testing.assert_array_equal(getattr(stored, name), column)
+    # Every column is a read-only view of the archive file, not a copy.
+    assert all(_is_mapped(column) for column in stored.columns().values())
+    assert not stored.close.flags.writeable
+    assert calculate_technical_indicators(stored) == calculate_technical_indicators(candles)
+
+    start, end = BASE_MS + 40 * MINUTE_MS, BASE_MS + 90 * MINUTE_MS
+    window = archive.candles("BTC/USDT", "1min", start_ms=start, end_ms=end)
+    np.testing.assert_array_equal(window.timestamp, candles.timestamp[40:90])
+    assert _is_mapped(window.close)
+    assert not len(archive.candles("BTC/USDT", "1min", start_ms=BASE_MS + 10**9))
+    assert not len(archive.candles("ETHUSDT", "1min"))
+
+    windows = list(archive.candle_windows("BTC/USDT", "1min", 120, start_ms=start, end_ms=end))
+    assert len(windows) == 50
+    assert [len(w) for w in windows[:2]] == [41, 42]
+    np.testing.assert_array_equal(windows[-1].timestamp, candles.timestamp[:90])
+    analysis = run_analysis("BTCUSDT", TradeBatch.empty(), windows[-1])
+    assert analysis == run_analysis("BTCUSDT", TradeBatch.empty(), candles[:90])
+
+
+def test_torn_appends_are_discarded_and_trades_kept_in_order(tmp_path):
+    archive = MarketArchive(tmp_path)
+    assert archive.append_trades("BTCUSDT", _trades([5, 3, 4, 1, 2])) == 5
+    assert archive.append_trades("BTCUSDT", _trades([6, 5, 7])) == 2
+    np.testing.assert_array_equal(archive.trades("BTCUSDT").trade_id, [1, 2, 3, 4, 5, 6, 7])
+
+    # A crash after writing a column but before committing leaves a torn tail behind.
+    directory = archive.path_for("trades", "BTCUSDT")
+    with open(directory / "price.bin", "ab") as f:
+        f.write(b"\xff" * 12)
+    assert len(archive.trades("BTCUSDT")) == 7
+    assert archive.append_trades("BTCUSDT", _trades([8, 9])) == 2
+    trades = archive.trades("BTCUSDT", start_ms=BASE_MS + 3000)
+    np.testing.assert_array_equal(trades.trade_id, [6, 7, 8, 9])
+    np.testing.assert_array_equal(trades.price, [106.0, 107.0, 108.0, 109.0])
+
+    meta = directory / "meta.json"
+    meta.write_text(meta.read_text().replace('"version": 1', '"version": 0'))
+    with pytest.raises(ValueError, match="is version 0"):
+        archive.trades("BTCUSDT")
+
+
+def test_order_book_snapshots_read_back_as_mapped_level_views(tmp_path):
+    archive = MarketArchive(tmp_path)
+    rng = np.random.default_rng(5)
+
+    def book(ts: int, bids: int, asks: int) -> OrderBookSnapshot:
+        bid_levels = np.column_stack([100 - np.arange(bids) * 0.5, rng.uniform(1, 5, bids)])
+        ask_levels = np.column_stack([101 + np.arange(asks) * 0.5, rng.uniform(1, 5, asks)])
+        return OrderBookSnapshot(bid_levels.reshape(-1, 2), ask_levels.reshape(-1, 2), ts)
+
+    books = [book(BASE_MS + i * 1000, bids=i % 4 + 1, asks=3 - i % 3) for i in range(10)]
+    assert archive.append_order_books("BTCUSDT", books[5:][::-1]) == 5
+    # Snapshots not newer than the last archived one are skipped, as are empty books.
+    empty = OrderBookSnapshot(np.empty((0, 2)), np.empty((0, 2)), BASE_MS + 99_000)
+    assert archive.append_order_books("BTCUSDT", [*books, empty]) == 0
+
+    stored = list(archive.order_books("BTCUSDT"))
+    assert [s.timestamp for s in stored] == [b.timestamp for b in books[5:]]
+    for snapshot, expected in zip(stored, books[5:], strict=True):
+        np.testing.assert_array_equal(snapshot.bids, expected.bids)
+        np.testing.assert_array_equal(snapshot.asks, expected.asks)
+        assert _is_mapped(snapshot.bids)
+        assert _is_mapped(snapshot.asks)
+    assert calculate_order_book_stats(stored[-1]) == calculate_order_book_stats(books[-1])
+
+    window = archive.order_books("BTCUSDT", start_ms=BASE_MS + 6500, end_ms=BASE_MS + 9000)
+    assert [s.timestamp for s in window] == [BASE_MS + 7000, BASE_MS + 8000]
+    assert not list(archive.order_books("ETHUSDT"))
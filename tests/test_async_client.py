@@ -0,0 +1,120 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from market_beacon.api import AsyncBitgetClient, BitgetAPIError
+
+
+def _candle_rows(params: dict[str, str]) -> list[list[str]]:
+    limit = int(params["limit"])
+    return [
+        [str(1_700_000_000_000 + i * 60_000), "1", "2", "0.5", "1.5", "10", "15"]
+        for i in range(limit)
+    ]
+
+
+def _ticker(params: dict[str, str]) -> list[dict[str, str]]:
+    return [
+        {
+            "symbol": params["symbol"],
+            "lastPr": "100",
+            "high24h": "110",
+            "low24h": "90",
+            "priceChangePercent": "0.01",
+            "vol24h": "1000",
+            "volUsd": "100000",
+            "ts": "1700000000000",
+        }
+    ]
+
+
+def test_gather_candles_runs_requests_concurrently(stub_server):
+    stub_server.route("/spot/market/candles", _candle_rows)
+    stub_server.delay = 0.2
+    symbols = [f"SYM{i}USDT" for i in range(10)]
+
+    async def scan():
+        async with stub_server.client(AsyncBitgetClient, max_concurrency=10) as client:
+            return await client.market.gather_candles(symbols, granularity="1min", limit=5)
+
+    start = time.perf_counter()
+    results = asyncio.run(scan())
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == symbols
+    assert all(len(candles) == 5 for candles in results.values())
+    assert stub_server.max_in_flight > 1
+    # Sequential fetching would take at least 10 * 0.2s.
+    assert elapsed < 1.0
+
+
+def test_concurrency_limit_is_respected(stub_server):
+    stub_server.route("/spot/market/ticker", _ticker)
+    stub_server.delay = 0.05
+    symbols = [f"SYM{i}USDT" for i in range(8)]
+
+    async def scan():
+        async with stub_server.client(AsyncBitgetClient, max_concurrency=2) as client:
+            return await client.market.gather_tickers(symbols)
+
+    results = asyncio.run(scan())
+
+    assert {s: t.symbol for s, t in results.items()} == {s: s for s in symbols}
+    assert stub_server.max_in_flight <= 2
+
+
+def test_gather_returns_api_errors_per_symbol(stub_server):
+    stub_server.route(
+        "/spot/market/ticker", lambda params: [] if params["symbol"] == "BAD" else _ticker(params)
+    )
+
+    async def scan():
+        async with stub_server.client(AsyncBitgetClient) as client:
+            return await client.market.gather_tickers(["GOOD", "BAD"], return_exceptions=True)
+
+    results = asyncio.run(scan())
+
+    assert results["GOOD"].last_price == 100.0
+    assert isinstance(results["BAD"], BitgetAPIError)
+
+
+def test_http_errors_are_raised_as_api_errors(stub_server):
+    async def fetch():
+        async with stub_server.client(AsyncBitgetClient) as client:
+            return await client.market.get_ticker("BTCUSDT")
+
+    with pytest.raises(BitgetAPIError) as exc_info:
+        asyncio.run(fetch())
+
+    assert exc_info.value.status_code == 404
+
+
+def test_trade_stream_pages_through_the_range(stub_server):
+    trades = [
+        {"tradeId": str(i), "price": "100", "size": "1", "side": "buy", "ts": str(ts)}
+        for i, ts in enumerate(range(1_700_000_000_000, 1_700_000_250_000, 1000))
+    ]
+    stub_server.route(
+        "/spot/market/fills",
+        lambda params: [
+            t
+            for t in trades
+            if int(params["startTime"]) <= int(t["ts"]) <= int(params["endTime"])
+            and int(t["tradeId"]) > int(params.get("afterTradeId", "-1"))
+        ][: int(params["limit"])],
+    )
+
+    async def stream():
+        async with stub_server.client(AsyncBitgetClient) as client:
+            return [
+                len(chunk)
+                async for chunk in client.market.iter_trade_batches(
+                    "BTCUSDT",
+                    datetime.fromtimestamp(1_700_000_000),
+                    datetime.fromtimestamp(1_700_000_250),
+                )
+            ]
+
+    assert asyncio.run(stream()) == [100, 100, 50]
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from market_beacon.api import BitgetAPIError, BitgetClient
+from market_beacon.backfill import backfill_candles, plan_backfill
+from market_beacon.store import CandleStore
+
+from .helpers import BASE_MS, StubHTTPError
+
+MINUTE_MS = 60_000
+
+
+class _History:
+    """Serves a one-candle-per-minute history of `count` candles from `BASE_MS`."""
+
+    def __init__(self, count: int, missing: range = range(0)) -> None:
+        minutes = np.setdiff1d(np.arange(count), np.array(missing, dtype=np.int64))
+        self.timestamps = BASE_MS + minutes * MINUTE_MS
+        self.failing_end_ms: int | None = None
+
+    def _rows(self, timestamps: np.ndarray) -> list[list[str]]:
+        return [[str(ts), "1", "2", "0.5", str(ts % 97), "10", "15"] for ts in timestamps.tolist()]
+
+    def candles(self, params: dict[str, str]) -> list[list[str]]:
+        return self._rows(self.timestamps[-int(params["limit"]) :])
+
+    def history_candles(self, params: dict[str, str]) -> list[list[str]]:
+        end_ms = int(params["endTime"])
+        if end_ms + 1 == self.failing_end_ms:
+            raise StubHTTPError(400)
+        older = self.timestamps[self.timestamps <= end_ms]
+        return self._rows(older[-int(params["limit"]) :])
+
+
+def _serve(stub_server, history: _History) -> BitgetClient:
+    stub_server.route("/spot/market/candles", history.candles)
+    stub_server.route("/spot/market/history-candles", history.history_candles)
+    return stub_server.client()
+
+
+def _at(minute: int) -> datetime:
+    return datetime.fromtimestamp((BASE_MS + minute * MINUTE_MS) / 1000)
+
+
+def test_plan_skips_chunks_already_held():
+    held = np.arange(400, dtype=np.int64) * MINUTE_MS
+    end_ms = 600 * MINUTE_MS
+
+    assert plan_backfill(held, 0, end_ms, MINUTE_MS) == [(400 * MINUTE_MS, end_ms)]
+    assert plan_backfill(np.delete(held, 50), 0, end_ms, MINUTE_MS) == [
+        (400 * MINUTE_MS, end_ms),
+        (0, 200 * MINUTE_MS),
+    ]
+
+
+def test_backfill_downloads_chunks_concurrently_and_reports_gaps(stub_server, tmp_path):
+    history = _History(2000, missing=range(700, 750))
+    stub_server.delay = 0.01
+    store = CandleStore(tmp_path)
+
+    with _serve(stub_server, history) as client:
+        result = backfill_candles(
+            client.market, "BTCUSDT", "1min", _at(-10), _at(2000), store=store, max_workers=4
+        )
+
+    assert result.requests == len(stub_server.requests) == 11
+    assert stub_server.max_in_flight > 1
+    assert result.candles.timestamp.tolist() == history.timestamps.tolist()
+    assert store.load("BTCUSDT", "1min").timestamp.tolist() == history.timestamps.tolist()
+    # Before the history starts, and the outage.
+    assert result.gaps == [
+        (BASE_MS - 10 * MINUTE_MS, BASE_MS),
+        (BASE_MS + 700 * MINUTE_MS, BASE_MS + 750 * MINUTE_MS),
+    ]
+
+
+def test_failed_backfill_keeps_completed_chunks_and_resumes(stub_server, tmp_path):
+    history = _History(1000)
+    history.failing_end_ms = BASE_MS + 600 * MINUTE_MS
+    store = CandleStore(tmp_path)
+
+    with _serve(stub_server, history) as client:
+        with pytest.raises(BitgetAPIError):
+            backfill_candles(client.market, "BTCUSDT", "1min", _at(0), _at(1000), store=store)
+        partial = store.load("BTCUSDT", "1min")
+
+        history.failing_end_ms = None
+        result = backfill_candles(client.market, "BTCUSDT", "1min", _at(0), _at(1000), store=store)
+
+    # Only the failed chunk is downloaded again.
+    assert len(partial) == 800
+    assert result.requests == 1
+    assert result.gaps == []
+    assert store.load("BTCUSDT", "1min").timestamp.tolist() == history.timestamps.tolist()
+
+
+def test_candle_limit_above_one_request_pages_back_through_history(stub_server):
+    history = _History(3000)
+
+    with _serve(stub_server, history) as client:
+        candles = client.market.get_candle_batch("BTCUSDT", "1min", limit=1500)
+
+    assert candles.timestamp.tolist() == history.timestamps[-1500:].tolist()
+    paths = [path.removeprefix("/api/v2") for path, _ in stub_server.requests]
+    assert paths == ["/spot/market/candles", *["/spot/market/history-candles"] * 3]
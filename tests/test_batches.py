@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from market_beacon.analysis import (
+    calculate_technical_indicators,
+    calculate_trade_stats_from_trades,
+    run_analysis,
+)
+from market_beacon.api.batches import CandleBatch, TradeBars, TradeBatch
+
+from .helpers import BASE_MS
+
+
+def _candle_rows(count: int) -> list[list[str]]:
+    rng = np.random.default_rng(7)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, count))
+    rows = []
+    for i, close in enumerate(closes):
+        open_ = closes[i - 1] if i else close
+        high = max(open_, close) * 1.002
+        low = min(open_, close) * 0.998
+        volume = rng.uniform(1, 50)
+        rows.append(
+            [
+                str(BASE_MS + i * 60_000),
+                *(f"{v:.6f}" for v in (open_, high, low, close, volume)),
+                "0",
+                "0",
+            ]
+        )
+    return rows
+
+
+def test_candle_batch_parses_rows_in_bulk():
+    batch = CandleBatch.from_rows([[str(BASE_MS), "1.5", "2", "1", "1.75", "10", "17.5", "17.5"]])
+
+    assert batch.timestamp.dtype == np.int64
+    assert batch.close.dtype == np.float64
+    assert batch.timestamp.tolist() == [BASE_MS]
+    assert batch.quote_volume.tolist() == [17.5]
+
+
+def test_candle_batch_rejects_short_rows():
+    with pytest.raises(ValueError, match="at least 7"):
+        CandleBatch.from_rows([["1", "2", "3"]])
+
+
+def test_candle_batch_round_trips_models():
+    batch = CandleBatch.from_rows(_candle_rows(5))
+
+    again = CandleBatch.from_candles(batch.to_candles())
+
+    for name, column in batch.columns().items():
+        np.testing.assert_array_equal(getattr(again, name), column)
+
+
+def test_trade_batch_parses_rows():
+    rows = [
+        {"tradeId": "2", "price": "101", "size": "0.5", "side": "sell", "ts": str(BASE_MS + 5)},
+        {"tradeId": "1", "price": "100", "size": "1.5", "side": "buy", "ts": str(BASE_MS)},
+    ]
+
+    batch = TradeBatch.from_rows(rows).sorted_by_time()
+
+    assert batch.trade_id.tolist() == [1, 2]
+    assert batch.is_buy.tolist() == [True, False]
+    assert [t.side for t in batch.to_trades()] == ["buy", "sell"]
+
+
+def test_analysis_accepts_batches_and_models_alike():
+    batch = CandleBatch.from_rows(_candle_rows(260))
+    trades = TradeBatch.from_rows(
+        [
+            {"tradeId": str(i), "price": str(100 + i), "size": "1", "side": "buy", "ts": str(i)}
+            for i in range(10)
+        ]
+    )
+
+    from_batch = calculate_technical_indicators(batch)
+    from_models = calculate_technical_indicators(batch.to_candles())
+
+    assert from_batch == from_models
+    assert from_batch.trend_indicators.moving_averages.sma_long is not None
+
+    result = run_analysis("BTCUSDT", trades, batch, mode="full")
+    assert result.trade_stats.total_trades == 10
+    assert result.trade_stats.vwap == pytest.approx(104.5)
+
+
+def _random_trades(count: int, seed: int = 3) -> TradeBatch:
+    rng = np.random.default_rng(seed)
+    return TradeBatch(
+        np.arange(count, dtype=np.int64),
+        BASE_MS + np.sort(rng.integers(0, 10 * 60_000, count)),
+        rng.uniform(99, 101, count),
+        rng.uniform(0.01, 2, count),
+        rng.random(count) < 0.5,
+    )
+
+
+def test_candle_resample_aggregates_whole_intervals():
+    candles = CandleBatch.from_rows(_candle_rows(100))
+
+    bars = candles.resample(300_000)
+
+    # BASE_MS is not a 5-minute boundary, so the partial bar before it is dropped.
+    first_open = -(-BASE_MS // 300_000) * 300_000
+    assert bars.timestamp.tolist() == list(range(first_open, BASE_MS + 100 * 60_000, 300_000))
+    for i, bar_open in enumerate(bars.timestamp.tolist()):
+        rows = (candles.timestamp >= bar_open) & (candles.timestamp < bar_open + 300_000)
+        assert (bars.open[i], bars.close[i]) == (candles.open[rows][0], candles.close[rows][-1])
+        assert (bars.high[i], bars.low[i]) == (candles.high[rows].max(), candles.low[rows].min())
+        assert bars.volume[i] == pytest.approx(candles.volume[rows].sum())
+        assert bars.quote_volume[i] == pytest.approx(candles.quote_volume[rows].sum())
+
+
+def test_trade_bars_aggregate_each_interval_exactly():
+    trades = _random_trades(5_000)
+
+    bars = TradeBars.from_trades(trades, interval_ms=60_000, origin_ms=BASE_MS)
+
+    assert bars.timestamp.tolist() == [BASE_MS + i * 60_000 for i in range(10)]
+    for i, bar_open in enumerate(bars.timestamp.tolist()):
+        in_bar = (trades.timestamp >= bar_open) & (trades.timestamp < bar_open + 60_000)
+        price, size, is_buy = trades.price[in_bar], trades.size[in_bar], trades.is_buy[in_bar]
+        assert (bars.open[i], bars.close[i]) == (price[0], price[-1])
+        assert (bars.high[i], bars.low[i]) == (price.max(), price.min())
+        assert bars.trade_count[i] == len(price)
+        assert bars.buy_count[i] == is_buy.sum()
+        assert bars.vwap[i] == pytest.approx(np.dot(price, size) / size.sum())
+        assert bars.delta[i] == pytest.approx(size[is_buy].sum() - size[~is_buy].sum())
+
+
+def test_trade_bars_combine_intervals_split_across_chunks():
+    trades = _random_trades(2_000)
+    whole = TradeBars.from_trades(trades, interval_ms=60_000, origin_ms=BASE_MS)
+
+    # Chunk boundaries that fall inside bars, as with paginated or windowed fetches.
+    parts = [
+        TradeBars.from_trades(trades[lo:hi], interval_ms=60_000, origin_ms=BASE_MS)
+        for lo, hi in ((0, 333), (333, 1_000), (1_000, 1_001), (1_001, 2_000))
+    ]
+    combined = TradeBars.combine(parts)
+
+    for name, column in whole.columns().items():
+        np.testing.assert_allclose(getattr(combined, name), column, rtol=1e-12)
+    from_bars = calculate_trade_stats_from_trades(combined).model_dump()
+    from_trades = calculate_trade_stats_from_trades(trades).model_dump()
+    assert from_bars == pytest.approx(from_trades)
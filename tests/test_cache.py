@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from market_beacon.api import BitgetAPIError, ReferenceCache
+from market_beacon.api.cache import CLOCK_OFFSET_KEY, SUPPORTED_SYMBOLS_KEY
+
+SYMBOLS_PAYLOAD = {"spotList": ["BTCUSDT", "ETHUSDT"], "futureList": []}
+
+
+def _paths(stub_server) -> list[str]:
+    return [path.removeprefix("/api/v2") for path, _ in stub_server.requests]
+
+
+def test_symbols_are_reused_across_clients_through_the_disk_tier(stub_server, tmp_path):
+    stub_server.route("/spot/market/support-symbols", lambda params: SYMBOLS_PAYLOAD)
+
+    with stub_server.client(reference_cache=ReferenceCache(tmp_path)) as client:
+        assert client.market.get_supported_symbols() == ["BTCUSDT", "ETHUSDT"]
+        assert client.market.get_supported_symbols() == ["BTCUSDT", "ETHUSDT"]
+    with stub_server.client(reference_cache=ReferenceCache(tmp_path)) as client:
+        assert client.market.get_supported_symbols() == ["BTCUSDT", "ETHUSDT"]
+
+    assert _paths(stub_server) == ["/spot/market/support-symbols"]
+
+
+def test_expired_entries_are_refreshed_and_served_stale_on_errors(stub_server):
+    stub_server.route("/spot/market/support-symbols", lambda params: SYMBOLS_PAYLOAD)
+    cache = ReferenceCache(ttls={SUPPORTED_SYMBOLS_KEY: 0})
+
+    with stub_server.client(reference_cache=cache) as client:
+        client.market.get_supported_symbols()
+        client.market.get_supported_symbols()
+        stub_server.fail("/spot/market/support-symbols", 400)
+        assert client.market.get_supported_symbols() == ["BTCUSDT", "ETHUSDT"]
+
+    assert len(stub_server.requests) == 3
+    # Without a value to fall back on, the error propagates.
+    stub_server.fail("/spot/market/support-symbols", 400)
+    with (
+        stub_server.client(reference_cache=ReferenceCache()) as client,
+        pytest.raises(BitgetAPIError),
+    ):
+        client.market.get_supported_symbols()
+
+
+def test_server_time_sets_the_signing_clock_offset(stub_server, tmp_path):
+    stub_server.route(
+        "/public/time", lambda params: {"serverTime": str(int(time.time() * 1000) + 5_000)}
+    )
+
+    with stub_server.client(reference_cache=ReferenceCache(tmp_path)) as client:
+        client.market.get_server_time()
+        assert client.clock.offset_ms == pytest.approx(5_000, abs=500)
+        *_, headers = client._prepare_request("GET", "/spot/account/info")
+        assert int(headers["ACCESS-TIMESTAMP"]) - time.time() * 1000 == pytest.approx(
+            5_000, abs=500
+        )
+
+    # A later run reuses the cached offset without asking the exchange.
+    with stub_server.client(reference_cache=ReferenceCache(tmp_path)) as client:
+        assert client.clock.offset_ms == ReferenceCache(tmp_path).get(CLOCK_OFFSET_KEY)
+        server_time = client.market.get_server_time()
+
+    assert len(stub_server.requests) == 1
+    assert server_time.server_time.timestamp() - time.time() == pytest.approx(5, abs=0.5)
@@ -0,0 +1,265 @@
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import httpx
+import numpy as np
+import pytest
+
+from market_beacon.analysis import TradeStatsAccumulator, calculate_trade_stats_from_trades
+from market_beacon.api import BitgetClient
+from market_beacon.api.auth import generate_signature
+from market_beacon.api.batches import TradeBars, TradeBatch
+from market_beacon.api.client import _BitgetClientBase
+from market_beacon.api.exceptions import BitgetAPIRequestError
+
+from .helpers import BASE_MS
+
+
+def _trades_route(trades: list[dict[str, str]], overlap_ms: int = 0):
+    """
+    Serves `/spot/market/fills` over a fixed trade list, filtered by time range and paged
+    by `afterTradeId`. `overlap_ms` widens the range to mimic inclusive window boundaries.
+    """
+
+    def handler(params: dict[str, str]) -> list[dict[str, str]]:
+        lo = int(params["startTime"]) - overlap_ms
+        hi = int(params["endTime"])
+        after = int(params.get("afterTradeId", "-1"))
+        in_range = [t for t in trades if lo <= int(t["ts"]) <= hi and int(t["tradeId"]) > after]
+        return in_range[: int(params["limit"])]
+
+    return handler
+
+
+def _trades(count: int, spacing_ms: int) -> list[dict[str, str]]:
+    return [
+        {
+            "tradeId": str(i),
+            "price": str(100 + i % 7),
+            "size": "0.5",
+            "side": "buy" if i % 2 else "sell",
+            "ts": str(BASE_MS + i * spacing_ms),
+        }
+        for i in range(count)
+    ]
+
+
+def test_windowed_trades_match_sequential_fetch(stub_server):
+    trades = _trades(count=950, spacing_ms=250)
+    stub_server.route("/spot/market/fills", _trades_route(trades, overlap_ms=1))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 950 * 250) / 1000)
+
+    with stub_server.client() as client:
+        sequential = client.market.get_trades("BTCUSDT", start_time=start, end_time=end)
+        windowed = client.market.get_trades(
+            "BTCUSDT",
+            start_time=start,
+            end_time=end,
+            max_workers=4,
+            window=timedelta(seconds=30),
+        )
+
+    assert [t.trade_id for t in windowed] == [t.trade_id for t in sequential]
+    assert [t.trade_id for t in windowed] == [str(i) for i in range(950)]
+
+
+def test_trade_bars_are_aggregated_per_window(stub_server):
+    trades = _trades(count=950, spacing_ms=250)
+    stub_server.route("/spot/market/fills", _trades_route(trades, overlap_ms=1))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 950 * 250 - 1) / 1000)
+
+    with stub_server.client() as client:
+        bars = client.market.get_trade_bars(
+            "BTCUSDT", start_time=start, end_time=end, interval=timedelta(seconds=60), max_workers=4
+        )
+
+    expected = TradeBars.from_trades(TradeBatch.from_rows(trades), 60_000, BASE_MS)
+    assert len(bars) == 4
+    for name, column in expected.columns().items():
+        np.testing.assert_allclose(getattr(bars, name), column, rtol=1e-12)
+
+
+def test_trade_bars_default_to_one_window_per_worker(stub_server):
+    trades = _trades(count=40, spacing_ms=1000)
+    stub_server.route("/spot/market/fills", _trades_route(trades))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 39_999) / 1000)
+
+    with stub_server.client() as client:
+        bars = client.market.get_trade_bars(
+            "BTCUSDT", start_time=start, end_time=end, interval=timedelta(seconds=1), max_workers=4
+        )
+
+    # Forty one-second bars, but one window (and request) per worker rather than per bar.
+    assert len(bars) == 40
+    assert len(stub_server.requests) == 4
+
+
+def _peak_traced_bytes(consume: Callable[[], object]) -> int:
+    """The peak memory Python allocated (on any thread) while running `consume`."""
+    tracemalloc.start()
+    try:
+        consume()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_trade_stream_yields_chronological_chunks(stub_server):
+    trades = _trades(count=950, spacing_ms=250)
+    stub_server.route("/spot/market/fills", _trades_route(trades, overlap_ms=1))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 950 * 250) / 1000)
+
+    with stub_server.client() as client:
+        pages = list(client.market.iter_trade_batches("BTCUSDT", start, end))
+        windows = list(
+            client.market.iter_trade_batches(
+                "BTCUSDT", start, end, max_workers=4, window=timedelta(seconds=30)
+            )
+        )
+        whole = client.market.get_trade_batch("BTCUSDT", start_time=start, end_time=end)
+
+    assert max(len(page) for page in pages) == 100
+    for chunks in (pages, windows):
+        timestamps = np.concatenate([chunk.timestamp for chunk in chunks])
+        assert timestamps.tolist() == whole.timestamp.tolist()
+
+    accumulator = TradeStatsAccumulator()
+    for chunk in pages:
+        accumulator.update(chunk)
+    assert accumulator.result().model_dump() == pytest.approx(
+        calculate_trade_stats_from_trades(whole).model_dump()
+    )
+
+
+def test_trade_stream_peak_memory_does_not_grow_with_the_range(stub_server):
+    trades = _trades(count=2000, spacing_ms=250)
+    stub_server.route("/spot/market/fills", _trades_route(trades))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+
+    def peaks(count: int) -> tuple[int, int]:
+        end = datetime.fromtimestamp((BASE_MS + count * 250 - 1) / 1000)
+        stream = _peak_traced_bytes(
+            lambda: deque(client.market.iter_trade_batches("BTCUSDT", start, end), maxlen=0)
+        )
+        whole = _peak_traced_bytes(
+            lambda: client.market.get_trade_batch("BTCUSDT", start_time=start, end_time=end)
+        )
+        return stream, whole
+
+    with stub_server.client() as client:
+        small_stream, small_whole = peaks(500)
+        large_stream, large_whole = peaks(2000)
+
+    # Streaming holds one page at a time, while a whole fetch holds every raw trade.
+    assert large_stream < 1.5 * small_stream
+    assert large_whole > 2.5 * small_whole
+
+
+def test_trade_stream_stops_fetching_when_closed_early(stub_server):
+    trades = _trades(count=600, spacing_ms=1000)
+    stub_server.route("/spot/market/fills", _trades_route(trades))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 599_999) / 1000)
+
+    with stub_server.client() as client:
+        stream = client.market.iter_trade_batches(
+            "BTCUSDT", start, end, max_workers=2, window=timedelta(seconds=10)
+        )
+        first = next(stream)
+        stream.close()
+
+    assert first.timestamp.tolist() == [BASE_MS + i * 1000 for i in range(10)]
+    # Two windows ahead at most, out of sixty.
+    assert len(stub_server.requests) <= 4
+
+
+def test_windowed_trades_default_to_one_window_per_worker(stub_server):
+    trades = _trades(count=40, spacing_ms=1000)
+    stub_server.route("/spot/market/fills", _trades_route(trades))
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 39_999) / 1000)
+
+    with stub_server.client() as client:
+        windowed = client.market.get_trades(
+            "BTCUSDT", start_time=start, end_time=end, max_workers=4
+        )
+
+    windows = {(p["startTime"], p["endTime"]) for _, p in stub_server.requests}
+    assert len(windows) == 4
+    assert len(windowed) == 40
+
+
+def test_fast_parse_matches_validated_models(stub_server):
+    trades = _trades(count=30, spacing_ms=1000)
+    stub_server.route("/spot/market/fills", _trades_route(trades))
+    stub_server.route(
+        "/spot/market/candles",
+        lambda params: [
+            [str(BASE_MS + i * 60_000), "1.5", "2.25", "0.75", str(i / 8), "10", "15.5"]
+            for i in range(int(params["limit"]))
+        ],
+    )
+    stub_server.route(
+        "/spot/market/orderbook",
+        lambda params: {
+            "bids": [["99.5", "1.25"], ["99", "3"]],
+            "asks": [["100.5", "0.5"]],
+            "ts": str(BASE_MS),
+        },
+    )
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+    end = datetime.fromtimestamp((BASE_MS + 29_999) / 1000)
+
+    results = []
+    for fast_parse in (False, True):
+        with stub_server.client(fast_parse=fast_parse) as client:
+            results.append(
+                (
+                    client.market.get_trades("BTCUSDT", start_time=start, end_time=end),
+                    client.market.get_candles("BTCUSDT", granularity="1min", limit=50),
+                    client.market.get_order_book("BTCUSDT"),
+                    client.market.get_order_book_snapshot("BTCUSDT"),
+                )
+            )
+
+    (trades_v, candles_v, book_v, snap_v), (trades_f, candles_f, book_f, snap_f) = results
+    assert [t.model_dump() for t in trades_f] == [t.model_dump() for t in trades_v]
+    assert [c.model_dump() for c in candles_f] == [c.model_dump() for c in candles_v]
+    assert book_f.model_dump() == book_v.model_dump()
+    np.testing.assert_array_equal(snap_f.bids, [[99.5, 1.25], [99.0, 3.0]])
+    np.testing.assert_array_equal(snap_f.asks, snap_v.asks)
+
+
+def test_fast_parse_still_rejects_error_codes():
+    response = httpx.Response(200, json={"code": "40034", "msg": "Parameter does not exist"})
+
+    with pytest.raises(BitgetAPIRequestError, match="Parameter does not exist"):
+        _BitgetClientBase._unwrap_response(response, trusted=True)
+
+
+def test_public_requests_are_unsigned_and_private_ones_signed():
+    client = BitgetClient("key", "secret", "passphrase")
+    params = {"symbol": "BTCUSDT", "limit": 5}
+
+    *_, public_headers = client._prepare_request("GET", "/spot/market/candles", params)
+    assert not any(name.startswith("ACCESS-") for name in public_headers)
+
+    *_, headers = client._prepare_request("GET", "/spot/account/assets", params)
+    expected = generate_signature(
+        headers["ACCESS-TIMESTAMP"],
+        "GET",
+        "/api/v2/spot/account/assets?symbol=BTCUSDT&limit=5",
+        "",
+        "secret",
+    )
+    assert headers["ACCESS-SIGN"] == expected
+    assert headers["ACCESS-KEY"] == "key"
+    assert headers["ACCESS-PASSPHRASE"] == "passphrase"
+    # Signing works on a copy of the header template.
+    assert "ACCESS-SIGN" not in client._signed_headers
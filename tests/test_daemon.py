@@ -0,0 +1,132 @@
+from dataclasses import replace
+
+import pytest
+
+from market_beacon.analysis import (
+    AnalysisResult,
+    calculate_trade_stats_from_candles,
+    interpret_indicator_values,
+    run_analysis,
+)
+from market_beacon.api.batches import CandleBatch, TradeBatch
+from market_beacon.daemon import AnalysisDaemon
+from market_beacon.indicators import IndicatorState
+
+from .helpers import BASE_MS, assert_same_analysis, make_random_candles
+
+MINUTE_MS = 60_000
+HISTORY = make_random_candles(1_200)
+
+
+class _Exchange:
+    """Serves `HISTORY` up to a movable clock, with the newest candle still in progress."""
+
+    def __init__(self) -> None:
+        self.now_ms = 0
+
+    def _visible(self) -> CandleBatch:
+        return HISTORY[: (self.now_ms - BASE_MS) // MINUTE_MS + 1]
+
+    def candles(self, params: dict[str, str]) -> list[list[str]]:
+        return self._rows(self._visible()[-int(params["limit"]) :])
+
+    def history_candles(self, params: dict[str, str]) -> list[list[str]]:
+        visible = self._visible()
+        older = visible[visible.timestamp <= int(params["endTime"])]
+        return self._rows(older[-int(params["limit"]) :])
+
+    @staticmethod
+    def _rows(batch: CandleBatch) -> list[list[str]]:
+        columns = [batch.open, batch.high, batch.low, batch.close, batch.volume, batch.quote_volume]
+        return [
+            [str(ts), *(repr(float(column[i])) for column in columns)]
+            for i, ts in enumerate(batch.timestamp.tolist())
+        ]
+
+
+@pytest.fixture
+def exchange(stub_server):
+    exchange = _Exchange()
+    stub_server.route("/spot/market/candles", exchange.candles)
+    stub_server.route("/spot/market/history-candles", exchange.history_candles)
+    client = stub_server.client()
+    with client:
+        exchange.market = client.market
+        yield exchange
+
+
+def _assert_matches_one_shot(result: AnalysisResult, candles: CandleBatch) -> None:
+    expected = run_analysis("BTCUSDT", TradeBatch.empty(), candles)
+    assert result.trade_stats == expected.trade_stats
+    assert_same_analysis(result.technical_analysis, expected.technical_analysis)
+
+
+def _at(candle_index: int) -> int:
+    """Two seconds after the candle at `candle_index` opened."""
+    return BASE_MS + candle_index * MINUTE_MS + 2_000
+
+
+def test_daemon_seeds_then_fetches_only_new_candles(exchange, stub_server):
+    with AnalysisDaemon(exchange.market, ["BTCUSDT"], "1min", candle_limit=300) as daemon:
+        exchange.now_ms = _at(400)
+        (first,) = daemon.tick(exchange.now_ms)
+        # Candle 400 is still in progress, so the window is the 300 closed before it.
+        _assert_matches_one_shot(first, HISTORY[100:400])
+        assert daemon.next_tick_ms() == BASE_MS + 401 * MINUTE_MS + 2_000
+
+        assert daemon.tick(exchange.now_ms + 30_000) == []
+
+        exchange.now_ms = _at(403)
+        (second,) = daemon.tick(exchange.now_ms)
+
+    limits = [int(params["limit"]) for _, params in stub_server.requests]
+    assert limits == [301, 4]
+
+    # The indicators carry the whole history seen, the window stats the latest 300 candles.
+    values = IndicatorState.from_candles(HISTORY[100:403]).values()
+    expected = interpret_indicator_values(replace(values, first_open=float(HISTORY.open[103])))
+    assert_same_analysis(second.technical_analysis, expected)
+    assert second.trade_stats == calculate_trade_stats_from_candles(HISTORY[103:403])
+
+
+def test_daemon_reseeds_after_missing_a_full_window(exchange, stub_server):
+    with AnalysisDaemon(exchange.market, ["BTCUSDT"], "1min", candle_limit=250) as daemon:
+        exchange.now_ms = _at(260)
+        daemon.tick(exchange.now_ms)
+        exchange.now_ms = _at(560)
+        (result,) = daemon.tick(exchange.now_ms)
+
+    assert [int(params["limit"]) for _, params in stub_server.requests] == [251, 251]
+    _assert_matches_one_shot(result, HISTORY[310:560])
+
+
+def test_windows_beyond_one_request_page_back_through_history(exchange, stub_server):
+    with AnalysisDaemon(exchange.market, ["BTCUSDT"], "1min", candle_limit=1_000) as daemon:
+        exchange.now_ms = _at(1_100)
+        (result,) = daemon.tick(exchange.now_ms)
+
+    requests = [
+        (path.removeprefix("/api/v2"), params["limit"]) for path, params in stub_server.requests
+    ]
+    assert requests == [("/spot/market/candles", "1000"), ("/spot/market/history-candles", "1")]
+    # The full 1000 closed candles, as the one-shot CLI would analyze.
+    _assert_matches_one_shot(result, HISTORY[100:1_100])
+
+
+def test_run_returns_once_stopped(exchange):
+    exchange.now_ms = _at(599)
+    ticks = []
+    with AnalysisDaemon(exchange.market, ["BTCUSDT"], "1min") as daemon:
+
+        def on_tick(results):
+            ticks.append(results)
+            daemon.stop()
+
+        daemon.run(on_tick)
+
+    assert len(ticks) == 1
+
+
+def test_calendar_granularities_are_rejected(exchange):
+    with pytest.raises(ValueError, match="no fixed length"):
+        AnalysisDaemon(exchange.market, ["BTCUSDT"], "1M")
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from market_beacon.analysis import MIN_REQUIRED_CANDLES, calculate_technical_indicators
+from market_beacon.api.batches import CandleBatch
+from market_beacon.indicators import IndicatorState
+
+from .helpers import assert_same_analysis, make_random_candles
+
+
+def _assert_matches_talib(state: IndicatorState, candles: CandleBatch) -> None:
+    assert_same_analysis(state.analysis(), calculate_technical_indicators(candles))
+
+
+def test_seeded_state_matches_talib_through_updates():
+    candles = make_random_candles(700)
+    state = IndicatorState.from_candles(candles[:300])
+    _assert_matches_talib(state, candles[:300])
+
+    for end in range(301, 701):
+        assert state.update(candles[end - 1 : end].to_candles()[0])
+        if end % 50 == 0:
+            _assert_matches_talib(state, candles[:end])
+
+    assert state.values().macd_histogram is not None
+    assert state.values().adx is not None
+
+
+def test_state_skips_stale_and_invalid_candles_like_the_batch_path():
+    candles = make_random_candles(260, seed=5)
+    dirty = candles.columns()
+    dirty["close"] = dirty["close"].copy()
+    dirty["close"][100] = np.nan
+    dirty_batch = CandleBatch(**dirty)
+
+    state = IndicatorState.from_candles(dirty_batch)
+    assert len(state) == 259
+    assert state.extend(dirty_batch[:200]) == 0
+
+    _assert_matches_talib(state, dirty_batch)
+
+
+def test_state_is_empty_until_enough_candles():
+    candles = make_random_candles(MIN_REQUIRED_CANDLES)
+    state = IndicatorState.from_candles(candles[:-1])
+
+    assert not state.ready
+    assert state.analysis() == calculate_technical_indicators(candles[:-1])
+    with pytest.raises(ValueError, match="no candles"):
+        IndicatorState().values()
+
+    state.extend(candles[-1:])
+    assert state.ready
+    _assert_matches_talib(state, candles)
@@ -0,0 +1,113 @@
+import io
+import json
+import urllib.request
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+import pytest
+
+from market_beacon import metrics
+from market_beacon.analysis import calculate_technical_indicators
+from market_beacon.api.ratelimit import RetryPolicy
+from market_beacon.metrics import JsonLinesSink, MetricsRegistry
+
+from .helpers import BASE_MS, make_random_candles
+
+TRADES = [
+    {
+        "symbol": "BTCUSDT",
+        "tradeId": str(i),
+        "side": "buy",
+        "price": "100",
+        "size": "1",
+        "ts": str(BASE_MS + i * 1000),
+    }
+    for i in range(250)
+]
+
+
+@pytest.fixture
+def registry() -> Iterator[MetricsRegistry]:
+    registry = MetricsRegistry()
+    metrics.set_sink(registry)
+    yield registry
+    metrics.set_sink(None)
+
+
+def _fills(params: dict[str, str]) -> list[dict[str, str]]:
+    after = int(params.get("afterTradeId", "-1"))
+    return [t for t in TRADES if int(t["tradeId"]) > after][: int(params["limit"])]
+
+
+def test_client_records_latency_bytes_pages_and_retries(stub_server, registry):
+    stub_server.route("/spot/market/fills", _fills)
+    stub_server.route("/spot/market/candles", lambda params: [])
+    stub_server.fail("/spot/market/candles", 503)
+    client = stub_server.client(retry_policy=RetryPolicy(base_delay=0))
+
+    start = datetime.fromtimestamp(BASE_MS / 1000)
+
+    with client:
+        client.market.get_trades("BTCUSDT", start, start + timedelta(hours=1))
+        client.market.get_candle_batch("BTCUSDT", "1min")
+
+    fills, candles = "/spot/market/fills", "/spot/market/candles"
+    assert registry.histogram(metrics.REQUEST_SECONDS, endpoint=fills).count == 3
+    assert registry.counter(metrics.PAGES, endpoint=fills) == 3
+    assert registry.counter(metrics.RESPONSE_BYTES, endpoint=fills) > 250 * 80
+    assert registry.histogram(metrics.DECODE_SECONDS, endpoint=fills).count == 3
+    # The failed attempt is timed too, but only the successful one has a body to decode.
+    assert registry.histogram(metrics.REQUEST_SECONDS, endpoint=candles).count == 2
+    assert registry.histogram(metrics.DECODE_SECONDS, endpoint=candles).count == 1
+    assert registry.counter(metrics.RETRIES, endpoint=candles) == 1
+    for method in ("MarketDataAPI.get_trades", "MarketDataAPI.get_candle_batch"):
+        assert registry.histogram(metrics.API_CALL_SECONDS, method=method).count == 1
+
+
+def test_indicator_groups_are_timed_and_rendered_for_prometheus(registry):
+    calculate_technical_indicators(make_random_candles(300))
+
+    groups = ("trend", "ichimoku", "momentum", "volatility", "volume", "interpret")
+    for group in groups:
+        assert registry.histogram(metrics.INDICATOR_SECONDS, group=group).count == 1
+
+    text = registry.render_prometheus()
+    assert text.count("# TYPE market_beacon_indicator_seconds histogram") == 1
+    assert 'market_beacon_indicator_seconds_bucket{group="trend",le="+Inf"} 1' in text
+    assert 'market_beacon_indicator_seconds_count{group="volume"} 1' in text
+
+
+def test_prometheus_endpoint_and_json_lines_sink():
+    registry = MetricsRegistry()
+    registry.increment(metrics.PAGES, 2, {"endpoint": '/a"b'})
+    server = metrics.serve_prometheus(registry, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'market_beacon_pages_total{endpoint="/a\\"b"} 2.0' in body
+
+    stream = io.StringIO()
+    metrics.set_sink(JsonLinesSink(stream))
+    try:
+        metrics.increment(metrics.RETRIES, endpoint="/x")
+        with metrics.timer(metrics.ANALYSIS_SECONDS, mode="fast"):
+            pass
+    finally:
+        metrics.set_sink(None)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["type"], line["name"], line["labels"]) for line in lines] == [
+        ("counter", metrics.RETRIES, {"endpoint": "/x"}),
+        ("observation", metrics.ANALYSIS_SECONDS, {"mode": "fast"}),
+    ]
+
+
+def test_disabled_instrumentation_is_a_no_op():
+    assert metrics.get_sink() is None
+    # Without a sink every timer is the same shared no-op context manager.
+    assert metrics.timer(metrics.ANALYSIS_SECONDS) is metrics.timer(metrics.DECODE_SECONDS)
+    metrics.increment(metrics.RETRIES, endpoint="/x")
+    calculate_technical_indicators(make_random_candles(300))
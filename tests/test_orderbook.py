@@ -0,0 +1,192 @@
+import random
+
+import numpy as np
+import pytest
+
+from market_beacon.analysis import calculate_order_book_stats
+from market_beacon.api.batches import OrderBookSnapshot
+from market_beacon.api.stream import BookUpdate, StreamMessage, Subscription
+from market_beacon.depth import DepthProfile, calculate_depth_analytics
+from market_beacon.orderbook import OrderBookEngine, OrderBookOutOfSyncError, book_checksum
+
+
+def _levels(book: dict[str, str], descending: bool) -> list[list[str]]:
+    ordered = sorted(book, key=float, reverse=descending)
+    return [[price, book[price]] for price in ordered]
+
+
+def test_engine_matches_reference_book_through_random_deltas():
+    rng = random.Random(3)
+    ref_bids = {f"{100 - i * 0.5:.1f}": f"{rng.uniform(0.1, 5):.3f}" for i in range(40)}
+    ref_asks = {f"{101 + i * 0.5:.1f}": f"{rng.uniform(0.1, 5):.3f}" for i in range(40)}
+    engine = OrderBookEngine("BTCUSDT")
+    engine.apply_snapshot(
+        _levels(ref_bids, descending=True),
+        _levels(ref_asks, descending=False),
+        timestamp=1,
+        seq=1,
+        checksum=book_checksum(_levels(ref_bids, True), _levels(ref_asks, False)),
+    )
+
+    for seq in range(2, 200):
+        deltas: dict[str, list[list[str]]] = {"bids": [], "asks": []}
+        for side, ref, lo in (("bids", ref_bids, 80.0), ("asks", ref_asks, 101.0)):
+            for _ in range(rng.randint(0, 6)):
+                price = f"{lo + rng.randint(0, 40) * 0.5:.1f}"
+                size = "0" if rng.random() < 0.3 else f"{rng.uniform(0.1, 5):.3f}"
+                deltas[side].append([price, size])
+                if size == "0":
+                    ref.pop(price, None)
+                else:
+                    ref[price] = size
+        expected_bids, expected_asks = _levels(ref_bids, True), _levels(ref_asks, False)
+        engine.apply_update(
+            deltas["bids"],
+            deltas["asks"],
+            timestamp=seq,
+            seq=seq,
+            checksum=book_checksum(expected_bids, expected_asks),
+        )
+
+        assert engine.bids.raw_levels.tolist() == expected_bids
+        assert engine.asks.raw_levels.tolist() == expected_asks
+
+    assert engine.best_bid == max(map(float, ref_bids))
+    assert engine.best_ask == min(map(float, ref_asks))
+    assert engine.bids.depth(5) == pytest.approx(sum(float(s) for _, s in expected_bids[:5]))
+    threshold = float(expected_asks[3][0])
+    assert engine.asks.depth_to_price(threshold) == pytest.approx(
+        sum(float(s) for _, s in expected_asks[:4])
+    )
+
+
+def test_engine_rejects_out_of_sequence_and_bad_checksums():
+    engine = OrderBookEngine("BTCUSDT")
+    engine.apply_snapshot([["100", "1"]], [["101", "2"]], timestamp=1, seq=10)
+
+    with pytest.raises(OrderBookOutOfSyncError, match="seq 9"):
+        engine.apply_update([["100", "3"]], [], timestamp=2, seq=9)
+    assert not engine.synced
+    with pytest.raises(OrderBookOutOfSyncError, match="no snapshot"):
+        engine.apply_update([["100", "3"]], [], timestamp=2, seq=11)
+
+    engine.apply_snapshot([["100", "1"]], [["101", "2"]], timestamp=3, seq=12)
+    with pytest.raises(OrderBookOutOfSyncError, match="checksum"):
+        engine.apply_update([["99", "1"]], [], timestamp=4, seq=13, checksum=12345)
+
+
+def test_engine_consumes_stream_messages_and_feeds_stats():
+    subscription = Subscription.books("BTCUSDT")
+    engine = OrderBookEngine("BTCUSDT")
+    snapshot = BookUpdate(bids=[["100", "1"], ["99", "2"]], asks=[["101", "4"]], timestamp=1)
+    delta = BookUpdate(bids=[["99", "0"], ["99.5", "3"]], asks=[["102", "1"]], timestamp=2)
+
+    engine.handle_message(StreamMessage(subscription, "snapshot", [snapshot]))
+    engine.handle_message(StreamMessage(subscription, "update", [delta]))
+
+    np.testing.assert_array_equal(engine.to_snapshot().bids, [[100.0, 1.0], [99.5, 3.0]])
+    stats = calculate_order_book_stats(engine)
+    assert stats.spread == 1.0
+    assert stats.total_bid_volume == 4.0
+    assert stats.total_ask_volume == 5.0
+
+
+def _random_snapshot(levels: int, seed: int = 5) -> OrderBookSnapshot:
+    rng = np.random.default_rng(seed)
+    bids = 99.95 - np.cumsum(rng.uniform(0.01, 0.1, levels))
+    asks = 100.05 + np.cumsum(rng.uniform(0.01, 0.1, levels))
+    return OrderBookSnapshot(
+        bids=np.column_stack([bids, rng.uniform(0.1, 5, levels)]),
+        asks=np.column_stack([asks, rng.uniform(0.1, 5, levels)]),
+        timestamp=1,
+    )
+
+
+def _sweep(levels: np.ndarray, notional: float) -> float | None:
+    """The average fill price of a market order walking `levels` one at a time."""
+    remaining, size = notional, 0.0
+    for price, available in levels.tolist():
+        take = min(available, remaining / price)
+        size += take
+        remaining -= take * price
+        if remaining <= 1e-9:
+            return notional / size
+    return None
+
+
+def test_depth_analytics_match_level_by_level_reference():
+    book = _random_snapshot(400)
+    bids, asks = book.bids, book.asks
+    mid = (bids[0, 0] + asks[0, 0]) / 2
+
+    depth = calculate_depth_analytics(book, notionals=(500, 5_000, 1e9))
+
+    assert depth is not None
+    for bps, bid_size in depth.bid_depth_bps.items():
+        within = bids[:, 0] >= mid * (1 - float(bps) / 1e4)
+        assert bid_size == pytest.approx(bids[within, 1].sum())
+        within = asks[:, 0] <= mid * (1 + float(bps) / 1e4)
+        assert depth.ask_depth_bps[bps] == pytest.approx(asks[within, 1].sum())
+    for levels, imbalance in depth.imbalance.items():
+        bid, ask = bids[: int(levels), 1].sum(), asks[: int(levels), 1].sum()
+        assert imbalance == pytest.approx((bid - ask) / (bid + ask))
+    for notional in ("500", "5000"):
+        buy, sell = _sweep(asks, float(notional)), _sweep(bids, float(notional))
+        assert buy is not None
+        assert sell is not None
+        assert depth.buy_slippage_bps[notional] == pytest.approx((buy / mid - 1) * 1e4)
+        assert depth.sell_slippage_bps[notional] == pytest.approx((1 - sell / mid) * 1e4)
+    # The book cannot fill a billion, so that impact is unknown rather than understated.
+    assert depth.buy_slippage_bps["1e+09"] is None
+    assert depth.sell_slippage_bps["1e+09"] is None
+
+    (bid_price, bid_size), (ask_price, ask_size) = bids[0], asks[0]
+    microprice = (bid_price * ask_size + ask_price * bid_size) / (bid_size + ask_size)
+    assert depth.microprice == pytest.approx(microprice)
+    profile = DepthProfile.from_snapshot(book)
+    assert profile.weighted_mid_price(1) == pytest.approx(microprice)
+    np.testing.assert_allclose(profile.bid_depth[1:], np.cumsum(bids[:, 1]))
+    np.testing.assert_allclose(profile.ask_notional[1:], np.cumsum(asks[:, 0] * asks[:, 1]))
+
+
+def test_order_book_stats_agree_across_book_representations():
+    book = _random_snapshot(50)
+    engine = OrderBookEngine("BTCUSDT")
+    engine.apply_snapshot(
+        [[repr(p), repr(s)] for p, s in book.bids.tolist()],
+        [[repr(p), repr(s)] for p, s in book.asks.tolist()],
+        timestamp=1,
+    )
+
+    stats = calculate_order_book_stats(book)
+
+    assert stats.depth is not None
+    assert calculate_order_book_stats(book.to_order_book()) == stats
+    assert calculate_order_book_stats(engine) == stats
+    one_sided = OrderBookSnapshot(book.bids, np.empty((0, 2)), timestamp=1)
+    assert calculate_order_book_stats(one_sided).depth is None
+
+
+def test_order_book_stats_read_a_live_engine_without_copying_it(monkeypatch):
+    book = _random_snapshot(50)
+    engine = OrderBookEngine("BTCUSDT")
+    engine.apply_snapshot(
+        [[repr(p), repr(s)] for p, s in book.bids.tolist()],
+        [[repr(p), repr(s)] for p, s in book.asks.tolist()],
+        timestamp=1,
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the live book was copied into a snapshot")
+
+    monkeypatch.setattr(OrderBookEngine, "to_snapshot", fail)
+    totals = engine.bids.running_totals
+    profile = DepthProfile.from_engine(engine)
+
+    assert calculate_order_book_stats(engine) == calculate_order_book_stats(book)
+    # The depth curves are the engine's cached totals, kept until the next update.
+    assert engine.bids.running_totals is totals
+    assert np.shares_memory(profile.bid_depth, totals)
+    engine.apply_update([[repr(book.bids[0, 0].item()), "0"]], [], timestamp=2)
+    assert engine.bids.running_totals is not totals
+    assert engine.bids.total_size == pytest.approx(book.bids[1:, 1].sum())
@@ -0,0 +1,78 @@
+from dataclasses import fields
+
+import numpy as np
+import pytest
+
+from market_beacon.analysis import (
+    IndicatorValues,
+    _talib_indicator_values,
+    calculate_technical_indicators,
+)
+from market_beacon.api.batches import CandleBatch
+from market_beacon.panel import (
+    CandlePanel,
+    calculate_indicator_table,
+    indicator_values_from_row,
+    technical_analysis_from_table,
+)
+
+from .helpers import assert_same_analysis, make_random_candles
+
+
+def _with_gaps(batch: CandleBatch, rows: list[int]) -> CandleBatch:
+    columns = {name: column.copy() for name, column in batch.columns().items()}
+    columns["close"][rows] = np.nan
+    return CandleBatch(**columns)
+
+
+@pytest.fixture
+def universe() -> dict[str, CandleBatch]:
+    return {
+        "AAAUSDT": make_random_candles(420, seed=1),
+        "BBBUSDT": _with_gaps(make_random_candles(290, seed=2), [5, 150]),
+        "CCCUSDT": make_random_candles(150, seed=3),
+        "DDDUSDT": make_random_candles(201, seed=4),
+    }
+
+
+def test_panel_right_aligns_histories(universe: dict[str, CandleBatch]):
+    panel = CandlePanel.from_batches(universe, length=300)
+
+    assert panel.symbols == ("AAAUSDT", "BBBUSDT", "CCCUSDT", "DDDUSDT")
+    assert panel.close.shape == (4, 300)
+    np.testing.assert_array_equal(panel.close[0], universe["AAAUSDT"].close[-300:])
+    # Invalid rows are dropped, then short histories are left-padded.
+    assert np.isnan(panel.close[1, :12]).all()
+    assert np.isfinite(panel.close[1, 12:]).all()
+    assert (panel.timestamp[2, :150] == 0).all()
+    assert panel.timestamp[2, -1] == universe["CCCUSDT"].timestamp[-1]
+
+
+def test_indicator_table_matches_talib_per_symbol(universe: dict[str, CandleBatch]):
+    table = calculate_indicator_table(CandlePanel.from_batches(universe))
+
+    assert table.index.tolist() == list(universe)
+    assert table["candles"].tolist() == [420, 288, 150, 201]
+    assert table.loc["CCCUSDT"].drop(["candles", "last_timestamp"]).isna().all()
+
+    for symbol in ("AAAUSDT", "BBBUSDT", "DDDUSDT"):
+        batch = universe[symbol]
+        expected = _talib_indicator_values(batch[np.isfinite(batch.close)])
+        actual = indicator_values_from_row(table.loc[symbol])
+        for field in fields(IndicatorValues):
+            want, got = getattr(expected, field.name), getattr(actual, field.name)
+            if field.name == "ema_ribbon":
+                assert got == pytest.approx(want, rel=1e-9), symbol
+            elif want is None:
+                assert got is None, (symbol, field.name)
+            else:
+                assert got == pytest.approx(want, rel=1e-9, abs=1e-9), (symbol, field.name)
+
+
+def test_table_rows_interpret_like_the_per_symbol_analysis(universe: dict[str, CandleBatch]):
+    table = calculate_indicator_table(CandlePanel.from_batches(universe))
+
+    for symbol, batch in universe.items():
+        assert_same_analysis(
+            technical_analysis_from_table(table, symbol), calculate_technical_indicators(batch)
+        )
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from market_beacon.analysis import run_analysis
+from market_beacon.api.batches import CandleBatch, TradeBatch
+from market_beacon.prefilter import PrefilterConfig, prefilter_symbols
+
+from .helpers import BASE_MS, StubHTTPError, make_random_candles
+
+# Symbol -> 24h USDT volume.
+VOLUMES = {
+    "AAAUSDT": 5e7,
+    "BBBUSDT": 2e7,
+    "CCCUSDT": 9e6,
+    "DDDUSDT": 3e6,
+    "THINUSDT": 1e4,
+    "EEEBTC": 8e7,
+}
+CANDLES = {symbol: make_random_candles(250, seed=i) for i, symbol in enumerate(VOLUMES)}
+
+
+def _tickers(params: dict[str, str]) -> list[dict[str, str]]:
+    return [
+        {
+            "symbol": symbol,
+            "lastPr": "1",
+            "high24h": "1.1",
+            "low24h": "0.9",
+            "change24h": "0.01",
+            "baseVolume": str(volume),
+            "quoteVolume": str(volume),
+            "usdtVolume": str(volume),
+            "bidPr": "0.9999",
+            "askPr": "1.0001",
+            "ts": str(BASE_MS),
+        }
+        for symbol, volume in VOLUMES.items()
+    ]
+
+
+def _candles(params: dict[str, str]) -> list[list[str]]:
+    if params["symbol"] == "CCCUSDT":
+        raise StubHTTPError(400)
+    batch = CANDLES[params["symbol"]]
+    columns = [batch.open, batch.high, batch.low, batch.close, batch.volume, batch.quote_volume]
+    return [
+        [str(ts), *(repr(float(column[i])) for column in columns)]
+        for i, ts in enumerate(batch.timestamp.tolist())
+    ][-int(params["limit"]) :]
+
+
+@pytest.fixture
+def client(stub_server):
+    stub_server.route("/spot/market/tickers", _tickers)
+    stub_server.route("/spot/market/candles", _candles)
+    stub_server.route(
+        "/spot/market/orderbook",
+        lambda params: {"asks": [["101", "1"]], "bids": [["100", "2"]], "ts": "1"},
+    )
+    client = stub_server.client()
+    with client:
+        yield client
+
+
+def _volatility(batch: CandleBatch) -> float:
+    return float(np.std(np.diff(np.log(batch.close))))
+
+
+def test_each_stage_only_sees_the_previous_stages_survivors(client, stub_server):
+    config = PrefilterConfig(min_usdt_volume=1e6, max_candidates=3, top=1)
+
+    report = prefilter_symbols(client.market, "1min", 250, config, fetch_workers=2)
+
+    # EEEBTC is not quoted in USDT, THINUSDT is too thin and DDDUSDT misses the cut.
+    assert report.universe == len(VOLUMES)
+    assert report.candidates.symbol.tolist() == ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    candle_requests = sorted(
+        params["symbol"] for path, params in stub_server.requests if path.endswith("/candles")
+    )
+    assert candle_requests == ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    assert [(f.symbol, f.stage) for f in report.failures] == [("CCCUSDT", "fetch")]
+
+    volatility = {s: _volatility(CANDLES[s]) for s in ("AAAUSDT", "BBBUSDT")}
+    for symbol, expected in volatility.items():
+        assert report.candle_scores[symbol]["volatility"] == pytest.approx(expected)
+    assert report.shortlist == [max(volatility, key=volatility.__getitem__)]
+    [analysis] = report.analyses
+    symbol = report.shortlist[0]
+    assert analysis == run_analysis(symbol, TradeBatch.empty(), CANDLES[symbol])
+    assert not any(path.endswith("/orderbook") for path, _ in stub_server.requests)
+
+
+def test_order_book_final_stage_and_config_errors(client, stub_server):
+    config = PrefilterConfig(quote_asset=None, min_usdt_volume=None, score_by="volume", top=2)
+
+    report = prefilter_symbols(client.market, "1min", 100, config, final_stage="orderbook")
+
+    assert len(report.shortlist) == 2
+    assert list(report.order_books) == report.shortlist
+    assert report.order_books[report.shortlist[0]].spread == 1.0
+    assert not report.analyses
+    book_requests = [p["symbol"] for path, p in stub_server.requests if path.endswith("/orderbook")]
+    assert sorted(book_requests) == sorted(report.shortlist)
+
+    with pytest.raises(ValueError, match="Cannot score candles by 'rsi'"):
+        prefilter_symbols(client.market, "1min", 100, PrefilterConfig(score_by="rsi"))
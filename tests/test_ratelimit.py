@@ -0,0 +1,169 @@
+from datetime import datetime
+
+import pytest
+
+from market_beacon.api.exceptions import BitgetAPIRequestError, BitgetPaginationError
+from market_beacon.api.ratelimit import RateLimiter, RetryPolicy, TokenBucket
+
+from .helpers import BASE_MS, StubHTTPError
+
+NO_WAIT_RETRIES = RetryPolicy(max_retries=3, base_delay=0.0, max_delay=0.0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ms(offset_ms: int) -> int:
+    return BASE_MS + offset_ms
+
+
+def _dt(offset_ms: int) -> datetime:
+    return datetime.fromtimestamp(_ms(offset_ms) / 1000)
+
+
+def _trade_pages(page_size: int, pages: int):
+    """Serves `pages` pages of trades, keyed off the afterTradeId cursor."""
+
+    def handler(params: dict[str, str]) -> list[dict[str, str]]:
+        start = int(params.get("afterTradeId", "0"))
+        if start >= page_size * pages:
+            return []
+        return [
+            {
+                "tradeId": str(i),
+                "price": "100",
+                "size": "1",
+                "side": "buy",
+                "ts": str(1_700_000_000_000 + i),
+            }
+            for i in range(start + 1, start + page_size + 1)
+        ]
+
+    return handler
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, clock=clock)
+
+    waits = [bucket.reserve() for _ in range(12)]
+
+    assert waits[:10] == [0.0] * 10
+    assert waits[10] == pytest.approx(0.1)
+    assert waits[11] == pytest.approx(0.2)
+
+    clock.now = 1.0
+    assert bucket.reserve() == pytest.approx(0.0, abs=1e-9)
+
+
+def test_rate_limiter_counts_throttled_waits():
+    limiter = RateLimiter(quotas={"/spot/market/fills": 2})
+
+    waits = [limiter.reserve("/spot/market/fills") for _ in range(3)]
+
+    assert waits[-1] > 0
+    assert limiter.stats.throttled_waits == 1
+
+
+def test_request_retries_transient_failures(stub_server):
+    stub_server.route("/public/time", lambda params: {"serverTime": "1700000000000"})
+    stub_server.fail("/public/time", 429, 503)
+
+    with stub_server.client(retry_policy=NO_WAIT_RETRIES) as client:
+        server_time = client.market.get_server_time()
+
+    assert server_time.server_time.year == 2023
+    assert client.stats.retries == 2
+
+
+def test_request_does_not_retry_client_errors(stub_server):
+    stub_server.route("/public/time", lambda params: {"serverTime": "1700000000000"})
+    stub_server.fail("/public/time", 400)
+
+    with (
+        stub_server.client(retry_policy=NO_WAIT_RETRIES) as client,
+        pytest.raises(BitgetAPIRequestError),
+    ):
+        client.market.get_server_time()
+
+    assert client.stats.retries == 0
+
+
+def test_get_trades_retries_page_without_losing_cursor(stub_server):
+    stub_server.route("/spot/market/fills", _trade_pages(page_size=100, pages=3))
+    stub_server.fail("/spot/market/fills", 429)
+
+    with stub_server.client(retry_policy=NO_WAIT_RETRIES) as client:
+        trades = client.market.get_trades(
+            "BTCUSDT", start_time=_dt(0), end_time=_dt(10_000), limit=100
+        )
+
+    assert [t.trade_id for t in trades] == [str(i) for i in range(1, 301)]
+
+
+def test_get_trades_failure_is_resumable(stub_server):
+    serve_page = _trade_pages(page_size=100, pages=3)
+    outage = {"active": True}
+
+    def flaky_second_page(params: dict[str, str]):
+        if params.get("afterTradeId") == "100" and outage["active"]:
+            raise StubHTTPError(503)
+        return serve_page(params)
+
+    stub_server.route("/spot/market/fills", flaky_second_page)
+
+    with stub_server.client(retry_policy=RetryPolicy(max_retries=0)) as client:
+        with pytest.raises(BitgetPaginationError) as exc_info:
+            client.market.get_trades("BTCUSDT", start_time=_dt(0), end_time=_dt(10_000))
+
+        error = exc_info.value
+        assert len(error.items) == 100
+        assert error.cursor == "100"
+
+        outage["active"] = False
+        rest = client.market.get_trades(
+            "BTCUSDT", start_time=_dt(0), end_time=_dt(10_000), after_trade_id=error.cursor
+        )
+
+    assert [t.trade_id for t in error.items + rest] == [str(i) for i in range(1, 301)]
+
+
+def test_windowed_trades_failure_keeps_earlier_windows(stub_server):
+    # One trade every 100 ms, so each of the three 10s windows is two pages of 50.
+    trades = [
+        {"tradeId": str(i), "price": "100", "size": "1", "side": "buy", "ts": str(_ms(i * 100))}
+        for i in range(300)
+    ]
+    outage = {"active": True}
+
+    def flaky_last_window(params: dict[str, str]):
+        lo, hi = int(params["startTime"]), int(params["endTime"])
+        after = int(params.get("afterTradeId", "-1"))
+        if lo == _ms(20_000) and after == 249 and outage["active"]:
+            raise StubHTTPError(503)
+        in_range = [t for t in trades if lo <= int(t["ts"]) <= hi and int(t["tradeId"]) > after]
+        return in_range[: int(params["limit"])]
+
+    stub_server.route("/spot/market/fills", flaky_last_window)
+
+    with stub_server.client(retry_policy=RetryPolicy(max_retries=0)) as client:
+        with pytest.raises(BitgetPaginationError, match=f"starting at {_ms(20_000)}") as exc_info:
+            client.market.get_trades(
+                "BTCUSDT", start_time=_dt(0), end_time=_dt(29_999), limit=50, max_workers=3
+            )
+
+        error = exc_info.value
+        assert [t.trade_id for t in error.items] == [str(i) for i in range(250)]
+        assert error.cursor == "249"
+
+        outage["active"] = False
+        rest = client.market.get_trades(
+            "BTCUSDT", start_time=_dt(20_000), end_time=_dt(29_999), after_trade_id=error.cursor
+        )
+
+    assert [t.trade_id for t in error.items + rest] == [str(i) for i in range(300)]
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from market_beacon.analysis import AnalysisResult, run_analysis
+from market_beacon.api.batches import CandleBatch, TradeBars, TradeBatch
+from market_beacon.scan import ScanFailure, fetch_analysis_inputs, scan_symbols, summarize_scan
+
+from .helpers import StubHTTPError, make_random_candles
+
+SYMBOLS = ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+
+
+def _candle_rows(symbol: str) -> list[list[str]]:
+    batch = make_random_candles(250, seed=SYMBOLS.index(symbol))
+    columns = [batch.open, batch.high, batch.low, batch.close, batch.volume, batch.quote_volume]
+    return [
+        [str(ts), *(repr(float(column[i])) for column in columns)]
+        for i, ts in enumerate(batch.timestamp.tolist())
+    ]
+
+
+def _candles_route(params: dict[str, str]) -> list[list[str]]:
+    if params["symbol"] not in SYMBOLS:
+        raise StubHTTPError(400)
+    return _candle_rows(params["symbol"])[-int(params["limit"]) :]
+
+
+@pytest.fixture
+def client(stub_server):
+    stub_server.route("/spot/market/candles", _candles_route)
+    client = stub_server.client()
+    with client:
+        yield client
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_scan_matches_single_symbol_analysis(client, processes):
+    results = list(
+        scan_symbols(
+            client.market,
+            [*SYMBOLS, "BADUSDT"],
+            granularity="1min",
+            candle_limit=250,
+            fetch_workers=4,
+            processes=processes,
+        )
+    )
+
+    failures = [r for r in results if isinstance(r, ScanFailure)]
+    assert [(f.symbol, f.stage) for f in failures] == [("BADUSDT", "fetch")]
+
+    analyses = {r.symbol: r for r in results if isinstance(r, AnalysisResult)}
+    assert sorted(analyses) == SYMBOLS
+    for symbol, analysis in analyses.items():
+        candles = CandleBatch.from_rows(_candle_rows(symbol))
+        assert analysis == run_analysis(symbol, TradeBatch.empty(), candles, mode="fast")
+
+
+def test_summary_ranks_descending_with_missing_values_last(client):
+    results = [
+        r
+        for r in scan_symbols(client.market, SYMBOLS, "1min", candle_limit=250, processes=0)
+        if isinstance(r, AnalysisResult)
+    ]
+    # Too few candles for indicators: RSI is missing.
+    short = run_analysis("DDDUSDT", TradeBatch.empty(), make_random_candles(50), mode="fast")
+
+    table = summarize_scan([*results, short], rank_by="rsi")
+
+    assert table.index.tolist() == [1, 2, 3, 4]
+    assert table["symbol"].iloc[-1] == "DDDUSDT"
+    rsi = table["rsi"].to_numpy()
+    assert np.isnan(rsi[-1])
+    assert np.all(np.diff(rsi[:-1]) <= 0)
+    assert summarize_scan(results, rank_by="change", top=1)["change_%"].iloc[0] == max(
+        r.technical_analysis.price_change_percent for r in results
+    )
+
+
+def test_full_mode_aggregates_trades_into_one_bar_per_candle(client, stub_server):
+    candles = make_random_candles(250, seed=0)
+    # A trade every 20 seconds, so each one-minute candle holds three.
+    trade_ts = range(int(candles.timestamp[0]), int(candles.timestamp[-1]) + 60_000, 20_000)
+    trades = [
+        {"tradeId": str(i), "price": "100", "size": "1", "side": "buy", "ts": str(ts)}
+        for i, ts in enumerate(trade_ts)
+    ]
+    stub_server.route(
+        "/spot/market/fills",
+        lambda params: [
+            t for t in trades if int(params["startTime"]) <= int(t["ts"]) <= int(params["endTime"])
+        ],
+    )
+
+    fetched, bars = fetch_analysis_inputs(
+        client.market, "AAAUSDT", "1min", candle_limit=5, mode="full", trade_workers=2
+    )
+
+    assert isinstance(bars, TradeBars)
+    assert bars.timestamp.tolist() == fetched.timestamp.tolist()
+    assert bars.trade_count.tolist() == [3] * 5
+
+
+def test_full_mode_fetches_calendar_month_trades_per_worker(client, stub_server):
+    candles = make_random_candles(250, seed=0)
+    start_ms, end_ms = int(candles.timestamp[-5]), int(candles.timestamp[-1])
+    trades = [
+        {"tradeId": str(i), "price": "100", "size": "1", "side": "buy", "ts": str(ts)}
+        for i, ts in enumerate(range(start_ms, end_ms + 1, 20_000))
+    ]
+    stub_server.route(
+        "/spot/market/fills",
+        lambda params: [
+            t for t in trades if int(params["startTime"]) <= int(t["ts"]) <= int(params["endTime"])
+        ],
+    )
+
+    _, bars = fetch_analysis_inputs(
+        client.market, "AAAUSDT", "1M", candle_limit=5, mode="full", trade_workers=2
+    )
+
+    assert bars.trade_count.tolist() == [len(trades)]
+    fills = [params for path, params in stub_server.requests if path.endswith("/fills")]
+    assert len({params["startTime"] for params in fills}) == 2
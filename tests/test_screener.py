@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from market_beacon.api import TickerTable
+from market_beacon.screener import rank_tickers, screen_tickers, top_movers
+
+from .helpers import BASE_MS
+
+
+def _ticker(
+    symbol: str, last: float, change: float, usdt_volume: float, spread: float
+) -> dict[str, str]:
+    return {
+        "symbol": symbol,
+        "lastPr": str(last),
+        "high24h": str(last * 1.1),
+        "low24h": str(last * 0.95),
+        "change24h": str(change),
+        "baseVolume": str(usdt_volume / last),
+        "quoteVolume": str(usdt_volume),
+        "usdtVolume": str(usdt_volume),
+        "bidPr": str(last - spread / 2) if spread else "",
+        "askPr": str(last + spread / 2),
+        "ts": str(BASE_MS),
+    }
+
+
+TICKERS = [
+    _ticker("BTCUSDT", 65_000, 0.02, 5e8, 1),
+    _ticker("ETHUSDT", 3_000, -0.04, 2e8, 0.1),
+    _ticker("DOGEUSDT", 0.1, 0.12, 3e6, 0.0001),
+    _ticker("ETHBTC", 0.05, -0.01, 1e6, 0.00001),
+    _ticker("THINUSDT", 1.0, -0.3, 5e3, 0),
+]
+
+
+@pytest.fixture
+def tickers(stub_server) -> TickerTable:
+    stub_server.route("/spot/market/tickers", lambda params: TICKERS)
+    client = stub_server.client()
+    with client:
+        table = client.market.get_tickers()
+    assert [(path, params) for path, params in stub_server.requests] == [
+        ("/api/v2/spot/market/tickers", {})
+    ]
+    return table
+
+
+def test_get_tickers_parses_the_universe_into_columns(tickers: TickerTable):
+    assert tickers.symbol.tolist() == [t["symbol"] for t in TICKERS]
+    np.testing.assert_array_equal(tickers.last_price, [65_000, 3_000, 0.1, 0.05, 1.0])
+    assert tickers.timestamp.dtype == np.int64
+    # THINUSDT has no bid, so its spread is unknown rather than zero.
+    assert np.isnan(tickers.bid_price[-1])
+    assert np.isnan(tickers.spread_bps[-1])
+    assert tickers.spread_bps[0] == pytest.approx(1 / 65_000 * 1e4)
+    assert tickers.range_24h[0] == pytest.approx(1.1 / 0.95 - 1)
+
+
+def test_screener_filters_and_ranks_in_bulk(tickers: TickerTable):
+    liquid = screen_tickers(tickers, quote_asset="USDT", min_usdt_volume=1e6, max_spread_bps=5)
+    assert liquid.symbol.tolist() == ["BTCUSDT", "ETHUSDT"]
+    movers = screen_tickers(tickers, min_abs_change=0.03)
+    assert movers.symbol.tolist() == ["ETHUSDT", "DOGEUSDT", "THINUSDT"]
+
+    assert top_movers(tickers, 2).symbol.tolist() == ["THINUSDT", "DOGEUSDT"]
+    assert top_movers(tickers, 2, "gainers").symbol.tolist() == ["DOGEUSDT", "BTCUSDT"]
+    assert top_movers(tickers, 2, "losers").symbol.tolist() == ["THINUSDT", "ETHUSDT"]
+    # Missing spreads rank last whichever way the table is sorted.
+    assert rank_tickers(tickers, "spread_bps").symbol[-1] == "THINUSDT"
+    assert rank_tickers(tickers, "spread_bps", ascending=True).symbol[-1] == "THINUSDT"
+    with pytest.raises(ValueError, match="Cannot rank tickers"):
+        rank_tickers(tickers, "rsi")
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Heavy dependencies the CLI must only import on the code paths that use them.
+LAZY_MODULES = ("pandas", "talib", "httpx", "websockets", "pydantic_settings")
+
+
+def _modules_loaded_by(code: str) -> set[str]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("BITGET_")}
+    check = f"{code}; import sys; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", check],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=Path(__file__).parents[1],
+    ).stdout.strip()
+    return set(output.split(",")) - {""}
+
+
+def test_cli_imports_without_heavy_dependencies_or_credentials():
+    assert _modules_loaded_by("import market_beacon.__main__") == set()
+
+
+def test_heavy_dependencies_load_on_first_use():
+    loaded = _modules_loaded_by(
+        "from market_beacon.api import AsyncBitgetClient; "
+        "from market_beacon.analysis import calculate_technical_indicators; "
+        "from tests.helpers import make_random_candles; "
+        "calculate_technical_indicators(make_random_candles(250))"
+    )
+    assert loaded == {"pandas", "talib", "httpx"}
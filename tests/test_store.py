@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from market_beacon.api.batches import CandleBatch
+from market_beacon.store import CandleStore, plan_candle_refresh
+
+MINUTE_MS = 60_000
+
+
+def _candles_route(params: dict[str, str]) -> list[list[str]]:
+    """Serves a one-candle-per-minute history ending at the current minute."""
+    now_ms = int(time.time() * 1000)
+    latest = now_ms - now_ms % MINUTE_MS
+    limit = int(params["limit"])
+    start = int(params.get("startTime", latest - (limit - 1) * MINUTE_MS))
+    end = min(int(params.get("endTime", latest)), latest)
+    opens = list(range(start, end + 1, MINUTE_MS))[-limit:]
+    return [[str(ts), "1", "2", "0.5", str(ts % 97), "10", "15"] for ts in opens]
+
+
+def test_plan_refreshes_tail_and_fills_gaps():
+    timestamps = np.array([0, 60_000, 120_000, 300_000, 360_000], dtype=np.int64)
+
+    window_start, ranges = plan_candle_refresh(
+        timestamps, interval_ms=MINUTE_MS, limit=8, now_ms=480_000 + 5
+    )
+
+    assert window_start == 60_000
+    # The 180s/240s gap, then the stale newest candle (360s) through the current minute.
+    assert ranges == [(180_000, 240_000), (360_000, 480_000)]
+
+
+def test_upsert_replaces_candles_with_same_open_time(tmp_path):
+    store = CandleStore(tmp_path)
+    rows = _candles_route({"limit": "3"})
+    store.upsert("BTCUSDT", "1min", CandleBatch.from_rows(rows))
+
+    refreshed_row = [*rows[-1][:4], "123", *rows[-1][5:]]
+    store.upsert("BTCUSDT", "1min", CandleBatch.from_rows([refreshed_row]))
+
+    stored = store.load("BTCUSDT", "1min")
+    assert len(stored) == 3
+    assert np.all(np.diff(stored.timestamp) > 0)
+    assert stored.close[-1] == 123.0
+    assert store.read("BTCUSDT", "1min", limit=1).close.tolist() == [123.0]
+
+
+def test_cached_get_candles_only_fetches_new_candles(stub_server, tmp_path):
+    stub_server.route("/spot/market/candles", _candles_route)
+    client = stub_server.client(candle_store=CandleStore(tmp_path))
+
+    with client:
+        first = client.market.get_candles("BTCUSDT", granularity="1min", limit=300)
+        second = client.market.get_candles("BTCUSDT", granularity="1min", limit=300)
+
+    assert len(first) == 300
+    assert len(second) == 300
+    assert second[-1].timestamp >= first[-1].timestamp
+
+    first_params, second_params = (params for _, params in stub_server.requests)
+    assert "startTime" not in first_params
+    # The follow-up only asks for the newest stored candle onwards.
+    assert int(second_params["limit"]) <= 2
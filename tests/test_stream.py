@@ -0,0 +1,141 @@
+import asyncio
+import json
+from typing import Any
+
+from websockets.asyncio.server import ServerConnection, serve
+
+from market_beacon.api import MarketStream, StreamMessage, Subscription
+from market_beacon.api.batches import TradeBatch
+from market_beacon.api.ratelimit import RetryPolicy
+
+from .helpers import BASE_MS
+
+
+def _push(arg: dict[str, str], seq: int) -> dict[str, Any]:
+    """Builds a push for a channel in the shape Bitget sends."""
+    if arg["channel"] == "trade":
+        data: list[Any] = [
+            {
+                "ts": str(BASE_MS + seq),
+                "price": "100.5",
+                "size": "0.25",
+                "side": "buy",
+                "tradeId": str(seq),
+            }
+        ]
+    else:
+        data = [[str(BASE_MS + seq * 60_000), "1", "2", "0.5", "1.5", "10", "15", "15"]]
+    return {"action": "snapshot", "arg": arg, "data": data, "ts": BASE_MS + seq}
+
+
+class StubStreamServer:
+    """A local WebSocket server that acknowledges subscriptions and pushes one update each."""
+
+    def __init__(self, drop_first_connection: bool = False, junk: tuple[str, ...] = ()):
+        self.drop_first_connection = drop_first_connection
+        # Frames sent ahead of each push, which the client must skip.
+        self.junk = junk
+        self.connections = 0
+        self.subscribed: list[list[dict[str, str]]] = []
+        self.pings = 0
+        self.url = ""
+
+    async def handler(self, ws: ServerConnection) -> None:
+        self.connections += 1
+        connection = self.connections
+        args: list[dict[str, str]] = []
+        self.subscribed.append(args)
+        async for raw in ws:
+            if raw == "ping":
+                self.pings += 1
+                await ws.send("pong")
+                continue
+            request = json.loads(raw)
+            for arg in request["args"]:
+                args.append(arg)
+                await ws.send(json.dumps({"event": request["op"], "arg": arg}))
+                for frame in self.junk:
+                    await ws.send(frame)
+                await ws.send(json.dumps(_push(arg, seq=connection)))
+            if self.drop_first_connection and connection == 1:
+                await ws.close()
+                return
+
+
+def _run_with_server(server: StubStreamServer, scenario) -> Any:
+    async def main() -> Any:
+        async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            server.url = f"ws://127.0.0.1:{port}"
+            return await asyncio.wait_for(scenario(), timeout=5)
+
+    return asyncio.run(main())
+
+
+def test_stream_multiplexes_and_fans_out_parsed_updates():
+    server = StubStreamServer()
+    btc, eth, sol = (Subscription.trades(s) for s in ("BTCUSDT", "ETHUSDT", "SOLUSDT"))
+    candles = Subscription.candles("BTCUSDT", "1min")
+
+    async def scenario() -> tuple[list[StreamMessage], list[StreamMessage]]:
+        received: list[StreamMessage] = []
+        async with MarketStream(server.url, max_subscriptions_per_connection=2) as stream:
+            stream.add_listener(received.append, subscriptions=[candles])
+            updates = stream.updates()
+            await stream.subscribe(btc, eth, sol, candles)
+            collected = [await anext(updates) for _ in range(4)]
+        return received, collected
+
+    received, collected = _run_with_server(server, scenario)
+
+    assert server.connections == 2
+    assert sorted(len(args) for args in server.subscribed) == [2, 2]
+    assert {m.subscription for m in collected} == {btc, eth, sol, candles}
+    trade_message = next(m for m in collected if m.subscription == btc)
+    assert isinstance(trade_message.data, TradeBatch)
+    assert trade_message.data.price.tolist() == [100.5]
+    assert [m.subscription for m in received] == [candles]
+    assert received[0].data.close.tolist() == [1.5]
+
+
+def test_stream_reconnects_and_resubscribes():
+    server = StubStreamServer(drop_first_connection=True)
+    btc = Subscription.trades("BTCUSDT")
+
+    async def scenario() -> list[StreamMessage]:
+        stream = MarketStream(
+            server.url,
+            ping_interval=0.05,
+            reconnect_policy=RetryPolicy(base_delay=0.01, max_delay=0.05),
+        )
+        async with stream:
+            updates = stream.updates([btc])
+            await stream.subscribe(btc)
+            messages = [await anext(updates) for _ in range(2)]
+            await asyncio.sleep(0.15)
+        return messages
+
+    messages = _run_with_server(server, scenario)
+
+    assert server.connections == 2
+    assert server.subscribed[1] == [btc.to_arg()]
+    # One push per connection: the first before the drop, the second after resubscribing.
+    assert [m.data.trade_id.tolist() for m in messages] == [[1], [2]]
+    assert server.pings > 0
+
+
+def test_stream_skips_frames_it_cannot_parse():
+    bad_timestamp = {**_push(Subscription.trades("BTCUSDT").to_arg(), seq=9), "ts": "soon"}
+    server = StubStreamServer(junk=("[1, 2]", "42", '"text"', "{", json.dumps(bad_timestamp)))
+    btc = Subscription.trades("BTCUSDT")
+
+    async def scenario() -> StreamMessage:
+        async with MarketStream(server.url) as stream:
+            updates = stream.updates([btc])
+            await stream.subscribe(btc)
+            return await anext(updates)
+
+    message = _run_with_server(server, scenario)
+
+    assert server.connections == 1
+    assert message.data.trade_id.tolist() == [1]
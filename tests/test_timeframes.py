@@ -0,0 +1,83 @@
+import pytest
+
+from market_beacon.analysis import calculate_technical_indicators
+from market_beacon.timeframes import (
+    group_timeframes,
+    order_timeframes,
+    run_multi_timeframe_analysis,
+)
+
+from .helpers import assert_same_analysis, make_random_candles
+
+BASE = make_random_candles(1_000)
+COLUMNS = [BASE.open, BASE.high, BASE.low, BASE.close, BASE.volume, BASE.quote_volume]
+ROWS = [
+    [str(ts), *(repr(float(column[i])) for column in COLUMNS)]
+    for i, ts in enumerate(BASE.timestamp.tolist())
+]
+
+
+def test_timeframes_are_resampled_from_one_base_fetch(stub_server):
+    stub_server.route("/spot/market/candles", lambda params: ROWS[-int(params["limit"]) :])
+    client = stub_server.client()
+
+    with client:
+        result = run_multi_timeframe_analysis(
+            client.market, "BTCUSDT", ["5min", "1min", "3min", "5min"], candle_limit=150
+        )
+
+    # One base candle per minute for 151 five-minute candles, the oldest being partial.
+    assert [(path, params["limit"]) for path, params in stub_server.requests] == [
+        ("/api/v2/spot/market/candles", "755")
+    ]
+    assert result.timeframes is not None
+    assert list(result.timeframes) == ["1min", "3min", "5min"]
+    assert result.technical_analysis == result.timeframes["1min"]
+    fetched = BASE[-755:]
+    for timeframe, minutes in (("1min", 1), ("3min", 3), ("5min", 5)):
+        candles = fetched.resample(minutes * 60_000) if minutes > 1 else fetched
+        assert len(candles) >= 150
+        expected = calculate_technical_indicators(candles[-150:])
+        assert_same_analysis(result.timeframes[timeframe], expected)
+
+
+def test_coarse_timeframes_are_fetched_directly_when_deriving_them_takes_many_pages(
+    stub_server,
+):
+    hourly = BASE.resample(3_600_000)
+    hourly_columns = [getattr(hourly, name) for name in ("open", "high", "low", "close")]
+    hourly_rows = [
+        [str(ts), *(repr(float(column[i])) for column in hourly_columns), "1", "1"]
+        for i, ts in enumerate(hourly.timestamp.tolist())
+    ]
+    stub_server.route(
+        "/spot/market/candles",
+        lambda params: (hourly_rows if params["granularity"] == "1h" else ROWS)[
+            -int(params["limit"]) :
+        ],
+    )
+    client = stub_server.client()
+
+    with client:
+        result = run_multi_timeframe_analysis(
+            client.market, "BTCUSDT", ["1min", "5min", "1h"], candle_limit=150
+        )
+
+    # Deriving 150 hourly candles would take 9,060 one-minute candles, so 1h is fetched.
+    requests = [(p["granularity"], p["limit"]) for _, p in stub_server.requests]
+    assert requests == [("1min", "755"), ("1h", "150")]
+    assert result.timeframes is not None
+    assert list(result.timeframes) == ["1min", "5min", "1h"]
+    assert group_timeframes(["1min", "5min", "1h"], 150, max_base_candles=None) == [
+        ["1min", "5min", "1h"]
+    ]
+    # 6Hutc does not divide into 4h candles, so it can't join the 4h group.
+    assert group_timeframes(["1h", "4h", "6Hutc"], 300) == [["1h"], ["4h"], ["6Hutc"]]
+
+
+def test_timeframes_must_divide_evenly_into_epoch_aligned_candles():
+    assert order_timeframes(["1Dutc", "1h", "4h"]) == ["1h", "4h", "1Dutc"]
+    with pytest.raises(ValueError, match="whole multiples of 3min"):
+        order_timeframes(["3min", "5min"])
+    with pytest.raises(ValueError, match=r"\['1day'\]"):
+        order_timeframes(["1h", "1day"])